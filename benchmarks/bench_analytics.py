@@ -0,0 +1,79 @@
+"""Stream 10M synthetic bids through the analytics aggregates and report time and peak memory.
+
+Pages of job and bid rows are generated and reduced one at a time, the way
+AnalyticsService reads them, so no backend is needed. --id-base shifts every
+ID (e.g. to 1000000000, where offline rows start) to show memory does not
+depend on how large the IDs are:
+
+    python -m benchmarks.bench_analytics --bids 10000000 --memory
+"""
+import argparse
+import resource
+import sys
+import time
+import tracemalloc
+import numpy as np
+from src.services.analytics_service import AnalyticsService, MarketplaceAggregates, PAGE_SIZE
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bids", type=int, default=10_000_000)
+    parser.add_argument("--jobs", type=int, default=500_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--id-base", type=int, default=0, help="Added to every job and user ID")
+    parser.add_argument("--memory", action="store_true",
+                        help="Trace Python and NumPy allocations (slower; reports the traced peak)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    statuses = np.array(["open", "assigned", "in-progress", "completed"])
+    bid_statuses = np.array(["pending", "accepted", "rejected"])
+    if args.memory:
+        tracemalloc.start()
+    rss_before = peak_rss_mb()
+    agg = MarketplaceAggregates()
+
+    start = time.perf_counter()
+    for first in range(1, args.jobs + 1, PAGE_SIZE):
+        ids = np.arange(first, min(first + PAGE_SIZE, args.jobs + 1)) + args.id_base
+        clients = rng.integers(1, args.users // 2 + 1, len(ids)) + args.id_base
+        budgets = np.round(rng.lognormal(6, 1, len(ids)), 2)
+        agg.add_jobs([{"job_id": j, "client_id": c, "budget": b, "status": s} for j, c, b, s in zip(
+            ids.tolist(), clients.tolist(), budgets.tolist(), rng.choice(statuses, len(ids)).tolist())])
+    for first in range(0, args.bids, PAGE_SIZE):
+        size = min(PAGE_SIZE, args.bids - first)
+        jobs = rng.integers(1, args.jobs + 1, size) + args.id_base
+        freelancers = rng.integers(args.users // 2 + 1, args.users + 1, size) + args.id_base
+        amounts = np.round(rng.lognormal(6, 0.5, size), 2)
+        agg.add_bids([{"job_id": j, "freelancer_id": f, "amount": a, "bid_status": s} for j, f, a, s in zip(
+            jobs.tolist(), freelancers.tolist(), amounts.tolist(), rng.choice(bid_statuses, size).tolist())])
+    elapsed = time.perf_counter() - start
+
+    service = AnalyticsService.__new__(AnalyticsService)
+    service.aggregates = lambda refresh=False: agg
+    report_start = time.perf_counter()
+    for name in AnalyticsService.REPORTS:
+        service.run_report(name, limit=10)
+    report_elapsed = time.perf_counter() - report_start
+
+    print(f"{args.jobs} jobs, {args.bids} bids, {args.users} users, IDs from {args.id_base + 1}")
+    print(f"aggregate pass {elapsed:.1f} s ({args.bids / elapsed / 1e6:.2f} M bids/s), "
+          f"all reports {report_elapsed * 1000:.0f} ms")
+    accumulators = sum(value.nbytes for value in vars(agg).values() if isinstance(value, np.ndarray))
+    print(f"accumulators {accumulators / 1e6:.1f} MB, peak RSS {peak_rss_mb():.0f} MB "
+          f"(+{peak_rss_mb() - rss_before:.0f} MB during the run)")
+    if args.memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"traced peak {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
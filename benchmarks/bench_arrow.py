@@ -0,0 +1,80 @@
+"""Compare dict rows and Arrow tables for a 100k-row job view: parse, memory, render payload and export.
+
+Response bodies come from an in-memory local backend, as JSON for the dict
+path and as CSV for the Arrow path:
+
+    python -m benchmarks.bench_arrow --rows 100000 --memory
+"""
+import argparse
+import csv
+import gc
+import io
+import json
+import random
+import time
+import tracemalloc
+from streamlit import dataframe_util
+from src.dao.columnar import csv_to_table, write_table
+from src.dao.local_backend import SCHEMA, LocalBackend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--memory", action="store_true",
+                        help="Trace Python memory (slows every step down; Arrow's own buffers are not traced)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    backend = LocalBackend(autosave=False)
+    backend.replace_table("jobs", [{
+        "job_id": i, "title": f"Job number {i} for a client", "client_id": rng.randint(1, 5000),
+        "assigned_to": rng.choice([None, rng.randint(5000, 20000)]), "budget": round(rng.uniform(50, 5000), 2),
+        "status": rng.choice(["open", "assigned", "in-progress", "completed"]), "deadline": "2027-03-01",
+        "created_at": "2026-10-19T00:25:31.135778+00:00", "latitude": None, "longitude": None
+    } for i in range(1, args.rows + 1)])
+    columns = SCHEMA["jobs"]["columns"]
+    json_body = json.dumps(backend.table("jobs").select("*").execute().data)
+    csv_body = backend.table("jobs").select("*").csv().execute().data
+    del backend
+    print(f"{args.rows} jobs: JSON body {len(json_body) / 1e6:.1f} MB, CSV body {len(csv_body) / 1e6:.1f} MB")
+
+    def measure(label, fn):
+        gc.collect()
+        if args.memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        line = f"{label:<40} {elapsed * 1000:7.0f} ms"
+        if args.memory:
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            line += f"   retained {retained / 1e6:6.1f} MB   peak {peak / 1e6:6.1f} MB"
+        print(line)
+        return result
+
+    def dict_csv():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, columns)
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    def export(fmt):
+        buffer = io.BytesIO()
+        write_table(table, buffer, fmt)
+        return buffer
+
+    rows = measure("dicts: parse JSON response", lambda: json.loads(json_body))
+    table = measure("arrow: parse CSV response", lambda: csv_to_table("jobs", csv_body, columns))
+    measure("dicts: st.dataframe payload", lambda: dataframe_util.convert_anything_to_arrow_bytes(rows))
+    measure("arrow: st.dataframe payload", lambda: dataframe_util.convert_anything_to_arrow_bytes(table))
+    measure("dicts: CSV export (csv.DictWriter)", dict_csv)
+    measure("arrow: CSV export", lambda: export("csv"))
+    measure("arrow: Parquet export", lambda: export("parquet"))
+    print(f"Arrow table holds {table.nbytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Time the capacity-constrained assignment solver on synthetic bids.
+
+    python -m benchmarks.bench_assignment --jobs 1000 --freelancers 5000 --bids 5000 20000 50000
+"""
+import argparse
+import time
+import numpy as np
+from src.services.assignment_service import min_cost_assignment
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--freelancers", type=int, default=5000)
+    parser.add_argument("--bids", type=int, nargs="+", default=[5000, 20000, 50000])
+    parser.add_argument("--max-capacity", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    capacity = rng.integers(0, args.max_capacity + 1, size=args.freelancers)
+    for n_bids in args.bids:
+        pairs = rng.choice(args.jobs * args.freelancers, size=n_bids, replace=False)
+        job_idx, freelancer_idx = np.divmod(pairs, args.freelancers)
+        amounts = rng.integers(50, 5000, size=n_bids).astype(np.float64)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            chosen = min_cost_assignment(job_idx, freelancer_idx, amounts, capacity, args.jobs)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"{args.jobs} jobs x {args.freelancers} freelancers, {n_bids} bids: "
+              f"median {timings[len(timings) // 2] * 1000:.0f} ms, {len(chosen)} jobs assigned, "
+              f"total {amounts[chosen].sum():.0f}")
+
+
+if __name__ == "__main__":
+    main()
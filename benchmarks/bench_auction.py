@@ -0,0 +1,69 @@
+"""Measure auction resolution throughput against a local backend with simulated round trips.
+
+Seeds a throwaway local database with open jobs and bids, then resolves them
+at several concurrency levels. Each backend request sleeps for --latency-ms
+(outside the backend's lock), standing in for a network round trip:
+
+    python -m benchmarks.bench_auction --jobs 2000 --latency-ms 20
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1000, help="Jobs per concurrency level")
+    parser.add_argument("--bids-per-job", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    # Never touch a configured Supabase project
+    os.environ.update(FREELANCE_BACKEND="local", FREELANCE_TASKS="inline",
+                      FREELANCE_LOCAL_DIR=tempfile.mkdtemp(prefix="bench-auction-"))
+    os.environ.setdefault("SUPABASE_POOL_SIZE", str(max(args.concurrency) * 2))
+    from src.dao.client import get_client
+    from src.dao.offline import get_local_store
+    from src.services.auction_service import AuctionService
+
+    store = get_local_store("local", os.environ["FREELANCE_LOCAL_DIR"])
+    store.autosave = False
+    sb = get_client()
+    rng = random.Random(42)
+    freelancers = args.bids_per_job * 2
+    sb.table("users").insert([{"name": "client", "email": "client@example.com", "role": "client"}] + [
+        {"name": f"f{i}", "email": f"f{i}@example.com", "role": "freelancer"} for i in range(freelancers)
+    ]).execute()
+
+    run = store.run
+
+    def slow_run(query):
+        time.sleep(args.latency_ms / 1000)
+        return run(query)
+
+    for concurrency in args.concurrency:
+        # A fresh set of jobs per level, inserted in chunks to keep local inserts fast
+        for start in range(0, args.jobs, 500):
+            jobs = sb.table("jobs").insert([
+                {"title": f"c{concurrency} job {i}", "client_id": 1, "budget": 100, "deadline": "2030-01-01"}
+                for i in range(start, min(start + 500, args.jobs))
+            ]).execute().data
+            sb.table("bids").insert([
+                {"job_id": job["job_id"], "freelancer_id": freelancer, "amount": rng.randint(10, 99)}
+                for job in jobs for freelancer in rng.sample(range(2, freelancers + 2), args.bids_per_job)
+            ]).execute()
+
+        store.run = slow_run
+        report = AuctionService().resolve(min_bids=1, concurrency=concurrency, batch_size=200)
+        store.run = run
+        latencies = sorted(o["latency_ms"] for o in report["outcomes"])
+        print(f"concurrency {concurrency:>3}: {report['accepted']} accepted, {report['skipped']} skipped, "
+              f"{report['failed']} failed in {report['elapsed_s']:.1f} s, {report['throughput_per_s']} jobs/s, "
+              f"p50 {latencies[len(latencies) // 2]:.0f} ms per job")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure the per-call overhead of @instrumented on service methods.
+
+Times a trivial method called bare, as an outermost instrumented call and as an
+instrumented call nested inside another one (which is not recorded):
+
+    python -m benchmarks.bench_metrics --calls 1000000
+"""
+import argparse
+import time
+from src.services.metrics import instrumented, metrics
+
+
+class Plain:
+    def work(self):
+        return None
+
+    def outer(self):
+        return self.work()
+
+
+@instrumented
+class Instrumented(Plain):
+    def work(self):
+        return None
+
+    def outer(self):
+        return self.work()
+
+
+def per_call(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    plain, timed = Plain(), Instrumented()
+    bare = per_call(plain.work, args.calls)
+    bare_nested = per_call(plain.outer, args.calls)
+    outermost = per_call(timed.work, args.calls)
+    nested = per_call(timed.outer, args.calls)
+
+    print(f"{args.calls} calls each")
+    print(f"      bare: {bare * 1e9:7.0f} ns/call")
+    print(f" outermost: {outermost * 1e9:7.0f} ns/call (+{(outermost - bare) * 1e9:.0f} ns recorded)")
+    print(f"    nested: {nested * 1e9:7.0f} ns/call (+{(nested - bare_nested - (outermost - bare)) * 1e9:.0f} ns "
+          f"for the unrecorded inner call)")
+    rows = {row["method"]: row["calls"] for row in metrics.summary() if row["service"] == "Instrumented"}
+    print(f"  recorded: work={rows['work']}, outer={rows['outer']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Time radius queries on the local backend's geohash index against a full scan.
+
+Loads synthetic jobs spread over a country-sized area into an in-memory local
+backend and runs nearby_jobs at several radii:
+
+    python -m benchmarks.bench_nearby --jobs 1000000
+"""
+import argparse
+import random
+import time
+from src.dao.geo import haversine_km
+from src.dao.local_backend import LocalBackend
+
+# Jobs are spread within this many degrees of the centre (about 550 km north-south)
+SPREAD_DEGREES = 5.0
+CENTRE = (52.37, 4.90)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--radius", type=float, nargs="+", default=[5, 50, 200])
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    backend = LocalBackend(autosave=False)
+    start = time.perf_counter()
+    backend.replace_table("jobs", [{
+        "job_id": i, "title": f"job {i}", "client_id": 1, "budget": 100, "status": "open", "deadline": "2030-01-01",
+        "latitude": CENTRE[0] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES),
+        "longitude": CENTRE[1] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES)
+    } for i in range(1, args.jobs + 1)])
+    print(f"loaded and indexed {args.jobs} jobs in {time.perf_counter() - start:.1f} s")
+
+    points = [(CENTRE[0] + rng.uniform(-1, 1), CENTRE[1] + rng.uniform(-1, 1)) for _ in range(args.queries)]
+    for radius in args.radius:
+        timings = []
+        for lat, lon in points:
+            start = time.perf_counter()
+            backend.rpc("nearby_jobs", {"p_latitude": lat, "p_longitude": lon, "p_radius_km": radius,
+                                        "p_limit": 20}).execute()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"radius {radius:>5g} km: p50 {timings[len(timings) // 2] * 1000:.1f} ms, "
+              f"p95 {timings[int(len(timings) * 0.95)] * 1000:.1f} ms")
+
+    lat, lon = points[0]
+    start = time.perf_counter()
+    distances = ((haversine_km(lat, lon, job["latitude"], job["longitude"]), job["job_id"])
+                 for job in backend.tables["jobs"].values())
+    sorted(match for match in distances if match[0] <= args.radius[0])[:20]
+    print(f"full scan for comparison: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Time vectorized scoring and top-k selection of open jobs for one freelancer.
+
+Runs on synthetic column arrays, so no backend is needed:
+
+    python -m benchmarks.bench_recommendations --jobs 100000
+"""
+import argparse
+import time
+import numpy as np
+from src.services.recommendation_service import FreelancerProfile, score_jobs, top_k
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--bids", type=int, default=500, help="Bids in the freelancer's history")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    budgets = np.round(rng.lognormal(6, 1, args.jobs), 2)
+    days_left = rng.integers(1, 180, args.jobs).astype(np.float64)
+    client_fill = rng.uniform(0, 1, args.jobs)
+    job_ids = np.arange(1, args.jobs + 1, dtype=np.int64)
+
+    profile = FreelancerProfile()
+    profile.apply([{
+        "bid_id": i, "job_id": int(rng.integers(1, args.jobs + 1)), "amount": float(rng.lognormal(6, 0.5)),
+        "bid_status": str(rng.choice(["pending", "accepted", "rejected"]))
+    } for i in range(1, args.bids + 1)], [])
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        mask = ~np.isin(job_ids, profile.bid_job_ids())
+        scores = score_jobs(budgets[mask], days_left[mask], client_fill[mask], profile.vector())
+        best = job_ids[mask][top_k(scores, args.limit)]
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    print(f"{args.jobs} open jobs, {args.bids} bids, top {args.limit}: "
+          f"median {timings[len(timings) // 2] * 1000:.1f} ms, best {timings[0] * 1000:.1f} ms")
+    print("top jobs:", best.tolist())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare memory and speed of dict rows and slotted records for large job lists.
+
+Parses a JSON response body of synthetic job rows, as a DAO receives it, then
+scans the result once by column:
+
+    python -m benchmarks.bench_records --rows 1000000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from src.dao.records import Job
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    body = json.dumps([{
+        "job_id": i, "title": f"Fix the sink #{i}", "client_id": i % 500, "assigned_to": None,
+        "budget": 1500.5 + i % 100, "status": "open" if i % 3 else "assigned", "deadline": "2026-11-01",
+        "created_at": "2026-10-01T10:00:00.123456+00:00", "latitude": None, "longitude": None
+    } for i in range(args.rows)])
+    print(f"{args.rows} rows, {len(body) / 1e6:.0f} MB of JSON")
+
+    for mode, convert in (("dicts", None), ("records", Job.from_row)):
+        def build():
+            rows = json.loads(body)
+            return rows if convert is None else [convert(row) for row in rows]
+
+        gc.collect()
+        start = time.perf_counter()
+        rows = build()
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        open_jobs = sum(1 for row in rows if row["status"] == "open")
+        scanned = time.perf_counter() - start
+        del rows
+
+        # Memory is traced in a separate run, since tracing slows allocation down
+        gc.collect()
+        tracemalloc.start()
+        rows = build()
+        live = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del rows
+        print(f"{mode:>8}: build {built:.2f} s, {live / 1e6:.0f} MB live, "
+              f"status scan {scanned:.2f} s ({open_jobs} open)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Time local job title searches against the inverted word and trigram index.
+
+Titles are built from a Zipf-distributed vocabulary of made-up words, so a
+few words are very common and most are rare, as in real job titles:
+
+    python -m benchmarks.bench_search --jobs 1000000
+"""
+import argparse
+import itertools
+import random
+import time
+from src.dao.text_index import TextIndex
+
+# English letter frequencies (percent), so made-up words share trigrams about as often as real ones
+_LETTERS = "etaoinshrdlcumwfgypbvkjxqz"
+_FREQUENCIES = [12.7, 9.1, 8.2, 7.5, 7.0, 6.7, 6.3, 6.1, 6.0, 4.3, 4.0, 2.8, 2.8, 2.4, 2.4, 2.2, 2.0, 2.0,
+                1.9, 1.5, 1.0, 0.8, 0.2, 0.2, 0.1, 0.1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = list(dict.fromkeys(
+        "".join(rng.choices(_LETTERS, _FREQUENCIES, k=rng.randint(3, 10))) for _ in range(args.vocabulary * 2)
+    ))[:args.vocabulary]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+
+    def title():
+        return " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(2, 6)))
+
+    start = time.perf_counter()
+    index = TextIndex((job_id, title()) for job_id in range(1, args.jobs + 1))
+    print(f"indexed {len(index)} titles in {time.perf_counter() - start:.1f} s")
+
+    queries = {
+        "prefix": [rng.choice(vocabulary)[:4] for _ in range(args.queries)],
+        "two words": [" ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=2)) for _ in range(args.queries)],
+        "typo": [word[:-2] + word[-1] for word in rng.choices(vocabulary, k=args.queries)],
+    }
+    for name, batch in queries.items():
+        timings, matched = [], 0
+        for query in batch:
+            start = time.perf_counter()
+            matched += len(index.search(query))
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"{name:>9}: median {timings[len(timings) // 2] * 1000:.1f} ms, "
+              f"p95 {timings[int(len(timings) * 0.95)] * 1000:.1f} ms, {matched / len(batch):.0f} matches/query")
+
+
+if __name__ == "__main__":
+    main()
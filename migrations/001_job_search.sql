@@ -0,0 +1,68 @@
+-- Full-text and fuzzy search over job titles.
+-- Adds a stored tsvector, GIN indexes for full-text and trigram matching,
+-- and a ranked, keyset-paged search function exposed through PostgREST RPC.
+
+create extension if not exists pg_trgm;
+
+alter table jobs
+    add column if not exists search_vector tsvector
+    generated always as (to_tsvector('english', coalesce(title, ''))) stored;
+
+create index if not exists jobs_search_vector_idx on jobs using gin (search_vector);
+create index if not exists jobs_title_trgm_idx on jobs using gin (title gin_trgm_ops);
+create index if not exists jobs_status_deadline_idx on jobs (status, deadline);
+create index if not exists jobs_status_budget_idx on jobs (status, budget);
+
+-- Results are ordered by rank (desc) then job_id (asc); pass the last row's
+-- rank and job_id as p_after_rank / p_after_id to fetch the next page.
+create or replace function search_jobs(
+    p_query text,
+    p_status text default null,
+    p_min_budget numeric default null,
+    p_max_budget numeric default null,
+    p_deadline_from date default null,
+    p_deadline_to date default null,
+    p_after_rank real default null,
+    p_after_id int default null,
+    p_limit int default 20
+)
+returns table (
+    job_id int,
+    title text,
+    client_id int,
+    assigned_to int,
+    budget numeric,
+    status text,
+    deadline date,
+    created_at timestamp with time zone,
+    rank real
+)
+language sql stable
+as $$
+    with q as (
+        select coalesce(p_query, '') as raw,
+               websearch_to_tsquery('english', coalesce(p_query, '')) as tsq
+    ),
+    matches as (
+        select j.job_id, j.title, j.client_id, j.assigned_to, j.budget,
+               j.status, j.deadline, j.created_at,
+               (case when q.raw = '' then 0
+                     else ts_rank(j.search_vector, q.tsq) + similarity(j.title, q.raw)
+                end)::real as rank
+        from jobs j, q
+        where (q.raw = '' or j.search_vector @@ q.tsq or j.title % q.raw)
+          and (p_status is null or j.status = p_status)
+          and (p_min_budget is null or j.budget >= p_min_budget)
+          and (p_max_budget is null or j.budget <= p_max_budget)
+          and (p_deadline_from is null or j.deadline >= p_deadline_from)
+          and (p_deadline_to is null or j.deadline <= p_deadline_to)
+    )
+    select m.job_id, m.title, m.client_id, m.assigned_to, m.budget,
+           m.status, m.deadline, m.created_at, m.rank
+    from matches m
+    where p_after_id is null
+       or m.rank < p_after_rank
+       or (m.rank = p_after_rank and m.job_id > p_after_id)
+    order by m.rank desc, m.job_id asc
+    limit p_limit;
+$$;
@@ -0,0 +1,4 @@
+-- Serves "k lowest pending bids for a job" straight from an ordered index scan.
+create index if not exists bids_pending_job_amount_idx
+    on bids (job_id, amount, bid_id)
+    where bid_status = 'pending';
@@ -0,0 +1,70 @@
+-- One-request home view for a user.
+-- Returns the user, their jobs (posted as a client, or assigned as a
+-- freelancer) with bid counts and the latest status of each, and their bids
+-- with the job they are on, aggregated into a single JSON payload.
+
+create index if not exists jobs_client_idx on jobs (client_id);
+create index if not exists jobs_assigned_to_idx on jobs (assigned_to);
+create index if not exists bids_freelancer_idx on bids (freelancer_id);
+create index if not exists job_status_job_updated_idx on job_status (job_id, updated_at desc, status_id desc);
+
+-- Returns null when the user does not exist.
+create or replace function user_dashboard(p_user_id int)
+returns jsonb
+language sql stable
+as $$
+    with my_jobs as (
+        select j.job_id, j.title, j.client_id, j.assigned_to, j.budget,
+               j.status, j.deadline, j.created_at
+        from jobs j
+        where j.client_id = p_user_id or j.assigned_to = p_user_id
+    ),
+    my_bids as (
+        select b.bid_id, b.job_id, b.freelancer_id, b.amount, b.message,
+               b.bid_status, b.created_at,
+               j.title as job_title, j.status as job_status, j.deadline as job_deadline
+        from bids b
+        join jobs j on j.job_id = b.job_id
+        where b.freelancer_id = p_user_id
+    ),
+    latest as (
+        select distinct on (s.job_id) s.job_id, s.status, s.updated_at
+        from job_status s
+        where s.job_id in (select job_id from my_jobs union select job_id from my_bids)
+        order by s.job_id, s.updated_at desc, s.status_id desc
+    ),
+    bid_counts as (
+        select b.job_id,
+               count(*) as bid_count,
+               count(*) filter (where b.bid_status = 'pending') as pending_bids,
+               min(b.amount) filter (where b.bid_status = 'pending') as lowest_pending_bid
+        from bids b
+        where b.job_id in (select job_id from my_jobs)
+        group by b.job_id
+    )
+    select case when u.user_id is null then null else jsonb_build_object(
+        'user', to_jsonb(u),
+        'jobs', coalesce((
+            select jsonb_agg(to_jsonb(m) || jsonb_build_object(
+                       'bid_count', coalesce(c.bid_count, 0),
+                       'pending_bids', coalesce(c.pending_bids, 0),
+                       'lowest_pending_bid', c.lowest_pending_bid,
+                       'latest_status', l.status,
+                       'latest_status_at', l.updated_at)
+                   order by m.deadline, m.job_id)
+            from my_jobs m
+            left join bid_counts c on c.job_id = m.job_id
+            left join latest l on l.job_id = m.job_id
+        ), '[]'::jsonb),
+        'bids', coalesce((
+            select jsonb_agg(to_jsonb(b) || jsonb_build_object(
+                       'latest_status', l.status,
+                       'latest_status_at', l.updated_at)
+                   order by b.created_at desc, b.bid_id desc)
+            from my_bids b
+            left join latest l on l.job_id = b.job_id
+        ), '[]'::jsonb)
+    ) end
+    from (select 1) as one
+    left join users u on u.user_id = p_user_id;
+$$;
@@ -0,0 +1,15 @@
+-- Indexes behind the keyset-paged tables in the UI.
+-- Every sortable column is paired with the primary key as a tie-breaker, so
+-- "rows after (value, id)" is a single index range scan at any page depth.
+
+create index if not exists users_created_idx on users (created_at, user_id);
+create index if not exists users_role_idx on users (role, user_id);
+
+create index if not exists jobs_deadline_idx on jobs (deadline, job_id);
+create index if not exists jobs_budget_idx on jobs (budget, job_id);
+create index if not exists jobs_created_idx on jobs (created_at, job_id);
+create index if not exists jobs_status_id_idx on jobs (status, job_id);
+
+create index if not exists bids_amount_idx on bids (amount, bid_id);
+create index if not exists bids_created_idx on bids (created_at, bid_id);
+create index if not exists bids_status_idx on bids (bid_status, bid_id);
@@ -0,0 +1,122 @@
+-- Range-partition the job_status history by month of updated_at.
+-- The table is rebuilt as a partitioned table (the primary key has to include
+-- the partition key), existing rows are copied into monthly partitions, and
+-- maintain_job_status_partitions() keeps upcoming months created and drops
+-- past months that archival (`freelance-cli status archive`) has emptied.
+
+begin;
+
+alter table job_status rename to job_status_legacy;
+alter table job_status_legacy rename constraint job_status_pkey to job_status_legacy_pkey;
+alter sequence job_status_status_id_seq owned by none;
+
+create table job_status (
+    status_id int not null default nextval('job_status_status_id_seq'),
+    job_id int not null references jobs(job_id) on delete cascade,
+    status text check (status in ('open', 'assigned','in-progress', 'completed')) not null,
+    updated_at timestamp with time zone not null default now(),
+    primary key (status_id, updated_at)
+) partition by range (updated_at);
+
+alter sequence job_status_status_id_seq owned by job_status.status_id;
+
+-- Catches rows outside every monthly partition instead of rejecting them
+create table job_status_default partition of job_status default;
+
+do $$
+declare
+    m date := date_trunc('month', coalesce((select min(updated_at) from job_status_legacy), now()))::date;
+begin
+    while m <= (date_trunc('month', now()) + interval '3 months')::date loop
+        execute format('create table if not exists %I partition of job_status for values from (%L) to (%L)',
+                       'job_status_' || to_char(m, 'YYYY_MM'), m, (m + interval '1 month')::date);
+        m := (m + interval '1 month')::date;
+    end loop;
+end $$;
+
+insert into job_status (status_id, job_id, status, updated_at)
+select status_id, job_id, status, coalesce(updated_at, now()) from job_status_legacy;
+
+drop table job_status_legacy;
+
+create index if not exists job_status_job_updated_idx on job_status (job_id, updated_at desc, status_id desc);
+create index if not exists job_status_updated_idx on job_status (updated_at);
+-- Archival finds newly completed jobs by scanning completions past its
+-- (updated_at, status_id) watermark
+drop index if exists job_status_completed_idx;
+create index if not exists job_status_completed_at_idx on job_status (updated_at, status_id) where status = 'completed';
+
+-- Creating a month's partition fails while the default partition holds rows
+-- for that month, so such rows are moved into a new table that is then
+-- attached as the partition. Rows still left in the default partition (dates
+-- outside every maintained month) are reported as default_rows so callers can
+-- alert on them.
+--
+-- The function runs DDL, so it runs as its owner and only the maintenance
+-- (service) role may call it; the anon and authenticated API roles get
+-- permission denied (42501).
+create or replace function maintain_job_status_partitions(p_months_ahead int default 3)
+returns jsonb
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    this_month date := date_trunc('month', now())::date;
+    m date;
+    part_name text;
+    part record;
+    has_rows boolean;
+    moved_rows bigint;
+    created text[] := '{}';
+    dropped text[] := '{}';
+    moved jsonb := '{}';
+    default_rows bigint;
+begin
+    for i in 0..p_months_ahead loop
+        m := (this_month + make_interval(months => i))::date;
+        part_name := 'job_status_' || to_char(m, 'YYYY_MM');
+        if to_regclass(part_name) is null then
+            -- Blocks writes to the default partition until the month is attached
+            lock table job_status_default in access exclusive mode;
+            execute format('create table %I (like job_status including defaults including constraints)', part_name);
+            execute format('with moved_out as (delete from job_status_default where updated_at >= %L and updated_at < %L returning *) '
+                           'insert into %I select * from moved_out', m, (m + interval '1 month')::date, part_name);
+            get diagnostics moved_rows = row_count;
+            execute format('alter table job_status attach partition %I for values from (%L) to (%L)',
+                           part_name, m, (m + interval '1 month')::date);
+            created := created || part_name;
+            if moved_rows > 0 then
+                moved := moved || jsonb_build_object(part_name, moved_rows);
+            end if;
+        end if;
+    end loop;
+
+    -- Past months emptied by archival no longer need their own table
+    for part in
+        select c.relname::text as name
+        from pg_inherits i
+        join pg_class c on c.oid = i.inhrelid
+        where i.inhparent = 'job_status'::regclass
+          and c.relname ~ '^job_status_\d{4}_\d{2}$'
+          and to_date(right(c.relname, 7), 'YYYY_MM') < this_month
+    loop
+        execute format('select exists (select 1 from %I)', part.name) into has_rows;
+        if not has_rows then
+            execute format('drop table %I', part.name);
+            dropped := dropped || part.name;
+        end if;
+    end loop;
+
+    select count(*) into default_rows from job_status_default;
+    return jsonb_build_object('created', to_jsonb(created), 'dropped', to_jsonb(dropped),
+                              'moved', moved, 'default_rows', default_rows);
+end;
+$$;
+
+revoke execute on function maintain_job_status_partitions(int) from public, anon, authenticated;
+grant execute on function maintain_job_status_partitions(int) to service_role;
+
+commit;
+
+notify pgrst, 'reload schema';
@@ -0,0 +1,25 @@
+-- One job title per client, enforced by the database instead of a read
+-- before every insert. Existing duplicates are not changed here: if any
+-- exist the migration stops and lists them, so they can be renamed or
+-- removed deliberately before it is re-run.
+
+do $$
+declare
+    conflicts text;
+begin
+    select string_agg(format('client_id=%s title=%L job_ids=%s', client_id, title, job_ids), E'\n')
+    into conflicts
+    from (
+        select client_id, title, string_agg(job_id::text, ',' order by job_id) as job_ids
+        from jobs
+        group by client_id, title
+        having count(*) > 1
+        order by client_id, title
+    ) d;
+    if conflicts is not null then
+        raise exception 'Duplicate job titles per client; resolve them before adding the constraint'
+            using detail = conflicts;
+    end if;
+end $$;
+
+alter table jobs add constraint jobs_client_id_title_key unique (client_id, title);
@@ -0,0 +1,49 @@
+-- Open jobs ready for auction resolution, each with its lowest pending bid.
+-- A job is eligible when its deadline is on or before p_deadline_before, or
+-- when it has at least p_min_bids pending bids. The lowest bid per job comes
+-- from bids_pending_job_amount_idx (migration 002), so a page of candidates
+-- is one set-based query however many jobs it covers.
+
+create or replace function auction_candidates(
+    p_deadline_before date default null,
+    p_min_bids int default null,
+    p_after_job_id int default 0,
+    p_limit int default 100
+)
+returns table (
+    job_id int,
+    title text,
+    client_id int,
+    deadline date,
+    pending_bids bigint,
+    bid_id int,
+    freelancer_id int,
+    amount numeric
+)
+language sql stable
+as $$
+    with pending as (
+        select b.job_id, count(*) as pending_bids
+        from bids b
+        join jobs j on j.job_id = b.job_id
+        where b.bid_status = 'pending'
+          and j.status = 'open'
+          and j.job_id > coalesce(p_after_job_id, 0)
+        group by b.job_id
+    )
+    select j.job_id, j.title, j.client_id, j.deadline, p.pending_bids,
+           lowest.bid_id, lowest.freelancer_id, lowest.amount
+    from jobs j
+    join pending p on p.job_id = j.job_id
+    cross join lateral (
+        select b.bid_id, b.freelancer_id, b.amount
+        from bids b
+        where b.job_id = j.job_id and b.bid_status = 'pending'
+        order by b.amount asc, b.bid_id asc
+        limit 1
+    ) lowest
+    where (p_deadline_before is not null and j.deadline <= p_deadline_before)
+       or (p_min_bids is not null and p.pending_bids >= p_min_bids)
+    order by j.job_id
+    limit p_limit;
+$$;
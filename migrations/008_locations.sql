@@ -0,0 +1,72 @@
+-- Optional locations for jobs and service areas for users, plus nearby_jobs().
+-- Points are indexed with earthdistance (on top of cube): a GiST index on
+-- ll_to_earth(latitude, longitude) answers "inside this bounding box" and the
+-- exact great-circle distance filters and orders what the box returns.
+
+create extension if not exists cube;
+create extension if not exists earthdistance;
+
+alter table jobs
+    add column if not exists latitude double precision check (latitude between -90 and 90),
+    add column if not exists longitude double precision check (longitude between -180 and 180),
+    add constraint jobs_location_check check ((latitude is null) = (longitude is null));
+
+alter table users
+    add column if not exists latitude double precision check (latitude between -90 and 90),
+    add column if not exists longitude double precision check (longitude between -180 and 180),
+    add column if not exists service_radius_km numeric(8,2) check (service_radius_km > 0),
+    add constraint users_location_check check ((latitude is null) = (longitude is null));
+
+create index if not exists jobs_location_idx on jobs
+    using gist (ll_to_earth(latitude, longitude))
+    where latitude is not null;
+
+-- Jobs within p_radius_km of a point, nearest first. Pages continue after
+-- (p_after_distance, p_after_id), the distance_km and job_id of the last row.
+create or replace function nearby_jobs(
+    p_latitude double precision,
+    p_longitude double precision,
+    p_radius_km double precision,
+    p_status text default null,
+    p_min_budget numeric default null,
+    p_max_budget numeric default null,
+    p_after_distance double precision default null,
+    p_after_id int default null,
+    p_limit int default 20
+)
+returns table (
+    job_id int,
+    title text,
+    client_id int,
+    assigned_to int,
+    budget numeric,
+    status text,
+    deadline date,
+    created_at timestamp with time zone,
+    latitude double precision,
+    longitude double precision,
+    distance_km double precision
+)
+language sql stable
+as $$
+    select *
+    from (
+        select j.job_id, j.title, j.client_id, j.assigned_to, j.budget, j.status, j.deadline,
+               j.created_at, j.latitude, j.longitude,
+               earth_distance(ll_to_earth(p_latitude, p_longitude),
+                              ll_to_earth(j.latitude, j.longitude)) / 1000 as distance_km
+        from jobs j
+        where j.latitude is not null
+          and earth_box(ll_to_earth(p_latitude, p_longitude), p_radius_km * 1000)
+              @> ll_to_earth(j.latitude, j.longitude)
+          and (p_status is null or j.status = p_status)
+          and (p_min_budget is null or j.budget >= p_min_budget)
+          and (p_max_budget is null or j.budget <= p_max_budget)
+    ) nearby
+    where nearby.distance_km <= p_radius_km
+      and (p_after_id is null or (nearby.distance_km, nearby.job_id) > (p_after_distance, p_after_id))
+    order by nearby.distance_km, nearby.job_id
+    limit p_limit;
+$$;
+
+notify pgrst, 'reload schema';
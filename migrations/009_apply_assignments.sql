@@ -0,0 +1,62 @@
+-- Apply a batch of job assignments (from `freelance-cli job auto-assign`) as
+-- one statement, and therefore one transaction. For every assignment whose job
+-- is still open and whose bid is still pending, it assigns the job, accepts
+-- the bid, rejects the job's other pending bids and records the 'assigned'
+-- status. Assignments that no longer fit are left out of the result. Each
+-- applied row lists the bids it rejected, so their bidders can be notified.
+
+-- The result gained rejected_bids, and a function's result type can only
+-- change by recreating it
+drop function if exists apply_assignments(jsonb);
+
+create or replace function apply_assignments(p_assignments jsonb)
+returns table (
+    job_id int,
+    freelancer_id int,
+    bid_id int,
+    amount numeric,
+    rejected_bids jsonb
+)
+language sql
+as $$
+    with wanted as (
+        select (a ->> 'job_id')::int as job_id,
+               (a ->> 'freelancer_id')::int as freelancer_id,
+               (a ->> 'bid_id')::int as bid_id
+        from jsonb_array_elements(p_assignments) a
+    ),
+    claimed as (
+        update jobs j
+        set assigned_to = w.freelancer_id, status = 'assigned'
+        from wanted w
+        join bids b on b.bid_id = w.bid_id
+                   and b.job_id = w.job_id
+                   and b.freelancer_id = w.freelancer_id
+                   and b.bid_status = 'pending'
+        where j.job_id = w.job_id and j.status = 'open'
+        returning j.job_id, w.freelancer_id, w.bid_id, b.amount
+    ),
+    accepted as (
+        update bids b set bid_status = 'accepted'
+        from claimed c
+        where b.bid_id = c.bid_id
+        returning b.bid_id
+    ),
+    rejected as (
+        update bids b set bid_status = 'rejected'
+        from claimed c
+        where b.job_id = c.job_id and b.bid_id <> c.bid_id and b.bid_status = 'pending'
+        returning b.bid_id, b.job_id, b.freelancer_id
+    ),
+    history as (
+        insert into job_status (job_id, status)
+        select c.job_id, 'assigned' from claimed c
+        returning status_id
+    )
+    select c.job_id, c.freelancer_id, c.bid_id, c.amount,
+           coalesce((select jsonb_agg(jsonb_build_object('bid_id', r.bid_id, 'job_id', r.job_id,
+                                                         'freelancer_id', r.freelancer_id) order by r.bid_id)
+                     from rejected r where r.job_id = c.job_id), '[]'::jsonb)
+    from claimed c
+    order by c.job_id;
+$$;
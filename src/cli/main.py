@@ -1,9 +1,52 @@
 import argparse
 import json
+import os
+import sys
+import time
+import urllib.request
 from src.services.user_service import UserService, UserError
 from src.services.job_service import JobService, JobError
 from src.services.bid_service import BidService, BidError
 from src.services.jobstatus_service import JobStatusService, JobStatusError
+from src.services.recommendation_service import RecommendationService, RecommendationError
+from src.services.scheduler_service import DeadlineScheduler, SchedulerError
+from src.services.analytics_service import AnalyticsService, AnalyticsError
+from src.services.sync_service import SyncService, SyncError
+from src.services.loadtest_service import LoadTest, LoadTestError
+from src.services.auction_service import AuctionService, AuctionError
+from src.services.assignment_service import AssignmentService, AssignmentError
+from src.services.metrics import MetricsRegistry, metrics, start_exporters
+from src.services.tasks import TaskWorker, TaskError, get_task_queue
+from src.dao.columnar import EXPORT_FORMATS, write_table
+from src.config import get_metrics_settings
+
+
+# ---------------- Bulk helpers ----------------
+def read_ids(ids, path):
+    """IDs given on the command line plus any in a file, separated by whitespace or commas ("-" is stdin)."""
+    if not path:
+        return ids
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    return (ids or []) + [int(token) for token in text.replace(",", " ").split()]
+
+
+def print_bulk_report(report, id_key, verb, as_json=False):
+    """Per-ID failures, then one summary line, for a bulk command."""
+    if as_json:
+        print(json.dumps(report, indent=2, default=str))
+        return
+    for failure in report["failures"]:
+        print(f"{id_key} {failure[id_key]}: {failure['error']}")
+    verb = f"Would have {verb}" if report["dry_run"] else verb[0].upper() + verb[1:]
+    line = f"{verb} {report['applied']} of {report['considered']}"
+    if "unchanged" in report:
+        line += f", {report['unchanged']} unchanged"
+    print(f"{line}, {report['skipped']} skipped (changed meanwhile), {report['failed']} failed "
+          f"in {report['elapsed_s']}s")
 
 
 # ---------------- User CLI ----------------
@@ -26,7 +69,7 @@ class UserCLI:
         """List all users or filter by role."""
         try:
             if args.role:
-                users = self.user_service.list_users_by_role(args.role)
+                users = self.user_service.list_users_by_role(args.role, limit=args.limit)
             else:
                 users = self.user_service.list_users(limit=args.limit)
             print(json.dumps(users, indent=2, default=str))
@@ -41,6 +84,14 @@ class UserCLI:
         except UserError as e:
             print("Error:", e)
 
+    def cmd_user_dashboard(self, args):
+        """Show a user's jobs and bids with bid counts and latest statuses."""
+        try:
+            d = self.user_service.get_dashboard(args.user_id)
+            print(json.dumps(d, indent=2, default=str))
+        except UserError as e:
+            print("Error:", e)
+
     def cmd_user_update(self, args):
         """Update user information."""
         try:
@@ -51,6 +102,11 @@ class UserCLI:
                 fields["email"] = args.email
             if args.phone:
                 fields["phone"] = args.phone
+            if args.latitude is not None or args.longitude is not None:
+                fields["latitude"] = args.latitude
+                fields["longitude"] = args.longitude
+            if args.service_radius_km is not None:
+                fields["service_radius_km"] = args.service_radius_km
             
             if not fields:
                 print("No fields to update")
@@ -71,17 +127,35 @@ class UserCLI:
         except UserError as e:
             print("Error:", e)
 
+    def cmd_user_bulk_delete(self, args):
+        """Delete many users by ID or role, keeping those with jobs or bids."""
+        try:
+            user_ids = read_ids(args.user_ids, args.ids_file)
+            report = self.user_service.bulk_remove(
+                user_ids, role=args.role, limit=args.limit, batch_size=args.batch_size, dry_run=args.dry_run
+            )
+        except (OSError, ValueError) as e:
+            print("Error: Could not read IDs:", e)
+            return
+        except UserError as e:
+            print("Error:", e)
+            return
+        print_bulk_report(report, "user_id", "deleted", args.json)
+
 
 # ---------------- Job CLI ----------------
 class JobCLI:
     def __init__(self):
         self.job_service = JobService()
+        self.recommendation_service = RecommendationService()
+        self.assignment_service = AssignmentService()
 
     def cmd_job_create(self, args):
         """Create a new job."""
         try:
             j = self.job_service.create_job(
-                args.title, args.client_id, args.budget, args.deadline, args.freelancer_id
+                args.title, args.client_id, args.budget, args.deadline, args.freelancer_id,
+                latitude=args.latitude, longitude=args.longitude
             )
             print("Created job:")
             print(json.dumps(j, indent=2, default=str))
@@ -96,6 +170,43 @@ class JobCLI:
         except JobError as e:
             print("Error:", e)
 
+    def cmd_job_search(self, args):
+        """Search jobs by title with filters and cursor paging."""
+        try:
+            page = self.job_service.search_jobs(
+                args.query, status=args.status,
+                min_budget=args.min_budget, max_budget=args.max_budget,
+                deadline_from=args.deadline_from, deadline_to=args.deadline_to,
+                cursor=args.cursor, limit=args.limit
+            )
+            print(json.dumps(page["jobs"], indent=2, default=str))
+            if page["next_cursor"]:
+                print("Next page: --cursor", page["next_cursor"])
+        except JobError as e:
+            print("Error:", e)
+
+    def cmd_job_nearby(self, args):
+        """List jobs near a freelancer, nearest first, with cursor paging."""
+        try:
+            page = self.job_service.find_nearby_jobs(
+                args.freelancer_id, radius_km=args.radius_km, status=args.status,
+                min_budget=args.min_budget, max_budget=args.max_budget,
+                cursor=args.cursor, limit=args.limit
+            )
+            print(json.dumps(page["jobs"], indent=2, default=str))
+            if page["next_cursor"]:
+                print("Next page: --cursor", page["next_cursor"])
+        except JobError as e:
+            print("Error:", e)
+
+    def cmd_job_recommend(self, args):
+        """Recommend open jobs for a freelancer."""
+        try:
+            jobs = self.recommendation_service.recommend_jobs(args.freelancer_id, limit=args.limit)
+            print(json.dumps(jobs, indent=2, default=str))
+        except RecommendationError as e:
+            print("Error:", e)
+
     def cmd_job_show(self, args):
         """Show details of a specific job."""
         try:
@@ -116,6 +227,9 @@ class JobCLI:
                 fields["deadline"] = args.deadline
             if args.status:
                 fields["status"] = args.status
+            if args.latitude is not None or args.longitude is not None:
+                fields["latitude"] = args.latitude
+                fields["longitude"] = args.longitude
             
             if not fields:
                 print("No fields to update")
@@ -136,6 +250,28 @@ class JobCLI:
         except JobError as e:
             print("Error:", e)
 
+    def cmd_job_auto_assign(self, args):
+        """Assign open jobs to bidding freelancers at the lowest total cost, within capacity."""
+        try:
+            report = self.assignment_service.auto_assign(
+                max_active_jobs=args.capacity, limit=args.limit, dry_run=args.dry_run
+            )
+        except AssignmentError as e:
+            print("Error:", e)
+            return
+        if args.json:
+            print(json.dumps(report, indent=2, default=str))
+            return
+        for row in report["assignments"]:
+            print(f"job {row['job_id']} -> freelancer {row['freelancer_id']} (bid {row['bid_id']}, amount {row['amount']})")
+        print(f"{report['open_jobs']} open job(s), {report['pending_bids']} pending bid(s) from "
+              f"{report['freelancers']} freelancer(s), {report['freelancers_at_capacity']} at capacity")
+        verb = "Would assign" if report["dry_run"] else f"Applied {report['applied']} of"
+        print(f"{verb} {report['assigned']} job(s) for {report['total_amount']} total, "
+              f"{report['unassigned']} left unassigned, {report['skipped']} skipped, "
+              f"{report['rejected']} competing bid(s) rejected "
+              f"(load {report['load_s']}s, solve {report['solve_s']}s, write {report['write_s']}s)")
+
     def cmd_job_by_client(self, args):
         """Get all jobs for a specific client."""
         try:
@@ -161,6 +297,23 @@ class JobCLI:
         except JobError as e:
             print("Error:", e)
 
+    def cmd_job_bulk_status(self, args):
+        """Set the status of many jobs by ID or filter."""
+        try:
+            job_ids = read_ids(args.job_ids, args.ids_file)
+            report = self.job_service.bulk_update_status(
+                args.status, job_ids, current_status=args.current_status, client_id=args.client_id,
+                freelancer_id=args.freelancer_id, limit=args.limit, batch_size=args.batch_size,
+                dry_run=args.dry_run
+            )
+        except (OSError, ValueError) as e:
+            print("Error: Could not read IDs:", e)
+            return
+        except JobError as e:
+            print("Error:", e)
+            return
+        print_bulk_report(report, "job_id", f"set to '{args.status}'", args.json)
+
 
 # ---------------- Bid CLI ----------------
 class BidCLI:
@@ -178,6 +331,30 @@ class BidCLI:
         except BidError as e:
             print("Error:", e)
 
+    def cmd_bid_create_many(self, args):
+        """Create many bids for one freelancer in one batch."""
+        try:
+            items = []
+            if args.file:
+                with open(args.file) as f:
+                    for entry in json.load(f):
+                        items.append((int(entry["job_id"]), float(entry["amount"]), entry.get("message")))
+            for raw in args.item or []:
+                parts = raw.split(":", 2)
+                if len(parts) < 2:
+                    print(f"Error: Invalid item '{raw}'. Use JOB_ID:AMOUNT[:MESSAGE]")
+                    return
+                items.append((int(parts[0]), float(parts[1]), parts[2] if len(parts) > 2 else None))
+            
+            results = self.bid_service.create_bids(args.freelancer_id, items)
+            created = sum(1 for r in results if r["ok"])
+            print(f"Created {created} of {len(results)} bids:")
+            print(json.dumps(results, indent=2, default=str))
+        except (OSError, ValueError, KeyError) as e:
+            print("Error: Could not read bids:", e)
+        except BidError as e:
+            print("Error:", e)
+
     def cmd_bid_list(self, args):
         """List all bids or filter by status."""
         try:
@@ -228,6 +405,23 @@ class BidCLI:
         except BidError as e:
             print("Error:", e)
 
+    def cmd_bid_bulk_reject(self, args):
+        """Reject many bids by ID, job or freelancer."""
+        try:
+            bid_ids = read_ids(args.bid_ids, args.ids_file)
+            report = self.bid_service.bulk_reject(
+                bid_ids, job_id=args.job_id, freelancer_id=args.freelancer_id,
+                bid_status=None if args.status == "any" else args.status, limit=args.limit,
+                batch_size=args.batch_size, dry_run=args.dry_run
+            )
+        except (OSError, ValueError) as e:
+            print("Error: Could not read IDs:", e)
+            return
+        except BidError as e:
+            print("Error:", e)
+            return
+        print_bulk_report(report, "bid_id", "rejected", args.json)
+
     def cmd_bid_update(self, args):
         """Update bid information."""
         try:
@@ -280,6 +474,293 @@ class JobStatusCLI:
         except JobStatusError as e:
             print("Error:", e)
 
+    def cmd_status_archive(self, args):
+        """Archive old status history of completed jobs to local segment files."""
+        try:
+            result = self.job_status_service.archive_history(args.older_than_days, args.batch_size)
+            print(f"Archived {result['archived_rows']} status row(s) of {result['jobs']} job(s) "
+                  f"into {len(result['segments'])} segment(s)")
+            if result["skipped"]:
+                print(f"Archival skipped: {result['skipped']}")
+            if result["partitions"].get("skipped"):
+                print(f"Partition maintenance skipped: {result['partitions']['skipped']}")
+            if result["partitions"].get("default_rows"):
+                print(f"Warning: {result['partitions']['default_rows']} status row(s) are in the default "
+                      f"partition, outside every monthly partition")
+            print(json.dumps(result, indent=2, default=str))
+        except JobStatusError as e:
+            print("Error:", e)
+
+
+# ---------------- Scheduler CLI ----------------
+class SchedulerCLI:
+    def __init__(self, job_service):
+        self.job_service = job_service
+
+    def cmd_scheduler(self, args):
+        """Run the deadline scheduler."""
+        try:
+            scheduler = DeadlineScheduler(
+                self.job_service, actions=args.actions, remind_days=args.remind_days,
+                horizon_days=args.horizon_days, lookback_days=args.lookback_days,
+                batch_size=args.batch_size
+            )
+            if args.once:
+                scheduler.load()
+                self.print_results(scheduler.tick())
+                return
+            print(f"Scheduler running every {args.interval}s (Ctrl+C to stop)")
+            scheduler.run(interval=args.interval, reload_every=args.reload_every,
+                          on_results=self.print_results)
+        except SchedulerError as e:
+            print("Error:", e)
+        except KeyboardInterrupt:
+            print("Scheduler stopped")
+
+    def print_results(self, results):
+        if not results:
+            print("No deadline actions due")
+            return
+        for action, jobs in results.items():
+            print(f"{action}: {len(jobs)} job(s)")
+            print(json.dumps(jobs, indent=2, default=str))
+
+
+# ---------------- Report CLI ----------------
+class ReportCLI:
+    def __init__(self):
+        self.analytics_service = AnalyticsService()
+
+    def cmd_report(self, args):
+        """Print a marketplace KPI report."""
+        try:
+            rows = self.analytics_service.run_report(args.name, limit=args.limit)
+            print(json.dumps(rows, indent=2, default=str))
+        except AnalyticsError as e:
+            print("Error:", e)
+
+
+# ---------------- Sync CLI ----------------
+class SyncCLI:
+    def __init__(self):
+        self.sync_service = SyncService()
+
+    def cmd_sync_status(self, args):
+        """Show queued offline changes and conflicts."""
+        try:
+            print(json.dumps(self.sync_service.status(), indent=2, default=str))
+        except SyncError as e:
+            print("Error:", e)
+
+    def cmd_sync_push(self, args):
+        """Replay queued offline changes on the backend."""
+        try:
+            if args.watch:
+                print(f"Pushing every {args.interval}s until the queue drains (Ctrl+C to stop)")
+                result = self.sync_service.watch(args.interval, args.batch_size, on_result=self.print_result)
+            else:
+                result = self.sync_service.push(args.batch_size)
+                self.print_result(result)
+            if result.get("conflicts"):
+                print("Some changes were rejected; see `sync conflicts`")
+        except SyncError as e:
+            print("Error:", e)
+        except KeyboardInterrupt:
+            print("Sync stopped")
+
+    def cmd_sync_pull(self, args):
+        """Refresh the local replica from the backend."""
+        try:
+            counts = self.sync_service.pull(force=args.force)
+            print("✅ Local replica refreshed")
+            print(json.dumps(counts, indent=2))
+        except SyncError as e:
+            print("Error:", e)
+
+    def cmd_sync_conflicts(self, args):
+        """List changes the backend rejected during sync."""
+        try:
+            entries = self.sync_service.conflicts(clear=args.clear)
+            print(json.dumps(entries, indent=2, default=str))
+        except SyncError as e:
+            print("Error:", e)
+
+    def print_result(self, result):
+        print(json.dumps(result, indent=2, default=str))
+
+
+# ---------------- Load Test CLI ----------------
+class LoadTestCLI:
+    def cmd_loadtest(self, args):
+        """Run a synthetic workload through the services and report latency per operation."""
+        try:
+            test = LoadTest(
+                clients=args.clients, freelancers=args.freelancers, jobs=args.jobs,
+                workers=args.workers, processes=args.processes, duration=args.duration,
+                skew=args.skew, burst=args.burst, accept_ratio=args.accept_ratio,
+                horizon_days=args.horizon_days, seed=args.seed
+            )
+            print(f"Setting up {args.clients} clients, {args.freelancers} freelancers and {args.jobs} jobs...")
+            report = test.run()
+        except LoadTestError as e:
+            print("Error:", e)
+            return
+        if args.json:
+            print(json.dumps(report, indent=2, default=str))
+            return
+        print(f"Backend: {report['backend']}  run: {report['run']}  workers: {report['workers']}  "
+              f"elapsed: {report['elapsed_s']}s")
+        print(f"Total: {report['total_calls']} calls, {report['throughput_per_s']}/s, "
+              f"error rate {report['error_rate']:.2%} (failures {report['failure_rate']:.2%})")
+        print(f"{'operation':<20}{'calls':>8}{'ops/s':>10}{'err%':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for row in report["operations"]:
+            print(f"{row['operation']:<20}{row['calls']:>8}{row['throughput_per_s']:>10}"
+                  f"{row['error_rate'] * 100:>8.1f}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+        for row in report["operations"]:
+            if row["errors_by_type"]:
+                print(f"  {row['operation']} errors: {row['errors_by_type']}")
+
+
+# ---------------- Auction CLI ----------------
+class AuctionCLI:
+    def __init__(self, bid_service):
+        self.auction_service = AuctionService(bid_service)
+
+    def cmd_auction_resolve(self, args):
+        """Accept the lowest pending bid on every eligible open job."""
+        try:
+            report = self.auction_service.resolve(
+                closing_within_days=args.closing_within_days, min_bids=args.min_bids,
+                batch_size=args.batch_size, concurrency=args.concurrency, limit=args.limit,
+                dry_run=args.dry_run
+            )
+        except AuctionError as e:
+            print("Error:", e)
+            return
+        if args.json:
+            print(json.dumps(report, indent=2, default=str))
+            return
+        for outcome in report["outcomes"]:
+            line = (f"job {outcome['job_id']}: {outcome['status']} bid {outcome['bid_id']} "
+                    f"(freelancer {outcome['freelancer_id']}, amount {outcome['amount']}, "
+                    f"{outcome['pending_bids']} pending)")
+            if outcome.get("error"):
+                line += f" - {outcome['error']}"
+            print(line)
+        label = "Candidates" if report["dry_run"] else "Resolved"
+        print(f"{label}: {report['eligible']} job(s), accepted {report['accepted']}, skipped {report['skipped']}, "
+              f"failed {report['failed']} in {report['elapsed_s']}s ({report['throughput_per_s']} jobs/s)")
+
+
+# ---------------- Worker CLI ----------------
+class WorkerCLI:
+    def cmd_worker(self, args):
+        """Run queued side effects (status history, notifications) until stopped."""
+        queue = get_task_queue(always=True)
+        if args.stats:
+            print(json.dumps(queue.stats(), indent=2))
+            return
+        if args.dead:
+            print(json.dumps(queue.dead_tasks(args.batch_size), indent=2, default=str))
+            return
+        if args.requeue_dead:
+            print(f"Requeued {queue.requeue_dead()} dead task(s)")
+            return
+        try:
+            worker = TaskWorker(queue, threads=args.threads, batch_size=args.batch_size,
+                                lease_seconds=args.lease, poll_interval=args.poll_interval)
+        except TaskError as e:
+            print("Error:", e)
+            return
+        if args.once:
+            counts = worker.drain()
+            print(f"Processed {counts['processed']} task(s), {counts['failed']} failed")
+            print(json.dumps(queue.stats(), indent=2))
+            return
+        print(f"Worker running with {args.threads} thread(s) (Ctrl+C to stop)")
+        worker.start()
+        try:
+            while True:
+                time.sleep(args.report_every)
+                stats = queue.stats()
+                print(f"processed {worker.processed}, failed {worker.failed}, depth {stats['depth']}, "
+                      f"dead {stats['dead']}, lag {stats['lag_seconds']}s")
+        except KeyboardInterrupt:
+            worker.stop(timeout=args.lease)
+            print("Worker stopped")
+
+
+# ---------------- Export CLI ----------------
+class ExportCLI:
+    def __init__(self, user_service, job_service, bid_service):
+        self.user_service = user_service
+        self.job_service = job_service
+        self.bid_service = bid_service
+
+    def cmd_export(self, args):
+        """Write a whole table, optionally filtered, to a CSV, Parquet or Arrow file."""
+        fmt = args.format or os.path.splitext(args.output)[1].lstrip(".").lower() or "csv"
+        if fmt not in EXPORT_FORMATS:
+            print(f"Error: Unknown export format '{fmt}'. Use --format with one of: {', '.join(EXPORT_FORMATS)}")
+            return
+        started = time.perf_counter()
+        try:
+            if args.table == "users":
+                data = self.user_service.export_users(args.status, limit=args.limit)
+            elif args.table == "jobs":
+                data = self.job_service.export_jobs(args.status, limit=args.limit)
+            else:
+                data = self.bid_service.export_bids(args.status, limit=args.limit)
+            loaded = time.perf_counter()
+            write_table(data, args.output, fmt)
+        except (UserError, JobError, BidError, OSError) as e:
+            print("Error:", e)
+            return
+        print(f"Exported {data.num_rows} {args.table} row(s) to {args.output} ({fmt}, "
+              f"{os.path.getsize(args.output)} bytes; load {loaded - started:.3f}s, "
+              f"write {time.perf_counter() - loaded:.3f}s)")
+
+
+# ---------------- Metrics CLI ----------------
+class MetricsCLI:
+    def cmd_metrics(self, args):
+        """Show service metrics from a running process's endpoint, an export file or this process."""
+        port = get_metrics_settings()["port"]
+        url = args.url or (f"http://127.0.0.1:{port}/metrics" if port else None)
+        try:
+            if args.input:
+                with open(args.input, "r", encoding="utf-8") as f:
+                    registry = MetricsRegistry.from_prometheus(f.read())
+            elif url:
+                with urllib.request.urlopen(url, timeout=5) as resp:
+                    registry = MetricsRegistry.from_prometheus(resp.read().decode())
+            else:
+                print("No metrics endpoint configured (set FREELANCE_METRICS_PORT); showing this process only.")
+                registry = metrics
+        except (OSError, ValueError) as e:
+            print("Error:", e)
+            return
+        if args.output:
+            registry.write(args.output)
+            print(f"Wrote metrics to {args.output}")
+            return
+        if args.raw:
+            print(registry.to_prometheus(), end="")
+            return
+        rows = registry.summary()
+        if not rows:
+            print("No service calls recorded yet.")
+            return
+        print(f"{'service':<18}{'method':<28}{'calls':>8}{'errors':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for row in rows:
+            if not row["calls"]:
+                continue
+            print(f"{row['service']:<18}{row['method']:<28}{row['calls']:>8}{row['errors']:>8}"
+                  f"{row['mean_ms']:>10}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+        for row in rows:
+            if row["errors_by_type"]:
+                print(f"  {row['service']}.{row['method']} errors: {row['errors_by_type']}")
+
 
 # ---------------- Main Freelance CLI ----------------
 class FreelanceCLI:
@@ -288,6 +769,15 @@ class FreelanceCLI:
         self.job_cli = JobCLI()
         self.bid_cli = BidCLI()
         self.job_status_cli = JobStatusCLI()
+        self.scheduler_cli = SchedulerCLI(self.job_cli.job_service)
+        self.report_cli = ReportCLI()
+        self.sync_cli = SyncCLI()
+        self.loadtest_cli = LoadTestCLI()
+        self.metrics_cli = MetricsCLI()
+        self.auction_cli = AuctionCLI(self.bid_cli.bid_service)
+        self.worker_cli = WorkerCLI()
+        self.export_cli = ExportCLI(self.user_cli.user_service, self.job_cli.job_service,
+                                    self.bid_cli.bid_service)
         self.parser = self.build_parser()
 
     def build_parser(self):
@@ -317,12 +807,20 @@ class FreelanceCLI:
         showu.add_argument("--user_id", type=int, required=True, help="User ID")
         showu.set_defaults(func=self.user_cli.cmd_user_show)
 
+        # User dashboard
+        dashu = puser_sub.add_parser("dashboard", help="Show a user's jobs, bids and statuses")
+        dashu.add_argument("--user_id", type=int, required=True, help="User ID")
+        dashu.set_defaults(func=self.user_cli.cmd_user_dashboard)
+
         # User update
         updu = puser_sub.add_parser("update", help="Update user")
         updu.add_argument("--user_id", type=int, required=True, help="User ID")
         updu.add_argument("--name", help="New name")
         updu.add_argument("--email", help="New email")
         updu.add_argument("--phone", help="New phone")
+        updu.add_argument("--latitude", type=float, help="New latitude (with --longitude)")
+        updu.add_argument("--longitude", type=float, help="New longitude (with --latitude)")
+        updu.add_argument("--service_radius_km", type=float, help="Distance the user travels for work, in km")
         updu.set_defaults(func=self.user_cli.cmd_user_update)
 
         # User delete
@@ -330,6 +828,17 @@ class FreelanceCLI:
         delu.add_argument("--user_id", type=int, required=True, help="User ID")
         delu.set_defaults(func=self.user_cli.cmd_user_delete)
 
+        # User bulk-delete
+        bdelu = puser_sub.add_parser("bulk-delete", help="Delete many users by ID or role (users with jobs or bids are kept)")
+        bdelu.add_argument("--user_ids", type=int, nargs="+", help="User IDs")
+        bdelu.add_argument("--ids_file", help="File of user IDs separated by whitespace or commas ('-' for stdin)")
+        bdelu.add_argument("--role", choices=["client", "freelancer"], help="Every user with this role (when no IDs are given)")
+        bdelu.add_argument("--limit", type=int, help="Consider at most this many users")
+        bdelu.add_argument("--batch_size", type=int, default=500, help="Users checked and deleted per request")
+        bdelu.add_argument("--dry-run", "--dry_run", dest="dry_run", action="store_true", help="Report what would be deleted")
+        bdelu.add_argument("--json", action="store_true", help="Print the full report as JSON")
+        bdelu.set_defaults(func=self.user_cli.cmd_user_bulk_delete)
+
         # ========== Job Commands ==========
         p_job = sub.add_parser("job", help="job commands")
         pjob_sub = p_job.add_subparsers(dest="action")
@@ -341,6 +850,8 @@ class FreelanceCLI:
         createj.add_argument("--budget", type=float, required=True, help="Job budget")
         createj.add_argument("--deadline", required=True, help="Job deadline (YYYY-MM-DD)")
         createj.add_argument("--freelancer_id", type=int, help="Freelancer ID (optional)")
+        createj.add_argument("--latitude", type=float, help="Job site latitude (optional, with --longitude)")
+        createj.add_argument("--longitude", type=float, help="Job site longitude (optional, with --latitude)")
         createj.set_defaults(func=self.job_cli.cmd_job_create)
 
         # Job list
@@ -349,6 +860,35 @@ class FreelanceCLI:
         listj.add_argument("--limit", type=int, default=100, help="Maximum number of jobs")
         listj.set_defaults(func=self.job_cli.cmd_job_list)
 
+        # Job search
+        searchj = pjob_sub.add_parser("search", help="Search jobs by title")
+        searchj.add_argument("--query", default="", help="Search text (full-text and fuzzy match on title)")
+        searchj.add_argument("--status", choices=["open", "assigned", "in-progress", "completed"], help="Filter by status")
+        searchj.add_argument("--min_budget", type=float, help="Minimum budget")
+        searchj.add_argument("--max_budget", type=float, help="Maximum budget")
+        searchj.add_argument("--deadline_from", help="Earliest deadline (YYYY-MM-DD)")
+        searchj.add_argument("--deadline_to", help="Latest deadline (YYYY-MM-DD)")
+        searchj.add_argument("--cursor", help="Cursor from the previous page")
+        searchj.add_argument("--limit", type=int, default=20, help="Page size")
+        searchj.set_defaults(func=self.job_cli.cmd_job_search)
+
+        # Job nearby
+        nearj = pjob_sub.add_parser("nearby", help="List jobs near a freelancer, nearest first")
+        nearj.add_argument("--freelancer_id", type=int, required=True, help="Freelancer ID")
+        nearj.add_argument("--radius_km", type=float, help="Search radius in km (default: the freelancer's service radius)")
+        nearj.add_argument("--status", default="open", choices=["open", "assigned", "in-progress", "completed"], help="Filter by status")
+        nearj.add_argument("--min_budget", type=float, help="Minimum budget")
+        nearj.add_argument("--max_budget", type=float, help="Maximum budget")
+        nearj.add_argument("--cursor", help="Cursor from the previous page")
+        nearj.add_argument("--limit", type=int, default=20, help="Page size")
+        nearj.set_defaults(func=self.job_cli.cmd_job_nearby)
+
+        # Job recommend
+        recj = pjob_sub.add_parser("recommend", help="Recommend open jobs for a freelancer")
+        recj.add_argument("--freelancer_id", type=int, required=True, help="Freelancer ID")
+        recj.add_argument("--limit", type=int, default=10, help="Number of jobs to recommend")
+        recj.set_defaults(func=self.job_cli.cmd_job_recommend)
+
         # Job show
         showj = pjob_sub.add_parser("show", help="Show job details")
         showj.add_argument("--job_id", type=int, required=True, help="Job ID")
@@ -361,6 +901,8 @@ class FreelanceCLI:
         updj.add_argument("--budget", type=float, help="New budget")
         updj.add_argument("--deadline", help="New deadline (YYYY-MM-DD)")
         updj.add_argument("--status", choices=["open", "assigned", "in-progress", "completed"], help="New status")
+        updj.add_argument("--latitude", type=float, help="New job site latitude (with --longitude)")
+        updj.add_argument("--longitude", type=float, help="New job site longitude (with --latitude)")
         updj.set_defaults(func=self.job_cli.cmd_job_update)
 
         # Job assign
@@ -369,6 +911,14 @@ class FreelanceCLI:
         assignj.add_argument("--freelancer_id", type=int, required=True, help="Freelancer ID")
         assignj.set_defaults(func=self.job_cli.cmd_job_assign)
 
+        # Job auto-assign
+        autoj = pjob_sub.add_parser("auto-assign", help="Assign open jobs from pending bids at the lowest total cost")
+        autoj.add_argument("--capacity", type=int, default=3, help="Most assigned or in-progress jobs per freelancer")
+        autoj.add_argument("--limit", type=int, help="Consider at most this many open jobs (oldest first)")
+        autoj.add_argument("--dry-run", "--dry_run", dest="dry_run", action="store_true", help="Show the plan without applying it")
+        autoj.add_argument("--json", action="store_true", help="Print the full report as JSON")
+        autoj.set_defaults(func=self.job_cli.cmd_job_auto_assign)
+
         # Job by client
         jbc = pjob_sub.add_parser("by-client", help="Get jobs by client")
         jbc.add_argument("--client_id", type=int, required=True, help="Client ID")
@@ -384,6 +934,21 @@ class FreelanceCLI:
         delj.add_argument("--job_id", type=int, required=True, help="Job ID")
         delj.set_defaults(func=self.job_cli.cmd_job_delete)
 
+        # Job bulk-status
+        bstatj = pjob_sub.add_parser("bulk-status", help="Set the status of many jobs by ID or filter")
+        bstatj.add_argument("--status", choices=["assigned", "in-progress", "completed"], required=True, help="New status")
+        bstatj.add_argument("--job_ids", type=int, nargs="+", help="Job IDs")
+        bstatj.add_argument("--ids_file", help="File of job IDs separated by whitespace or commas ('-' for stdin)")
+        bstatj.add_argument("--current_status", choices=["open", "assigned", "in-progress", "completed"],
+                            help="Filter: jobs currently in this status (when no IDs are given)")
+        bstatj.add_argument("--client_id", type=int, help="Filter: jobs posted by this client")
+        bstatj.add_argument("--freelancer_id", type=int, help="Filter: jobs assigned to this freelancer")
+        bstatj.add_argument("--limit", type=int, help="Consider at most this many jobs")
+        bstatj.add_argument("--batch_size", type=int, default=500, help="Jobs checked and updated per request")
+        bstatj.add_argument("--dry-run", "--dry_run", dest="dry_run", action="store_true", help="Report what would change")
+        bstatj.add_argument("--json", action="store_true", help="Print the full report as JSON")
+        bstatj.set_defaults(func=self.job_cli.cmd_job_bulk_status)
+
         # ========== Bid Commands ==========
         p_bid = sub.add_parser("bid", help="bid commands")
         pbid_sub = p_bid.add_subparsers(dest="action")
@@ -396,6 +961,13 @@ class FreelanceCLI:
         createb.add_argument("--message", help="Bid message (optional)")
         createb.set_defaults(func=self.bid_cli.cmd_bid_create)
 
+        # Bid create-many
+        createmb = pbid_sub.add_parser("create-many", help="Create bids on many jobs at once")
+        createmb.add_argument("--freelancer_id", type=int, required=True, help="Freelancer ID")
+        createmb.add_argument("--item", action="append", help="Bid as JOB_ID:AMOUNT[:MESSAGE] (repeatable)")
+        createmb.add_argument("--file", help="JSON file with a list of {job_id, amount, message}")
+        createmb.set_defaults(func=self.bid_cli.cmd_bid_create_many)
+
         # Bid list
         listb = pbid_sub.add_parser("list", help="List bids")
         listb.add_argument("--status", choices=["pending", "accepted", "rejected"], help="Filter by status")
@@ -427,6 +999,20 @@ class FreelanceCLI:
         rejectb.add_argument("--bid_id", type=int, required=True, help="Bid ID")
         rejectb.set_defaults(func=self.bid_cli.cmd_bid_reject)
 
+        # Bid bulk-reject
+        brejectb = pbid_sub.add_parser("bulk-reject", help="Reject many bids by ID, job or freelancer")
+        brejectb.add_argument("--bid_ids", type=int, nargs="+", help="Bid IDs")
+        brejectb.add_argument("--ids_file", help="File of bid IDs separated by whitespace or commas ('-' for stdin)")
+        brejectb.add_argument("--job_id", type=int, help="Filter: bids on this job (when no IDs are given)")
+        brejectb.add_argument("--freelancer_id", type=int, help="Filter: bids by this freelancer")
+        brejectb.add_argument("--status", choices=["pending", "accepted", "any"], default="pending",
+                              help="Filter: bids in this status (default pending)")
+        brejectb.add_argument("--limit", type=int, help="Consider at most this many bids")
+        brejectb.add_argument("--batch_size", type=int, default=500, help="Bids checked and updated per request")
+        brejectb.add_argument("--dry-run", "--dry_run", dest="dry_run", action="store_true", help="Report what would change")
+        brejectb.add_argument("--json", action="store_true", help="Print the full report as JSON")
+        brejectb.set_defaults(func=self.bid_cli.cmd_bid_bulk_reject)
+
         # Bid update
         updb = pbid_sub.add_parser("update", help="Update bid")
         updb.add_argument("--bid_id", type=int, required=True, help="Bid ID")
@@ -453,6 +1039,113 @@ class FreelanceCLI:
         latestj.add_argument("--job_id", type=int, required=True, help="Job ID")
         latestj.set_defaults(func=self.job_status_cli.cmd_status_latest)
 
+        # Archive old history
+        archivej = pstatus_sub.add_parser("archive", help="Move old history of completed jobs to local archive segments")
+        archivej.add_argument("--older_than_days", type=int, default=90, help="Archive rows older than this many days")
+        archivej.add_argument("--batch_size", type=int, default=500, help="Completed jobs handled per segment")
+        archivej.set_defaults(func=self.job_status_cli.cmd_status_archive)
+
+        # ========== Scheduler Command ==========
+        p_sched = sub.add_parser("scheduler", help="Run deadline actions (reminders, close bidding, flag overdue)")
+        p_sched.add_argument("--actions", nargs="+", choices=["remind", "close-bidding", "flag-overdue"],
+                             help="Actions to run (default: all)")
+        p_sched.add_argument("--remind_days", type=int, default=2, help="Days before the deadline to send reminders")
+        p_sched.add_argument("--horizon_days", type=int, default=7, help="How far ahead deadlines are loaded")
+        p_sched.add_argument("--lookback_days", type=int, default=7,
+                             help="How far back past deadlines are loaded (older overdue jobs are skipped)")
+        p_sched.add_argument("--batch_size", type=int, default=100, help="Jobs handled per action batch")
+        p_sched.add_argument("--interval", type=float, default=60, help="Seconds between ticks")
+        p_sched.add_argument("--reload_every", type=float, default=3600, help="Seconds between horizon reloads")
+        p_sched.add_argument("--once", action="store_true", help="Run a single tick and exit")
+        p_sched.set_defaults(func=self.scheduler_cli.cmd_scheduler)
+
+        # ========== Report Command ==========
+        p_report = sub.add_parser("report", help="Marketplace KPI reports")
+        p_report.add_argument("name", choices=AnalyticsService.REPORTS, help="Report name")
+        p_report.add_argument("--limit", type=int, default=50, help="Maximum number of rows")
+        p_report.set_defaults(func=self.report_cli.cmd_report)
+
+        # ========== Sync Commands (FREELANCE_BACKEND=offline) ==========
+        p_sync = sub.add_parser("sync", help="offline queue and replica commands")
+        psync_sub = p_sync.add_subparsers(dest="action")
+
+        sstatus = psync_sub.add_parser("status", help="Show queued changes and conflicts")
+        sstatus.set_defaults(func=self.sync_cli.cmd_sync_status)
+
+        spush = psync_sub.add_parser("push", help="Replay queued changes on the backend")
+        spush.add_argument("--batch_size", type=int, default=100, help="Inserts sent per request")
+        spush.add_argument("--watch", action="store_true", help="Keep retrying until the queue drains")
+        spush.add_argument("--interval", type=float, default=30, help="Seconds between retries with --watch")
+        spush.set_defaults(func=self.sync_cli.cmd_sync_push)
+
+        spull = psync_sub.add_parser("pull", help="Refresh the local replica from the backend")
+        spull.add_argument("--force", action="store_true", help="Pull even with changes still queued (they stay queued)")
+        spull.set_defaults(func=self.sync_cli.cmd_sync_pull)
+
+        sconflicts = psync_sub.add_parser("conflicts", help="List changes the backend rejected")
+        sconflicts.add_argument("--clear", action="store_true", help="Clear the list after printing")
+        sconflicts.set_defaults(func=self.sync_cli.cmd_sync_conflicts)
+
+        # ========== Load Test Command ==========
+        p_load = sub.add_parser("loadtest", help="Drive a synthetic workload and report throughput and latency")
+        p_load.add_argument("--clients", type=int, default=5, help="Clients to create")
+        p_load.add_argument("--freelancers", type=int, default=50, help="Freelancers to create")
+        p_load.add_argument("--jobs", type=int, default=100, help="Jobs to create")
+        p_load.add_argument("--workers", type=int, default=8, help="Worker threads per process")
+        p_load.add_argument("--processes", type=int, default=1, help="Worker processes (Supabase backend only)")
+        p_load.add_argument("--duration", type=float, default=30, help="Seconds to run the workload")
+        p_load.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of job popularity")
+        p_load.add_argument("--burst", type=float, default=8.0, help="Extra bidding weight as deadlines approach")
+        p_load.add_argument("--accept_ratio", type=float, default=0.3, help="Share of bid decisions that accept")
+        p_load.add_argument("--horizon_days", type=int, default=14, help="Deadline spread of generated jobs")
+        p_load.add_argument("--seed", type=int, default=42, help="Random seed")
+        p_load.add_argument("--json", action="store_true", help="Print the full report as JSON")
+        p_load.set_defaults(func=self.loadtest_cli.cmd_loadtest)
+
+        # ========== Auction Commands ==========
+        p_auction = sub.add_parser("auction", help="auction commands")
+        pauction_sub = p_auction.add_subparsers(dest="action")
+
+        aresolve = pauction_sub.add_parser("resolve", help="Accept the lowest bid on every eligible open job")
+        aresolve.add_argument("--closing_within_days", type=int, help="Jobs whose deadline is within this many days")
+        aresolve.add_argument("--min_bids", type=int, help="Jobs with at least this many pending bids")
+        aresolve.add_argument("--batch_size", type=int, default=100, help="Jobs selected and resolved per batch")
+        aresolve.add_argument("--concurrency", type=int, default=8, help="Parallel accepts within a batch")
+        aresolve.add_argument("--limit", type=int, help="Resolve at most this many jobs")
+        aresolve.add_argument("--dry_run", action="store_true", help="List the candidates without accepting")
+        aresolve.add_argument("--json", action="store_true", help="Print the full report as JSON")
+        aresolve.set_defaults(func=self.auction_cli.cmd_auction_resolve)
+
+        # ========== Worker Command ==========
+        p_worker = sub.add_parser("worker", help="Process queued side effects (FREELANCE_TASKS=queue)")
+        p_worker.add_argument("--threads", type=int, default=4, help="Worker threads")
+        p_worker.add_argument("--batch_size", type=int, default=100, help="Tasks claimed per batch")
+        p_worker.add_argument("--lease", type=float, default=60, help="Seconds a claimed task is reserved before redelivery")
+        p_worker.add_argument("--poll_interval", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+        p_worker.add_argument("--report_every", type=float, default=60, help="Seconds between progress lines")
+        p_worker.add_argument("--once", action="store_true", help="Process every ready task, then exit")
+        p_worker.add_argument("--stats", action="store_true", help="Show queue depth and lag, then exit")
+        p_worker.add_argument("--dead", action="store_true", help="List tasks that ran out of attempts")
+        p_worker.add_argument("--requeue_dead", action="store_true", help="Retry every dead task")
+        p_worker.set_defaults(func=self.worker_cli.cmd_worker)
+
+        # ========== Export Command ==========
+        p_export = sub.add_parser("export", help="Export a table to CSV, Parquet or Arrow")
+        p_export.add_argument("--table", choices=["users", "jobs", "bids"], required=True, help="Table to export")
+        p_export.add_argument("--status", help="Only rows with this status (role for users)")
+        p_export.add_argument("--limit", type=int, help="Export at most this many rows (lowest IDs first)")
+        p_export.add_argument("--format", choices=EXPORT_FORMATS, help="File format (default: from the output extension, else csv)")
+        p_export.add_argument("--output", required=True, help="File to write")
+        p_export.set_defaults(func=self.export_cli.cmd_export)
+
+        # ========== Metrics Command ==========
+        p_metrics = sub.add_parser("metrics", help="Show service call counts, errors and latency")
+        p_metrics.add_argument("--url", help="Metrics endpoint to scrape (default: FREELANCE_METRICS_PORT on localhost)")
+        p_metrics.add_argument("--input", help="Read a Prometheus text export instead of scraping")
+        p_metrics.add_argument("--output", help="Write the metrics as Prometheus text to this file")
+        p_metrics.add_argument("--raw", action="store_true", help="Print Prometheus text instead of a summary")
+        p_metrics.set_defaults(func=self.metrics_cli.cmd_metrics)
+
         return parser
 
     def run(self):
@@ -460,6 +1153,9 @@ class FreelanceCLI:
         if not hasattr(args, "func"):
             self.parser.print_help()
             return
+        if args.cmd != "metrics":
+            settings = get_metrics_settings()
+            start_exporters(settings["port"], settings["file"])
         args.func(args)
 
 
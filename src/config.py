@@ -1,11 +1,12 @@
 import os
-from supabase import create_client, Client
+from typing import Optional
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
 
 # Load .env file for local development
 load_dotenv()
 
-def get_supabase() -> Client:
+def get_supabase(url_override: Optional[str] = None) -> Client:
     # Try Streamlit secrets first (for deployment), then fall back to environment variables (for local)
     try:
         import streamlit as st
@@ -15,8 +16,80 @@ def get_supabase() -> Client:
         # Fall back to .env file
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
+    # Read replicas share the project key but have their own URL
+    url = url_override or url
     
     if not url or not key:
         raise ValueError("Supabase credentials not found. Set SUPABASE_URL and SUPABASE_KEY")
     
-    return create_client(url, key)
\ No newline at end of file
+    # Hard HTTP timeout so requests abandoned by the transport policy still end
+    options = ClientOptions(postgrest_client_timeout=float(os.getenv("SUPABASE_HTTP_TIMEOUT", "30")))
+    return create_client(url, key, options=options)
+
+
+def get_pool_settings() -> dict:
+    # Connection pool sizing for the shared DAO client
+    return {
+        "max_size": int(os.getenv("SUPABASE_POOL_SIZE", "10")),
+        "timeout": float(os.getenv("SUPABASE_POOL_TIMEOUT", "10")),
+    }
+
+
+
+def get_transport_settings() -> dict:
+    # Timeouts, retries, hedging and circuit breaking for backend requests
+    return {
+        "read_timeout": float(os.getenv("SUPABASE_READ_TIMEOUT", "5")),
+        "write_timeout": float(os.getenv("SUPABASE_WRITE_TIMEOUT", "10")),
+        "read_retries": int(os.getenv("SUPABASE_READ_RETRIES", "2")),
+        "backoff_base": float(os.getenv("SUPABASE_RETRY_BACKOFF", "0.1")),
+        "backoff_max": float(os.getenv("SUPABASE_RETRY_BACKOFF_MAX", "2")),
+        "hedge_reads": os.getenv("SUPABASE_HEDGE_READS", "false").lower() in ("1", "true", "yes"),
+        "breaker_threshold": int(os.getenv("SUPABASE_BREAKER_THRESHOLD", "5")),
+        "breaker_cooldown": float(os.getenv("SUPABASE_BREAKER_COOLDOWN", "30")),
+    }
+
+
+def get_routing_settings() -> dict:
+    # Optional read replicas; reads go there unless a session wrote recently
+    read_urls = os.getenv("SUPABASE_READ_URLS", "")
+    return {
+        "read_urls": [url.strip() for url in read_urls.split(",") if url.strip()],
+        "ryw_window": float(os.getenv("SUPABASE_RYW_WINDOW", "5")),
+        "replica_cooldown": float(os.getenv("SUPABASE_REPLICA_COOLDOWN", "30")),
+    }
+
+
+def get_backend_settings() -> dict:
+    # "supabase" (default), "local" (standalone local database) or "offline"
+    # (local replica of Supabase plus a write queue synced with `freelance-cli sync`)
+    local_dir = os.getenv("FREELANCE_LOCAL_DIR", ".freelance")
+    return {
+        "mode": os.getenv("FREELANCE_BACKEND", "supabase").lower(),
+        "local_dir": local_dir,
+        # Compressed segments of archived job status history
+        "archive_dir": os.getenv("FREELANCE_ARCHIVE_DIR", os.path.join(local_dir, "archive")),
+    }
+
+
+def get_metrics_settings() -> dict:
+    # Optional exports of the service metrics: a local HTTP endpoint and/or a
+    # Prometheus text file written when the process exits
+    port = os.getenv("FREELANCE_METRICS_PORT", "")
+    return {
+        "port": int(port) if port else None,
+        "file": os.getenv("FREELANCE_METRICS_FILE") or None,
+    }
+
+def get_task_settings() -> dict:
+    # Side effects (status history, notifications): "inline" runs them in the
+    # caller, "queue" hands them to `freelance-cli worker` through a local queue
+    local_dir = os.getenv("FREELANCE_LOCAL_DIR", ".freelance")
+    return {
+        "mode": os.getenv("FREELANCE_TASKS", "inline").lower(),
+        "path": os.getenv("FREELANCE_TASK_DB", os.path.join(local_dir, "tasks.sqlite3")),
+        "max_attempts": int(os.getenv("FREELANCE_TASK_MAX_ATTEMPTS", "10")),
+        # Worker threads started inside the app process itself (0: run `freelance-cli worker`)
+        "embedded_workers": int(os.getenv("FREELANCE_TASK_WORKERS", "0")),
+        "notifications_path": os.getenv("FREELANCE_NOTIFICATIONS_FILE", os.path.join(local_dir, "notifications.jsonl")),
+    }
\ No newline at end of file
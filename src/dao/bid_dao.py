@@ -1,12 +1,16 @@
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from typing import Any, Optional, List, Dict, Set
+from src.dao.client import get_client
+from src.dao.singleflight import reads
+from src.dao.errors import constraint_errors
+from src.dao.paging import fetch_page
+from src.dao.columnar import fetch_table
 
 # ==================== BID DAO ====================
 class BidDAO:
     """Data Access Object for bid-related database operations."""
     
-    def __init__(self):
-        self.sb = get_supabase()
+    def __init__(self, records: bool = False):
+        self.sb = get_client(records)
     
     def create_bid(self, job_id: int, freelancer_id: int, amount: float, 
                    message: Optional[str] = None) -> Optional[Dict]:
@@ -20,27 +24,75 @@ class BidDAO:
         if message:
             bid_data["message"] = message
             
-        self.sb.table("bids").insert(bid_data).execute()
-        
-        # Fetch the most recently created bid
-        resp = self.sb.table("bids").select("*").order("bid_id", desc=True).limit(1).execute()
+        # The response carries the inserted row
+        with constraint_errors("bids"):
+            resp = self.sb.table("bids").insert(bid_data).execute()
         return resp.data[0] if resp.data else None
     
+    def create_bids(self, bids: List[Dict]) -> List[Dict]:
+        """Insert several bids in a single request and return the inserted records."""
+        if not bids:
+            return []
+        with constraint_errors("bids"):
+            resp = self.sb.table("bids").insert(bids).execute()
+        return resp.data or []
+    
     def get_bid_by_id(self, bid_id: int) -> Optional[Dict]:
         """Retrieve a single bid by ID."""
-        resp = self.sb.table("bids").select("*").eq("bid_id", bid_id).execute()
-        return resp.data[0] if resp.data else None
+        def fetch():
+            resp = self.sb.table("bids").select("*").eq("bid_id", bid_id).execute()
+            return resp.data[0] if resp.data else None
+        return reads.do(("bids.get_bid_by_id", bid_id, self.sb.records), fetch)
     
     def get_bids_by_job_id(self, job_id: int) -> List[Dict]:
         """Retrieve all bids for a specific job."""
-        resp = self.sb.table("bids").select("*").eq("job_id", job_id).execute()
-        return resp.data or []
+        def fetch():
+            resp = self.sb.table("bids").select("*").eq("job_id", job_id).execute()
+            return resp.data or []
+        return reads.do(("bids.get_bids_by_job_id", job_id, self.sb.records), fetch)
+    
+    def get_lowest_pending_bids(self, job_id: int, limit: int) -> List[Dict]:
+        """Retrieve the lowest pending bids for a job, cheapest first."""
+        def fetch():
+            resp = self.sb.table("bids").select("*").eq("job_id", job_id).eq("bid_status", "pending") \
+                .order("amount", desc=False).order("bid_id", desc=False).limit(limit).execute()
+            return resp.data or []
+        return reads.do(("bids.get_lowest_pending_bids", job_id, limit, self.sb.records), fetch)
     
     def get_bids_by_freelancer_id(self, freelancer_id: int) -> List[Dict]:
         """Retrieve all bids made by a specific freelancer."""
         resp = self.sb.table("bids").select("*").eq("freelancer_id", freelancer_id).execute()
         return resp.data or []
     
+    def get_bids_by_freelancer_since(self, freelancer_id: int, after_bid_id: int,
+                                     recheck_ids: Optional[List[int]] = None,
+                                     chunk_size: int = 500) -> List[Dict]:
+        """Retrieve a freelancer's bids newer than after_bid_id plus the listed bids to re-check.
+
+        The bids to re-check are sent in chunks of IDs, the first along with the new-bids filter.
+        """
+        recheck_ids = list(recheck_ids or [])
+        chunks = [recheck_ids[i:i + chunk_size] for i in range(0, len(recheck_ids), chunk_size)]
+        filters = f"bid_id.gt.{after_bid_id}"
+        if chunks:
+            filters += f",bid_id.in.({','.join(str(i) for i in chunks[0])})"
+        resp = self.sb.table("bids").select("bid_id, job_id, amount, bid_status") \
+            .eq("freelancer_id", freelancer_id).or_(filters).execute()
+        rows = resp.data or []
+        for chunk in chunks[1:]:
+            resp = self.sb.table("bids").select("bid_id, job_id, amount, bid_status") \
+                .eq("freelancer_id", freelancer_id).in_("bid_id", chunk).execute()
+            rows.extend(resp.data or [])
+        return rows
+    
+    def get_bids_by_freelancer_for_jobs(self, freelancer_id: int, job_ids: List[int]) -> List[Dict]:
+        """Retrieve a freelancer's existing bids on any of the given jobs."""
+        if not job_ids:
+            return []
+        resp = self.sb.table("bids").select("*").eq("freelancer_id", freelancer_id) \
+            .in_("job_id", job_ids).execute()
+        return resp.data or []
+    
     def get_bid_by_job_and_freelancer(self, job_id: int, freelancer_id: int) -> Optional[Dict]:
         """Check if a bid exists for a job-freelancer combination."""
         resp = self.sb.table("bids").select("*").match({
@@ -49,13 +101,28 @@ class BidDAO:
         }).execute()
         return resp.data[0] if resp.data else None
     
-    def get_bids_by_status(self, bid_status: str) -> List[Dict]:
-        """Retrieve all bids with a specific status."""
-        resp = self.sb.table("bids").select("*").eq("bid_status", bid_status).execute()
+    def get_bids_by_status(self, bid_status: str, limit: Optional[int] = None) -> List[Dict]:
+        """Retrieve bids with a specific status, up to an optional limit."""
+        query = self.sb.table("bids").select("*").eq("bid_status", bid_status).order("bid_id", desc=False)
+        if limit is not None:
+            query = query.limit(limit)
+        resp = query.execute()
         return resp.data or []
 
-    def update_bid(self, bid_id: int, fields: Dict) -> Optional[Dict]:
-        """Update bid fields and return the updated record."""
+    def update_bid(self, bid_id: int, fields: Dict, expect: Optional[Dict] = None) -> Optional[Dict]:
+        """Update bid fields and return the updated record.
+        
+        With `expect`, the update only applies while every expected column still
+        holds the given value, in a single request; None means the guard did not
+        match (or the bid does not exist).
+        """
+        if expect:
+            query = self.sb.table("bids").update(fields).eq("bid_id", bid_id)
+            for column, value in expect.items():
+                query = query.eq(column, value)
+            resp = query.execute()
+            return resp.data[0] if resp.data else None
+        
         # Update the bid
         self.sb.table("bids").update(fields).eq("bid_id", bid_id).execute()
         
@@ -63,8 +130,53 @@ class BidDAO:
         resp = self.sb.table("bids").select("*").eq("bid_id", bid_id).execute()
         return resp.data[0] if resp.data else None
 
-    def delete_bid(self, bid_id: int) -> Optional[Dict]:
-        """Delete a bid and return the deleted record."""
+    def update_bids(self, bid_ids: List[int], fields: Dict, expect: Optional[Dict] = None,
+                    unless: Optional[Dict] = None) -> List[Dict]:
+        """Update several bids in one request, optionally guarded, and return the rows that changed.
+        
+        `expect` limits the update to bids whose columns hold the given values,
+        `unless` skips bids whose columns already do.
+        """
+        if not bid_ids:
+            return []
+        query = self.sb.table("bids").update(fields).in_("bid_id", bid_ids)
+        for column, value in (expect or {}).items():
+            query = query.eq(column, value)
+        for column, value in (unless or {}).items():
+            query = query.neq(column, value)
+        resp = query.execute()
+        return resp.data or []
+
+    def get_pending_bids_for_jobs(self, job_ids: List[int], chunk_size: int = 500) -> List[Dict]:
+        """Pending bids on the given jobs, fetched in chunks of job IDs."""
+        rows = []
+        for i in range(0, len(job_ids), chunk_size):
+            resp = self.sb.table("bids").select("bid_id, job_id, freelancer_id, amount") \
+                .in_("job_id", job_ids[i:i + chunk_size]).eq("bid_status", "pending").execute()
+            rows.extend(resp.data or [])
+        return rows
+
+    def reject_pending_bids_for_jobs(self, job_ids: List[int]) -> List[Dict]:
+        """Reject every pending bid on the given jobs in one request and return the rejected bids."""
+        if not job_ids:
+            return []
+        resp = self.sb.table("bids").update({"bid_status": "rejected"}) \
+            .in_("job_id", job_ids).eq("bid_status", "pending").execute()
+        return resp.data or []
+
+    def delete_bid(self, bid_id: int, expect: Optional[Dict] = None) -> Optional[Dict]:
+        """Delete a bid and return the deleted record.
+        
+        With `expect`, the delete is a single guarded request; None means the
+        guard did not match (or the bid does not exist).
+        """
+        if expect:
+            query = self.sb.table("bids").delete().eq("bid_id", bid_id)
+            for column, value in expect.items():
+                query = query.eq(column, value)
+            resp = query.execute()
+            return resp.data[0] if resp.data else None
+        
         # Get bid before deleting
         bid = self.get_bid_by_id(bid_id)
         
@@ -74,7 +186,56 @@ class BidDAO:
         
         return bid
 
+    def get_bids_page(self, columns: str = "*", after_id: int = 0, limit: int = 1000,
+                      bid_status: Optional[str] = None, job_id: Optional[int] = None,
+                      freelancer_id: Optional[int] = None) -> List[Dict]:
+        """Retrieve one page of bids ordered by ID, starting after the given ID."""
+        query = self.sb.table("bids").select(columns).gt("bid_id", after_id)
+        if bid_status:
+            query = query.eq("bid_status", bid_status)
+        if job_id is not None:
+            query = query.eq("job_id", job_id)
+        if freelancer_id is not None:
+            query = query.eq("freelancer_id", freelancer_id)
+        resp = query.order("bid_id", desc=False).limit(limit).execute()
+        return resp.data or []
+
+    def get_bids_by_ids(self, bid_ids: List[int]) -> List[Dict]:
+        """Retrieve several bids in a single request."""
+        if not bid_ids:
+            return []
+        resp = self.sb.table("bids").select("*").in_("bid_id", bid_ids).execute()
+        return resp.data or []
+
+    def get_freelancer_ids_with_bids(self, freelancer_ids: List[int]) -> Set[int]:
+        """Which of the given freelancers have placed any bid."""
+        if not freelancer_ids:
+            return set()
+        resp = self.sb.table("bids").select("freelancer_id").in_("freelancer_id", freelancer_ids).execute()
+        return {row["freelancer_id"] for row in resp.data or []}
+
     def list_bids(self, limit: int = 100) -> List[Dict]:
         """Retrieve all bids with optional limit."""
         resp = self.sb.table("bids").select("*").order("bid_id", desc=False).limit(limit).execute()
+        return resp.data or []
+
+    def get_bids_arrow(self, bid_status: Optional[str] = None, columns: Optional[List[str]] = None,
+                       limit: Optional[int] = None) -> Any:
+        """Every bid (optionally in one status) as a typed pyarrow.Table, read page by page."""
+        return fetch_table(self.sb, "bids", {"bid_status": bid_status}, columns, limit)
+
+    def list_bids_page(self, bid_status: Optional[str] = None, sort: str = "bid_id", desc: bool = False,
+                       cursor: Optional[str] = None, limit: int = 25) -> Dict:
+        """Retrieve one sorted page of bids, optionally filtered by status."""
+        return fetch_page(self.sb, "bids", {"bid_status": bid_status}, sort, desc, cursor, limit)
+
+    def get_auction_candidates(self, deadline_before: Optional[str] = None, min_bids: Optional[int] = None,
+                               after_job_id: int = 0, limit: int = 100) -> List[Dict]:
+        """One page of open jobs due for resolution, each with its lowest pending bid, by job ID."""
+        resp = self.sb.rpc("auction_candidates", {
+            "p_deadline_before": deadline_before,
+            "p_min_bids": min_bids,
+            "p_after_job_id": after_job_id,
+            "p_limit": limit
+        }).execute()
         return resp.data or []
\ No newline at end of file
@@ -0,0 +1,265 @@
+import queue
+import threading
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from src.config import (get_supabase, get_pool_settings, get_transport_settings, get_routing_settings,
+                        get_backend_settings)
+from src.dao.transport import TransportPolicy, CircuitBreaker
+from src.dao.records import RECORD_TYPES
+from src.dao.routing import ReadRouter, Replica
+from src.dao.singleflight import reads
+from src.dao.offline import get_local_store
+
+# RPC functions that only read, and so may be retried and hedged
+READ_ONLY_RPCS = {"search_jobs", "user_dashboard", "auction_candidates", "nearby_jobs"}
+_WRITE_STEPS = {"insert", "upsert", "update", "delete"}
+
+
+class PoolTimeout(Exception):
+    """Raised when no backend connection becomes free within the pool timeout."""
+    pass
+
+
+class ConnectionPool:
+    """Bounded pool of backend clients, each checked out by one thread at a time.
+
+    Clients are created lazily up to max_size and reused afterwards, so their
+    HTTP keep-alive connections stay warm. When every client is busy, callers
+    wait in line for up to `timeout` seconds before PoolTimeout is raised.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_size: int = 10, timeout: float = 10.0):
+        if max_size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+        # LIFO hands out the most recently used (warmest) client first
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._counts = {"checkouts": 0, "waits": 0, "timeouts": 0}
+
+    def acquire(self) -> Any:
+        with self._lock:
+            self._counts["checkouts"] += 1
+            try:
+                client = self._idle.get_nowait()
+                self._in_use += 1
+                return client
+            except queue.Empty:
+                create = self._created < self.max_size
+                if create:
+                    self._created += 1
+                    self._in_use += 1
+                else:
+                    self._counts["waits"] += 1
+
+        if create:
+            try:
+                return self.factory()
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                    self._in_use -= 1
+                raise
+
+        try:
+            client = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self._counts["timeouts"] += 1
+            raise PoolTimeout(f"No backend connection available after {self.timeout}s")
+        with self._lock:
+            self._in_use += 1
+        return client
+
+    def release(self, client: Any):
+        with self._lock:
+            self._in_use -= 1
+        self._idle.put(client)
+
+    @contextmanager
+    def connection(self):
+        """Check out a client for the duration of the block."""
+        client = self.acquire()
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts, size=self._created, in_use=self._in_use, max_size=self.max_size)
+
+
+class PooledQuery:
+    """Records a query-builder chain and replays it on a pooled client at execute().
+
+    Every builder call returns a new PooledQuery, so partially built queries can
+    be extended or reused the same way as the underlying query builders. When a
+    record type is given, returned rows are converted to it after execute().
+    """
+
+    def __init__(self, owner: "PooledClient", root: tuple, steps: tuple = (), record_type: Optional[type] = None):
+        self._owner = owner
+        self._root = root
+        self._steps = steps
+        self._record_type = record_type
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def step(*args, **kwargs):
+            return PooledQuery(self._owner, self._root, self._steps + ((name, args, kwargs),), self._record_type)
+        return step
+
+    @property
+    def is_read(self) -> bool:
+        if self._root[0] == "rpc":
+            return self._root[1][0] in READ_ONLY_RPCS
+        return not any(name in _WRITE_STEPS for name, _, _ in self._steps)
+
+    def is_point_lookup(self, key_columns: Dict[str, set]) -> bool:
+        """True for a table read filtered by equality on one of its key columns."""
+        if self._root[0] != "table":
+            return False
+        keys = key_columns.get(self._root[1][0], ())
+        return any(name == "eq" and args and args[0] in keys for name, args, _ in self._steps)
+
+    def build(self, client: Any) -> Any:
+        """Apply the recorded chain to a real client and return its query builder."""
+        name, args, kwargs = self._root
+        query = getattr(client, name)(*args, **kwargs)
+        for name, args, kwargs in self._steps:
+            query = getattr(query, name)(*args, **kwargs)
+        # Retries are owned by the transport policy, not the client library
+        if hasattr(query, "retry"):
+            query = query.retry(False)
+        return query
+
+    def execute_on(self, pool: ConnectionPool):
+        """Run the query once on a client from the given pool."""
+        with pool.connection() as client:
+            return self.build(client).execute()
+
+    def execute(self):
+        owner = self._owner
+        is_read = self.is_read
+        router = owner.router
+        if router is None:
+            run = lambda: self.execute_on(owner.pool)
+        else:
+            # Routing depends on the calling session, so decide before any worker thread runs it
+            replica = router.choose(is_read)
+            run = lambda: router.read(self, replica) if is_read else self.execute_on(owner.pool)
+        try:
+            resp = run() if owner.policy is None else owner.policy.call(run, is_read)
+        finally:
+            if not is_read:
+                # Even a failed or timed-out write may have landed; later reads must not see older data
+                reads.invalidate()
+                if router is not None:
+                    router.note_write()
+        if self._record_type is not None and isinstance(resp.data, list):
+            from_row = self._record_type.from_row
+            resp.data = [from_row(row) for row in resp.data]
+        return resp
+
+
+class PooledClient:
+    """Drop-in stand-in for the supabase client that routes every request through a pool.
+
+    With records=True, table rows come back as slotted records (see src.dao.records)
+    instead of dicts. RPC results are always left as returned. With a router,
+    reads may be served by read replicas (see src.dao.routing).
+    """
+
+    def __init__(self, pool: ConnectionPool, policy: Optional[TransportPolicy] = None, records: bool = False,
+                 router: Optional[ReadRouter] = None):
+        self.pool = pool
+        self.policy = policy
+        self.records = records
+        self.router = router
+
+    def table(self, table_name: str) -> PooledQuery:
+        record_type = RECORD_TYPES.get(table_name) if self.records else None
+        return PooledQuery(self, ("table", (table_name,), {}), record_type=record_type)
+
+    def rpc(self, fn: str, params: Optional[Dict] = None, **kwargs) -> PooledQuery:
+        return PooledQuery(self, ("rpc", (fn, params or {}), kwargs))
+
+    def pin_primary(self):
+        """Context manager sending this thread's reads to the primary inside the block."""
+        return self.router.pin_primary() if self.router is not None else nullcontext()
+
+
+_client = None
+_record_client = None
+_primary = None
+_client_lock = threading.Lock()
+
+
+def _build_primary() -> PooledClient:
+    settings = get_pool_settings()
+    pool = ConnectionPool(get_supabase, settings["max_size"], settings["timeout"])
+    t = get_transport_settings()
+    policy = TransportPolicy(
+        read_timeout=t["read_timeout"], write_timeout=t["write_timeout"],
+        read_retries=t["read_retries"], backoff_base=t["backoff_base"],
+        backoff_max=t["backoff_max"], hedge_reads=t["hedge_reads"],
+        breaker=CircuitBreaker(t["breaker_threshold"], t["breaker_cooldown"]),
+        # Hedged reads can run two requests per caller
+        max_workers=settings["max_size"] * 2
+    )
+    router = None
+    routing = get_routing_settings()
+    if routing["read_urls"]:
+        replicas = [
+            Replica(url, ConnectionPool(partial(get_supabase, url), settings["max_size"], settings["timeout"]),
+                    routing["replica_cooldown"])
+            for url in routing["read_urls"]
+        ]
+        router = ReadRouter(pool, replicas, routing["ryw_window"])
+        # Coalesced reads must not hand replica rows to a session pinned to the primary
+        reads.scope = router.scope
+    return PooledClient(pool, policy, router=router)
+
+
+def get_primary_client() -> PooledClient:
+    """Return the pooled Supabase client, whatever FREELANCE_BACKEND is set to."""
+    global _primary
+    with _client_lock:
+        if _primary is None:
+            _primary = _build_primary()
+        return _primary
+
+
+def get_client(records: bool = False) -> PooledClient:
+    """Return the process-wide pooled client shared by every DAO.
+
+    records=True returns a view of the same pool and policy that yields slotted records.
+    When SUPABASE_READ_URLS is set, reads are routed to those replicas. With
+    FREELANCE_BACKEND=local or offline, requests go to the local backend instead.
+    """
+    global _client, _record_client
+    backend = get_backend_settings()
+    if backend["mode"] == "supabase":
+        primary = get_primary_client()
+    with _client_lock:
+        if _client is None:
+            if backend["mode"] == "supabase":
+                _client = primary
+            else:
+                store = get_local_store(backend["mode"], backend["local_dir"])
+                settings = get_pool_settings()
+                # Local calls need no timeouts or retries, only the shared pool and record views
+                _client = PooledClient(ConnectionPool(lambda: store, settings["max_size"], settings["timeout"]))
+        if records:
+            if _record_client is None:
+                _record_client = PooledClient(_client.pool, _client.policy, records=True, router=_client.router)
+            return _record_client
+        return _client
@@ -0,0 +1,109 @@
+import io
+from typing import Any, Dict, List, Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from src.dao.local_backend import SCHEMA
+
+MONEY = pa.decimal128(18, 2)
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+# Wide enough to parse any amount exactly before rounding to cents
+_WIDE_DECIMAL = pa.decimal128(38, 9)
+
+# File formats an Arrow table can be exported to, by file extension
+EXPORT_FORMATS = ("csv", "parquet", "arrow")
+
+# Arrow type of every column, mirroring schema.sql
+ARROW_TYPES = {
+    "users": {
+        "user_id": pa.int64(), "name": pa.string(), "email": pa.string(), "phone": pa.string(),
+        "role": pa.string(), "created_at": TIMESTAMP, "latitude": pa.float64(),
+        "longitude": pa.float64(), "service_radius_km": pa.float64()
+    },
+    "jobs": {
+        "job_id": pa.int64(), "title": pa.string(), "client_id": pa.int64(), "assigned_to": pa.int64(),
+        "budget": MONEY, "status": pa.string(), "deadline": pa.date32(), "created_at": TIMESTAMP,
+        "latitude": pa.float64(), "longitude": pa.float64()
+    },
+    "bids": {
+        "bid_id": pa.int64(), "job_id": pa.int64(), "freelancer_id": pa.int64(), "amount": MONEY,
+        "message": pa.string(), "bid_status": pa.string(), "created_at": TIMESTAMP
+    },
+    "job_status": {
+        "status_id": pa.int64(), "job_id": pa.int64(), "status": pa.string(), "updated_at": TIMESTAMP
+    }
+}
+
+
+def arrow_schema(table: str, columns: Optional[List[str]] = None) -> pa.Schema:
+    types = ARROW_TYPES[table]
+    return pa.schema([(column, types[column]) for column in columns or SCHEMA[table]["columns"]])
+
+
+def _to_money(array: pa.Array) -> pa.Array:
+    return pc.round(array.cast(_WIDE_DECIMAL), 2).cast(MONEY)
+
+
+def csv_to_table(table: str, text: str, columns: Optional[List[str]] = None) -> pa.Table:
+    """Parse a PostgREST CSV response straight into typed columns, without per-row objects.
+
+    Unquoted empty fields are NULL and quoted ones empty strings, matching how
+    PostgREST writes them.
+    """
+    schema = arrow_schema(table, columns)
+    if not text:
+        return schema.empty_table()
+    column_types = {f.name: (_WIDE_DECIMAL if f.type == MONEY else f.type) for f in schema}
+    parsed = pa_csv.read_csv(
+        io.BytesIO(text.encode("utf-8")),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types, include_columns=schema.names,
+                                              strings_can_be_null=True, quoted_strings_can_be_null=False)
+    )
+    return pa.Table.from_arrays(
+        [_to_money(parsed[f.name]) if f.type == MONEY else parsed[f.name] for f in schema], schema=schema
+    )
+
+
+def fetch_table(sb: Any, table: str, filters: Optional[Dict[str, Any]] = None,
+                columns: Optional[List[str]] = None, limit: Optional[int] = None,
+                page_size: int = 1000) -> pa.Table:
+    """Read a whole (filtered) table as one Arrow table, keyset-paged by primary key.
+
+    Pages are requested as CSV and parsed by Arrow into typed columns, so no
+    Python object is created per row or value.
+    """
+    pk = SCHEMA[table]["pk"]
+    columns = list(columns or SCHEMA[table]["columns"])
+    if pk not in columns:
+        columns.insert(0, pk)
+    batches, after_id, fetched = [], 0, 0
+    while limit is None or fetched < limit:
+        size = page_size if limit is None else min(page_size, limit - fetched)
+        query = sb.table(table).select(",".join(columns)).gt(pk, after_id)
+        for column, value in (filters or {}).items():
+            if value is not None:
+                query = query.eq(column, value)
+        query = query.order(pk, desc=False).limit(size)
+        data = query.csv().execute().data
+        # An empty body comes back as an empty list rather than text
+        page = csv_to_table(table, data if isinstance(data, str) else "", columns)
+        batches.append(page)
+        fetched += page.num_rows
+        if page.num_rows < size:
+            break
+        after_id = page[pk][-1].as_py()
+    return pa.concat_tables(batches) if batches else arrow_schema(table, columns).empty_table()
+
+
+def write_table(data: pa.Table, sink: Any, fmt: str = "csv"):
+    """Write an Arrow table to a path or binary file object as CSV, Parquet or Arrow IPC (Feather v2)."""
+    if fmt == "csv":
+        pa_csv.write_csv(data, sink)
+    elif fmt == "parquet":
+        pq.write_table(data, sink)
+    elif fmt == "arrow":
+        feather.write_feather(data, sink, compression="uncompressed")
+    else:
+        raise ValueError(f"Unknown export format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}")
@@ -0,0 +1,80 @@
+import re
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from postgrest.exceptions import APIError
+
+# Postgres SQLSTATE codes for constraint violations
+CONSTRAINT_KINDS = {
+    "23505": "unique",
+    "23514": "check",
+    "23503": "foreign_key",
+    "23502": "not_null"
+}
+
+_CONSTRAINT = re.compile(r'constraint "([^"]+)"')
+_RELATION = re.compile(r'(?:relation|table) "([^"]+)"')
+_COLUMN = re.compile(r'column "([^"]+)"')
+_KEY = re.compile(r"Key \((.+?)\)=\((.*?)\)")
+
+
+class ConstraintViolation(Exception):
+    """A write was rejected by a database constraint.
+
+    `kind` is "unique", "check", "foreign_key" or "not_null"; `columns` are the
+    columns the constraint covers, and `values` the offending values when the
+    database reports them.
+    """
+
+    def __init__(self, kind: str, table: Optional[str], constraint: Optional[str],
+                 columns: Tuple[str, ...], values: Dict[str, str], message: str):
+        super().__init__(message)
+        self.kind = kind
+        self.table = table
+        self.constraint = constraint
+        self.columns = columns
+        self.values = values
+
+    def on(self, kind: str, *columns: str) -> bool:
+        """True if this is a `kind` violation on exactly these columns."""
+        return self.kind == kind and set(self.columns) == set(columns)
+
+    @classmethod
+    def from_api_error(cls, error: APIError, table: Optional[str] = None) -> Optional["ConstraintViolation"]:
+        """Parse a PostgREST error; None if it is not a constraint violation."""
+        kind = CONSTRAINT_KINDS.get(str(error.code or ""))
+        if kind is None:
+            return None
+        message = str(error.message or error)
+        details = str(getattr(error, "details", None) or "")
+        match = _CONSTRAINT.search(message)
+        constraint = match.group(1) if match else None
+        match = _RELATION.search(message)
+        table = match.group(1) if match else table
+
+        columns, values = (), {}
+        key = _KEY.search(details)
+        if key:
+            columns = tuple(c.strip() for c in key.group(1).split(","))
+            raw = [v.strip() for v in key.group(2).split(",")]
+            if len(raw) == len(columns):
+                values = dict(zip(columns, raw))
+        elif kind == "not_null":
+            match = _COLUMN.search(message)
+            columns = (match.group(1),) if match else ()
+        elif constraint and table:
+            # Postgres names single-column constraints <table>_<column>_check / _fkey
+            match = re.fullmatch(rf"{re.escape(table)}_(\w+)_(?:check|fkey)", constraint)
+            columns = (match.group(1),) if match else ()
+        return cls(kind, table, constraint, columns, values, message)
+
+
+@contextmanager
+def constraint_errors(table: Optional[str] = None):
+    """Re-raise constraint violations from the enclosed writes as ConstraintViolation."""
+    try:
+        yield
+    except APIError as e:
+        violation = ConstraintViolation.from_api_error(e, table)
+        if violation is None:
+            raise
+        raise violation from e
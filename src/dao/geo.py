@@ -0,0 +1,123 @@
+import bisect
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9  # ~5m cells; coarser cells are prefixes of these
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def location_problem(lat: Optional[float], lon: Optional[float]) -> Optional[str]:
+    """Why a latitude/longitude pair is unusable, or None if it is fine (or both are unset)."""
+    if (lat is None) != (lon is None):
+        return "Latitude and longitude must be given together"
+    if lat is not None and not -90 <= lat <= 90:
+        return "Latitude must be between -90 and 90"
+    if lon is not None and not -180 <= lon <= 180:
+        return "Longitude must be between -180 and 180"
+    return None
+
+
+def _spread(x: int) -> int:
+    """Spread the low 32 bits of x so there is a zero bit between each."""
+    x &= 0xFFFFFFFF
+    x = (x | (x << 16)) & 0x0000FFFF0000FFFF
+    x = (x | (x << 8)) & 0x00FF00FF00FF00FF
+    x = (x | (x << 4)) & 0x0F0F0F0F0F0F0F0F
+    x = (x | (x << 2)) & 0x3333333333333333
+    return (x | (x << 1)) & 0x5555555555555555
+
+
+def geohash(lat: float, lon: float, precision: int = PRECISION) -> str:
+    """Standard base-32 geohash of a point."""
+    bits = 5 * precision
+    lon_bits, lat_bits = (bits + 1) // 2, bits // 2
+    # Quantising to the grid gives the same bits as halving the range bit by bit
+    x = min(int((lon + 180) / 360 * (1 << lon_bits)), (1 << lon_bits) - 1)
+    y = min(int((lat + 90) / 180 * (1 << lat_bits)), (1 << lat_bits) - 1)
+    # Longitude takes the first bit, then the two alternate
+    value = _spread(x) | (_spread(y) << 1) if bits % 2 else (_spread(x) << 1) | _spread(y)
+    return "".join(_BASE32[(value >> 5 * (precision - 1 - i)) & 31] for i in range(precision))
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """(lat, lon) extent in degrees of a geohash cell of the given precision."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def covering_cells(lat: float, lon: float, radius_km: float, max_cells: int = 32) -> Optional[Set[str]]:
+    """Geohash cells that together cover the circle around a point.
+
+    Uses the finest precision that needs at most `max_cells` cells; None means
+    the circle is so large (or touches a pole) that every row is a candidate.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = lat - dlat, lat + dlat
+    if south <= -90 or north >= 90:
+        return None
+    dlon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(max(abs(south), abs(north))))))
+    if dlon >= 180:
+        return None
+    for precision in range(PRECISION, 0, -1):
+        cell_lat, cell_lon = _cell_size(precision)
+        rows = math.floor((north + 90) / cell_lat) - math.floor((south + 90) / cell_lat) + 1
+        cols = math.floor((lon + dlon + 180) / cell_lon) - math.floor((lon - dlon + 180) / cell_lon) + 1
+        if rows * cols <= max_cells:
+            break
+    else:
+        return None
+    cells = set()
+    first_row = math.floor((south + 90) / cell_lat)
+    first_col = math.floor((lon - dlon + 180) / cell_lon)
+    for r in range(rows):
+        center_lat = (first_row + r + 0.5) * cell_lat - 90
+        for c in range(cols):
+            # Wrap across the antimeridian
+            center_lon = ((first_col + c + 0.5) * cell_lon) % 360 - 180
+            cells.add(geohash(center_lat, center_lon, precision))
+    return cells
+
+
+class GeohashIndex:
+    """Sorted (geohash, key) pairs; a cell at any precision is one contiguous range."""
+
+    def __init__(self, entries: Iterable[Tuple[str, int]] = ()):
+        self._entries: List[Tuple[str, int]] = sorted(entries)
+        self._hashes: Dict[int, str] = {key: cell for cell, key in self._entries}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: int, lat: float, lon: float):
+        self.remove(key)
+        cell = geohash(lat, lon)
+        bisect.insort(self._entries, (cell, key))
+        self._hashes[key] = cell
+
+    def remove(self, key: int):
+        cell = self._hashes.pop(key, None)
+        if cell is not None:
+            i = bisect.bisect_left(self._entries, (cell, key))
+            if i < len(self._entries) and self._entries[i] == (cell, key):
+                del self._entries[i]
+
+    def within(self, cells: Optional[Set[str]]) -> Iterable[int]:
+        """Keys of every point inside the given cells (all keys when cells is None)."""
+        if cells is None:
+            return list(self._hashes)
+        keys = []
+        for cell in cells:
+            # "~" sorts after every base-32 character, so this spans the whole prefix
+            lo = bisect.bisect_left(self._entries, (cell,))
+            hi = bisect.bisect_left(self._entries, (cell + "~",))
+            keys.extend(key for _, key in self._entries[lo:hi])
+        return keys
@@ -1,14 +1,19 @@
-from typing import List, Dict, Optional
-from src.config import get_supabase
+from typing import Any, List, Dict, Optional, Set
+from src.dao.client import get_client
+from src.dao.singleflight import reads
+from src.dao.errors import constraint_errors
+from src.dao.paging import fetch_page
+from src.dao.columnar import fetch_table
 
 class JobDAO:
     """Data Access Object for job-related database operations."""
     
-    def __init__(self):
-        self.sb = get_supabase()
+    def __init__(self, records: bool = False):
+        self.sb = get_client(records)
     
     def create_job(self, title: str, client_id: int, budget: float, deadline: str, 
-               assigned_to: Optional[int] = None, status: Optional[str] = None) -> Optional[Dict]:
+               assigned_to: Optional[int] = None, status: Optional[str] = None,
+               latitude: Optional[float] = None, longitude: Optional[float] = None) -> Optional[Dict]:
         """Create a new job and return the inserted record."""
         # Insert the new job
         job_data = {
@@ -20,17 +25,53 @@ class JobDAO:
         if assigned_to:
             job_data["assigned_to"] = assigned_to
             job_data["status"] = "assigned"  # Override default only when assigning
+        if latitude is not None:
+            job_data["latitude"] = latitude
+            job_data["longitude"] = longitude
             
-        self.sb.table("jobs").insert(job_data).execute()
-        
-        # Fetch the most recently created job
-        resp = self.sb.table("jobs").select("*").order("job_id", desc=True).limit(1).execute()
+        # The response carries the inserted row
+        with constraint_errors("jobs"):
+            resp = self.sb.table("jobs").insert(job_data).execute()
         return resp.data[0] if resp.data else None
     
     def get_job_by_id(self, job_id: int) -> Optional[Dict]:
         """Retrieve a single job by ID."""
-        resp = self.sb.table("jobs").select("*").eq("job_id", job_id).execute()
-        return resp.data[0] if resp.data else None
+        def fetch():
+            resp = self.sb.table("jobs").select("*").eq("job_id", job_id).execute()
+            return resp.data[0] if resp.data else None
+        return reads.do(("jobs.get_job_by_id", job_id, self.sb.records), fetch)
+    
+    def get_jobs_by_ids(self, job_ids: List[int]) -> List[Dict]:
+        """Retrieve several jobs in a single request."""
+        if not job_ids:
+            return []
+        resp = self.sb.table("jobs").select("*").in_("job_id", job_ids).execute()
+        return resp.data or []
+    
+    def get_jobs_page(self, columns: str = "*", after_id: int = 0, limit: int = 1000,
+                      status: Optional[str] = None, client_id: Optional[int] = None,
+                      assigned_to: Optional[int] = None) -> List[Dict]:
+        """Retrieve one page of jobs ordered by ID, starting after the given ID."""
+        query = self.sb.table("jobs").select(columns).gt("job_id", after_id)
+        if status:
+            query = query.eq("status", status)
+        if client_id is not None:
+            query = query.eq("client_id", client_id)
+        if assigned_to is not None:
+            query = query.eq("assigned_to", assigned_to)
+        resp = query.order("job_id", desc=False).limit(limit).execute()
+        return resp.data or []
+    
+    def get_jobs_due_by(self, deadline: str, statuses: List[str], after_id: int = 0,
+                        limit: int = 1000, since: Optional[str] = None) -> List[Dict]:
+        """Retrieve one page of jobs in the given statuses with a deadline on or before a date
+        (and on or after `since`, when given)."""
+        query = self.sb.table("jobs").select("job_id, title, client_id, assigned_to, status, deadline") \
+            .lte("deadline", deadline).in_("status", statuses).gt("job_id", after_id)
+        if since is not None:
+            query = query.gte("deadline", since)
+        resp = query.order("job_id", desc=False).limit(limit).execute()
+        return resp.data or []
     
     def get_jobs_by_client_id(self, client_id: int) -> List[Dict]:
         """Retrieve all jobs posted by a specific client."""
@@ -50,17 +91,66 @@ class JobDAO:
         resp = self.sb.table("jobs").select("*").eq("assigned_to", freelancer_id).execute()
         return resp.data or []
 
-    def update_job(self, job_id: int, fields: Dict) -> Optional[Dict]:
-        """Update job fields and return the updated record."""
+    def update_job(self, job_id: int, fields: Dict, expect: Optional[Dict] = None) -> Optional[Dict]:
+        """Update job fields and return the updated record.
+        
+        With `expect`, the update only applies while every expected column still
+        holds the given value, in a single request; None means the guard did not
+        match (or the job does not exist).
+        """
+        if expect:
+            query = self.sb.table("jobs").update(fields).eq("job_id", job_id)
+            for column, value in expect.items():
+                query = query.eq(column, value)
+            with constraint_errors("jobs"):
+                resp = query.execute()
+            return resp.data[0] if resp.data else None
+        
         # Update the job
-        self.sb.table("jobs").update(fields).eq("job_id", job_id).execute()
+        with constraint_errors("jobs"):
+            self.sb.table("jobs").update(fields).eq("job_id", job_id).execute()
         
         # Fetch and return updated job
         resp = self.sb.table("jobs").select("*").eq("job_id", job_id).execute()
         return resp.data[0] if resp.data else None
 
-    def delete_job(self, job_id: int) -> Optional[Dict]:
-        """Delete a job and return the deleted record."""
+    def update_jobs(self, job_ids: List[int], fields: Dict, expect: Optional[Dict] = None,
+                    unless: Optional[Dict] = None) -> List[Dict]:
+        """Update several jobs in one request and return the rows that changed.
+        
+        `expect` limits the update to jobs whose columns hold the given values,
+        `unless` skips jobs whose columns already do.
+        """
+        if not job_ids:
+            return []
+        query = self.sb.table("jobs").update(fields).in_("job_id", job_ids)
+        for column, value in (expect or {}).items():
+            query = query.eq(column, value)
+        for column, value in (unless or {}).items():
+            query = query.neq(column, value)
+        with constraint_errors("jobs"):
+            resp = query.execute()
+        return resp.data or []
+
+    def get_user_ids_with_jobs(self, user_ids: List[int], column: str = "client_id") -> Set[int]:
+        """Which of the given users appear in a job's client_id (or assigned_to) column."""
+        if not user_ids:
+            return set()
+        resp = self.sb.table("jobs").select(column).in_(column, user_ids).execute()
+        return {row[column] for row in resp.data or []}
+
+    def delete_job(self, job_id: int, expect_status_in: Optional[List[str]] = None) -> Optional[Dict]:
+        """Delete a job and return the deleted record.
+        
+        With `expect_status_in`, the delete is a single request that only applies
+        while the job is in one of those statuses; None means the guard did not
+        match (or the job does not exist).
+        """
+        if expect_status_in:
+            resp = self.sb.table("jobs").delete().eq("job_id", job_id) \
+                .in_("status", expect_status_in).execute()
+            return resp.data[0] if resp.data else None
+        
         # Get job before deleting
         job = self.get_job_by_id(job_id)
         
@@ -70,10 +160,84 @@ class JobDAO:
         
         return job
 
-    def get_jobs_by_status(self,status: str) ->List[Dict]:
-        return self.sb.table("jobs").select("*").eq("status",status).execute().data
+    def get_active_job_counts(self, freelancer_ids: List[int], chunk_size: int = 500) -> Dict[int, int]:
+        """Number of assigned or in-progress jobs per freelancer, fetched in chunks of IDs."""
+        counts = {freelancer_id: 0 for freelancer_id in freelancer_ids}
+        for i in range(0, len(freelancer_ids), chunk_size):
+            resp = self.sb.table("jobs").select("assigned_to") \
+                .in_("assigned_to", freelancer_ids[i:i + chunk_size]) \
+                .in_("status", ["assigned", "in-progress"]).execute()
+            for row in resp.data or []:
+                counts[row["assigned_to"]] += 1
+        return counts
+
+    def apply_assignments(self, assignments: List[Dict]) -> List[Dict]:
+        """Assign jobs to freelancers by accepted bid in one transaction; returns the applied rows.
+        
+        Each assignment is {job_id, freelancer_id, bid_id}. One that no longer
+        fits (job not open, bid not pending) is left out rather than failing the rest.
+        Each applied row carries the job's other pending bids, now rejected, as
+        `rejected_bids` ({bid_id, job_id, freelancer_id}).
+        """
+        if not assignments:
+            return []
+        resp = self.sb.rpc("apply_assignments", {"p_assignments": assignments}).execute()
+        return resp.data or []
+
+    def get_jobs_by_status(self,status: str, limit: Optional[int] = None) ->List[Dict]:
+        query = self.sb.table("jobs").select("*").eq("status",status).order("job_id", desc=False)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.execute().data
+
+    def search_jobs(self, query: str, status: Optional[str] = None,
+                    min_budget: Optional[float] = None, max_budget: Optional[float] = None,
+                    deadline_from: Optional[str] = None, deadline_to: Optional[str] = None,
+                    after_rank: Optional[float] = None, after_id: Optional[int] = None,
+                    limit: int = 20) -> List[Dict]:
+        """Ranked full-text/fuzzy title search, paged after (after_rank, after_id)."""
+        resp = self.sb.rpc("search_jobs", {
+            "p_query": query,
+            "p_status": status,
+            "p_min_budget": min_budget,
+            "p_max_budget": max_budget,
+            "p_deadline_from": deadline_from,
+            "p_deadline_to": deadline_to,
+            "p_after_rank": after_rank,
+            "p_after_id": after_id,
+            "p_limit": limit
+        }).execute()
+        return resp.data or []
+
+    def find_nearby_jobs(self, latitude: float, longitude: float, radius_km: float,
+                         status: Optional[str] = None, min_budget: Optional[float] = None,
+                         max_budget: Optional[float] = None, after_distance: Optional[float] = None,
+                         after_id: Optional[int] = None, limit: int = 20) -> List[Dict]:
+        """Jobs within radius_km of a point, nearest first, paged after (after_distance, after_id)."""
+        resp = self.sb.rpc("nearby_jobs", {
+            "p_latitude": latitude,
+            "p_longitude": longitude,
+            "p_radius_km": radius_km,
+            "p_status": status,
+            "p_min_budget": min_budget,
+            "p_max_budget": max_budget,
+            "p_after_distance": after_distance,
+            "p_after_id": after_id,
+            "p_limit": limit
+        }).execute()
+        return resp.data or []
 
     def list_jobs(self, limit: int = 100) -> List[Dict]:
         """Retrieve all jobs with optional limit."""
         resp = self.sb.table("jobs").select("*").order("job_id", desc=False).limit(limit).execute()
-        return resp.data or []
\ No newline at end of file
+        return resp.data or []
+
+    def get_jobs_arrow(self, status: Optional[str] = None, columns: Optional[List[str]] = None,
+                       limit: Optional[int] = None) -> Any:
+        """Every job (optionally in one status) as a typed pyarrow.Table, read page by page."""
+        return fetch_table(self.sb, "jobs", {"status": status}, columns, limit)
+
+    def list_jobs_page(self, status: Optional[str] = None, sort: str = "job_id", desc: bool = False,
+                       cursor: Optional[str] = None, limit: int = 25) -> Dict:
+        """Retrieve one sorted page of jobs, optionally filtered by status."""
+        return fetch_page(self.sb, "jobs", {"status": status}, sort, desc, cursor, limit)
\ No newline at end of file
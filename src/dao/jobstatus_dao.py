@@ -1,25 +1,41 @@
-from typing import List, Dict, Optional
-from src.config import get_supabase
+from typing import List, Dict, Optional, Tuple
+from src.dao.client import get_client
+from src.dao.singleflight import reads
+from src.dao.errors import constraint_errors
 
 # ==================== JOB STATUS DAO ====================
 class JobStatusDAO:
     """Data Access Object for job status history tracking."""
     
-    def __init__(self):
-        self.sb = get_supabase()
+    def __init__(self, records: bool = False):
+        self.sb = get_client(records)
     
     def create_job_status(self, job_id: int, status: str) -> Optional[Dict]:
         """Create a new job status record and return it."""
-        # Insert the new status
-        self.sb.table("job_status").insert({
-            "job_id": job_id,
-            "status": status
-        }).execute()
-        
-        # Fetch the most recently created status
-        resp = self.sb.table("job_status").select("*").order("status_id", desc=True).limit(1).execute()
+        # Insert the new status; the response carries the inserted row
+        with constraint_errors("job_status"):
+            resp = self.sb.table("job_status").insert({
+                "job_id": job_id,
+                "status": status
+            }).execute()
         return resp.data[0] if resp.data else None
     
+    def create_job_statuses(self, rows: List[Dict]) -> List[Dict]:
+        """Insert several status records ({job_id, status, updated_at}) in one request."""
+        if not rows:
+            return []
+        with constraint_errors("job_status"):
+            resp = self.sb.table("job_status").insert(rows).execute()
+        return resp.data or []
+    
+    def get_statuses_at(self, job_ids: List[int], timestamps: List[str]) -> List[Dict]:
+        """Status records of the given jobs stamped with any of the given times."""
+        if not job_ids or not timestamps:
+            return []
+        resp = self.sb.table("job_status").select("status_id, job_id, status, updated_at") \
+            .in_("job_id", job_ids).in_("updated_at", timestamps).execute()
+        return resp.data or []
+    
     def get_status_by_id(self, status_id: int) -> Optional[Dict]:
         """Retrieve a single status record by ID."""
         resp = self.sb.table("job_status").select("*").eq("status_id", status_id).execute()
@@ -32,8 +48,10 @@ class JobStatusDAO:
     
     def get_latest_status_by_job_id(self, job_id: int) -> Optional[Dict]:
         """Retrieve the most recent status for a specific job."""
-        resp = self.sb.table("job_status").select("*").eq("job_id", job_id).order("updated_at", desc=True).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        def fetch():
+            resp = self.sb.table("job_status").select("*").eq("job_id", job_id).order("updated_at", desc=True).limit(1).execute()
+            return resp.data[0] if resp.data else None
+        return reads.do(("job_status.get_latest_status_by_job_id", job_id, self.sb.records), fetch)
 
     def delete_status(self, status_id: int) -> Optional[Dict]:
         """Delete a status record and return the deleted record."""
@@ -49,4 +67,47 @@ class JobStatusDAO:
     def list_all_statuses(self, limit: int = 100) -> List[Dict]:
         """Retrieve all status records with optional limit."""
         resp = self.sb.table("job_status").select("*").order("updated_at", desc=False).limit(limit).execute()
-        return resp.data or []
\ No newline at end of file
+        return resp.data or []
+
+    def get_completions_after(self, after: Optional[Tuple[str, int]], before: str, limit: int = 1000) -> List[Dict]:
+        """One page of "completed" status rows updated before `before`, ordered by
+        (updated_at, status_id) and starting after the `after` pair."""
+        query = self.sb.table("job_status").select("status_id, job_id, updated_at").eq("status", "completed") \
+            .lt("updated_at", before)
+        if after:
+            updated_at, status_id = after
+            query = query.or_(f'updated_at.gt."{updated_at}",'
+                              f'and(updated_at.eq."{updated_at}",status_id.gt.{status_id})')
+        resp = query.order("updated_at", desc=False).order("status_id", desc=False).limit(limit).execute()
+        return resp.data or []
+
+    def get_statuses_before(self, job_ids: List[int], before: str, page_size: int = 1000) -> List[Dict]:
+        """Retrieve all status rows of the given jobs last updated before a timestamp."""
+        if not job_ids:
+            return []
+        rows, after_id = [], 0
+        while True:
+            resp = self.sb.table("job_status").select("*").in_("job_id", job_ids).lt("updated_at", before) \
+                .gt("status_id", after_id).order("status_id", desc=False).limit(page_size).execute()
+            page = resp.data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            after_id = page[-1]["status_id"]
+
+    def delete_statuses(self, status_ids: List[int], chunk_size: int = 500) -> int:
+        """Delete status rows by ID in chunks and return how many were removed."""
+        deleted = 0
+        for i in range(0, len(status_ids), chunk_size):
+            resp = self.sb.table("job_status").delete().in_("status_id", status_ids[i:i + chunk_size]).execute()
+            deleted += len(resp.data or [])
+        return deleted
+
+    def maintain_partitions(self, months_ahead: int = 3) -> Dict:
+        """Create upcoming monthly partitions and drop past ones archival has emptied.
+
+        Rows already in the default partition for a new month are moved into it
+        ("moved"); "default_rows" counts the rows left outside every monthly partition.
+        """
+        resp = self.sb.rpc("maintain_job_status_partitions", {"p_months_ahead": months_ahead}).execute()
+        return resp.data or {"created": [], "dropped": [], "moved": {}, "default_rows": 0}
\ No newline at end of file
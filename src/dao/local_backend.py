@@ -0,0 +1,831 @@
+import heapq
+import json
+import os
+import re
+import threading
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+from postgrest.exceptions import APIError
+from src.dao.geo import GeohashIndex, covering_cells, geohash, haversine_km
+from src.dao.text_index import TextIndex
+
+# Mirrors schema.sql: columns, keys, defaults and constraints of each table
+SCHEMA = {
+    "users": {
+        "pk": "user_id",
+        "columns": ["user_id", "name", "email", "phone", "role", "created_at",
+                    "latitude", "longitude", "service_radius_km"],
+        "not_null": ["name", "email", "role"],
+        "defaults": {"created_at": "now"},
+        "checks": {"role": ("client", "freelancer")},
+        "positive": ["service_radius_km"],
+        "ranges": {"latitude": (-90, 90), "longitude": (-180, 180)},
+        "paired": [("latitude", "longitude")],
+        "unique": [("email",)],
+        "references": {}
+    },
+    "jobs": {
+        "pk": "job_id",
+        "columns": ["job_id", "title", "client_id", "assigned_to", "budget", "status", "deadline", "created_at",
+                    "latitude", "longitude"],
+        "not_null": ["title", "client_id", "deadline"],
+        "defaults": {"status": "open", "created_at": "now"},
+        "checks": {"status": ("open", "assigned", "in-progress", "completed")},
+        "positive": ["budget"],
+        "ranges": {"latitude": (-90, 90), "longitude": (-180, 180)},
+        "paired": [("latitude", "longitude")],
+        "spatial": ("latitude", "longitude"),
+        "text": "title",
+        "unique": [("client_id", "title")],
+        "references": {"client_id": ("users", "cascade"), "assigned_to": ("users", "set null")}
+    },
+    "bids": {
+        "pk": "bid_id",
+        "columns": ["bid_id", "job_id", "freelancer_id", "amount", "message", "bid_status", "created_at"],
+        "not_null": ["job_id", "freelancer_id"],
+        "defaults": {"bid_status": "pending", "created_at": "now"},
+        "checks": {"bid_status": ("pending", "accepted", "rejected")},
+        "positive": ["amount"],
+        "unique": [("job_id", "freelancer_id")],
+        "references": {"job_id": ("jobs", "cascade"), "freelancer_id": ("users", "cascade")}
+    },
+    "job_status": {
+        "pk": "status_id",
+        "columns": ["status_id", "job_id", "status", "updated_at"],
+        "not_null": ["job_id", "status"],
+        "defaults": {"updated_at": "now"},
+        "checks": {"status": ("open", "assigned", "in-progress", "completed")},
+        "unique": [],
+        "references": {"job_id": ("jobs", "cascade")}
+    }
+}
+
+_FILTER_OPS = {"eq", "neq", "gt", "gte", "lt", "lte", "in", "is", "like", "ilike"}
+
+
+def _error(code: str, message: str, details: Optional[str] = None) -> APIError:
+    # Same shape PostgREST returns, so callers handle local and remote failures alike
+    return APIError({"code": code, "message": message, "details": details, "hint": None})
+
+
+def _key_details(columns: tuple, row: Dict, suffix: str) -> str:
+    values = ", ".join(str(row.get(c)) for c in columns)
+    return f"Key ({', '.join(columns)})=({values}) {suffix}"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _normalize(value: Any) -> Any:
+    """Convert Python values to the JSON form PostgREST would store and return."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _coerce(row_value: Any, value: Any) -> Any:
+    """Coerce a filter operand to the type of the stored value it is compared with."""
+    value = _normalize(value)
+    if isinstance(value, str) and isinstance(row_value, (int, float)) and not isinstance(row_value, bool):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    if isinstance(value, str) and isinstance(row_value, bool):
+        return value.lower() == "true"
+    return value
+
+
+def _like(pattern: str, flags: int = 0) -> re.Pattern:
+    parts = (re.escape(part) for part in str(pattern).replace("*", "%").split("%"))
+    return re.compile("^" + ".*".join(parts) + "$", flags | re.DOTALL)
+
+
+def _matches(row: Dict, column: str, op: str, value: Any) -> bool:
+    current = row.get(column)
+    if op == "is":
+        wanted = None if str(value).lower() == "null" else str(value).lower() == "true"
+        return current is wanted if wanted is None else current == wanted
+    if op == "in":
+        return any(current == _coerce(current, item) for item in value)
+    if current is None:
+        return False
+    if op in ("like", "ilike"):
+        return bool(_like(value, re.IGNORECASE if op == "ilike" else 0).match(str(current)))
+    value = _coerce(current, value)
+    try:
+        if op == "eq":
+            return current == value
+        if op == "neq":
+            return current != value
+        if op == "gt":
+            return current > value
+        if op == "gte":
+            return current >= value
+        if op == "lt":
+            return current < value
+        return current <= value
+    except TypeError:
+        return False
+
+
+def _csv_field(value: Any) -> str:
+    # Like PostgREST: NULL is an empty field, an empty string is quoted
+    if value is None:
+        return ""
+    text = str(value)
+    if text == "" or any(ch in text for ch in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _to_csv(rows: List[Dict], columns: List[str]) -> str:
+    lines = [",".join(columns)]
+    lines.extend(",".join(_csv_field(row.get(column)) for column in columns) for row in rows)
+    return "\n".join(lines) + "\n"
+
+
+def _split_top_level(text: str) -> List[str]:
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _parse_logic(text: str) -> Callable[[Dict], bool]:
+    """Parse one PostgREST logic-tree term such as `bid_id.gt.5` or `and(a.eq.1,b.in.(2,3))`."""
+    for joiner, combine in (("and(", all), ("or(", any)):
+        if text.startswith(joiner) and text.endswith(")"):
+            terms = [_parse_logic(term) for term in _split_top_level(text[len(joiner):-1])]
+            return lambda row: combine(term(row) for term in terms)
+    column, op, value = text.split(".", 2)
+    if op not in _FILTER_OPS:
+        raise _error("PGRST100", f"Unsupported operator in filter: {text}")
+    if op == "in":
+        value = [item.strip().strip('"') for item in value.strip("()").split(",") if item.strip()]
+    elif len(value) > 1 and value[0] == value[-1] == '"':
+        # Double quotes protect values holding reserved characters such as , . : ( )
+        value = value[1:-1]
+    return lambda row: _matches(row, column, op, value)
+
+
+class LocalResponse:
+    """Result of a local query, shaped like the PostgREST client's response."""
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class LocalQuery:
+    """Query builder over a LocalBackend table covering the PostgREST subset the DAOs use."""
+
+    def __init__(self, backend: "LocalBackend", table: str):
+        if table not in SCHEMA:
+            raise _error("42P01", f'relation "public.{table}" does not exist')
+        self.backend = backend
+        self.table = table
+        self.op = "select"
+        self.payload = None
+        self.columns = None
+        self.count = None
+        self.filters = []
+        self.orders = []
+        self.offset = 0
+        self.max_rows = None
+        self.key_lookup = None
+        self.as_csv = False
+
+    def _check_column(self, column: str):
+        if column not in SCHEMA[self.table]["columns"]:
+            raise _error("42703", f"column {self.table}.{column} does not exist")
+
+    def select(self, *columns: str, count: Optional[str] = None, **kwargs) -> "LocalQuery":
+        spec = ",".join(columns) or "*"
+        if spec.strip() != "*":
+            self.columns = [column.strip() for column in spec.split(",") if column.strip()]
+            for column in self.columns:
+                self._check_column(column)
+        self.count = count
+        return self
+
+    def insert(self, json: Any, **kwargs) -> "LocalQuery":
+        self.op, self.payload = "insert", json
+        return self
+
+    def upsert(self, json: Any, **kwargs) -> "LocalQuery":
+        self.op, self.payload = "upsert", json
+        return self
+
+    def update(self, json: Dict, **kwargs) -> "LocalQuery":
+        self.op, self.payload = "update", json
+        return self
+
+    def delete(self, **kwargs) -> "LocalQuery":
+        self.op = "delete"
+        return self
+
+    def _filter(self, column: str, op: str, value: Any) -> "LocalQuery":
+        self._check_column(column)
+        self.filters.append(lambda row: _matches(row, column, op, value))
+        if op == "eq" and column == SCHEMA[self.table]["pk"] and self.key_lookup is None:
+            # Primary-key lookups skip the table scan
+            self.key_lookup = value
+        return self
+
+    def eq(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "LocalQuery":
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "LocalQuery":
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "LocalQuery":
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: List[Any]) -> "LocalQuery":
+        return self._filter(column, "in", list(values))
+
+    def match(self, query: Dict) -> "LocalQuery":
+        for column, value in query.items():
+            self._filter(column, "eq", value)
+        return self
+
+    def or_(self, filters: str, **kwargs) -> "LocalQuery":
+        terms = [_parse_logic(term) for term in _split_top_level(filters)]
+        self.filters.append(lambda row: any(term(row) for term in terms))
+        return self
+
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None, **kwargs) -> "LocalQuery":
+        self._check_column(column)
+        # Postgres puts NULLs last ascending and first descending unless told otherwise
+        nulls_last = (not desc) if nullsfirst is None else not nullsfirst
+        self.orders.append((column, desc, nulls_last))
+        return self
+
+    def limit(self, size: int, **kwargs) -> "LocalQuery":
+        self.max_rows = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs) -> "LocalQuery":
+        self.offset, self.max_rows = start, end - start + 1
+        return self
+
+    def csv(self) -> "LocalQuery":
+        self.as_csv = True
+        return self
+
+    def execute(self) -> LocalResponse:
+        resp = self.backend.run(self)
+        if self.as_csv:
+            resp.data = _to_csv(resp.data, self.columns or SCHEMA[self.table]["columns"])
+        return resp
+
+
+class LocalRpc:
+    """Pending call to a locally implemented database function."""
+
+    def __init__(self, backend: "LocalBackend", fn: str, params: Dict):
+        self.backend = backend
+        self.fn = fn
+        self.params = params
+
+    def execute(self) -> LocalResponse:
+        function = LOCAL_RPCS.get(self.fn)
+        if function is None:
+            raise _error("PGRST202", f"Could not find the function public.{self.fn} locally")
+        with self.backend.lock:
+            return LocalResponse(function(self.backend, self.params))
+
+
+class LocalBackend:
+    """In-process stand-in for the Supabase backend, persisted to a JSON file.
+
+    Enforces the constraints from schema.sql (checks, uniques, foreign keys and
+    cascades) and raises the same APIError codes PostgREST would. Serial IDs
+    start above `id_floor`, which keeps locally created rows apart from IDs
+    handed out elsewhere.
+
+    With a `log_path`, changes can be made durable with `journal()`, which
+    appends them to a change log instead of rewriting the whole file; every
+    `snapshot_every` entries the file is saved and the log emptied. Loading
+    replays the log over the last saved file.
+    """
+
+    def __init__(self, path: Optional[str] = None, autosave: bool = True, id_floor: int = 0,
+                 log_path: Optional[str] = None, snapshot_every: int = 1000):
+        self.path = path
+        self.autosave = autosave
+        self.id_floor = id_floor
+        self.log_path = log_path
+        self.snapshot_every = snapshot_every
+        self._journaled = 0
+        self.lock = threading.RLock()
+        self.tables = {name: {} for name in SCHEMA}
+        self.sequences = {name: 0 for name in SCHEMA}
+        # (table, unique columns) -> {values: primary key}
+        self.unique = {(name, columns): {} for name in SCHEMA for columns in SCHEMA[name]["unique"]}
+        # table -> geohash grid over its (latitude, longitude) columns
+        self.spatial = {name: GeohashIndex() for name in SCHEMA if "spatial" in SCHEMA[name]}
+        # table -> inverted word and trigram index over its searchable text column
+        self.text = {name: TextIndex() for name in SCHEMA if "text" in SCHEMA[name]}
+        if path and os.path.exists(path):
+            self.load()
+        if log_path and os.path.exists(log_path):
+            self._replay_log()
+
+    # ---- Client interface ----
+    def table(self, table_name: str) -> LocalQuery:
+        return LocalQuery(self, table_name)
+
+    def from_(self, table_name: str) -> LocalQuery:
+        return self.table(table_name)
+
+    def rpc(self, fn: str, params: Optional[Dict] = None, **kwargs) -> LocalRpc:
+        return LocalRpc(self, fn, params or {})
+
+    # ---- Persistence ----
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        with self.lock:
+            for name in SCHEMA:
+                pk = SCHEMA[name]["pk"]
+                columns = SCHEMA[name]["columns"]
+                # Files written before a column existed load with it as null
+                self.tables[name] = {row[pk]: {c: row.get(c) for c in columns} for row in state["tables"].get(name, [])}
+                self.sequences[name] = state.get("sequences", {}).get(name, 0)
+                self._reindex(name)
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            state = {
+                "tables": {name: list(rows.values()) for name, rows in self.tables.items()},
+                "sequences": self.sequences
+            }
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            if self.log_path and os.path.exists(self.log_path):
+                # Everything logged so far is in the file now
+                with open(self.log_path, "w", encoding="utf-8"):
+                    pass
+            self._journaled = 0
+
+    def journal(self, name: str, rows: Optional[List[Dict]] = None, deleted: Optional[List[Any]] = None):
+        """Durably record rows written to (or keys deleted from) a table, by appending to the change log.
+
+        Entries hold the resulting rows rather than the statement, so replaying
+        one twice (e.g. after a crash between a snapshot and emptying the log)
+        changes nothing.
+        """
+        if not self.log_path:
+            self.save()
+            return
+        entry = {"table": name}
+        if rows is not None:
+            entry["rows"] = rows
+        if deleted is not None:
+            entry["deleted"] = deleted
+        with self.lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._journaled += 1
+            if self._journaled >= self.snapshot_every:
+                self.save()
+
+    def _replay_log(self):
+        with open(self.log_path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        pk_of = {name: SCHEMA[name]["pk"] for name in SCHEMA}
+        with self.lock:
+            for entry in entries:
+                name = entry["table"]
+                for row in entry.get("rows", []):
+                    previous = self.tables[name].get(row[pk_of[name]])
+                    if previous is not None:
+                        self._unindex(name, previous)
+                    self.tables[name][row[pk_of[name]]] = row
+                    self._index(name, row)
+                    self.sequences[name] = max(self.sequences[name], row[pk_of[name]])
+                if entry.get("deleted"):
+                    self._delete_rows(name, entry["deleted"])
+            self._journaled = len(entries)
+
+    def replace_table(self, name: str, rows: List[Dict]):
+        """Swap in a fresh copy of a table (e.g. pulled from the primary)."""
+        pk = SCHEMA[name]["pk"]
+        columns = SCHEMA[name]["columns"]
+        with self.lock:
+            self.tables[name] = {row[pk]: {c: _normalize(row.get(c)) for c in columns} for row in rows}
+            self.sequences[name] = max(self.tables[name], default=0)
+            self._reindex(name)
+
+    # ---- Unique, spatial and text indexes ----
+    def _reindex(self, name: str):
+        for columns in SCHEMA[name]["unique"]:
+            self.unique[(name, columns)] = {}
+        for row in self.tables[name].values():
+            for columns in SCHEMA[name]["unique"]:
+                key = tuple(row.get(c) for c in columns)
+                if None not in key:
+                    self.unique[(name, columns)][key] = row[SCHEMA[name]["pk"]]
+        if name in self.spatial:
+            # Built in one sort rather than row by row
+            lat, lon = SCHEMA[name]["spatial"]
+            self.spatial[name] = GeohashIndex(
+                (geohash(row[lat], row[lon]), key) for key, row in self.tables[name].items()
+                if row.get(lat) is not None and row.get(lon) is not None
+            )
+        if name in self.text:
+            column = SCHEMA[name]["text"]
+            self.text[name] = TextIndex((key, row.get(column)) for key, row in self.tables[name].items())
+
+    def _index(self, name: str, row: Dict):
+        for columns in SCHEMA[name]["unique"]:
+            key = tuple(row.get(c) for c in columns)
+            if None not in key:
+                self.unique[(name, columns)][key] = row[SCHEMA[name]["pk"]]
+        if name in self.spatial:
+            lat, lon = SCHEMA[name]["spatial"]
+            if row.get(lat) is not None and row.get(lon) is not None:
+                self.spatial[name].add(row[SCHEMA[name]["pk"]], float(row[lat]), float(row[lon]))
+        if name in self.text:
+            self.text[name].add(row[SCHEMA[name]["pk"]], row.get(SCHEMA[name]["text"]))
+
+    def _unindex(self, name: str, row: Dict):
+        for columns in SCHEMA[name]["unique"]:
+            index = self.unique[(name, columns)]
+            key = tuple(row.get(c) for c in columns)
+            if index.get(key) == row[SCHEMA[name]["pk"]]:
+                del index[key]
+        if name in self.spatial:
+            self.spatial[name].remove(row[SCHEMA[name]["pk"]])
+        if name in self.text:
+            self.text[name].remove(row[SCHEMA[name]["pk"]])
+
+    # ---- Execution ----
+    def _next_id(self, name: str) -> int:
+        current = max(self.sequences[name], self.id_floor)
+        self.sequences[name] = current + 1
+        return current + 1
+
+    def _candidates(self, query: LocalQuery) -> List[Dict]:
+        rows = self.tables[query.table]
+        scan = rows.values()
+        if query.key_lookup is not None:
+            try:
+                row = rows.get(int(query.key_lookup))
+                scan = [row] if row is not None else []
+            except (TypeError, ValueError):
+                pass
+        return [row for row in scan if all(f(row) for f in query.filters)]
+
+    def _check_row(self, name: str, row: Dict):
+        spec = SCHEMA[name]
+        for column in spec["not_null"]:
+            if row.get(column) is None:
+                raise _error("23502", f'null value in column "{column}" of relation "{name}" violates not-null constraint')
+        for column, allowed in spec["checks"].items():
+            if row.get(column) is not None and row[column] not in allowed:
+                raise _error("23514", f'new row for relation "{name}" violates check constraint "{name}_{column}_check"')
+        for column in spec.get("positive", []):
+            if row.get(column) is not None and float(row[column]) <= 0:
+                raise _error("23514", f'new row for relation "{name}" violates check constraint "{name}_{column}_check"')
+        for column, (low, high) in spec.get("ranges", {}).items():
+            if row.get(column) is not None and not low <= float(row[column]) <= high:
+                raise _error("23514", f'new row for relation "{name}" violates check constraint "{name}_{column}_check"')
+        for columns in spec.get("paired", []):
+            if len({row.get(c) is None for c in columns}) > 1:
+                raise _error("23514", f'new row for relation "{name}" violates check constraint "{name}_location_check"')
+        for columns in spec["unique"]:
+            owner = self.unique[(name, columns)].get(tuple(row.get(c) for c in columns))
+            if owner is not None and owner != row[spec["pk"]]:
+                raise _error("23505", f'duplicate key value violates unique constraint "{name}_{"_".join(columns)}_key"',
+                             _key_details(columns, row, "already exists."))
+        for column, (parent, _) in spec["references"].items():
+            if row.get(column) is not None and row[column] not in self.tables[parent]:
+                raise _error("23503", f'insert or update on table "{name}" violates foreign key constraint "{name}_{column}_fkey"',
+                             _key_details((column,), row, f'is not present in table "{parent}".'))
+
+    def _prepare(self, name: str, values: Dict) -> Dict:
+        spec = SCHEMA[name]
+        for column in values:
+            if column not in spec["columns"]:
+                raise _error("PGRST204", f"Could not find the '{column}' column of '{name}' in the schema cache")
+        row = {column: _normalize(values.get(column)) for column in spec["columns"]}
+        for column, default in spec["defaults"].items():
+            if column not in values:
+                row[column] = _now() if default == "now" else default
+        if values.get(spec["pk"]) is None:
+            row[spec["pk"]] = self._next_id(name)
+        else:
+            self.sequences[name] = max(self.sequences[name], row[spec["pk"]])
+        return row
+
+    def _delete_rows(self, name: str, keys: List[Any]):
+        """Delete rows and apply the foreign-key actions of tables referencing them."""
+        rows = self.tables[name]
+        for key in keys:
+            row = rows.pop(key, None)
+            if row is not None:
+                self._unindex(name, row)
+        gone = set(keys)
+        for child, spec in SCHEMA.items():
+            for column, (parent, action) in spec["references"].items():
+                if parent != name:
+                    continue
+                hit = [row for row in self.tables[child].values() if row.get(column) in gone]
+                if action == "cascade":
+                    self._delete_rows(child, [row[spec["pk"]] for row in hit])
+                else:
+                    for row in hit:
+                        row[column] = None
+
+    def _project(self, query: LocalQuery, rows: List[Dict]) -> List[Dict]:
+        if query.columns is None:
+            return [dict(row) for row in rows]
+        return [{c: row.get(c) for c in query.columns} for row in rows]
+
+    def run(self, query: LocalQuery) -> LocalResponse:
+        name = query.table
+        pk = SCHEMA[name]["pk"]
+        with self.lock:
+            if query.op == "select":
+                rows = self._candidates(query)
+                count = len(rows) if query.count else None
+                for column, desc, nulls_last in reversed(query.orders):
+                    null_rank = int(nulls_last != desc)
+                    rows.sort(key=lambda row: (null_rank, 0) if row.get(column) is None
+                              else (1 - null_rank, row.get(column)), reverse=desc)
+                rows = rows[query.offset:]
+                if query.max_rows is not None:
+                    rows = rows[:query.max_rows]
+                return LocalResponse(self._project(query, rows), count)
+
+            if query.op in ("insert", "upsert"):
+                payload = query.payload if isinstance(query.payload, list) else [query.payload]
+                staged = []
+                for values in payload:
+                    if query.op == "upsert" and values.get(pk) in self.tables[name]:
+                        row = dict(self.tables[name][values[pk]], **{k: _normalize(v) for k, v in values.items()})
+                    else:
+                        row = self._prepare(name, values)
+                    staged.append(row)
+                # Check everything before changing anything, so a bad row fails the whole statement
+                for i, row in enumerate(staged):
+                    self._check_row(name, row)
+                    for other in staged[:i]:
+                        for columns in SCHEMA[name]["unique"] + [(pk,)]:
+                            if all(row.get(c) is not None and row.get(c) == other.get(c) for c in columns):
+                                raise _error("23505", f'duplicate key value violates unique constraint "{name}_{"_".join(columns)}_key"',
+                                             _key_details(columns, row, "already exists."))
+                for row in staged:
+                    previous = self.tables[name].get(row[pk])
+                    if previous is not None:
+                        self._unindex(name, previous)
+                    self.tables[name][row[pk]] = row
+                    self._index(name, row)
+                self._saved()
+                return LocalResponse(self._project(query, staged))
+
+            rows = self._candidates(query)
+            if query.op == "update":
+                for column in query.payload:
+                    if column not in SCHEMA[name]["columns"]:
+                        raise _error("PGRST204", f"Could not find the '{column}' column of '{name}' in the schema cache")
+                changes = {column: _normalize(value) for column, value in query.payload.items()}
+                updated = [dict(row, **changes) for row in rows]
+                for row in updated:
+                    self._check_row(name, row)
+                # Rows updated together must not collide with each other either
+                for columns in SCHEMA[name]["unique"]:
+                    keys = [tuple(row.get(c) for c in columns) for row in updated]
+                    if len(set(keys)) < len(keys):
+                        duplicate = next(row for i, row in enumerate(updated) if keys[i] in keys[:i])
+                        raise _error("23505", f'duplicate key value violates unique constraint "{name}_{"_".join(columns)}_key"',
+                                     _key_details(columns, duplicate, "already exists."))
+                for before, after in zip(rows, updated):
+                    self._unindex(name, before)
+                    self.tables[name][after[pk]] = after
+                    self._index(name, after)
+                self._saved()
+                return LocalResponse(self._project(query, updated))
+
+            # delete
+            self._delete_rows(name, [row[pk] for row in rows])
+            self._saved()
+            return LocalResponse(self._project(query, rows))
+
+    def _saved(self):
+        if self.autosave:
+            self.save()
+
+
+# ---- Local versions of the database functions in migrations/ ----
+
+def _search_jobs(backend: LocalBackend, params: Dict) -> List[Dict]:
+    """Token and fuzzy title match standing in for the full-text search_jobs function.
+
+    Only jobs the title index matches are scored: prefix word hits plus pg_trgm-style similarity.
+    """
+    raw = (params.get("p_query") or "").strip()
+    jobs = backend.tables["jobs"]
+    ranks = backend.text["jobs"].search(raw) if raw else None
+    results = []
+    for job in (jobs.values() if ranks is None else (jobs[key] for key in ranks)):
+        if params.get("p_status") and job["status"] != params["p_status"]:
+            continue
+        budget = job.get("budget")
+        if params.get("p_min_budget") is not None and (budget is None or budget < float(params["p_min_budget"])):
+            continue
+        if params.get("p_max_budget") is not None and (budget is None or budget > float(params["p_max_budget"])):
+            continue
+        if params.get("p_deadline_from") and job["deadline"] < str(params["p_deadline_from"]):
+            continue
+        if params.get("p_deadline_to") and job["deadline"] > str(params["p_deadline_to"]):
+            continue
+        results.append(dict(job, rank=0.0 if ranks is None else ranks[job["job_id"]]))
+    results.sort(key=lambda row: (-row["rank"], row["job_id"]))
+    after_id = params.get("p_after_id")
+    if after_id is not None:
+        after_rank = float(params.get("p_after_rank") or 0)
+        results = [row for row in results
+                   if row["rank"] < after_rank or (row["rank"] == after_rank and row["job_id"] > after_id)]
+    return results[:params.get("p_limit") or 20]
+
+
+def _user_dashboard(backend: LocalBackend, params: Dict) -> Optional[Dict]:
+    """The user_dashboard payload: the user, their jobs with bid counts, and their bids."""
+    user_id = params.get("p_user_id")
+    user = backend.tables["users"].get(user_id)
+    if user is None:
+        return None
+    jobs = backend.tables["jobs"]
+    my_jobs = [job for job in jobs.values() if user_id in (job["client_id"], job.get("assigned_to"))]
+    my_bids = [bid for bid in backend.tables["bids"].values() if bid["freelancer_id"] == user_id]
+    job_ids = {job["job_id"] for job in my_jobs} | {bid["job_id"] for bid in my_bids}
+
+    latest = {}
+    for status in backend.tables["job_status"].values():
+        if status["job_id"] in job_ids:
+            current = latest.get(status["job_id"])
+            key = (status.get("updated_at") or "", status["status_id"])
+            if current is None or key > (current.get("updated_at") or "", current["status_id"]):
+                latest[status["job_id"]] = status
+    counts = {}
+    for bid in backend.tables["bids"].values():
+        if bid["job_id"] in job_ids:
+            count = counts.setdefault(bid["job_id"], {"bid_count": 0, "pending_bids": 0, "lowest_pending_bid": None})
+            count["bid_count"] += 1
+            if bid.get("bid_status") == "pending":
+                count["pending_bids"] += 1
+                if count["lowest_pending_bid"] is None or bid["amount"] < count["lowest_pending_bid"]:
+                    count["lowest_pending_bid"] = bid["amount"]
+
+    def status_of(job_id):
+        status = latest.get(job_id) or {}
+        return {"latest_status": status.get("status"), "latest_status_at": status.get("updated_at")}
+
+    empty = {"bid_count": 0, "pending_bids": 0, "lowest_pending_bid": None}
+    return {
+        "user": dict(user),
+        "jobs": [dict(job, **counts.get(job["job_id"], empty), **status_of(job["job_id"]))
+                 for job in sorted(my_jobs, key=lambda job: (job["deadline"], job["job_id"]))],
+        "bids": [dict(bid, job_title=jobs[bid["job_id"]]["title"], job_status=jobs[bid["job_id"]]["status"],
+                      job_deadline=jobs[bid["job_id"]]["deadline"], **status_of(bid["job_id"]))
+                 for bid in sorted(my_bids, key=lambda bid: (bid.get("created_at") or "", bid["bid_id"]), reverse=True)]
+    }
+
+
+def _auction_candidates(backend: LocalBackend, params: Dict) -> List[Dict]:
+    """Open jobs due for resolution, each with its lowest pending bid."""
+    deadline_before = params.get("p_deadline_before")
+    min_bids = params.get("p_min_bids")
+    after_id = params.get("p_after_job_id") or 0
+    pending = {}
+    for bid in backend.tables["bids"].values():
+        if bid.get("bid_status") == "pending":
+            pending.setdefault(bid["job_id"], []).append(bid)
+    results = []
+    for job_id in sorted(pending):
+        job = backend.tables["jobs"].get(job_id)
+        if job is None or job["status"] != "open" or job_id <= after_id:
+            continue
+        bids = pending[job_id]
+        if not ((deadline_before is not None and job["deadline"] <= str(deadline_before))
+                or (min_bids is not None and len(bids) >= min_bids)):
+            continue
+        lowest = min(bids, key=lambda bid: (bid.get("amount") is None, bid.get("amount") or 0, bid["bid_id"]))
+        results.append({
+            "job_id": job_id, "title": job["title"], "client_id": job["client_id"], "deadline": job["deadline"],
+            "pending_bids": len(bids), "bid_id": lowest["bid_id"], "freelancer_id": lowest["freelancer_id"],
+            "amount": lowest.get("amount")
+        })
+    return results[:params.get("p_limit") or 100]
+
+
+def _nearby_jobs(backend: LocalBackend, params: Dict) -> List[Dict]:
+    """Jobs within a radius of a point, nearest first, found through the geohash grid."""
+    lat, lon = float(params["p_latitude"]), float(params["p_longitude"])
+    radius = float(params["p_radius_km"])
+    after_distance, after_id = params.get("p_after_distance"), params.get("p_after_id")
+    jobs = backend.tables["jobs"]
+    matches = []
+    for job_id in backend.spatial["jobs"].within(covering_cells(lat, lon, radius)):
+        job = jobs[job_id]
+        if params.get("p_status") and job["status"] != params["p_status"]:
+            continue
+        budget = job.get("budget")
+        if params.get("p_min_budget") is not None and (budget is None or budget < float(params["p_min_budget"])):
+            continue
+        if params.get("p_max_budget") is not None and (budget is None or budget > float(params["p_max_budget"])):
+            continue
+        distance = haversine_km(lat, lon, float(job["latitude"]), float(job["longitude"]))
+        if distance > radius:
+            continue
+        if after_id is not None and (distance, job_id) <= (float(after_distance), after_id):
+            continue
+        matches.append((distance, job_id))
+    # Only the page is sorted out of the matches and copied
+    return [dict(jobs[job_id], distance_km=distance)
+            for distance, job_id in heapq.nsmallest(params.get("p_limit") or 20, matches)]
+
+
+def _apply_assignments(backend: LocalBackend, params: Dict) -> List[Dict]:
+    """Assign jobs by accepted bid, reject the other pending bids and record the status, all under one lock."""
+    jobs, bids = backend.tables["jobs"], backend.tables["bids"]
+    applied = []
+    for item in params.get("p_assignments") or []:
+        job, bid = jobs.get(item["job_id"]), bids.get(item["bid_id"])
+        if (job is None or job["status"] != "open" or bid is None or bid["bid_status"] != "pending"
+                or bid["job_id"] != job["job_id"] or bid["freelancer_id"] != item["freelancer_id"]):
+            continue
+        job.update(assigned_to=bid["freelancer_id"], status="assigned")
+        rejected = []
+        for other in sorted(bids.values(), key=lambda row: row["bid_id"]):
+            if other["job_id"] == job["job_id"] and other["bid_status"] == "pending":
+                other["bid_status"] = "accepted" if other["bid_id"] == bid["bid_id"] else "rejected"
+                if other["bid_status"] == "rejected":
+                    rejected.append({key: other[key] for key in ("bid_id", "job_id", "freelancer_id")})
+        status = backend._prepare("job_status", {"job_id": job["job_id"], "status": "assigned"})
+        backend.tables["job_status"][status["status_id"]] = status
+        applied.append({"job_id": job["job_id"], "freelancer_id": bid["freelancer_id"],
+                        "bid_id": bid["bid_id"], "amount": bid["amount"], "rejected_bids": rejected})
+    backend._saved()
+    return sorted(applied, key=lambda row: row["job_id"])
+
+
+def _maintain_job_status_partitions(backend: LocalBackend, params: Dict) -> Dict:
+    """The local job_status table is not partitioned, so there is never anything to do."""
+    return {"created": [], "dropped": [], "moved": {}, "default_rows": 0}
+
+
+LOCAL_RPCS = {
+    "search_jobs": _search_jobs,
+    "user_dashboard": _user_dashboard,
+    "auction_candidates": _auction_candidates,
+    "nearby_jobs": _nearby_jobs,
+    "apply_assignments": _apply_assignments,
+    "maintain_job_status_partitions": _maintain_job_status_partitions
+}
+
+# Functions that change rows; the offline write queue cannot replay these
+WRITE_RPCS = {"apply_assignments"}
\ No newline at end of file
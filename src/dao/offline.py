@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from src.dao.local_backend import LocalBackend, LocalQuery, SCHEMA, WRITE_RPCS, _error
+
+# Rows created offline get IDs from here up, well above anything the primary
+# hands out, so they sort as newest locally and are easy to remap on sync
+TEMP_ID_BASE = 1_000_000_000
+_WRITE_STEPS = {"insert", "upsert", "update", "delete"}
+
+
+def is_temp_id(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > TEMP_ID_BASE
+
+
+class OpQueue:
+    """Durable, append-only queue of write operations stored as JSON lines."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def append(self, op: Dict):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(op, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def load(self) -> List[Dict]:
+        with self._lock:
+            if not os.path.exists(self.path):
+                return []
+            with open(self.path, "r", encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+
+    def replace(self, ops: List[Dict]):
+        """Atomically rewrite the queue, e.g. with the operations still left after a sync."""
+        with self._lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for op in ops:
+                    f.write(json.dumps(op, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+
+class OfflineQuery:
+    """Builder chain for the offline backend: runs on the local replica and queues writes."""
+
+    def __init__(self, backend: "OfflineBackend", table: str, steps: tuple = ()):
+        self._backend = backend
+        self._table = table
+        self._steps = steps
+
+    def __getattr__(self, name: str):
+        # Only builder methods the local backend supports, so feature checks see the truth
+        if name.startswith("_") or not hasattr(LocalQuery, name):
+            raise AttributeError(name)
+
+        def step(*args, **kwargs):
+            return OfflineQuery(self._backend, self._table, self._steps + ((name, args, kwargs),))
+        return step
+
+    def execute(self):
+        return self._backend.run(self._table, self._steps)
+
+
+class OfflineBackend:
+    """Client for offline mode: reads and writes hit the local replica at local latency.
+
+    Each successful local write is also appended to the durable queue, in
+    order, so SyncService can replay it on the primary once it is reachable,
+    and to the replica's change log (see LocalBackend.journal), so a write
+    costs two appends rather than a rewrite of the whole replica.
+    """
+
+    def __init__(self, replica: LocalBackend, queue: OpQueue):
+        self.replica = replica
+        self.queue = queue
+        self._lock = threading.Lock()
+
+    def table(self, table_name: str) -> OfflineQuery:
+        return OfflineQuery(self, table_name)
+
+    def rpc(self, fn: str, params: Optional[Dict] = None, **kwargs):
+        if fn in WRITE_RPCS:
+            raise _error("0A000", f"{fn} changes rows on the primary and is not available offline; sync and retry online")
+        return self.replica.rpc(fn, params, **kwargs)
+
+    def run(self, table: str, steps: tuple):
+        query = self.replica.table(table)
+        for name, args, kwargs in steps:
+            query = getattr(query, name)(*args, **kwargs)
+        if not any(name in _WRITE_STEPS for name, _, _ in steps):
+            return query.execute()
+
+        # One write at a time keeps the queue in the order writes were applied
+        with self._lock, self.replica.lock:
+            resp = query.execute()
+            pk = SCHEMA[table]["pk"]
+            op = {
+                "table": table,
+                "steps": [[name, list(args), kwargs] for name, args, kwargs in steps],
+                "affected": len(resp.data or []),
+                "queued_at": time.time()
+            }
+            if query.op in ("insert", "upsert"):
+                op["temp_ids"] = [row[pk] for row in resp.data]
+            # Queue first: a crash before the replica change is logged loses nothing the primary needs
+            self.queue.append(op)
+            keys = [row[pk] for row in resp.data or [] if pk in row]
+            if len(keys) < len(resp.data or []):
+                # A projection left the key out, so the change cannot be logged by row
+                self.replica.save()
+            elif query.op == "delete":
+                self.replica.journal(table, deleted=keys)
+            else:
+                rows = self.replica.tables[table]
+                self.replica.journal(table, rows=[rows[key] for key in keys if key in rows])
+        return resp
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_local_store(mode: str, directory: str) -> Any:
+    """Return the process-wide local backend for "local" or "offline" mode.
+
+    "local" is a standalone database file. "offline" is a replica of the primary
+    plus the write queue that `freelance-cli sync` replays.
+    """
+    with _stores_lock:
+        key = (mode, os.path.abspath(directory))
+        if key not in _stores:
+            if mode == "local":
+                _stores[key] = LocalBackend(os.path.join(directory, "local.json"))
+            elif mode == "offline":
+                replica = LocalBackend(os.path.join(directory, "replica.json"), autosave=False,
+                                       id_floor=TEMP_ID_BASE, log_path=os.path.join(directory, "replica.log.jsonl"))
+                _stores[key] = OfflineBackend(replica, OpQueue(os.path.join(directory, "queue.jsonl")))
+            else:
+                raise ValueError(f"Unknown local backend mode: {mode}")
+        return _stores[key]
@@ -0,0 +1,129 @@
+import base64
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from src.dao.local_backend import SCHEMA
+
+# Columns each table can be sorted on; all are backed by an index (see migrations/004)
+SORTABLE = {
+    "users": ("user_id", "created_at"),
+    "jobs": ("job_id", "deadline", "budget", "created_at"),
+    "bids": ("bid_id", "amount", "created_at")
+}
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="page-prefetch")
+
+
+def encode_cursor(sort_value: Any, key: int) -> str:
+    """Opaque cursor for the row after which the next page starts."""
+    raw = json.dumps([sort_value, key], default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, key = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(key, int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return sort_value, key
+
+
+def _after(sort: str, pk: str, sort_value: Any, key: int, desc: bool) -> str:
+    """PostgREST or-filter for rows after (sort_value, key) with NULLs sorted last."""
+    op = "lt" if desc else "gt"
+    if sort_value is None:
+        return f"and({sort}.is.null,{pk}.{op}.{key})"
+    return f"{sort}.{op}.{sort_value},{sort}.is.null,and({sort}.eq.{sort_value},{pk}.{op}.{key})"
+
+
+def fetch_page(sb: Any, table: str, filters: Dict[str, Any], sort: str, desc: bool = False,
+               cursor: Optional[str] = None, limit: int = 25) -> Dict:
+    """Fetch one keyset-paged page of a table.
+
+    Rows are ordered by `sort` then the primary key, and the page starts after
+    the row the cursor points at, so any page costs the same as the first.
+    Only the first page asks for an (estimated) total row count.
+    """
+    pk = SCHEMA[table]["pk"]
+    query = sb.table(table).select("*") if cursor else sb.table(table).select("*", count="estimated")
+    for column, value in filters.items():
+        if value is not None:
+            query = query.eq(column, value)
+    if cursor:
+        sort_value, key = decode_cursor(cursor)
+        if sort == pk:
+            query = query.lt(pk, key) if desc else query.gt(pk, key)
+        else:
+            query = query.or_(_after(sort, pk, sort_value, key, desc))
+    if sort != pk:
+        query = query.order(sort, desc=desc, nullsfirst=False)
+    # One extra row tells whether there is a next page
+    resp = query.order(pk, desc=desc).limit(limit + 1).execute()
+    rows = resp.data or []
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1][sort], page[-1][pk]) if len(rows) > limit else None
+    return {"rows": page, "next_cursor": next_cursor, "total_estimate": None if cursor else resp.count}
+
+
+class PagePrefetcher:
+    """Serves pages for one paged view and loads the following page in the background.
+
+    At most one prefetched page is held, and it is dropped once it is older than
+    `max_age` seconds, so a view never keeps more than the next page in memory.
+    """
+
+    def __init__(self, max_age: float = 30):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pending = None  # (key, submitted_at, future)
+
+    def _fresh(self, key: Any):
+        pending = self._pending
+        if pending is not None and pending[0] == key and time.monotonic() - pending[1] < self.max_age:
+            return pending
+        return None
+
+    def page(self, key: Any, fetch: Callable[[], Dict]) -> Dict:
+        with self._lock:
+            pending = self._fresh(key)
+            if pending is not None:
+                self._pending = None
+        return pending[2].result() if pending is not None else fetch()
+
+    def prefetch(self, key: Any, fetch: Callable[[], Dict]):
+        with self._lock:
+            if self._fresh(key) is None:
+                self._pending = (key, time.monotonic(), _executor.submit(fetch))
+
+
+def id_batches(pk: str, ids: Optional[List[int]], by_ids: Callable[[List[int]], List[Dict]],
+               page: Callable[[int, int], List[Dict]], batch_size: int = 500,
+               limit: Optional[int] = None) -> Iterator[Tuple[List[int], Dict[int, Dict]]]:
+    """Walk the targets of a bulk operation in batches: the listed IDs, or every row a filter matches.
+
+    Yields (IDs in the batch, {id: row}); listed IDs that do not exist are
+    missing from the rows. Filtered rows are paged by primary key with
+    `page(after_id, size)`, so the caller may change them between batches.
+    """
+    if ids is not None:
+        ids = list(dict.fromkeys(ids))[:limit]
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            yield batch, {row[pk]: row for row in by_ids(batch)}
+        return
+    after_id, seen = 0, 0
+    while limit is None or seen < limit:
+        size = batch_size if limit is None else min(batch_size, limit - seen)
+        rows = page(after_id, size)
+        if rows:
+            yield [row[pk] for row in rows], {row[pk]: row for row in rows}
+        seen += len(rows)
+        if len(rows) < size:
+            return
+        after_id = rows[-1][pk]
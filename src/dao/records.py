@@ -0,0 +1,104 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, Optional
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    # str() first so floats like 0.1 keep their JSON spelling instead of binary noise
+    return None if value is None else Decimal(str(value))
+
+
+def _date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+def _datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+class Record:
+    """Compact, slotted row with typed fields and read access like the dict rows it replaces.
+
+    Subclasses list their columns in __slots__ and map the ones that need
+    parsing in _parsers. Columns the row did not carry (e.g. left out of a
+    select) stay unset, so reading them fails and `in` is False, as with a dict.
+    """
+
+    __slots__ = ()
+    _parsers: Dict[str, Any] = {}
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "Record":
+        """Build a record from one response row."""
+        record = object.__new__(cls)
+        parsers = cls._parsers
+        for name in cls.__slots__:
+            if name in row:
+                value = row[name]
+                parser = parsers.get(name)
+                setattr(record, name, value if value is None or parser is None else parser(value))
+        return record
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and hasattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def keys(self):
+        return [name for name in self.__slots__ if hasattr(self, name)]
+
+    def to_dict(self) -> Dict:
+        """Plain dict view for JSON output."""
+        return {name: getattr(self, name) for name in self.keys()}
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.to_dict().items())
+        return f"{type(self).__name__}({fields})"
+
+
+class User(Record):
+    __slots__ = ("user_id", "name", "email", "phone", "role", "created_at")
+    _parsers = {"created_at": _datetime}
+
+
+class Job(Record):
+    __slots__ = ("job_id", "title", "client_id", "assigned_to", "budget", "status", "deadline", "created_at")
+    _parsers = {"budget": _decimal, "deadline": _date, "created_at": _datetime}
+
+
+class Bid(Record):
+    __slots__ = ("bid_id", "job_id", "freelancer_id", "amount", "message", "bid_status", "created_at")
+    _parsers = {"amount": _decimal, "created_at": _datetime}
+
+
+class JobStatus(Record):
+    __slots__ = ("status_id", "job_id", "status", "updated_at")
+    _parsers = {"updated_at": _datetime}
+
+
+# Record type for each table, used by DAOs running in record mode
+RECORD_TYPES = {
+    "users": User,
+    "jobs": Job,
+    "bids": Bid,
+    "job_status": JobStatus
+}
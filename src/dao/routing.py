@@ -0,0 +1,129 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from src.dao.transport import is_transient
+
+# Columns used for point lookups on each table; an empty answer from a replica
+# for one of these may just be replication lag, so it is re-read on the primary
+POINT_LOOKUP_COLUMNS = {
+    "users": {"user_id", "email"},
+    "jobs": {"job_id"},
+    "bids": {"bid_id"},
+    "job_status": {"status_id", "job_id"}
+}
+
+
+class Replica:
+    """One read endpoint with its own connection pool, taken out of rotation after transient errors."""
+
+    def __init__(self, name: str, pool: Any, cooldown: float = 30.0):
+        self.name = name
+        self.pool = pool
+        self.cooldown = cooldown
+        self._down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def mark_down(self):
+        self._down_until = time.monotonic() + self.cooldown
+
+
+class ReadRouter:
+    """Sends reads to replicas and writes to the primary, with read-your-writes.
+
+    After a session writes, its reads stay on the primary for `ryw_window`
+    seconds so it sees its own changes despite replica lag. A session is the
+    calling thread unless `session_key` is replaced (the Streamlit app keys it
+    by browser session). pin_primary() forces primary reads for a block
+    regardless of the window.
+    """
+
+    def __init__(self, primary: Any, replicas: List[Replica], ryw_window: float = 5.0,
+                 session_key: Callable[[], Hashable] = threading.get_ident):
+        self.primary = primary
+        self.replicas = replicas
+        self.ryw_window = ryw_window
+        self.session_key = session_key
+        self._next = itertools.count()
+        self._local = threading.local()
+        self._last_writes = {}
+        self._lock = threading.Lock()
+        self._counts = {"primary_reads": 0, "replica_reads": 0, "ryw_reads": 0,
+                        "error_fallbacks": 0, "lag_fallbacks": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def note_write(self):
+        """Start (or extend) the current session's read-your-writes window."""
+        now = time.monotonic()
+        with self._lock:
+            self._last_writes[self.session_key()] = now
+            if len(self._last_writes) > 1000:
+                # Forget sessions whose window has long passed
+                self._last_writes = {key: at for key, at in self._last_writes.items()
+                                     if now - at < self.ryw_window}
+
+    def pinned(self) -> bool:
+        """True while the current session's reads must go to the primary."""
+        if getattr(self._local, "pins", 0):
+            return True
+        with self._lock:
+            last_write = self._last_writes.get(self.session_key())
+        return last_write is not None and time.monotonic() - last_write < self.ryw_window
+
+    def scope(self) -> str:
+        """Which endpoint the current session's reads would use; keeps coalesced reads from crossing it."""
+        return "primary" if self.pinned() or not self.replicas else "replica"
+
+    @contextmanager
+    def pin_primary(self):
+        """Route every read made by this thread inside the block to the primary."""
+        self._local.pins = getattr(self._local, "pins", 0) + 1
+        try:
+            yield
+        finally:
+            self._local.pins -= 1
+
+    def choose(self, is_read: bool) -> Optional[Replica]:
+        """Pick the replica for a request, or None for the primary. Call from the caller's thread."""
+        if not is_read:
+            return None
+        if self.pinned():
+            self._count("ryw_reads")
+            return None
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            self._count("primary_reads")
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    def read(self, query: Any, replica: Optional[Replica]) -> Any:
+        """Run a read on the chosen replica, falling back to the primary on errors or lag."""
+        if replica is None:
+            return query.execute_on(self.primary)
+        try:
+            resp = query.execute_on(replica.pool)
+        except Exception as e:
+            if not is_transient(e):
+                raise
+            replica.mark_down()
+            self._count("error_fallbacks")
+            return query.execute_on(self.primary)
+        if not resp.data and query.is_point_lookup(POINT_LOOKUP_COLUMNS):
+            # The row may exist but not have replicated yet
+            self._count("lag_fallbacks")
+            return query.execute_on(self.primary)
+        self._count("replica_reads")
+        return resp
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counts)
+        stats["replicas"] = {replica.name: "up" if replica.healthy else "down" for replica in self.replicas}
+        return stats
@@ -0,0 +1,84 @@
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """One in-flight request shared by every caller asking for the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent identical reads so they share one backend request.
+
+    Writes call invalidate(), so a read that starts after a write never joins
+    one that started before it and may return pre-write rows.
+    """
+
+    def __init__(self):
+        # Optional callable whose result is added to every key, e.g. the read route in use
+        self.scope: Optional[Callable[[], Hashable]] = None
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counts = {"calls": 0, "executed": 0, "coalesced": 0, "invalidations": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or wait for the identical call already in flight and share its result."""
+        if self.scope is not None:
+            key = (key, self.scope())
+        with self._lock:
+            self._counts["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._counts["executed"] += 1
+            else:
+                call.waiters += 1
+                self._counts["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Each follower gets its own copy so callers cannot mutate each other's rows
+            return copy.deepcopy(call.result)
+
+        result = None
+        try:
+            result = fn()
+            return result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                # An invalidation may already have replaced this call with a newer one
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                waiters = call.waiters
+            if waiters and call.error is None:
+                # Snapshot before the leader's caller can touch the result
+                call.result = copy.deepcopy(result)
+            call.done.set()
+
+    def invalidate(self):
+        """Detach every call in flight: its current waiters still share it, later reads start afresh."""
+        with self._lock:
+            self._calls.clear()
+            self._counts["invalidations"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of calls made, backend requests executed and calls served by coalescing."""
+        with self._lock:
+            return dict(self._counts, in_flight=len(self._calls))
+
+
+# Shared by every DAO instance, since Streamlit sessions share the services
+reads = SingleFlight()
@@ -0,0 +1,106 @@
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class StatusArchive:
+    """Job status rows moved off the hot table, kept as gzip-compressed JSON-lines segments.
+
+    Each archival run writes one immutable segment. A small index maps every
+    job to the segments holding its rows, so reading one job's history opens
+    only those segments. The index also keeps the archival watermark: the
+    (updated_at, status_id) of the last "completed" status row whose job has
+    been archived.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._index = None
+        self._index_mtime = None
+
+    def _load_index(self) -> Dict:
+        mtime = os.path.getmtime(self.index_path) if os.path.exists(self.index_path) else None
+        if self._index is None or mtime != self._index_mtime:
+            if mtime is None:
+                self._index = {"segments": {}, "jobs": {}}
+            else:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            self._index_mtime = mtime
+        return self._index
+
+    def _save_index(self, index: Dict):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+        self._index, self._index_mtime = index, os.path.getmtime(self.index_path)
+
+    def write_segment(self, rows: List[Dict]) -> str:
+        """Durably write rows as a new segment and index it; returns the segment name."""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            index = self._load_index()
+            name = f"segment-{time.strftime('%Y%m%dT%H%M%S')}-{len(index['segments']):05d}.jsonl.gz"
+            path = os.path.join(self.directory, name)
+            with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps(row, default=str) + "\n")
+            os.replace(path + ".tmp", path)
+
+            index = dict(index, segments=dict(index["segments"]), jobs=dict(index["jobs"]))
+            job_ids = sorted({row["job_id"] for row in rows})
+            index["segments"][name] = {
+                "rows": len(rows),
+                "jobs": len(job_ids),
+                "bytes": os.path.getsize(path),
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+            }
+            for job_id in job_ids:
+                index["jobs"][str(job_id)] = index["jobs"].get(str(job_id), []) + [name]
+            self._save_index(index)
+            return name
+
+    def watermark(self) -> Optional[Tuple[str, int]]:
+        """(updated_at, status_id) of the last completion handled by archival (None before the first run)."""
+        with self._lock:
+            mark = self._load_index().get("watermark")
+        return tuple(mark) if isinstance(mark, list) else None
+
+    def set_watermark(self, updated_at: str, status_id: int):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            self._save_index(dict(self._load_index(), watermark=[updated_at, status_id]))
+
+    def history(self, job_id: int) -> List[Dict]:
+        """Archived status rows of one job, oldest first."""
+        with self._lock:
+            segments = list(self._load_index()["jobs"].get(str(job_id), []))
+        rows = []
+        for name in segments:
+            with gzip.open(os.path.join(self.directory, name), "rt", encoding="utf-8") as f:
+                for line in f:
+                    row = json.loads(line)
+                    if row["job_id"] == job_id:
+                        rows.append(row)
+        rows.sort(key=lambda row: (row.get("updated_at") or "", row["status_id"]))
+        return rows
+
+    def stats(self) -> Dict:
+        with self._lock:
+            index = self._load_index()
+        segments = index["segments"].values()
+        return {
+            "segments": len(index["segments"]),
+            "rows": sum(s["rows"] for s in segments),
+            "jobs": len(index["jobs"]),
+            "bytes": sum(s["bytes"] for s in segments),
+            "watermark": index.get("watermark")
+        }
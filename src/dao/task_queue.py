@@ -0,0 +1,148 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List
+
+_SCHEMA = """
+create table if not exists tasks (
+    task_id integer primary key autoincrement,
+    kind text not null,
+    payload text not null,
+    attempts integer not null default 0,
+    created_at real not null,
+    available_at real not null,
+    leased_until real,
+    last_error text,
+    dead integer not null default 0
+);
+create index if not exists tasks_ready_idx on tasks (dead, available_at, task_id);
+"""
+
+
+class TaskQueue:
+    """Durable task queue in a local SQLite file, shared by every process that opens it.
+
+    Claiming a task leases it for `lease_seconds`; a task is deleted only when
+    its handler completes, so one whose worker dies is claimed again once the
+    lease runs out (at-least-once delivery). Tasks that keep failing are marked
+    dead after `max_attempts` and stay in the file for inspection.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 10):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets workers claim while callers enqueue
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("pragma journal_mode=wal")
+            conn.execute("pragma synchronous=full")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], delay: float = 0) -> int:
+        """Durably add a task; it is on disk when this returns."""
+        now = time.time()
+        cur = self._conn().execute(
+            "insert into tasks (kind, payload, created_at, available_at) values (?, ?, ?, ?)",
+            (kind, json.dumps(payload, default=str), now, now + delay)
+        )
+        return cur.lastrowid
+
+    def enqueue_many(self, kind: str, payloads: List[Dict[str, Any]]) -> int:
+        """Durably add several tasks in one transaction; returns how many."""
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("begin")
+            conn.executemany(
+                "insert into tasks (kind, payload, created_at, available_at) values (?, ?, ?, ?)",
+                [(kind, json.dumps(payload, default=str), now, now) for payload in payloads]
+            )
+        return len(payloads)
+
+    def claim(self, limit: int, lease_seconds: float = 60) -> List[Dict]:
+        """Lease up to `limit` ready tasks, oldest first, in one statement."""
+        now = time.time()
+        rows = self._conn().execute(
+            """
+            update tasks set leased_until = ?, attempts = attempts + 1
+            where task_id in (
+                select task_id from tasks
+                where dead = 0 and available_at <= ? and (leased_until is null or leased_until < ?)
+                order by task_id limit ?
+            )
+            returning task_id, kind, payload, attempts, created_at
+            """,
+            (now + lease_seconds, now, now, limit)
+        ).fetchall()
+        tasks = [dict(row, payload=json.loads(row["payload"])) for row in rows]
+        tasks.sort(key=lambda task: task["task_id"])
+        return tasks
+
+    def complete(self, task_ids: List[int]):
+        if task_ids:
+            marks = ",".join("?" * len(task_ids))
+            self._conn().execute(f"delete from tasks where task_id in ({marks})", task_ids)
+
+    def retry(self, task_id: int, attempts: int, error: str, delay: float):
+        """Release a failed task to run again after `delay`, or mark it dead when out of attempts."""
+        self._conn().execute(
+            "update tasks set leased_until = null, available_at = ?, last_error = ?, dead = ? where task_id = ?",
+            (time.time() + delay, error[:1000], int(attempts >= self.max_attempts), task_id)
+        )
+
+    def stats(self) -> Dict:
+        """Depth by state, the age of the oldest unfinished task (lag) and depth per kind.
+
+        "delayed" tasks failed and wait out their retry backoff.
+        """
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute(
+            """
+            select
+                coalesce(sum(dead = 0 and (leased_until is null or leased_until < ?) and available_at <= ?), 0) as ready,
+                coalesce(sum(dead = 0 and (leased_until is null or leased_until < ?) and available_at > ?), 0) as delayed,
+                coalesce(sum(dead = 0 and leased_until >= ?), 0) as in_flight,
+                coalesce(sum(dead = 1), 0) as dead,
+                min(case when dead = 0 then created_at end) as oldest
+            from tasks
+            """,
+            (now, now, now, now, now)
+        ).fetchone()
+        kinds = conn.execute(
+            "select kind, count(*) as n from tasks where dead = 0 group by kind order by kind"
+        ).fetchall()
+        return {
+            "depth": row["ready"] + row["delayed"] + row["in_flight"],
+            "ready": row["ready"],
+            "delayed": row["delayed"],
+            "in_flight": row["in_flight"],
+            "dead": row["dead"],
+            "lag_seconds": round(now - row["oldest"], 3) if row["oldest"] is not None else 0.0,
+            "by_kind": {r["kind"]: r["n"] for r in kinds}
+        }
+
+    def dead_tasks(self, limit: int = 100) -> List[Dict]:
+        rows = self._conn().execute(
+            "select task_id, kind, payload, attempts, created_at, last_error from tasks "
+            "where dead = 1 order by task_id limit ?", (limit,)
+        ).fetchall()
+        return [dict(row, payload=json.loads(row["payload"])) for row in rows]
+
+    def requeue_dead(self) -> int:
+        """Give every dead task a fresh set of attempts; returns how many."""
+        cur = self._conn().execute(
+            "update tasks set dead = 0, attempts = 0, leased_until = null, available_at = ? where dead = 1",
+            (time.time(),)
+        )
+        return cur.rowcount
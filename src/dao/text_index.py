@@ -0,0 +1,108 @@
+import bisect
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+# pg_trgm's default similarity threshold for the % operator
+SIMILARITY_THRESHOLD = 0.3
+
+
+def words(text: str) -> List[str]:
+    return re.findall(r"\w+", (text or "").lower())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word padded like pg_trgm does (two spaces before, one after)."""
+    grams = set()
+    for word in words(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TextIndex:
+    """Inverted word and trigram index over one text column, keyed by primary key.
+
+    Searches only touch the postings of the query's words and trigrams instead
+    of every row.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[int, str]] = ()):
+        self._words: Dict[str, Set[int]] = {}
+        self._grams: Dict[str, Set[int]] = {}
+        # key -> indexed text (the row's own string) and its trigram count
+        self._texts: Dict[int, str] = {}
+        self._gram_counts: Dict[int, int] = {}
+        self._vocabulary: List[str] = []  # sorted, for prefix lookups
+        for key, text in entries:
+            self.add(key, text)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, key: int, text: str):
+        self.remove(key)
+        for word in set(words(text)):
+            postings = self._words.get(word)
+            if postings is None:
+                postings = self._words[word] = set()
+                bisect.insort(self._vocabulary, word)
+            postings.add(key)
+        grams = trigrams(text)
+        for gram in grams:
+            self._grams.setdefault(gram, set()).add(key)
+        self._texts[key] = text
+        self._gram_counts[key] = len(grams)
+
+    def remove(self, key: int):
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        del self._gram_counts[key]
+        doc_words = set(words(text))
+        for index, terms in ((self._words, doc_words), (self._grams, trigrams(text))):
+            for term in terms:
+                postings = index[term]
+                postings.discard(key)
+                if not postings:
+                    del index[term]
+        for word in doc_words:
+            if word not in self._words:
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, word)]
+
+    def _prefixed(self, prefix: str) -> Iterable[str]:
+        lo = bisect.bisect_left(self._vocabulary, prefix)
+        hi = bisect.bisect_left(self._vocabulary, prefix + "\uffff")
+        return self._vocabulary[lo:hi]
+
+    def search(self, query: str, threshold: float = SIMILARITY_THRESHOLD) -> Dict[int, float]:
+        """Rank of every key whose words start with a query word or whose trigram similarity passes.
+
+        The rank is the share of query words matched plus the trigram similarity.
+        """
+        tokens = words(query)
+        hits = Counter()
+        for token in tokens:
+            matched = set()
+            for word in self._prefixed(token):
+                matched |= self._words[word]
+            hits.update(matched)
+
+        # A key passing the threshold shares at least ceil(threshold * |query grams|) trigrams
+        # with the query, so it is in the postings of one of the rarest grams left after that
+        query_grams = trigrams(query)
+        needed = max(1, math.ceil(threshold * len(query_grams)))
+        rarest = sorted(query_grams, key=lambda gram: len(self._grams.get(gram, ())))
+        candidates = set(hits)
+        for gram in rarest[:len(rarest) - needed + 1]:
+            candidates.update(self._grams.get(gram, ()))
+
+        postings = [self._grams[gram] for gram in query_grams if gram in self._grams]
+        ranks = {}
+        for key in candidates:
+            common = sum(1 for keys in postings if key in keys)
+            similarity = common / (len(query_grams) + self._gram_counts[key] - common) if common else 0.0
+            if hits[key] or similarity >= threshold:
+                ranks[key] = round(hits[key] / max(len(tokens), 1) + similarity, 6)
+        return ranks
@@ -0,0 +1,215 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Optional
+import httpx
+from postgrest.exceptions import APIError
+
+# PostgREST/Postgres error codes that signal a struggling backend rather than a bad request
+_TRANSIENT_CODE_PREFIXES = ("PGRST00", "08", "53", "57", "40001", "40P01")
+
+
+class TransportError(Exception):
+    """Raised when a backend request times out or keeps failing after retries."""
+    pass
+
+
+class CircuitOpenError(TransportError):
+    """Raised without contacting the backend while the circuit breaker is open."""
+    pass
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for failures worth retrying: network errors, timeouts, 5xx and overload codes."""
+    if isinstance(error, (httpx.TransportError, FutureTimeout, TimeoutError)):
+        return True
+    if isinstance(error, APIError):
+        code = str(error.code or "")
+        return code.startswith(_TRANSIENT_CODE_PREFIXES) or (code.isdigit() and code.startswith("5"))
+    return False
+
+
+class CircuitBreaker:
+    """Opens after consecutive failed requests and fast-fails until a cooldown passes.
+
+    After the cooldown one probe request is let through (half-open); its outcome
+    closes the circuit again or re-opens it for another cooldown.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.cooldown:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release_probe(self):
+        """Settle an attempt that never reached the backend, without a verdict.
+
+        A half-open circuit stays half-open, so the next call probes again; a
+        closed one keeps its failure count.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class LatencyWindow:
+    """Rolling window of recent request latencies, used to pick the hedging delay."""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < 20:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class TransportPolicy:
+    """Timeouts, jittered retries, hedged reads and circuit breaking for backend calls.
+
+    Only idempotent reads are retried or hedged; writes get a timeout and a
+    single attempt so they are never applied twice.
+    """
+
+    def __init__(self, read_timeout: float = 5.0, write_timeout: float = 10.0,
+                 read_retries: int = 2, backoff_base: float = 0.1, backoff_max: float = 2.0,
+                 hedge_reads: bool = False, hedge_percentile: float = 0.95,
+                 breaker: Optional[CircuitBreaker] = None, max_workers: int = 32):
+        self.read_timeout = read_timeout
+        self.write_timeout = write_timeout
+        self.read_retries = read_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_reads = hedge_reads
+        self.hedge_percentile = hedge_percentile
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyWindow()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="transport")
+        self._lock = threading.Lock()
+        self._counts = {"calls": 0, "retries": 0, "hedges": 0, "timeouts": 0,
+                        "failures": 0, "fast_fails": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _timed(self, fn: Callable[[], Any]) -> Any:
+        start = time.monotonic()
+        result = fn()
+        self.latency.add(time.monotonic() - start)
+        return result
+
+    def _attempt(self, fn: Callable[[], Any], timeout: float, hedge: bool) -> Any:
+        """One attempt, optionally duplicated once it runs slower than the recent p95."""
+        deadline = time.monotonic() + timeout
+        futures = [self._executor.submit(self._timed, fn)]
+        delay = self.latency.percentile(self.hedge_percentile) if hedge else None
+        if delay is not None and delay < timeout:
+            done, _ = wait(futures, timeout=delay)
+            if not done:
+                self._count("hedges")
+                futures.append(self._executor.submit(self._timed, fn))
+
+        error = None
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        if error is not None and not pending:
+            raise error
+        self._count("timeouts")
+        raise FutureTimeout(f"Backend request exceeded {timeout}s")
+
+    def call(self, fn: Callable[[], Any], is_read: bool) -> Any:
+        """Run one backend request under the policy."""
+        self._count("calls")
+        attempts = 1 + (self.read_retries if is_read else 0)
+        timeout = self.read_timeout if is_read else self.write_timeout
+        for attempt in range(attempts):
+            if not self.breaker.allow():
+                self._count("fast_fails")
+                raise CircuitOpenError("Backend circuit is open; failing fast")
+            # Every attempt settles the breaker, so a half-open probe can never stay in flight.
+            # outcome is "healthy", "failed" (the backend is struggling) or None (never reached it)
+            outcome = None
+            try:
+                result = self._attempt(fn, timeout, hedge=is_read and self.hedge_reads)
+                outcome = "healthy"
+            except Exception as e:
+                if not is_transient(e):
+                    # The backend answered a bad request, which says nothing about its health.
+                    # Anything else (a saturated local pool, a bug) never reached it at all
+                    if isinstance(e, APIError):
+                        outcome = "healthy"
+                    raise
+                outcome = "failed"
+                self._count("failures")
+                if attempt == attempts - 1:
+                    raise TransportError(f"Backend request failed after {attempt + 1} attempt(s): {e}") from e
+            finally:
+                if outcome == "healthy":
+                    self.breaker.record_success()
+                elif outcome == "failed":
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.release_probe()
+            if outcome == "healthy":
+                return result
+            self._count("retries")
+            # Full jitter keeps retrying sessions from synchronising
+            time.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counts)
+        stats["breaker"] = self.breaker.state
+        stats["p95_seconds"] = self.latency.percentile(0.95)
+        return stats
@@ -1,45 +1,69 @@
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from typing import Any, Optional, List, Dict
+from src.dao.client import get_client
+from src.dao.singleflight import reads
+from src.dao.errors import constraint_errors
+from src.dao.paging import fetch_page
+from src.dao.columnar import fetch_table
 
 class UserDAO:
     """Data Access Object for user-related database operations."""
     
-    def __init__(self):
-        self.sb = get_supabase()
+    def __init__(self, records: bool = False):
+        self.sb = get_client(records)
     
     def create_user(self, name: str, email: str, phone: str, role: str) -> Optional[Dict]:
         """Create a new user and return the inserted record."""
-        # Insert the new user
-        self.sb.table("users").insert({
-            "name": name, 
-            "email": email, 
-            "phone": phone, 
-            "role": role
-        }).execute()
-        
-        # Fetch the newly created user by email
-        resp = self.sb.table("users").select("*").eq("email", email).execute()
+        # Insert the new user; the response carries the inserted row
+        with constraint_errors("users"):
+            resp = self.sb.table("users").insert({
+                "name": name, 
+                "email": email, 
+                "phone": phone, 
+                "role": role
+            }).execute()
         return resp.data[0] if resp.data else None
     
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """Retrieve a single user by ID."""
-        resp = self.sb.table("users").select("*").eq("user_id", user_id).execute()
-        return resp.data[0] if resp.data else None
+        def fetch():
+            resp = self.sb.table("users").select("*").eq("user_id", user_id).execute()
+            return resp.data[0] if resp.data else None
+        return reads.do(("users.get_user_by_id", user_id, self.sb.records), fetch)
+    
+    def get_users_by_ids(self, user_ids: List[int]) -> List[Dict]:
+        """Retrieve several users in a single request."""
+        if not user_ids:
+            return []
+        resp = self.sb.table("users").select("*").in_("user_id", user_ids).execute()
+        return resp.data or []
+    
+    def get_users_page(self, columns: str = "*", after_id: int = 0, limit: int = 1000,
+                       role: Optional[str] = None) -> List[Dict]:
+        """Retrieve one page of users ordered by ID, starting after the given ID."""
+        query = self.sb.table("users").select(columns).gt("user_id", after_id)
+        if role:
+            query = query.eq("role", role)
+        resp = query.order("user_id", desc=False).limit(limit).execute()
+        return resp.data or []
     
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Retrieve a single user by email."""
         resp = self.sb.table("users").select("*").eq("email", email).execute()
         return resp.data[0] if resp.data else None
 
-    def get_users_by_role(self, role: str) -> List[Dict]:
-        """Retrieve all users with a specific role."""
-        resp = self.sb.table("users").select("*").eq("role", role).execute()
+    def get_users_by_role(self, role: str, limit: Optional[int] = None) -> List[Dict]:
+        """Retrieve users with a specific role, up to an optional limit."""
+        query = self.sb.table("users").select("*").eq("role", role).order("user_id", desc=False)
+        if limit is not None:
+            query = query.limit(limit)
+        resp = query.execute()
         return resp.data or []
 
     def update_user(self, user_id: int, fields: Dict) -> Optional[Dict]:
         """Update user fields and return the updated record."""
         # Update the user
-        self.sb.table("users").update(fields).eq("user_id", user_id).execute()
+        with constraint_errors("users"):
+            self.sb.table("users").update(fields).eq("user_id", user_id).execute()
         
         # Fetch and return updated user
         resp = self.sb.table("users").select("*").eq("user_id", user_id).execute()
@@ -56,7 +80,29 @@ class UserDAO:
         
         return user
 
+    def delete_users(self, user_ids: List[int]) -> List[Dict]:
+        """Delete several users in one request and return the deleted records."""
+        if not user_ids:
+            return []
+        resp = self.sb.table("users").delete().in_("user_id", user_ids).execute()
+        return resp.data or []
+
     def list_users(self, limit: int = 100) -> List[Dict]:
         """Retrieve all users with optional limit."""
         resp = self.sb.table("users").select("*").order("user_id", desc=False).limit(limit).execute()
-        return resp.data or [] 
\ No newline at end of file
+        return resp.data or [] 
+
+    def get_users_arrow(self, role: Optional[str] = None, columns: Optional[List[str]] = None,
+                        limit: Optional[int] = None) -> Any:
+        """Every user (optionally of one role) as a typed pyarrow.Table, read page by page."""
+        return fetch_table(self.sb, "users", {"role": role}, columns, limit)
+
+    def get_dashboard(self, user_id: int) -> Optional[Dict]:
+        """The user with their jobs, bids, bid counts and latest statuses, in one request."""
+        resp = self.sb.rpc("user_dashboard", {"p_user_id": user_id}).execute()
+        return resp.data or None
+
+    def list_users_page(self, role: Optional[str] = None, sort: str = "user_id", desc: bool = False,
+                        cursor: Optional[str] = None, limit: int = 25) -> Dict:
+        """Retrieve one sorted page of users, optionally filtered by role."""
+        return fetch_page(self.sb, "users", {"role": role}, sort, desc, cursor, limit)
\ No newline at end of file
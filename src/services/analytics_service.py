@@ -0,0 +1,273 @@
+import threading
+import time
+from typing import List, Dict, Optional
+import numpy as np
+from src.dao.job_dao import JobDAO
+from src.dao.bid_dao import BidDAO
+
+PAGE_SIZE = 1000
+# Reports share one streamed pass; reuse it for this long
+AGGREGATES_TTL_SECONDS = 60
+
+JOB_STATUS_CODES = {"open": 0, "assigned": 1, "in-progress": 2, "completed": 3}
+BID_STATUS_CODES = {"pending": 0, "accepted": 1, "rejected": 2}
+
+
+class AnalyticsError(Exception):
+    """Exception raised for analytics-related errors."""
+    pass
+
+
+def _fit(array: np.ndarray, size: int) -> np.ndarray:
+    """Grow a dense accumulator (doubling) so that index size-1 is valid."""
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _add(array: np.ndarray, positions: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """Vectorized group-by sum of weights (or counts) into a dense accumulator."""
+    if len(positions) == 0:
+        return array
+    array = _fit(array, int(positions.max()) + 1)
+    # add.at costs O(page), unlike bincount which would touch the whole accumulator
+    np.add.at(array, positions, 1 if weights is None else weights)
+    return array
+
+
+class IdIndex:
+    """Maps IDs to compact positions 0..n-1 in the order they were first seen.
+
+    Accumulators indexed by position are sized by how many distinct IDs there
+    are, however large the IDs themselves get (offline rows, for one, use IDs
+    above a billion).
+    """
+
+    def __init__(self):
+        self._positions = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _map(self, ids: np.ndarray, lookup) -> np.ndarray:
+        unique, inverse = np.unique(ids, return_inverse=True)
+        mapped = np.fromiter((lookup(i) for i in unique.tolist()), dtype=np.int64, count=len(unique))
+        return mapped[inverse.reshape(-1)]
+
+    def add(self, ids: np.ndarray) -> np.ndarray:
+        """Positions of the given IDs, assigning new ones to IDs not seen before."""
+        positions = self._positions
+        return self._map(ids, lambda i: positions.setdefault(i, len(positions)))
+
+    def find(self, ids: np.ndarray) -> np.ndarray:
+        """Positions of the given IDs, -1 for IDs not seen before."""
+        return self._map(ids, lambda i: self._positions.get(i, -1))
+
+    def ids(self) -> np.ndarray:
+        """Every ID seen so far, in position order."""
+        return np.fromiter(self._positions, dtype=np.int64, count=len(self._positions))
+
+
+class MarketplaceAggregates:
+    """Dense per-job, per-client and per-freelancer accumulators built from paged reads.
+
+    Each stream's IDs are mapped to compact positions (see IdIndex), so memory
+    is bounded by the number of distinct jobs and users, not by the number of
+    bids: each page is reduced into the accumulators and then discarded.
+    """
+
+    def __init__(self):
+        self.jobs = IdIndex()
+        self.clients = IdIndex()
+        self.freelancers = IdIndex()
+        # Per job position
+        self.job_client = np.zeros(0, dtype=np.int64)
+        self.job_budget = np.zeros(0, dtype=np.float64)
+        self.job_status = np.zeros(0, dtype=np.int8)
+        self.job_bids = np.zeros(0, dtype=np.int64)
+        # Per client position
+        self.client_jobs = np.zeros(0, dtype=np.int64)
+        self.client_filled = np.zeros(0, dtype=np.int64)
+        self.client_budget = np.zeros(0, dtype=np.float64)
+        self.client_spend = np.zeros(0, dtype=np.float64)
+        self.client_ratio_sum = np.zeros(0, dtype=np.float64)
+        self.client_ratio_count = np.zeros(0, dtype=np.int64)
+        # Per freelancer position
+        self.freelancer_bids = np.zeros(0, dtype=np.int64)
+        self.freelancer_accepted = np.zeros(0, dtype=np.int64)
+        self.freelancer_rejected = np.zeros(0, dtype=np.int64)
+        self.freelancer_earned = np.zeros(0, dtype=np.float64)
+        self.total_bids = 0
+
+    def add_jobs(self, rows: List[Dict]):
+        n = len(rows)
+        jobs = self.jobs.add(np.fromiter((r["job_id"] for r in rows), dtype=np.int64, count=n))
+        clients = self.clients.add(np.fromiter((r["client_id"] for r in rows), dtype=np.int64, count=n))
+        budgets = np.fromiter((float(r["budget"] or 0) for r in rows), dtype=np.float64, count=n)
+        statuses = np.fromiter((JOB_STATUS_CODES.get(r["status"], 0) for r in rows), dtype=np.int8, count=n)
+
+        size = len(self.jobs)
+        for name in ("job_client", "job_budget", "job_status", "job_bids"):
+            setattr(self, name, _fit(getattr(self, name), size))
+        self.job_client[jobs] = clients
+        self.job_budget[jobs] = budgets
+        self.job_status[jobs] = statuses
+
+        self.client_jobs = _add(self.client_jobs, clients)
+        self.client_filled = _add(self.client_filled, clients[statuses > 0])
+        self.client_budget = _add(self.client_budget, clients, budgets)
+
+    def add_bids(self, rows: List[Dict]):
+        n = len(rows)
+        jobs = self.jobs.find(np.fromiter((r["job_id"] for r in rows), dtype=np.int64, count=n))
+        freelancers = self.freelancers.add(np.fromiter((r["freelancer_id"] for r in rows), dtype=np.int64, count=n))
+        amounts = np.fromiter((float(r["amount"] or 0) for r in rows), dtype=np.float64, count=n)
+        statuses = np.fromiter((BID_STATUS_CODES.get(r["bid_status"], 0) for r in rows), dtype=np.int8, count=n)
+        self.total_bids += n
+
+        accepted = statuses == 1
+        self.freelancer_bids = _add(self.freelancer_bids, freelancers)
+        self.freelancer_accepted = _add(self.freelancer_accepted, freelancers[accepted])
+        self.freelancer_rejected = _add(self.freelancer_rejected, freelancers[statuses == 2])
+        self.freelancer_earned = _add(self.freelancer_earned, freelancers[accepted], amounts[accepted])
+
+        # Bids whose job row was not seen (deleted mid-scan) are ignored for job KPIs
+        known = jobs >= 0
+        jobs, amounts, accepted = jobs[known], amounts[known], accepted[known]
+        self.job_bids = _add(self.job_bids, jobs)
+        clients = self.job_client[jobs]
+        budgets = self.job_budget[jobs]
+        self.client_spend = _add(self.client_spend, clients[accepted], amounts[accepted])
+        priced = budgets > 0
+        self.client_ratio_sum = _add(self.client_ratio_sum, clients[priced], amounts[priced] / budgets[priced])
+        self.client_ratio_count = _add(self.client_ratio_count, clients[priced])
+
+
+def _rows(id_name: str, ids: np.ndarray, columns: Dict[str, np.ndarray], sort_by: str, limit: int) -> List[Dict]:
+    """Turn parallel column arrays into the top `limit` report rows by one column."""
+    order = np.argsort(-columns[sort_by], kind="stable")[:limit]
+    names = list(columns)
+    values = [columns[name][order].tolist() for name in names]
+    return [dict(zip([id_name] + names, row)) for row in zip(ids[order].tolist(), *values)]
+
+
+class AnalyticsService:
+    """Marketplace KPIs computed with vectorized group-bys over streamed job and bid pages."""
+
+    REPORTS = ["marketplace", "client-spend", "freelancer-win-rate", "bid-to-budget",
+               "bids-per-job", "bids-per-job-summary", "fill-rate"]
+
+    def __init__(self):
+        self.jobdao = JobDAO()
+        self.biddao = BidDAO()
+        self._lock = threading.Lock()
+        self._aggregates = None
+        self._loaded_at = 0.0
+
+    def _load(self) -> MarketplaceAggregates:
+        agg = MarketplaceAggregates()
+        after_id = 0
+        while True:
+            rows = self.jobdao.get_jobs_page("job_id, client_id, budget, status", after_id, PAGE_SIZE)
+            if rows:
+                agg.add_jobs(rows)
+                after_id = rows[-1]["job_id"]
+            if len(rows) < PAGE_SIZE:
+                break
+        after_id = 0
+        while True:
+            rows = self.biddao.get_bids_page("bid_id, job_id, freelancer_id, amount, bid_status", after_id, PAGE_SIZE)
+            if rows:
+                agg.add_bids(rows)
+                after_id = rows[-1]["bid_id"]
+            if len(rows) < PAGE_SIZE:
+                break
+        return agg
+
+    def aggregates(self, refresh: bool = False) -> MarketplaceAggregates:
+        with self._lock:
+            if refresh or self._aggregates is None or time.monotonic() - self._loaded_at > AGGREGATES_TTL_SECONDS:
+                self._aggregates = self._load()
+                self._loaded_at = time.monotonic()
+            return self._aggregates
+
+    def run_report(self, name: str, limit: int = 50, refresh: bool = False) -> List[Dict]:
+        """Compute one named report and return its rows."""
+        if name not in self.REPORTS:
+            raise AnalyticsError(f"Invalid report. Must be one of: {', '.join(self.REPORTS)}")
+        if limit < 1:
+            raise AnalyticsError("Limit must be at least 1")
+        agg = self.aggregates(refresh)
+
+        if name == "marketplace":
+            jobs = len(agg.jobs)
+            budgets = agg.job_budget[:jobs]
+            filled = int((agg.job_status[:jobs] > 0).sum())
+            return [{
+                "jobs": jobs,
+                "bids": agg.total_bids,
+                "fill_rate": round(filled / jobs, 4) if jobs else 0.0,
+                "avg_bids_per_job": round(float(agg.job_bids.sum()) / jobs, 2) if jobs else 0.0,
+                "total_budget": round(float(budgets.sum()), 2),
+                "accepted_spend": round(float(agg.client_spend.sum()), 2),
+                "avg_bid_to_budget": round(float(agg.client_ratio_sum.sum() / max(agg.client_ratio_count.sum(), 1)), 4)
+            }]
+
+        clients = len(agg.clients)
+        if name == "client-spend":
+            return _rows("client_id", agg.clients.ids(), {
+                "jobs_posted": agg.client_jobs[:clients],
+                "total_budget": np.round(agg.client_budget[:clients], 2),
+                "accepted_spend": np.round(_fit(agg.client_spend, clients)[:clients], 2)
+            }, "accepted_spend", limit)
+
+        if name == "freelancer-win-rate":
+            size = len(agg.freelancers)
+            accepted = _fit(agg.freelancer_accepted, size)[:size]
+            rejected = _fit(agg.freelancer_rejected, size)[:size]
+            decided = accepted + rejected
+            return _rows("freelancer_id", agg.freelancers.ids(), {
+                "bids": agg.freelancer_bids[:size],
+                "accepted": accepted,
+                "rejected": rejected,
+                "win_rate": np.round(np.divide(accepted, decided, out=np.zeros(size), where=decided > 0), 4),
+                "earned": np.round(_fit(agg.freelancer_earned, size)[:size], 2)
+            }, "win_rate", limit)
+
+        if name == "bid-to-budget":
+            positions = np.nonzero(agg.client_ratio_count)[0]
+            counts = agg.client_ratio_count[positions]
+            return _rows("client_id", agg.clients.ids()[positions], {
+                "bids": counts,
+                "avg_bid_to_budget": np.round(agg.client_ratio_sum[positions] / counts, 4)
+            }, "avg_bid_to_budget", limit)
+
+        if name == "bids-per-job-summary":
+            size = len(agg.jobs)
+            if not size:
+                return []
+            counts = agg.job_bids[:size]
+            return [{
+                "jobs": size,
+                "mean": round(float(counts.mean()), 2),
+                "median": float(np.median(counts)),
+                "p90": float(np.percentile(counts, 90)),
+                "max": int(counts.max()),
+                "jobs_without_bids": int((counts == 0).sum())
+            }]
+
+        if name == "bids-per-job":
+            size = len(agg.jobs)
+            return _rows("job_id", agg.jobs.ids(), {"bids": agg.job_bids[:size], "budget": agg.job_budget[:size]},
+                         "bids", limit)
+
+        # fill-rate
+        jobs = agg.client_jobs[:clients]
+        filled = _fit(agg.client_filled, clients)[:clients]
+        return _rows("client_id", agg.clients.ids(), {
+            "jobs_posted": jobs,
+            "filled": filled,
+            "fill_rate": np.round(filled / jobs, 4)
+        }, "fill_rate", limit)
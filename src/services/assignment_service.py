@@ -0,0 +1,158 @@
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from postgrest.exceptions import APIError
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+from src.dao.job_dao import JobDAO
+from src.dao.bid_dao import BidDAO
+from src.services.bid_leaderboard import leaderboards
+from src.services.bid_service import BidService
+
+PAGE_SIZE = 1000
+
+
+class AssignmentError(Exception):
+    """Exception raised for batch assignment errors."""
+    pass
+
+
+def min_cost_assignment(job_idx: np.ndarray, freelancer_idx: np.ndarray, amounts: np.ndarray,
+                        capacity: np.ndarray, n_jobs: int) -> np.ndarray:
+    """Choose bids so that as many jobs as possible are assigned, at the lowest total amount.
+
+    Bid i offers freelancer `freelancer_idx[i]` for job `job_idx[i]` at
+    `amounts[i]`; freelancer f can take at most `capacity[f]` more jobs. Each
+    freelancer becomes `capacity` identical columns ("slots") and every job gets
+    a private "unassigned" column costing more than all bids together, so a full
+    matching always exists and leaving a job out is never cheaper than filling
+    it. Returns the indices of the chosen bids.
+    """
+    if len(amounts) == 0:
+        return np.empty(0, dtype=np.int64)
+    # A freelancer never needs more slots than the jobs they bid on
+    bids_per_freelancer = np.bincount(freelancer_idx, minlength=len(capacity))
+    slots = np.minimum(capacity, bids_per_freelancer)
+    slot_start = np.concatenate(([0], np.cumsum(slots)[:-1]))
+    n_slots = int(slots.sum())
+
+    # One edge per (bid, slot of its freelancer)
+    reps = slots[freelancer_idx]
+    edge_bid = np.repeat(np.arange(len(amounts)), reps)
+    offset = np.arange(len(edge_bid)) - np.repeat(np.cumsum(reps) - reps, reps)
+    edge_col = slot_start[freelancer_idx[edge_bid]] + offset
+
+    unassigned = float(amounts.sum()) + 1.0
+    rows = np.concatenate((job_idx[edge_bid], np.arange(n_jobs)))
+    cols = np.concatenate((edge_col, n_slots + np.arange(n_jobs)))
+    weights = np.concatenate((amounts[edge_bid], np.full(n_jobs, unassigned)))
+    graph = csr_matrix((weights, (rows, cols)), shape=(n_jobs, n_slots + n_jobs))
+
+    row_ind, col_ind = min_weight_full_bipartite_matching(graph)
+    matched = col_ind < n_slots
+    row_ind, col_ind = row_ind[matched], col_ind[matched]
+    # Map each matched (job, slot) back to the bid: slot -> freelancer, then (job, freelancer) -> bid
+    slot_owner = np.repeat(np.arange(len(capacity)), slots)
+    bid_of = {(j, f): i for i, (j, f) in enumerate(zip(job_idx.tolist(), freelancer_idx.tolist()))}
+    return np.array([bid_of[(j, f)] for j, f in zip(row_ind.tolist(), slot_owner[col_ind].tolist())],
+                    dtype=np.int64)
+
+
+class AssignmentService:
+    """Assigns open jobs to bidding freelancers in bulk, within each freelancer's capacity."""
+
+    def __init__(self):
+        self.jobdao = JobDAO()
+        self.biddao = BidDAO()
+
+    def _open_job_ids(self, limit: Optional[int]) -> List[int]:
+        job_ids, after_id = [], 0
+        while limit is None or len(job_ids) < limit:
+            size = PAGE_SIZE if limit is None else min(PAGE_SIZE, limit - len(job_ids))
+            page = self.jobdao.get_jobs_page("job_id", after_id, size, status="open")
+            job_ids.extend(row["job_id"] for row in page)
+            if len(page) < size:
+                break
+            after_id = page[-1]["job_id"]
+        return job_ids
+
+    def plan(self, max_active_jobs: int = 3, limit: Optional[int] = None) -> Tuple[List[Dict], Dict]:
+        """Compute the assignment of open jobs (up to `limit`) from their pending bids.
+
+        Returns the assignments and a summary of the problem and timings.
+        """
+        if max_active_jobs < 1:
+            raise AssignmentError("Capacity must be at least 1 job per freelancer")
+        if limit is not None and limit < 1:
+            raise AssignmentError("Limit must be at least 1")
+
+        started = time.perf_counter()
+        job_ids = self._open_job_ids(limit)
+        bids = self.biddao.get_pending_bids_for_jobs(job_ids)
+        freelancer_ids = sorted({bid["freelancer_id"] for bid in bids})
+        active = self.jobdao.get_active_job_counts(freelancer_ids)
+        loaded = time.perf_counter()
+
+        job_pos = {job_id: i for i, job_id in enumerate(job_ids)}
+        freelancer_pos = {freelancer_id: i for i, freelancer_id in enumerate(freelancer_ids)}
+        job_idx = np.fromiter((job_pos[bid["job_id"]] for bid in bids), dtype=np.int64, count=len(bids))
+        freelancer_idx = np.fromiter((freelancer_pos[bid["freelancer_id"]] for bid in bids),
+                                     dtype=np.int64, count=len(bids))
+        amounts = np.fromiter((float(bid["amount"]) for bid in bids), dtype=np.float64, count=len(bids))
+        capacity = np.maximum(max_active_jobs - np.array([active[f] for f in freelancer_ids], dtype=np.int64), 0)
+        chosen = min_cost_assignment(job_idx, freelancer_idx, amounts, capacity, len(job_ids))
+        solved = time.perf_counter()
+
+        assignments = sorted(({
+            "job_id": bids[i]["job_id"],
+            "freelancer_id": bids[i]["freelancer_id"],
+            "bid_id": bids[i]["bid_id"],
+            "amount": bids[i]["amount"]
+        } for i in chosen.tolist()), key=lambda row: row["job_id"])
+        summary = {
+            "open_jobs": len(job_ids),
+            "pending_bids": len(bids),
+            "freelancers": len(freelancer_ids),
+            "freelancers_at_capacity": int((capacity == 0).sum()),
+            "assigned": len(assignments),
+            "unassigned": len(job_ids) - len(assignments),
+            "total_amount": round(float(amounts[chosen].sum()), 2),
+            "load_s": round(loaded - started, 3),
+            "solve_s": round(solved - loaded, 3)
+        }
+        return assignments, summary
+
+    def auto_assign(self, max_active_jobs: int = 3, limit: Optional[int] = None,
+                    dry_run: bool = False) -> Dict:
+        """Plan the cheapest assignment of open jobs and, unless dry_run, apply it in one write.
+
+        Jobs or bids that changed between planning and the write are reported
+        as skipped.
+        """
+        assignments, report = self.plan(max_active_jobs, limit)
+        report["dry_run"] = dry_run
+        if dry_run or not assignments:
+            report.update(applied=0, skipped=0, rejected=0, write_s=0.0, assignments=assignments)
+            return report
+
+        started = time.perf_counter()
+        try:
+            applied = self.jobdao.apply_assignments(
+                [{key: row[key] for key in ("job_id", "freelancer_id", "bid_id")} for row in assignments]
+            )
+        except APIError as e:
+            raise AssignmentError(f"Could not apply assignments: {e.message or e}")
+        finally:
+            # Accepted and rejected bids leave these jobs' leaderboards
+            leaderboards.invalidate(row["job_id"] for row in assignments)
+        # Same word to the losing bidders as accept_bid sends
+        rejected = [bid for row in applied for bid in row.pop("rejected_bids", None) or []]
+        BidService._notify_rejected(rejected)
+        report.update(
+            applied=len(applied),
+            skipped=len(assignments) - len(applied),
+            rejected=len(rejected),
+            write_s=round(time.perf_counter() - started, 3),
+            assignments=applied
+        )
+        return report
@@ -0,0 +1,97 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from src.services.bid_service import BidService, BidError
+
+
+class AuctionError(Exception):
+    """Exception raised for auction resolution errors."""
+    pass
+
+
+class AuctionService:
+    """Resolves open jobs in bulk by accepting each one's lowest pending bid."""
+
+    def __init__(self, bid_service: Optional[BidService] = None):
+        self.bid_service = bid_service or BidService()
+        self.biddao = self.bid_service.biddao
+
+    def candidates(self, closing_within_days: Optional[int] = None, min_bids: Optional[int] = None,
+                   batch_size: int = 100, limit: Optional[int] = None):
+        """Yield pages of eligible open jobs with their lowest pending bid, in job ID order."""
+        if closing_within_days is None and min_bids is None:
+            raise AuctionError("Give a deadline window, a minimum bid count, or both")
+        if closing_within_days is not None and closing_within_days < 0:
+            raise AuctionError("Deadline window cannot be negative")
+        if min_bids is not None and min_bids < 1:
+            raise AuctionError("Minimum bid count must be at least 1")
+        if batch_size < 1:
+            raise AuctionError("Batch size must be at least 1")
+        deadline_before = None
+        if closing_within_days is not None:
+            deadline_before = (date.today() + timedelta(days=closing_within_days)).isoformat()
+
+        seen, after_id = 0, 0
+        while limit is None or seen < limit:
+            size = batch_size if limit is None else min(batch_size, limit - seen)
+            page = self.biddao.get_auction_candidates(deadline_before, min_bids, after_id, size)
+            if not page:
+                return
+            yield page
+            seen += len(page)
+            after_id = page[-1]["job_id"]
+            if len(page) < size:
+                return
+
+    def _resolve_one(self, candidate: Dict) -> Dict:
+        outcome = {key: candidate[key] for key in ("job_id", "bid_id", "freelancer_id", "amount", "pending_bids")}
+        started = time.perf_counter()
+        try:
+            # Same rules as a manual accept: still pending, still lowest, job still open
+            self.bid_service.accept_bid(candidate["bid_id"])
+            outcome["status"] = "accepted"
+        except BidError as e:
+            outcome["status"] = "skipped"
+            outcome["error"] = str(e)
+        except Exception as e:
+            outcome["status"] = "failed"
+            outcome["error"] = f"{type(e).__name__}: {e}"
+        outcome["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return outcome
+
+    def resolve(self, closing_within_days: Optional[int] = None, min_bids: Optional[int] = None,
+                batch_size: int = 100, concurrency: int = 8, limit: Optional[int] = None,
+                dry_run: bool = False) -> Dict:
+        """Accept the lowest pending bid of every eligible open job.
+
+        Candidates are selected one page (`batch_size` jobs) at a time, and each
+        page is resolved by up to `concurrency` parallel accepts before the next
+        is fetched. Jobs whose bids changed since selection are skipped with the
+        reason accept_bid gives. With dry_run, candidates are only listed.
+        """
+        if concurrency < 1:
+            raise AuctionError("Concurrency must be at least 1")
+        started = time.perf_counter()
+        outcomes: List[Dict] = []
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="auction") as executor:
+            for page in self.candidates(closing_within_days, min_bids, batch_size, limit):
+                if dry_run:
+                    outcomes.extend(dict(candidate, status="candidate") for candidate in page)
+                    continue
+                outcomes.extend(executor.map(self._resolve_one, page))
+        elapsed = time.perf_counter() - started
+
+        counts = {}
+        for outcome in outcomes:
+            counts[outcome["status"]] = counts.get(outcome["status"], 0) + 1
+        return {
+            "eligible": len(outcomes),
+            "accepted": counts.get("accepted", 0),
+            "skipped": counts.get("skipped", 0),
+            "failed": counts.get("failed", 0),
+            "dry_run": dry_run,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(len(outcomes) / elapsed, 1) if elapsed > 0 else 0.0,
+            "outcomes": outcomes
+        }
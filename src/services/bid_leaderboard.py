@@ -0,0 +1,171 @@
+import bisect
+import itertools
+import threading
+import time
+from typing import Iterable, List, Dict, Optional, Tuple
+
+# Versions are global so a reloaded board never reuses an old version number
+_versions = itertools.count(1)
+
+
+class BidLeaderboard:
+    """The k lowest pending bids for one job, kept sorted by (amount, bid_id)."""
+
+    def __init__(self, job_id: int, size: int, bids: List[Dict]):
+        self.job_id = job_id
+        self.size = size
+        self.keys = []
+        self.bids = []
+        for bid in bids:
+            self._insert(bid)
+        # Fewer rows than requested means every pending bid of the job is held
+        self.complete = len(bids) < size
+        self.stale = False
+        self.loaded_at = time.monotonic()
+        self.version = next(_versions)
+
+    @staticmethod
+    def _key(bid: Dict):
+        return (float(bid["amount"]), bid["bid_id"])
+
+    def _insert(self, bid: Dict):
+        key = self._key(bid)
+        pos = bisect.bisect_left(self.keys, key)
+        self.keys.insert(pos, key)
+        self.bids.insert(pos, bid)
+
+    def _index(self, bid_id: int) -> Optional[int]:
+        for i, bid in enumerate(self.bids):
+            if bid["bid_id"] == bid_id:
+                return i
+        return None
+
+    def remove(self, bid_id: int):
+        """Drop a bid that is no longer pending."""
+        i = self._index(bid_id)
+        if i is None:
+            # A stale board is being reloaded; the reload must not win over this change
+            if self.stale:
+                self.version = next(_versions)
+            return
+        del self.keys[i]
+        del self.bids[i]
+        # A bid outside the board may now belong in it; reload on next read
+        if not self.complete:
+            self.stale = True
+        self.version = next(_versions)
+
+    def offer(self, bid: Dict):
+        """Insert or reposition a bid, keeping only the lowest `size` pending bids."""
+        self.remove(bid["bid_id"])
+        if bid["bid_status"] != "pending":
+            return
+        if not self.complete and len(self.bids) >= self.size and self._key(bid) > self.keys[-1]:
+            return
+        self._insert(bid)
+        if len(self.bids) > self.size:
+            self.keys.pop()
+            self.bids.pop()
+            self.complete = False
+        self.version = next(_versions)
+
+    def top(self, k: int) -> List[Dict]:
+        return self.bids[:k]
+
+
+class LeaderboardRegistry:
+    """Process-wide owner of the loaded leaderboards, shared by every service that changes bids.
+
+    BidService applies its own writes to the boards; other paths that change
+    bids in bulk (scheduled close-bidding, batch assignment, job deletes)
+    invalidate the affected jobs instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards: Dict[int, BidLeaderboard] = {}
+
+    def fresh(self, job_id: int, ttl: float) -> Optional[BidLeaderboard]:
+        """The job's board if it is loaded, current and younger than ttl seconds."""
+        with self._lock:
+            board = self._boards.get(job_id)
+            if board and not board.stale and time.monotonic() - board.loaded_at <= ttl:
+                return board
+            return None
+
+    def begin_reload(self, job_id: int, size: int) -> Tuple[BidLeaderboard, int, bool]:
+        """Mark the board a reload replaces stale and note its version, before the query runs.
+
+        With no board loaded, an empty one is put in its place, so writes and
+        invalidations made while the query runs are seen by `store`. The
+        returned flag says whether that placeholder was created.
+        """
+        with self._lock:
+            board = self._boards.get(job_id)
+            created = board is None
+            if created:
+                board = BidLeaderboard(job_id, size, [])
+                board.complete = False
+                self._boards[job_id] = board
+            # Stale boards count every change to the job, even to bids they do not hold
+            board.stale = True
+            return board, board.version, created
+
+    def store(self, board: BidLeaderboard, previous: BidLeaderboard, version: int) -> bool:
+        """Replace `previous` with a reloaded board, unless it changed or went away meanwhile."""
+        with self._lock:
+            current = self._boards.get(board.job_id)
+            if current is not previous or current.version != version:
+                return False
+            self._boards[board.job_id] = board
+            return True
+
+    def discard(self, board: BidLeaderboard):
+        """Drop a board (e.g. a placeholder whose reload failed) if it is still the loaded one."""
+        with self._lock:
+            if self._boards.get(board.job_id) is board:
+                del self._boards[board.job_id]
+
+    def track(self, bid: Dict):
+        """Apply a created or updated bid to its job's board, if one is loaded."""
+        with self._lock:
+            board = self._boards.get(bid["job_id"])
+            if board:
+                board.offer(bid)
+
+    def remove(self, job_id: int, bid_id: int):
+        """Drop a deleted bid from its job's board, if one is loaded."""
+        with self._lock:
+            board = self._boards.get(job_id)
+            if board:
+                board.remove(bid_id)
+
+    def invalidate(self, job_ids: Iterable[int]):
+        """Forget the boards of jobs whose bids changed outside BidService."""
+        with self._lock:
+            for job_id in job_ids:
+                self._boards.pop(job_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._boards.clear()
+
+
+# The one registry every service in the process reads and invalidates
+leaderboards = LeaderboardRegistry()
+
+
+def leaderboard_diff(previous: List[Dict], current: List[Dict]) -> Dict[str, List[Dict]]:
+    """Compare two leaderboard snapshots and report added, removed and changed bids."""
+    before = {bid["bid_id"]: (rank, bid) for rank, bid in enumerate(previous, 1)}
+    after = {bid["bid_id"]: (rank, bid) for rank, bid in enumerate(current, 1)}
+    added = [{**bid, "rank": rank} for bid_id, (rank, bid) in after.items() if bid_id not in before]
+    removed = [{**bid, "rank": rank} for bid_id, (rank, bid) in before.items() if bid_id not in after]
+    changed = []
+    for bid_id, (rank, bid) in after.items():
+        if bid_id in before:
+            old_rank, old_bid = before[bid_id]
+            if old_rank != rank or old_bid["amount"] != bid["amount"]:
+                changed.append({**bid, "rank": rank, "previous_rank": old_rank,
+                                "previous_amount": old_bid["amount"]})
+    return {"added": added, "removed": removed, "changed": changed}
@@ -1,13 +1,28 @@
+import time
+from datetime import date
 from typing import List, Dict,Optional
 from src.dao.bid_dao import BidDAO
 from src.dao.job_dao import JobDAO
 from src.dao.user_dao import UserDAO
 from src.dao.jobstatus_dao import JobStatusDAO
+from src.dao.paging import SORTABLE, id_batches
+from src.dao.errors import ConstraintViolation
+from src.services.bid_leaderboard import BidLeaderboard, leaderboards
+from src.services.metrics import instrumented
+from src.services import tasks
+
+# Number of lowest pending bids tracked per job, and how long a board is
+# trusted before it is reloaded to pick up writes made by other processes
+LEADERBOARD_SIZE = 10
+LEADERBOARD_TTL_SECONDS = 30
+# Bids checked and changed per request by the bulk operations
+BULK_BATCH_SIZE = 500
 
 class BidError(Exception):
     """Exception raised for bid-related errors."""
     pass
 
+@instrumented
 class BidService:
     """Business logic for bid operations."""
     
@@ -24,8 +39,9 @@ class BidService:
         job = self.jobdao.get_job_by_id(job_id)
         if not job:
             raise BidError(f"Job with id {job_id} does not exist")
-        if job["status"] != "open":
-            raise BidError(f"Cannot bid on job with status '{job['status']}'")
+        problem = self._bidding_problem(job)
+        if problem:
+            raise BidError(problem)
         
         # Validate freelancer exists and has correct role
         freelancer = self.userdao.get_user_by_id(freelancer_id)
@@ -38,43 +54,191 @@ class BidService:
         if amount <= 0:
             raise BidError("Bid amount must be greater than zero")
         
-        # Check if bid already exists for this job-freelancer combination
-        existing_bid = self.biddao.get_bid_by_job_and_freelancer(job_id, freelancer_id)
-        if existing_bid:
-            raise BidError(f"Freelancer has already placed a bid on job {job_id}")
+        # One bid per freelancer and job is enforced by the database
+        try:
+            bid = self.biddao.create_bid(job_id, freelancer_id, amount, message)
+        except ConstraintViolation as e:
+            raise self._bid_error(e)
+        self._track_bid(bid)
+        return bid
+    
+    def create_bids(self, freelancer_id: int, items: List[tuple]) -> List[Dict]:
+        """Create many bids for one freelancer with a fixed number of requests.
+        
+        Each item is (job_id, amount) or (job_id, amount, message). Returns one
+        result per item, in order, with either the created bid or an error.
+        The valid bids are inserted together; if the database rejects one of
+        them (e.g. a concurrent bid on the same job), that item gets the error
+        and the others are inserted again without it.
+        """
+        if not items:
+            raise BidError("No bids to create")
+        
+        # Validate freelancer once for the whole batch
+        freelancer = self.userdao.get_user_by_id(freelancer_id)
+        if not freelancer:
+            raise BidError(f"Freelancer with id {freelancer_id} does not exist")
+        if freelancer["role"] != "freelancer":
+            raise BidError(f"User with id {freelancer_id} is not a freelancer")
+        
+        # One query for all target jobs and one for existing bids on them
+        job_ids = list({item[0] for item in items if self._item_problem(item) is None})
+        jobs = {job["job_id"]: job for job in self.jobdao.get_jobs_by_ids(job_ids)}
+        already_bid = {bid["job_id"] for bid in self.biddao.get_bids_by_freelancer_for_jobs(freelancer_id, job_ids)}
         
-        return self.biddao.create_bid(job_id, freelancer_id, amount, message)
+        results = []
+        pending = []
+        for item in items:
+            error = self._item_problem(item)
+            if error:
+                results.append({"job_id": None, "ok": False, "error": error})
+                continue
+            job_id, amount = item[0], item[1]
+            message = item[2] if len(item) > 2 else None
+            job = jobs.get(job_id)
+            if not job:
+                error = f"Job with id {job_id} does not exist"
+            elif amount <= 0:
+                error = "Bid amount must be greater than zero"
+            elif job_id in already_bid:
+                error = f"Freelancer has already placed a bid on job {job_id}"
+            else:
+                error = self._bidding_problem(job)
+            
+            if error:
+                results.append({"job_id": job_id, "ok": False, "error": error})
+                continue
+            
+            already_bid.add(job_id)
+            row = {"job_id": job_id, "freelancer_id": freelancer_id, "amount": amount}
+            if message:
+                row["message"] = message
+            result = {"job_id": job_id, "ok": True, "bid": None}
+            pending.append((result, row))
+            results.append(result)
+        
+        # Insert every valid bid in a single request, dropping any the database rejects
+        created = {}
+        while pending:
+            try:
+                created = {bid["job_id"]: bid for bid in self.biddao.create_bids([row for _, row in pending])}
+                break
+            except ConstraintViolation as e:
+                failed = [(result, row) for result, row in pending if str(row["job_id"]) == e.values.get("job_id")]
+                if not failed:
+                    # The violation does not name its row: find it by inserting the bids one at a time
+                    created = self._create_bids_one_by_one(pending)
+                    break
+                for result, _ in failed:
+                    result.update(ok=False, error=str(self._bid_error(e)))
+                    del result["bid"]
+                pending = [(result, row) for result, row in pending if str(row["job_id"]) != e.values.get("job_id")]
+        for result in results:
+            if result["ok"]:
+                result["bid"] = created.get(result["job_id"])
+                self._track_bid(result["bid"])
+        return results
+    
+    @staticmethod
+    def _bidding_problem(job: Dict) -> Optional[str]:
+        """Why a job takes no new bids, or None if it does.
+        
+        Bidding closes on the deadline, when the scheduler's close-bidding
+        action rejects the pending bids, so a job still open after its
+        deadline takes no new ones.
+        """
+        if job["status"] != "open":
+            return f"Cannot bid on job with status '{job['status']}'"
+        if str(job["deadline"]) <= date.today().isoformat():
+            return f"Bidding on job {job['job_id']} closed on its deadline {job['deadline']}"
+        return None
+    
+    @staticmethod
+    def _item_problem(item) -> Optional[str]:
+        """Why a create_bids item is not a (job_id, amount[, message]) tuple, or None if it is."""
+        if not isinstance(item, (tuple, list)) or len(item) not in (2, 3):
+            return f"Invalid bid {item!r}: expected (job_id, amount) or (job_id, amount, message)"
+        job_id, amount = item[0], item[1]
+        if not isinstance(job_id, int) or isinstance(job_id, bool):
+            return f"Invalid job id {job_id!r}"
+        if not isinstance(amount, (int, float)) or isinstance(amount, bool):
+            return f"Invalid bid amount {amount!r}"
+        if len(item) > 2 and item[2] is not None and not isinstance(item[2], str):
+            return f"Invalid bid message {item[2]!r}"
+        return None
+    
+    def _create_bids_one_by_one(self, pending: List[tuple]) -> Dict[int, Dict]:
+        """Insert (result, row) pairs separately, recording each rejected one on its result."""
+        created = {}
+        for result, row in pending:
+            try:
+                created.update((bid["job_id"], bid) for bid in self.biddao.create_bids([row]))
+            except ConstraintViolation as e:
+                result.update(ok=False, error=str(self._bid_error(e)))
+                del result["bid"]
+        return created
+    
+    @staticmethod
+    def _bid_error(violation: ConstraintViolation) -> BidError:
+        """The BidError message for a constraint the database rejected a bid write with."""
+        if violation.on("unique", "job_id", "freelancer_id"):
+            return BidError(f"Freelancer has already placed a bid on job {violation.values.get('job_id')}")
+        if violation.on("foreign_key", "job_id"):
+            return BidError(f"Job with id {violation.values.get('job_id')} does not exist")
+        if violation.on("foreign_key", "freelancer_id"):
+            return BidError(f"Freelancer with id {violation.values.get('freelancer_id')} does not exist")
+        if violation.on("check", "amount"):
+            return BidError("Bid amount must be greater than zero")
+        return BidError(str(violation))
     
     def update_bid(self, bid_id: int, fields: Dict) -> Dict:
         """Update bid with validation."""
-        bid = self.biddao.get_bid_by_id(bid_id)
-        if not bid:
-            raise BidError(f"Bid with id {bid_id} does not exist")
-        
         # Validate amount if being updated
         if "amount" in fields and fields["amount"] <= 0:
             raise BidError("Bid amount must be greater than zero")
         
+        # Plain edits only apply to pending bids; one guarded write checks and applies
+        if "bid_status" not in fields:
+            updated = self.biddao.update_bid(bid_id, fields, expect={"bid_status": "pending"})
+            if not updated:
+                # Read only to explain why the guard did not match
+                bid = self.biddao.get_bid_by_id(bid_id)
+                if not bid:
+                    raise BidError(f"Bid with id {bid_id} does not exist")
+                raise BidError(f"Cannot update bid with status '{bid['bid_status']}'")
+            self._track_bid(updated)
+            return updated
+        
         # Validate bid_status if being updated
-        if "bid_status" in fields:
-            valid_statuses = ['pending', 'accepted', 'rejected']
-            if fields["bid_status"] not in valid_statuses:
-                raise BidError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
-            
-            # If accepting bid, assign freelancer to job
-            if fields["bid_status"] == "accepted":
-                job = self.jobdao.get_job_by_id(bid["job_id"])
-                if job and job["status"] == "open":
-                    self.jobdao.update_job(bid["job_id"], {
-                        "assigned_to": bid["freelancer_id"],
-                        "status": "assigned"
-                    })
+        valid_statuses = ['pending', 'accepted', 'rejected']
+        if fields["bid_status"] not in valid_statuses:
+            raise BidError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
         
-        # Don't allow updates if bid is already accepted or rejected
-        if bid["bid_status"] in ['accepted', 'rejected'] and "bid_status" not in fields:
-            raise BidError(f"Cannot update bid with status '{bid['bid_status']}'")
+        bid = self.biddao.get_bid_by_id(bid_id)
+        if not bid:
+            raise BidError(f"Bid with id {bid_id} does not exist")
         
-        return self.biddao.update_bid(bid_id, fields)
+        # If accepting bid, assign freelancer to job while it is still open
+        claimed = None
+        if fields["bid_status"] == "accepted":
+            claimed = self.jobdao.update_job(bid["job_id"], {
+                "assigned_to": bid["freelancer_id"],
+                "status": "assigned"
+            }, expect={"status": "open"})
+        
+        # Change the status only if nobody changed it since the read (e.g. a concurrent accept)
+        updated = self.biddao.update_bid(bid_id, fields, expect={"bid_status": bid["bid_status"]})
+        if not updated:
+            if claimed:
+                # Release the job claimed above
+                self.jobdao.update_job(bid["job_id"], {"assigned_to": None, "status": "open"},
+                                       expect={"status": "assigned", "assigned_to": bid["freelancer_id"]})
+            current = self.biddao.get_bid_by_id(bid_id)
+            if not current:
+                raise BidError(f"Bid with id {bid_id} does not exist")
+            raise BidError(f"Bid {bid_id} changed to '{current['bid_status']}' meanwhile")
+        self._track_bid(updated)
+        return updated
     
     def accept_bid(self, bid_id: int) -> Dict:
         """Accept a bid only if it is the lowest bid for that job, then reject all others."""
@@ -85,13 +249,6 @@ class BidService:
         if bid["bid_status"] != "pending":
             raise BidError(f"Cannot accept bid with status '{bid['bid_status']}'")
     
-        # Validate job exists and is open
-        job = self.jobdao.get_job_by_id(bid["job_id"])
-        if not job:
-            raise BidError(f"Job with id {bid['job_id']} does not exist")
-        if job["status"] != "open":
-            raise BidError(f"Cannot accept bids for job with status '{job['status']}'")
-    
         # Get all pending bids for this job
         all_bids = self.biddao.get_bids_by_job_id(bid["job_id"])
         pending_bids = [b for b in all_bids if b["bid_status"] == "pending"]
@@ -106,43 +263,125 @@ class BidService:
         if bid["bid_id"] != lowest_bid["bid_id"]:
             raise BidError(f"Cannot accept bid. Bid {lowest_bid['bid_id']} with amount {lowest_bid['amount']} is lower")
     
-        # Get IDs of all other pending bids to reject
-        other_bid_ids = [b["bid_id"] for b in pending_bids if b["bid_id"] != bid_id]
-    
-        # Reject all other bids
-        if other_bid_ids:
-            for other_bid_id in other_bid_ids:
-                self.biddao.update_bid(other_bid_id, {"bid_status": "rejected"})
-    
-        # Update job: assign freelancer and change status to 'assigned'
-        self.jobdao.update_job(bid["job_id"], {
+        # Claim the job: assign the freelancer only while the job is still open
+        job = self.jobdao.update_job(bid["job_id"], {
             "assigned_to": bid["freelancer_id"],
             "status": "assigned"
-        })
+        }, expect={"status": "open"})
+        if not job:
+            job = self.jobdao.get_job_by_id(bid["job_id"])
+            if not job:
+                raise BidError(f"Job with id {bid['job_id']} does not exist")
+            raise BidError(f"Cannot accept bids for job with status '{job['status']}'")
+    
+        # Accept the bid only if nobody changed it meanwhile
+        accepted_bid = self.biddao.update_bid(bid_id, {"bid_status": "accepted"},
+                                              expect={"bid_status": "pending"})
+        if not accepted_bid:
+            # Release the job claimed above
+            self.jobdao.update_job(bid["job_id"], {"assigned_to": None, "status": "open"},
+                                   expect={"status": "assigned", "assigned_to": bid["freelancer_id"]})
+            raise BidError(f"Bid {bid_id} is no longer pending")
+    
+        # Reject all other pending bids in one request
+        other_bid_ids = [b["bid_id"] for b in pending_bids if b["bid_id"] != bid_id]
+        rejected = self.biddao.update_bids(other_bid_ids, {"bid_status": "rejected"}, expect={"bid_status": "pending"})
     
-        # Track job status change in history
-        self.jobstatusdao.create_job_status(bid["job_id"], "assigned")
+        # Status history and word to the other bidders, off the request path in queue mode
+        tasks.submit("job_status", {"job_id": bid["job_id"], "status": "assigned", "updated_at": tasks.now()})
+        self._notify_rejected(rejected)
     
-        # Accept the bid
-        accepted_bid = self.biddao.update_bid(bid_id, {"bid_status": "accepted"})
+        # No pending bids remain for this job
+        leaderboards.invalidate([bid["job_id"]])
     
         return accepted_bid
     
+    @staticmethod
+    def _notify_rejected(rejected: List[Dict]):
+        """Tell the freelancers whose bids were rejected."""
+        tasks.submit_many("notify", [{
+            "key": f"bid_rejected:{bid['bid_id']}",
+            "event": "bid_rejected",
+            "user_id": bid["freelancer_id"],
+            "job_id": bid["job_id"],
+            "bid_id": bid["bid_id"],
+            "at": tasks.now()
+        } for bid in rejected])
+    
+    def close_bidding(self, job_ids: List[int]) -> List[Dict]:
+        """Reject every pending bid on the given jobs in one request, as accept_bid does for the losers."""
+        rejected = self.biddao.reject_pending_bids_for_jobs(job_ids)
+        leaderboards.invalidate(job_ids)
+        self._notify_rejected(rejected)
+        return rejected
+    
     def reject_bid(self, bid_id: int) -> Dict:
         """Reject a bid."""
         return self.update_bid(bid_id, {"bid_status": "rejected"})
     
+    def bulk_reject(self, bid_ids: Optional[List[int]] = None, job_id: Optional[int] = None,
+                    freelancer_id: Optional[int] = None, bid_status: Optional[str] = None,
+                    limit: Optional[int] = None, batch_size: int = BULK_BATCH_SIZE,
+                    dry_run: bool = False) -> Dict:
+        """Reject many bids, listed by ID or matched by filters, with reject_bid's rules.
+        
+        Filters match by job and/or freelancer, optionally narrowed by status.
+        Each batch is checked from one read and rejected with one filtered
+        update. Bids that do not exist are listed in "failures".
+        """
+        if bid_ids is None and job_id is None and freelancer_id is None:
+            raise BidError("Give bid IDs, a job or a freelancer")
+        if bid_status and bid_status not in ('pending', 'accepted', 'rejected'):
+            raise BidError("Invalid status. Must be one of: pending, accepted, rejected")
+        if batch_size < 1:
+            raise BidError("Batch size must be at least 1")
+        
+        started = time.perf_counter()
+        report = {"dry_run": dry_run, "considered": 0, "applied": 0, "unchanged": 0,
+                  "skipped": 0, "failures": []}
+        batches = id_batches(
+            "bid_id", bid_ids, self.biddao.get_bids_by_ids,
+            lambda after_id, size: self.biddao.get_bids_page(
+                "*", after_id, size, bid_status=bid_status, job_id=job_id, freelancer_id=freelancer_id),
+            batch_size, limit
+        )
+        for batch, bids in batches:
+            report["considered"] += len(batch)
+            eligible = []
+            for bid_id in batch:
+                bid = bids.get(bid_id)
+                if not bid:
+                    report["failures"].append({"bid_id": bid_id, "error": f"Bid with id {bid_id} does not exist"})
+                elif bid["bid_status"] == "rejected":
+                    report["unchanged"] += 1
+                else:
+                    eligible.append(bid_id)
+            if dry_run:
+                report["applied"] += len(eligible)
+                continue
+            
+            rejected = self.biddao.update_bids(eligible, {"bid_status": "rejected"}, unless={"bid_status": "rejected"})
+            report["applied"] += len(rejected)
+            report["skipped"] += len(eligible) - len(rejected)
+            for bid in rejected:
+                self._track_bid(bid)
+        
+        report["failed"] = len(report["failures"])
+        report["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return report
+    
     def delete_bid(self, bid_id: int) -> Dict:
         """Delete a bid."""
-        bid = self.biddao.get_bid_by_id(bid_id)
-        if not bid:
-            raise BidError(f"Bid with id {bid_id} does not exist")
-        
-        # Only allow deletion if bid is pending
-        if bid["bid_status"] != "pending":
+        # Only allow deletion if bid is pending, checked by the delete itself
+        deleted = self.biddao.delete_bid(bid_id, expect={"bid_status": "pending"})
+        if not deleted:
+            bid = self.biddao.get_bid_by_id(bid_id)
+            if not bid:
+                raise BidError(f"Bid with id {bid_id} does not exist")
             raise BidError(f"Cannot delete bid with status '{bid['bid_status']}'")
         
-        return self.biddao.delete_bid(bid_id)
+        leaderboards.remove(deleted["job_id"], bid_id)
+        return deleted
     
     def get_bid_by_id(self, bid_id: int) -> Dict:
         """Retrieve a bid by ID."""
@@ -171,5 +410,60 @@ class BidService:
             valid_statuses = ['pending', 'accepted', 'rejected']
             if status not in valid_statuses:
                 raise BidError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
-            return self.biddao.get_bids_by_status(status)
-        return self.biddao.list_bids(limit)
\ No newline at end of file
+            return self.biddao.get_bids_by_status(status, limit)
+        return self.biddao.list_bids(limit)
+    
+    def page_bids(self, status: Optional[str] = None, sort: str = "bid_id", desc: bool = False,
+                  cursor: Optional[str] = None, limit: int = 25) -> Dict:
+        """One page of bids plus the cursor for the next (and, on the first page, an estimated total)."""
+        if status:
+            valid_statuses = ['pending', 'accepted', 'rejected']
+            if status not in valid_statuses:
+                raise BidError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        if sort not in SORTABLE["bids"]:
+            raise BidError(f"Cannot sort bids by {sort}. Use one of: {', '.join(SORTABLE['bids'])}")
+        if limit < 1 or limit > 100:
+            raise BidError("Limit must be between 1 and 100")
+        try:
+            return self.biddao.list_bids_page(status or None, sort, desc, cursor, limit)
+        except ValueError as e:
+            raise BidError(str(e))
+    
+    def export_bids(self, status: Optional[str] = None, limit: Optional[int] = None):
+        """Every bid (optionally in one status, up to `limit`) as a typed pyarrow.Table."""
+        if status:
+            valid_statuses = ['pending', 'accepted', 'rejected']
+            if status not in valid_statuses:
+                raise BidError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        if limit is not None and limit < 1:
+            raise BidError("Limit must be at least 1")
+        return self.biddao.get_bids_arrow(status or None, limit=limit)
+    
+    def _track_bid(self, bid: Optional[Dict]):
+        """Apply a created or updated bid to its job's leaderboard, if one is loaded."""
+        if bid:
+            leaderboards.track(bid)
+    
+    def get_bid_leaderboard(self, job_id: int, k: int = LEADERBOARD_SIZE) -> Dict:
+        """Get the k lowest pending bids for a job, served from memory when possible."""
+        if k < 1 or k > LEADERBOARD_SIZE:
+            raise BidError(f"Leaderboard size must be between 1 and {LEADERBOARD_SIZE}")
+        
+        board = leaderboards.fresh(job_id, LEADERBOARD_TTL_SECONDS)
+        if board:
+            return {"job_id": job_id, "version": board.version, "bids": board.top(k)}
+        
+        # (Re)load with one ordered, limited query. The new board is kept only if
+        # no write touched the old one meanwhile; otherwise the next read reloads
+        previous, version, created = leaderboards.begin_reload(job_id, LEADERBOARD_SIZE)
+        try:
+            if created and not self.jobdao.get_job_by_id(job_id):
+                raise BidError(f"Job with id {job_id} does not exist")
+            bids = self.biddao.get_lowest_pending_bids(job_id, LEADERBOARD_SIZE)
+        except BaseException:
+            if created:
+                leaderboards.discard(previous)
+            raise
+        board = BidLeaderboard(job_id, LEADERBOARD_SIZE, bids)
+        leaderboards.store(board, previous, version)
+        return {"job_id": job_id, "version": board.version, "bids": board.top(k)}
@@ -1,12 +1,23 @@
+import time
 from datetime import datetime
 from src.dao.user_dao import UserDAO
 from src.dao.job_dao import JobDAO
 from src.dao.bid_dao import BidDAO
 from src.dao.jobstatus_dao import JobStatusDAO
+from src.dao.paging import SORTABLE, id_batches
+from src.dao.errors import ConstraintViolation
+from src.dao.geo import location_problem
+from src.services.bid_leaderboard import leaderboards
+from src.services.metrics import instrumented
+from src.services import tasks
 from typing import List, Dict,Optional
+# Jobs checked and changed per request by the bulk operations
+BULK_BATCH_SIZE = 500
+
 class JobError(Exception):
     pass
 
+@instrumented
 class JobService:
     """Business logic for job operations."""
     
@@ -15,9 +26,20 @@ class JobService:
         self.userdao = UserDAO()
         self.biddao = BidDAO()
         self.job_status_dao = JobStatusDAO()
+        self._listeners = []
+    
+    def add_listener(self, callback):
+        """Register a callback invoked with every job created or updated through this service."""
+        self._listeners.append(callback)
+    
+    def _notify(self, job: Optional[Dict]):
+        if job:
+            for callback in self._listeners:
+                callback(job)
         
     def create_job(self, title: str, client_id: int, budget: float, deadline_str: str, 
-                   assigned_to: Optional[int] = None) -> Dict:
+                   assigned_to: Optional[int] = None, latitude: Optional[float] = None,
+                   longitude: Optional[float] = None) -> Dict:
         """Create a new job with validation."""
         # Validate client exists and has correct role
         client = self.userdao.get_user_by_id(client_id)
@@ -48,21 +70,26 @@ class JobService:
         if deadline_date <= today:
             raise JobError(f"Deadline {deadline_str} must be in the future")
         
-        # Check for duplicate job title by same client
-        existing_job = self.jobdao.get_job_by_clientid_and_title(client_id, title)
-        if existing_job:
-            raise JobError(f"Client already has a job with title '{title}'")
+        # Validate location (optional)
+        problem = location_problem(latitude, longitude)
+        if problem:
+            raise JobError(problem)
         
         # Determine status based on assignment
         status = 'assigned' if assigned_to else 'open'
         
-        # Create the job
-        job = self.jobdao.create_job(title, client_id, budget, deadline_str, assigned_to, status)
+        # Create the job; duplicate titles per client are rejected by the database
+        try:
+            job = self.jobdao.create_job(title, client_id, budget, deadline_str, assigned_to, status,
+                                         latitude, longitude)
+        except ConstraintViolation as e:
+            raise self._job_error(e, title)
         
-        # Create initial status history
+        # Initial status history, off the request path in queue mode
         if job:
-            self.job_status_dao.create_job_status(job["job_id"], status)
+            tasks.submit("job_status", {"job_id": job["job_id"], "status": status, "updated_at": tasks.now()})
         
+        self._notify(job)
         return job
     
     def update_job(self, job_id: int, fields: Dict) -> Dict:
@@ -85,6 +112,12 @@ class JobService:
             except ValueError:
                 raise JobError("Invalid deadline format. Use YYYY-MM-DD")
         
+        # Validate location if being updated; both coordinates change together
+        if "latitude" in fields or "longitude" in fields:
+            problem = location_problem(fields.get("latitude"), fields.get("longitude"))
+            if problem:
+                raise JobError(problem)
+        
         # Validate freelancer if being assigned
         if "assigned_to" in fields and fields["assigned_to"]:
             freelancer = self.userdao.get_user_by_id(fields["assigned_to"])
@@ -99,11 +132,32 @@ class JobService:
             else: 
                 if not job["assigned_to"] and not fields["assigned_to"]: 
                     raise JobError(f"Cannot update status as the job is not assigned to any freelancer")
-            # Track status change in history
-            if fields["status"] != job["status"]:
-                self.job_status_dao.create_job_status(job_id, fields["status"])
         
-        return self.jobdao.update_job(job_id, fields)
+        changed_at = tasks.now()
+        try:
+            updated = self.jobdao.update_job(job_id, fields)
+        except ConstraintViolation as e:
+            raise self._job_error(e, fields.get("title"))
+        # Track status change in history once the update has been applied
+        if updated and "status" in fields and fields["status"] != job["status"]:
+            tasks.submit("job_status", {"job_id": job_id, "status": fields["status"], "updated_at": changed_at})
+        self._notify(updated)
+        return updated
+    
+    @staticmethod
+    def _job_error(violation: ConstraintViolation, title: Optional[str] = None) -> JobError:
+        """The JobError message for a constraint the database rejected a job write with."""
+        if violation.on("unique", "client_id", "title"):
+            return JobError(f"Client already has a job with title '{title}'")
+        if violation.on("foreign_key", "client_id"):
+            return JobError(f"Client with id {violation.values.get('client_id')} does not exist")
+        if violation.on("foreign_key", "assigned_to"):
+            return JobError(f"Freelancer with id {violation.values.get('assigned_to')} does not exist")
+        if violation.on("check", "budget"):
+            return JobError("Budget must be greater than zero")
+        if violation.on("check", "location") or violation.on("check", "latitude") or violation.on("check", "longitude"):
+            return JobError("Invalid location. Give latitude (-90 to 90) and longitude (-180 to 180) together")
+        return JobError(str(violation))
     
     def assign_freelancer_to_job(self, job_id: int, freelancer_id: int) -> Dict:
         """Assign a freelancer to a job."""
@@ -123,15 +177,77 @@ class JobService:
     
     def delete_job(self, job_id: int) -> Dict:
         """Delete a job."""
-        job = self.jobdao.get_job_by_id(job_id)
-        if not job:
-            raise JobError(f"Job with id {job_id} does not exist")
-        
-        # Only allow deletion if job is not in progress or completed
-        if job["status"] in ['in-progress', 'completed']:
+        # Only allow deletion if job is not in progress or completed, checked by the delete itself
+        deleted = self.jobdao.delete_job(job_id, expect_status_in=['open', 'assigned'])
+        if not deleted:
+            # Read only to explain why the guard did not match
+            job = self.jobdao.get_job_by_id(job_id)
+            if not job:
+                raise JobError(f"Job with id {job_id} does not exist")
             raise JobError(f"Cannot delete job with status '{job['status']}'")
         
-        return self.jobdao.delete_job(job_id)
+        # Its bids went with it
+        leaderboards.invalidate([job_id])
+        return deleted
+    
+    def bulk_update_status(self, status: str, job_ids: Optional[List[int]] = None,
+                           current_status: Optional[str] = None, client_id: Optional[int] = None,
+                           freelancer_id: Optional[int] = None, limit: Optional[int] = None,
+                           batch_size: int = BULK_BATCH_SIZE, dry_run: bool = False) -> Dict:
+        """Set the status of many jobs, listed by ID or matched by filters, with update_job's rules.
+        
+        Each batch is checked from one read and changed with one filtered
+        update; the history rows of the jobs that changed are written in one
+        insert. Jobs that break a rule are listed in "failures" and left alone.
+        """
+        valid_statuses = ['assigned', 'in-progress', 'completed']
+        if status not in valid_statuses:
+            raise JobError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        if job_ids is None and not (current_status or client_id or freelancer_id):
+            raise JobError("Give job IDs or at least one filter")
+        if batch_size < 1:
+            raise JobError("Batch size must be at least 1")
+        
+        started = time.perf_counter()
+        report = {"status": status, "dry_run": dry_run, "considered": 0, "applied": 0,
+                  "unchanged": 0, "skipped": 0, "failures": []}
+        batches = id_batches(
+            "job_id", job_ids, self.jobdao.get_jobs_by_ids,
+            lambda after_id, size: self.jobdao.get_jobs_page(
+                "*", after_id, size, status=current_status, client_id=client_id, assigned_to=freelancer_id),
+            batch_size, limit
+        )
+        for batch, jobs in batches:
+            report["considered"] += len(batch)
+            eligible = []
+            for job_id in batch:
+                job = jobs.get(job_id)
+                if not job:
+                    report["failures"].append({"job_id": job_id, "error": f"Job with id {job_id} does not exist"})
+                elif not job["assigned_to"]:
+                    report["failures"].append({"job_id": job_id, "error": "Cannot update status as the job is not assigned to any freelancer"})
+                elif job["status"] == status:
+                    report["unchanged"] += 1
+                else:
+                    eligible.append(job_id)
+            if dry_run:
+                report["applied"] += len(eligible)
+                continue
+            
+            changed_at = tasks.now()
+            updated = self.jobdao.update_jobs(eligible, {"status": status}, unless={"status": status})
+            # Jobs deleted or moved to this status since the read are not written twice
+            report["applied"] += len(updated)
+            report["skipped"] += len(eligible) - len(updated)
+            tasks.submit_many("job_status", [
+                {"job_id": job["job_id"], "status": status, "updated_at": changed_at} for job in updated
+            ])
+            for job in updated:
+                self._notify(job)
+        
+        report["failed"] = len(report["failures"])
+        report["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return report
     
     def get_job_by_id(self, job_id: int) -> Dict:
         """Retrieve a job by ID."""
@@ -160,5 +276,138 @@ class JobService:
             valid_statuses = ['open', 'assigned', 'in-progress', 'completed']
             if status not in valid_statuses:
                 raise JobError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
-            return self.jobdao.get_jobs_by_status(status)
-        return self.jobdao.list_jobs(limit)
\ No newline at end of file
+            return self.jobdao.get_jobs_by_status(status, limit)
+        return self.jobdao.list_jobs(limit)
+    
+    def page_jobs(self, status: Optional[str] = None, sort: str = "job_id", desc: bool = False,
+                  cursor: Optional[str] = None, limit: int = 25) -> Dict:
+        """One page of jobs plus the cursor for the next (and, on the first page, an estimated total)."""
+        if status:
+            valid_statuses = ['open', 'assigned', 'in-progress', 'completed']
+            if status not in valid_statuses:
+                raise JobError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        if sort not in SORTABLE["jobs"]:
+            raise JobError(f"Cannot sort jobs by {sort}. Use one of: {', '.join(SORTABLE['jobs'])}")
+        if limit < 1 or limit > 100:
+            raise JobError("Limit must be between 1 and 100")
+        try:
+            return self.jobdao.list_jobs_page(status or None, sort, desc, cursor, limit)
+        except ValueError as e:
+            raise JobError(str(e))
+    
+    def export_jobs(self, status: Optional[str] = None, limit: Optional[int] = None):
+        """Every job (optionally in one status, up to `limit`) as a typed pyarrow.Table."""
+        if status:
+            valid_statuses = ['open', 'assigned', 'in-progress', 'completed']
+            if status not in valid_statuses:
+                raise JobError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        if limit is not None and limit < 1:
+            raise JobError("Limit must be at least 1")
+        return self.jobdao.get_jobs_arrow(status or None, limit=limit)
+    
+    def search_jobs(self, query: str, status: Optional[str] = None,
+                    min_budget: Optional[float] = None, max_budget: Optional[float] = None,
+                    deadline_from: Optional[str] = None, deadline_to: Optional[str] = None,
+                    cursor: Optional[str] = None, limit: int = 20) -> Dict:
+        """Search jobs by title and return one ranked page plus the cursor for the next."""
+        if status:
+            valid_statuses = ['open', 'assigned', 'in-progress', 'completed']
+            if status not in valid_statuses:
+                raise JobError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        
+        # Validate budget range
+        if min_budget is not None and min_budget < 0:
+            raise JobError("Minimum budget cannot be negative")
+        if max_budget is not None and max_budget < 0:
+            raise JobError("Maximum budget cannot be negative")
+        if min_budget is not None and max_budget is not None and min_budget > max_budget:
+            raise JobError("Minimum budget cannot exceed maximum budget")
+        
+        # Validate deadline range
+        for value in (deadline_from, deadline_to):
+            if value:
+                try:
+                    datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    raise JobError(f"Invalid date format: {value}. Use YYYY-MM-DD")
+        if deadline_from and deadline_to and deadline_from > deadline_to:
+            raise JobError("Deadline range start must not be after its end")
+        
+        if limit < 1 or limit > 100:
+            raise JobError("Limit must be between 1 and 100")
+        
+        # Cursor is "<rank>:<job_id>" of the last row on the previous page
+        after_rank, after_id = None, None
+        if cursor:
+            try:
+                rank_str, id_str = cursor.split(":")
+                after_rank, after_id = float(rank_str), int(id_str)
+            except ValueError:
+                raise JobError(f"Invalid cursor: {cursor}")
+        
+        # Fetch one extra row to know whether another page exists
+        rows = self.jobdao.search_jobs(
+            (query or "").strip(), status, min_budget, max_budget,
+            deadline_from or None, deadline_to or None, after_rank, after_id, limit + 1
+        )
+        jobs = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = jobs[-1]
+            next_cursor = f"{last['rank']!r}:{last['job_id']}"
+        
+        return {"jobs": jobs, "next_cursor": next_cursor}
+    
+    def find_nearby_jobs(self, freelancer_id: int, radius_km: Optional[float] = None,
+                         status: Optional[str] = "open", min_budget: Optional[float] = None,
+                         max_budget: Optional[float] = None, cursor: Optional[str] = None,
+                         limit: int = 20) -> Dict:
+        """Jobs near a freelancer, nearest first, as one page plus the cursor for the next.
+        
+        The radius defaults to the freelancer's service radius.
+        """
+        freelancer = self.userdao.get_user_by_id(freelancer_id)
+        if not freelancer:
+            raise JobError(f"Freelancer with id {freelancer_id} does not exist")
+        if freelancer["role"] != "freelancer":
+            raise JobError(f"User with id {freelancer_id} is not a freelancer")
+        if freelancer.get("latitude") is None or freelancer.get("longitude") is None:
+            raise JobError(f"Freelancer with id {freelancer_id} has no location set")
+        
+        if radius_km is None:
+            radius_km = freelancer.get("service_radius_km")
+            if radius_km is None:
+                raise JobError("Give a radius or set the freelancer's service radius")
+        if radius_km <= 0:
+            raise JobError("Radius must be greater than zero")
+        
+        if status:
+            valid_statuses = ['open', 'assigned', 'in-progress', 'completed']
+            if status not in valid_statuses:
+                raise JobError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+        if min_budget is not None and max_budget is not None and min_budget > max_budget:
+            raise JobError("Minimum budget cannot exceed maximum budget")
+        if limit < 1 or limit > 100:
+            raise JobError("Limit must be between 1 and 100")
+        
+        # Cursor is "<distance_km>:<job_id>" of the last row on the previous page
+        after_distance, after_id = None, None
+        if cursor:
+            try:
+                distance_str, id_str = cursor.split(":")
+                after_distance, after_id = float(distance_str), int(id_str)
+            except ValueError:
+                raise JobError(f"Invalid cursor: {cursor}")
+        
+        # Fetch one extra row to know whether another page exists
+        rows = self.jobdao.find_nearby_jobs(
+            float(freelancer["latitude"]), float(freelancer["longitude"]), float(radius_km),
+            status or None, min_budget, max_budget, after_distance, after_id, limit + 1
+        )
+        jobs = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = jobs[-1]
+            next_cursor = f"{last['distance_km']!r}:{last['job_id']}"
+        
+        return {"jobs": jobs, "next_cursor": next_cursor}
\ No newline at end of file
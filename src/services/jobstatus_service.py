@@ -1,15 +1,22 @@
+from datetime import datetime, timedelta, timezone
+from postgrest.exceptions import APIError
+from src.config import get_backend_settings
 from src.dao.job_dao import JobDAO
 from src.dao.jobstatus_dao import JobStatusDAO
+from src.dao.status_archive import StatusArchive
+from src.services.metrics import instrumented
 from typing import List, Dict
 class JobStatusError(Exception):
     """Exception raised for job status-related errors."""
     pass
+@instrumented
 class JobStatusService:
     """Business logic for job status history tracking."""
     
     def __init__(self):
         self.job_status_dao = JobStatusDAO()
         self.jobdao = JobDAO()
+        self.archive = StatusArchive(get_backend_settings()["archive_dir"])
         
     def create_job_status(self, job_id: int, status: str) -> Dict:
         """Create a new job status record with validation."""
@@ -26,11 +33,18 @@ class JobStatusService:
         return self.job_status_dao.create_job_status(job_id, status)
     
     def get_status_history(self, job_id: int) -> List[Dict]:
-        """Get complete status history for a job."""
+        """Get complete status history for a job, including archived rows."""
         job = self.jobdao.get_job_by_id(job_id)
         if not job:
             raise JobStatusError(f"Job with id {job_id} does not exist")
-        return self.job_status_dao.get_status_history_by_job_id(job_id)
+        history = self.job_status_dao.get_status_history_by_job_id(job_id)
+        archived = self.archive.history(job_id)
+        if not archived:
+            return history
+        # A run interrupted between writing a segment and deleting its rows leaves both copies
+        by_id = {row["status_id"]: row for row in archived}
+        by_id.update((row["status_id"], row) for row in history)
+        return sorted(by_id.values(), key=lambda row: (row.get("updated_at") or "", row["status_id"]))
     
     def get_latest_status(self, job_id: int) -> Dict:
         """Get the most recent status for a job."""
@@ -52,4 +66,72 @@ class JobStatusService:
     
     def list_all_statuses(self, limit: int = 100) -> List[Dict]:
         """List all status records."""
-        return self.job_status_dao.list_all_statuses(limit)
\ No newline at end of file
+        return self.job_status_dao.list_all_statuses(limit)
+    
+    def archive_history(self, older_than_days: int = 90, batch_size: int = 500) -> Dict:
+        """Move status rows of completed jobs older than N days into local archive segments.
+        
+        Jobs are found from their "completed" status rows older than the
+        cutoff, in (updated_at, status_id) order and starting after the
+        watermark the previous run left in the archive, so each run only visits
+        jobs completed since. Rows are stamped by the caller and may be written
+        later through the task queue, so the scan never relies on ID order
+        matching time order. The newest archivable row of each job stays in the
+        table, so latest-status reads never need the archive. Segments are
+        written before rows are deleted.
+        
+        Segments live on this host's disk, so rows are only archived on the
+        local backend; elsewhere deleting them would hide the history from
+        every other host, and only partition maintenance runs.
+        """
+        if older_than_days < 0:
+            raise JobStatusError("Age in days cannot be negative")
+        if batch_size < 1:
+            raise JobStatusError("Batch size must be at least 1")
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=older_than_days)).isoformat()
+        archived = jobs = 0
+        segments = []
+        watermark = self.archive.watermark()
+        skipped = None
+        if get_backend_settings()["mode"] != "local":
+            skipped = "archive segments are local files; rows are only archived on the local backend"
+        while skipped is None:
+            page = self.job_status_dao.get_completions_after(watermark, cutoff, batch_size)
+            if not page:
+                break
+            # A job reopened since it completed gets another completion row later
+            job_ids = sorted({row["job_id"] for row in page})
+            completed = [job["job_id"] for job in self.jobdao.get_jobs_by_ids(job_ids)
+                         if job["status"] == "completed"]
+            rows = self.job_status_dao.get_statuses_before(completed, cutoff)
+            newest = {}
+            for row in rows:
+                current = newest.get(row["job_id"])
+                if current is None or (row["updated_at"], row["status_id"]) > (current["updated_at"], current["status_id"]):
+                    newest[row["job_id"]] = row
+            movable = [row for row in rows if newest[row["job_id"]] is not row]
+            if movable:
+                segments.append(self.archive.write_segment(movable))
+                archived += self.job_status_dao.delete_statuses([row["status_id"] for row in movable])
+                jobs += len({row["job_id"] for row in movable})
+            watermark = (page[-1]["updated_at"], page[-1]["status_id"])
+            self.archive.set_watermark(*watermark)
+            if len(page) < batch_size:
+                break
+        try:
+            partitions = self.job_status_dao.maintain_partitions()
+        except APIError as e:
+            if e.code != "42501":
+                raise
+            # Partition DDL is limited to the maintenance (service) role
+            partitions = {"skipped": "maintain_job_status_partitions needs the service role key"}
+        return {
+            "archived_rows": archived,
+            "jobs": jobs,
+            "segments": segments,
+            "cutoff": cutoff,
+            "watermark": watermark,
+            "skipped": skipped,
+            "partitions": partitions,
+            "archive": self.archive.stats()
+        }
@@ -0,0 +1,317 @@
+import bisect
+import math
+import multiprocessing
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import List, Dict, Optional
+from src.config import get_backend_settings
+from src.services.user_service import UserService, UserError
+from src.services.job_service import JobService, JobError
+from src.services.bid_service import BidService, BidError
+from src.services.jobstatus_service import JobStatusError
+
+# Relative frequency of each operation in the steady-state mix
+OPERATION_MIX = {
+    "create_bid": 50,
+    "get_bids_by_job": 15,
+    "get_job_by_id": 10,
+    "decide_bid": 12,
+    "update_job": 8,
+    "advance_job": 5
+}
+# Exceptions the services raise for rejected requests, as opposed to failures
+DOMAIN_ERRORS = {error.__name__ for error in (UserError, JobError, BidError, JobStatusError)}
+
+
+class LoadTestError(Exception):
+    """Exception raised for load-test configuration errors."""
+    pass
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct * len(ordered)) - 1))]
+
+
+class OperationStats:
+    """Latencies and outcomes per operation, mergeable across threads and processes."""
+
+    def __init__(self):
+        self.latencies = {}  # op -> [seconds]
+        self.errors = {}  # op -> {exception type: count}
+        self._lock = threading.Lock()
+
+    def record(self, op: str, seconds: float, error: Optional[BaseException] = None):
+        with self._lock:
+            self.latencies.setdefault(op, []).append(seconds)
+            if error is not None:
+                by_type = self.errors.setdefault(op, {})
+                name = type(error).__name__
+                by_type[name] = by_type.get(name, 0) + 1
+
+    def merge(self, other: Dict):
+        with self._lock:
+            for op, samples in other["latencies"].items():
+                self.latencies.setdefault(op, []).extend(samples)
+            for op, by_type in other["errors"].items():
+                mine = self.errors.setdefault(op, {})
+                for name, count in by_type.items():
+                    mine[name] = mine.get(name, 0) + count
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"latencies": {op: list(s) for op, s in self.latencies.items()},
+                    "errors": {op: dict(e) for op, e in self.errors.items()}}
+
+    def report(self, elapsed: float) -> List[Dict]:
+        """One row per operation with throughput, error rate and p50/p95/p99 latency."""
+        rows = []
+        with self._lock:
+            for op in sorted(self.latencies):
+                ordered = sorted(self.latencies[op])
+                by_type = self.errors.get(op, {})
+                errors = sum(by_type.values())
+                rows.append({
+                    "operation": op,
+                    "calls": len(ordered),
+                    "errors": errors,
+                    "failures": sum(n for name, n in by_type.items() if name not in DOMAIN_ERRORS),
+                    "error_rate": round(errors / len(ordered), 4),
+                    "errors_by_type": self.errors.get(op, {}),
+                    "throughput_per_s": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+                    "p50_ms": round(_percentile(ordered, 0.50) * 1000, 2),
+                    "p95_ms": round(_percentile(ordered, 0.95) * 1000, 2),
+                    "p99_ms": round(_percentile(ordered, 0.99) * 1000, 2)
+                })
+        return rows
+
+
+class Workload:
+    """Synthetic marketplace traffic with skewed job popularity and bursts near deadlines.
+
+    A virtual clock runs from day 0 to `horizon_days` over the run. A job's
+    chance of drawing bids follows a Zipf law on its popularity rank and is
+    boosted as its deadline approaches on that clock; once it passes, the
+    client decides on the job's bids instead.
+    """
+
+    def __init__(self, jobs: List[Dict], freelancer_ids: List[int], skew: float = 1.1,
+                 burst: float = 8.0, accept_ratio: float = 0.3, horizon_days: int = 14, seed: int = 0):
+        self.jobs = jobs
+        self.freelancer_ids = freelancer_ids
+        self.skew = skew
+        self.burst = burst
+        self.accept_ratio = accept_ratio
+        self.horizon_days = horizon_days
+        self.rng = random.Random(seed)
+        # Popularity rank is random per job, so it is independent of the deadline
+        ranks = list(range(1, len(jobs) + 1))
+        self.rng.shuffle(ranks)
+        self.popularity = [1.0 / rank ** skew for rank in ranks]
+        self._ops = list(OPERATION_MIX)
+        self._op_cumulative = self._cumulative(OPERATION_MIX.values())
+
+    @staticmethod
+    def _cumulative(weights) -> List[float]:
+        total, out = 0.0, []
+        for weight in weights:
+            total += weight
+            out.append(total)
+        return out
+
+    def _draw(self, cumulative: List[float]) -> int:
+        return bisect.bisect_right(cumulative, self.rng.random() * cumulative[-1])
+
+    def operation(self) -> str:
+        return self._ops[min(self._draw(self._op_cumulative), len(self._ops) - 1)]
+
+    def pick_job(self, virtual_day: float, closing: bool = False) -> Dict:
+        """A job to bid on (weighted by popularity and deadline urgency) or, if closing, one past its deadline."""
+        weights = []
+        for job, popularity in zip(self.jobs, self.popularity):
+            days_left = job["day"] - virtual_day
+            if closing:
+                weights.append(popularity if days_left <= 0 else 0.0)
+            else:
+                weights.append(popularity * (1 + self.burst * math.exp(-days_left)) if days_left > 0 else 0.0)
+        cumulative = self._cumulative(weights)
+        if not cumulative or cumulative[-1] == 0:
+            return self.jobs[self.rng.randrange(len(self.jobs))]
+        return self.jobs[min(self._draw(cumulative), len(self.jobs) - 1)]
+
+    def bid_amount(self, job: Dict) -> float:
+        return round(float(job["budget"]) * self.rng.uniform(0.6, 1.1), 2)
+
+
+class LoadTest:
+    """Drives a synthetic workload through the real service layer and measures it."""
+
+    def __init__(self, clients: int = 5, freelancers: int = 50, jobs: int = 100,
+                 workers: int = 8, processes: int = 1, duration: float = 30.0,
+                 skew: float = 1.1, burst: float = 8.0, accept_ratio: float = 0.3,
+                 horizon_days: int = 14, seed: int = 42):
+        if min(clients, freelancers, jobs, workers, processes) < 1:
+            raise LoadTestError("clients, freelancers, jobs, workers and processes must be at least 1")
+        if duration <= 0:
+            raise LoadTestError("Duration must be positive")
+        if not 0 <= accept_ratio <= 1:
+            raise LoadTestError("Accept ratio must be between 0 and 1")
+        if processes > 1 and get_backend_settings()["mode"] != "supabase":
+            # Each process would load its own copy of the local database
+            raise LoadTestError("Multiple processes need FREELANCE_BACKEND=supabase")
+        self.clients = clients
+        self.freelancers = freelancers
+        self.jobs = jobs
+        self.workers = workers
+        self.processes = processes
+        self.duration = duration
+        self.skew = skew
+        self.burst = burst
+        self.accept_ratio = accept_ratio
+        self.horizon_days = horizon_days
+        self.seed = seed
+        self.stats = OperationStats()
+
+    def _timed(self, op: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            # Rejections (DOMAIN_ERRORS) and failures are both counted by exception type
+            self.stats.record(op, time.perf_counter() - start, e)
+            return None
+        self.stats.record(op, time.perf_counter() - start)
+        return result
+
+    def setup(self) -> Dict:
+        """Create the users and jobs the workload runs against, tagged with a unique run ID."""
+        users, jobs_service = UserService(), JobService()
+        rng = random.Random(self.seed)
+        run = uuid.uuid4().hex[:8]
+        client_ids, freelancer_ids, jobs = [], [], []
+        for i in range(self.clients):
+            user = self._timed("setup.create_user", users.create_user,
+                               f"Load client {i}", f"lt-{run}-c{i}@load.test", "0000000000", "client")
+            if user:
+                client_ids.append(user["user_id"])
+        for i in range(self.freelancers):
+            user = self._timed("setup.create_user", users.create_user,
+                               f"Load freelancer {i}", f"lt-{run}-f{i}@load.test", "0000000000", "freelancer")
+            if user:
+                freelancer_ids.append(user["user_id"])
+        if not client_ids or not freelancer_ids:
+            raise LoadTestError("Setup could not create users; check the backend")
+        for i in range(self.jobs):
+            day = rng.randint(1, self.horizon_days)
+            job = self._timed("setup.create_job", jobs_service.create_job,
+                              f"Load job {run}-{i}", rng.choice(client_ids),
+                              round(rng.uniform(100, 5000), 2), str(date.today() + timedelta(days=day)))
+            if job:
+                jobs.append({"job_id": job["job_id"], "budget": job["budget"], "day": day})
+        if not jobs:
+            raise LoadTestError("Setup could not create jobs; check the backend")
+        return {"run": run, "client_ids": client_ids, "freelancer_ids": freelancer_ids, "jobs": jobs}
+
+    def _worker(self, index: int, fixture: Dict, started: float, services: Dict):
+        workload = Workload(fixture["jobs"], fixture["freelancer_ids"], self.skew, self.burst,
+                            self.accept_ratio, self.horizon_days, seed=self.seed * 1000 + index)
+        bids, jobs = services["bid"], services["job"]
+        while True:
+            elapsed = time.monotonic() - started
+            if elapsed >= self.duration:
+                return
+            virtual_day = elapsed / self.duration * self.horizon_days
+            op = workload.operation()
+            if op == "create_bid":
+                job = workload.pick_job(virtual_day)
+                self._timed(op, bids.create_bid, job["job_id"], workload.rng.choice(fixture["freelancer_ids"]),
+                            workload.bid_amount(job), "load test bid")
+            elif op == "get_bids_by_job":
+                self._timed(op, bids.get_bids_by_job, workload.pick_job(virtual_day)["job_id"])
+            elif op == "get_job_by_id":
+                self._timed(op, jobs.get_job_by_id, workload.pick_job(virtual_day)["job_id"])
+            elif op == "decide_bid":
+                job = workload.pick_job(virtual_day, closing=True)
+                pending = self._timed("get_bids_by_job", bids.get_bids_by_job, job["job_id"]) or []
+                pending = [b for b in pending if b["bid_status"] == "pending"]
+                if not pending:
+                    continue
+                if workload.rng.random() < workload.accept_ratio:
+                    lowest = min(pending, key=lambda b: float(b["amount"]))
+                    self._timed("accept_bid", bids.accept_bid, lowest["bid_id"])
+                else:
+                    self._timed("reject_bid", bids.reject_bid, workload.rng.choice(pending)["bid_id"])
+            elif op == "update_job":
+                job = workload.pick_job(virtual_day)
+                self._timed(op, jobs.update_job, job["job_id"],
+                            {"budget": round(float(job["budget"]) * workload.rng.uniform(0.9, 1.2), 2)})
+            else:
+                # Move an assigned job along its lifecycle
+                job = workload.pick_job(virtual_day, closing=True)
+                current = self._timed("get_job_by_id", jobs.get_job_by_id, job["job_id"])
+                following = {"assigned": "in-progress", "in-progress": "completed"}.get((current or {}).get("status"))
+                if following:
+                    self._timed("update_job_status", jobs.update_job, job["job_id"], {"status": following})
+
+    def run_threads(self, fixture: Dict, first_worker: int = 0) -> float:
+        """Run this process's worker threads against shared services; returns wall time."""
+        services = {"job": JobService(), "bid": BidService()}
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="loadtest") as pool:
+            futures = [pool.submit(self._worker, first_worker + i, fixture, started, services)
+                       for i in range(self.workers)]
+            for future in futures:
+                future.result()
+        return time.monotonic() - started
+
+    def run(self) -> Dict:
+        """Set up a fixture, drive the workload and return the per-operation report."""
+        fixture = self.setup()
+        setup_rows = self.stats.report(1.0)
+        self.stats = OperationStats()
+        if self.processes == 1:
+            elapsed = self.run_threads(fixture)
+        else:
+            started = time.monotonic()
+            # Spawned, not forked: the parent's pooled client and its threads must not be copied
+            with ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+                futures = [pool.submit(_run_in_process, self._settings(), fixture, p * self.workers)
+                           for p in range(self.processes)]
+                for future in futures:
+                    self.stats.merge(future.result())
+            elapsed = time.monotonic() - started
+        operations = self.stats.report(elapsed)
+        calls = sum(row["calls"] for row in operations)
+        errors = sum(row["errors"] for row in operations)
+        failures = sum(row["failures"] for row in operations)
+        return {
+            "backend": get_backend_settings()["mode"],
+            "run": fixture["run"],
+            "workers": self.workers * self.processes,
+            "elapsed_s": round(elapsed, 2),
+            "total_calls": calls,
+            "throughput_per_s": round(calls / elapsed, 2) if elapsed > 0 else 0.0,
+            "error_rate": round(errors / calls, 4) if calls else 0.0,
+            "failure_rate": round(failures / calls, 4) if calls else 0.0,
+            "operations": operations,
+            "setup": [{k: row[k] for k in ("operation", "calls", "errors", "p50_ms", "p95_ms")} for row in setup_rows]
+        }
+
+    def _settings(self) -> Dict:
+        return {"clients": self.clients, "freelancers": self.freelancers, "jobs": self.jobs,
+                "workers": self.workers, "duration": self.duration, "skew": self.skew,
+                "burst": self.burst, "accept_ratio": self.accept_ratio,
+                "horizon_days": self.horizon_days, "seed": self.seed}
+
+
+def _run_in_process(settings: Dict, fixture: Dict, first_worker: int) -> Dict:
+    """Entry point for worker processes: run threads on a shared fixture and return raw stats."""
+    test = LoadTest(**settings)
+    test.run_threads(fixture, first_worker)
+    return test.stats.snapshot()
@@ -0,0 +1,282 @@
+import atexit
+import bisect
+import functools
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency histogram bucket upper bounds, in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_SAMPLE = re.compile(r'^(\w+)\{([^}]*)\} (\S+)$')
+_LABEL = re.compile(r'(\w+)="([^"]*)"')
+
+
+class MethodMetrics:
+    """Call count, errors by exception type and a latency histogram for one service method."""
+
+    __slots__ = ("lock", "calls", "errors", "buckets", "total")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = {}
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.total = 0.0
+
+    def clear(self):
+        with self.lock:
+            self.calls = 0
+            self.errors = {}
+            self.buckets = [0] * (len(BUCKETS) + 1)
+            self.total = 0.0
+
+    def observe(self, seconds: float, error: Optional[str] = None):
+        slot = bisect.bisect_left(BUCKETS, seconds)
+        with self.lock:
+            self.calls += 1
+            self.total += seconds
+            self.buckets[slot] += 1
+            if error is not None:
+                self.errors[error] = self.errors.get(error, 0) + 1
+
+    def quantile(self, q: float, buckets: List[int], calls: int) -> float:
+        """Estimate a latency quantile by interpolating inside its histogram bucket."""
+        if not calls:
+            return 0.0
+        rank = q * calls
+        seen = 0
+        for i, count in enumerate(buckets):
+            if seen + count >= rank and count:
+                lower = BUCKETS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return BUCKETS[-1]
+
+
+class MetricsRegistry:
+    """Process-wide service metrics with Prometheus text export.
+
+    Recording takes one lock per method, so instrumented calls cost a couple
+    of microseconds and never contend across different methods.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods = {}  # (service, method) -> MethodMetrics
+        self._gauges = {}  # name -> (help, callback returning [(labels, value)])
+        self._server = None
+
+    def method(self, service: str, name: str) -> MethodMetrics:
+        key = (service, name)
+        metrics = self._methods.get(key)
+        if metrics is None:
+            with self._lock:
+                metrics = self._methods.setdefault(key, MethodMetrics())
+        return metrics
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], List[Tuple[Dict[str, str], float]]]):
+        """Register a gauge whose samples are read when metrics are exported."""
+        with self._lock:
+            self._gauges[name] = (help_text, read)
+
+    def gauges(self) -> Dict[str, List[Tuple[Dict[str, str], float]]]:
+        """Current samples of every registered gauge; a gauge that fails to read is left out."""
+        with self._lock:
+            items = sorted(self._gauges.items())
+        samples = {}
+        for name, (_, read) in items:
+            try:
+                samples[name] = read()
+            except Exception:
+                continue
+        return samples
+
+    def _copies(self):
+        with self._lock:
+            items = sorted(self._methods.items())
+        for key, m in items:
+            with m.lock:
+                yield key, m, m.calls, dict(m.errors), list(m.buckets), m.total
+
+    def summary(self) -> List[Dict]:
+        """One row per service method with calls, errors and estimated p50/p95/p99 in ms."""
+        rows = []
+        for (service, name), m, calls, errors, buckets, total in self._copies():
+            rows.append({
+                "service": service,
+                "method": name,
+                "calls": calls,
+                "errors": sum(errors.values()),
+                "errors_by_type": errors,
+                "mean_ms": round(total / calls * 1000, 3) if calls else 0.0,
+                "p50_ms": round(m.quantile(0.50, buckets, calls) * 1000, 3),
+                "p95_ms": round(m.quantile(0.95, buckets, calls) * 1000, 3),
+                "p99_ms": round(m.quantile(0.99, buckets, calls) * 1000, 3)
+            })
+        return rows
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        calls_lines, error_lines, latency_lines = [], [], []
+        for (service, name), _, calls, errors, buckets, total in self._copies():
+            labels = f'service="{service}",method="{name}"'
+            calls_lines.append(f"freelance_service_calls_total{{{labels}}} {calls}")
+            for error, count in sorted(errors.items()):
+                error_lines.append(f'freelance_service_errors_total{{{labels},error="{error}"}} {count}')
+            cumulative = 0
+            for bound, count in zip(BUCKETS, buckets):
+                cumulative += count
+                latency_lines.append(f'freelance_service_latency_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            latency_lines.append(f'freelance_service_latency_seconds_bucket{{{labels},le="+Inf"}} {calls}')
+            latency_lines.append(f"freelance_service_latency_seconds_sum{{{labels}}} {total:.6f}")
+            latency_lines.append(f"freelance_service_latency_seconds_count{{{labels}}} {calls}")
+        gauge_lines = []
+        for name, samples in self.gauges().items():
+            gauge_lines.append(f"# HELP {name} {self._gauges[name][0]}")
+            gauge_lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                rendered = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+                gauge_lines.append(f"{name}{{{rendered}}} {value}" if rendered else f"{name} {value}")
+        return "\n".join([
+            "# HELP freelance_service_calls_total Service method calls.",
+            "# TYPE freelance_service_calls_total counter",
+            *calls_lines,
+            "# HELP freelance_service_errors_total Service method calls that raised, by exception type.",
+            "# TYPE freelance_service_errors_total counter",
+            *error_lines,
+            "# HELP freelance_service_latency_seconds Service method latency.",
+            "# TYPE freelance_service_latency_seconds histogram",
+            *latency_lines,
+            *gauge_lines
+        ]) + "\n"
+
+    def write(self, path: str):
+        """Write the Prometheus text export to a file (e.g. for node_exporter's textfile collector)."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve /metrics (Prometheus text) and /metrics.json (summary) from a daemon thread."""
+        if self._server is not None:
+            return self._server
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body, kind = json.dumps(registry.summary()).encode(), "application/json"
+                elif self.path.startswith("/metrics"):
+                    body, kind = registry.to_prometheus().encode(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server
+
+    @classmethod
+    def from_prometheus(cls, text: str) -> "MetricsRegistry":
+        """Rebuild a registry from a Prometheus text export, e.g. scraped from another process."""
+        registry = cls()
+        for line in text.splitlines():
+            match = _SAMPLE.match(line.strip())
+            if not match:
+                continue
+            name, labels, value = match.group(1), dict(_LABEL.findall(match.group(2))), match.group(3)
+            if "service" not in labels or "method" not in labels:
+                continue
+            m = registry.method(labels["service"], labels["method"])
+            if name == "freelance_service_calls_total":
+                m.calls = int(float(value))
+            elif name == "freelance_service_errors_total":
+                m.errors[labels.get("error", "Exception")] = int(float(value))
+            elif name == "freelance_service_latency_seconds_sum":
+                m.total = float(value)
+            elif name == "freelance_service_latency_seconds_bucket":
+                bound = labels.get("le")
+                slot = len(BUCKETS) if bound == "+Inf" else bisect.bisect_left(BUCKETS, float(bound))
+                # Buckets are cumulative in the export; stored per slot here
+                m.buckets[slot] = int(float(value))
+        for m in registry._methods.values():
+            for slot in range(len(m.buckets) - 1, 0, -1):
+                m.buckets[slot] -= m.buckets[slot - 1]
+        return registry
+
+    def reset(self):
+        """Zero every method's counters in place; @instrumented wrappers keep their MethodMetrics."""
+        with self._lock:
+            methods = list(self._methods.values())
+        for m in methods:
+            m.clear()
+
+
+# Shared by every instrumented service in the process
+metrics = MetricsRegistry()
+
+
+# Set while an instrumented call is being recorded on this thread; nested calls skip recording
+_active = threading.local()
+
+
+def instrumented(cls):
+    """Class decorator recording calls, errors and latency of every public method in `metrics`.
+
+    Only the outermost instrumented call on a thread is recorded: a service
+    method calling another one (e.g. reject_bid -> update_bid) counts once,
+    under the method that was called from outside.
+    """
+    service = cls.__name__
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not callable(attr) or isinstance(attr, (staticmethod, classmethod, type)):
+            continue
+        setattr(cls, name, _timed(attr, metrics.method(service, name)))
+    return cls
+
+
+def _timed(fn, method: MethodMetrics):
+    clock = time.perf_counter
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if getattr(_active, "recording", False):
+            return fn(*args, **kwargs)
+        _active.recording = True
+        start = clock()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            method.observe(clock() - start, type(e).__name__)
+            raise
+        finally:
+            _active.recording = False
+        method.observe(clock() - start)
+        return result
+    return wrapper
+
+
+def start_exporters(port: Optional[int] = None, path: Optional[str] = None):
+    """Start the HTTP endpoint and/or the on-exit file export if configured."""
+    if port:
+        try:
+            metrics.serve(port)
+        except OSError:
+            # Another process (e.g. a second app session) already serves this port
+            pass
+    if path:
+        atexit.register(metrics.write, path)
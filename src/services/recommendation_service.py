@@ -0,0 +1,217 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import List, Dict, Tuple
+import numpy as np
+from src.dao.job_dao import JobDAO
+from src.dao.bid_dao import BidDAO
+from src.dao.user_dao import UserDAO
+
+# Relative weight of each feature in the final job score
+WEIGHTS = {
+    "budget_fit": 0.45,
+    "budget_level": 0.20,
+    "urgency": 0.15,
+    "client_fill_rate": 0.20
+}
+
+# How long the job column snapshot is reused before it is reloaded
+JOB_COLUMNS_TTL_SECONDS = 60
+PAGE_SIZE = 1000
+# Freelancer profiles kept in memory; the least recently used one is dropped beyond this
+PROFILE_CACHE_SIZE = 10_000
+STATUS_CODES = {"open": 0, "assigned": 1, "in-progress": 2, "completed": 3}
+
+
+class RecommendationError(Exception):
+    """Exception raised for recommendation-related errors."""
+    pass
+
+
+class FreelancerProfile:
+    """Per-freelancer bid history summary, refreshed incrementally from new bids."""
+
+    def __init__(self):
+        self.last_bid_id = 0
+        self.bids = {}  # bid_id -> (job_id, amount, bid_status)
+
+    def apply(self, rows: List[Dict], rechecked: List[int]):
+        """Merge new or re-checked bid rows into the profile.
+
+        Re-checked bids missing from the rows were deleted and are dropped.
+        """
+        for bid_id in set(rechecked).difference(row["bid_id"] for row in rows):
+            self.bids.pop(bid_id, None)
+        for row in rows:
+            self.bids[row["bid_id"]] = (row["job_id"], float(row["amount"]), row["bid_status"])
+            self.last_bid_id = max(self.last_bid_id, row["bid_id"])
+
+    def pending_ids(self) -> List[int]:
+        """Bids whose status may still change and must be re-checked on refresh."""
+        return [bid_id for bid_id, (_, _, status) in self.bids.items() if status == "pending"]
+
+    def bid_job_ids(self) -> np.ndarray:
+        return np.fromiter((job_id for job_id, _, _ in self.bids.values()), dtype=np.int64)
+
+    def vector(self) -> np.ndarray:
+        """Return [mean log amount, std log amount, win rate, has history]."""
+        amounts = [amount for _, amount, status in self.bids.values() if status == "accepted"]
+        if not amounts:
+            # No wins yet: fall back to what the freelancer usually bids
+            amounts = [amount for _, amount, _ in self.bids.values()]
+        if not amounts:
+            return np.array([0.0, 0.0, 0.0, 0.0])
+        logs = np.log(np.asarray(amounts))
+        decided = [s for _, _, s in self.bids.values() if s != "pending"]
+        win_rate = decided.count("accepted") / len(decided) if decided else 0.0
+        return np.array([logs.mean(), logs.std(), win_rate, 1.0])
+
+
+def score_jobs(budgets: np.ndarray, days_left: np.ndarray, client_fill: np.ndarray,
+               profile: np.ndarray) -> np.ndarray:
+    """Score jobs for one freelancer; every input is a column array over the same jobs."""
+    log_budget = np.log(budgets)
+    center, spread = log_budget.mean(), log_budget.std() or 1.0
+
+    # Closeness of the job budget to the freelancer's typical accepted amount
+    if profile[3]:
+        mu, sigma = profile[0], max(profile[1], 0.5)
+    else:
+        mu, sigma = center, spread
+    budget_fit = np.exp(-((log_budget - mu) ** 2) / (2 * sigma ** 2))
+
+    # Higher budgets relative to the market score better
+    budget_level = 1.0 / (1.0 + np.exp(-(log_budget - center) / spread))
+
+    # Enough time to deliver, but sooner deadlines fill first
+    urgency = (1.0 - np.exp(-days_left / 7.0)) * np.exp(-days_left / 90.0)
+
+    return (WEIGHTS["budget_fit"] * budget_fit
+            + WEIGHTS["budget_level"] * budget_level
+            + WEIGHTS["urgency"] * urgency
+            + WEIGHTS["client_fill_rate"] * client_fill)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    idx = np.argpartition(-scores, k)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+class RecommendationService:
+    """Ranks open jobs for a freelancer from job, client and bid history features."""
+
+    def __init__(self):
+        self.jobdao = JobDAO()
+        self.biddao = BidDAO()
+        self.userdao = UserDAO()
+        self._lock = threading.Lock()
+        self._columns = None
+        self._columns_loaded_at = 0.0
+        self._profiles = OrderedDict()
+
+    def _load_job_columns(self) -> Dict[str, np.ndarray]:
+        """Stream all jobs by ID pages into column arrays plus per-client fill rates."""
+        job_ids, client_ids, budgets, deadlines, statuses = [], [], [], [], []
+        after_id = 0
+        while True:
+            rows = self.jobdao.get_jobs_page("job_id, client_id, budget, deadline, status",
+                                             after_id, PAGE_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                job_ids.append(row["job_id"])
+                client_ids.append(row["client_id"])
+                budgets.append(row["budget"] or 0)
+                deadlines.append(row["deadline"])
+                statuses.append(STATUS_CODES.get(row["status"], 0))
+            after_id = rows[-1]["job_id"]
+            if len(rows) < PAGE_SIZE:
+                break
+
+        client_ids = np.asarray(client_ids, dtype=np.int64)
+        statuses = np.asarray(statuses, dtype=np.int8)
+
+        # Client behaviour: smoothed share of the client's jobs that got filled. Counts
+        # are kept per distinct client, so their size does not depend on how large IDs get
+        _, clients = np.unique(client_ids, return_inverse=True)
+        clients = clients.reshape(-1)
+        total = np.bincount(clients)
+        filled = np.bincount(clients, weights=(statuses > 0), minlength=len(total))
+        fill_rate = (filled + 1.0) / (total + 2.0)
+
+        open_mask = statuses == 0
+        return {
+            "job_id": np.asarray(job_ids, dtype=np.int64)[open_mask],
+            "budget": np.asarray(budgets, dtype=np.float64)[open_mask],
+            "deadline": np.asarray(deadlines, dtype="datetime64[D]")[open_mask],
+            "client_fill": fill_rate[clients[open_mask]]
+        }
+
+    def _job_columns(self) -> Dict[str, np.ndarray]:
+        with self._lock:
+            if self._columns is None or time.monotonic() - self._columns_loaded_at > JOB_COLUMNS_TTL_SECONDS:
+                self._columns = self._load_job_columns()
+                self._columns_loaded_at = time.monotonic()
+            return self._columns
+
+    def _profile(self, freelancer_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the IDs of jobs the freelancer bid on and their feature vector.
+
+        Only bids that are new or still pending are fetched; the profile is read
+        and updated under the lock, and callers get a snapshot of it. At most
+        PROFILE_CACHE_SIZE profiles are kept, dropping the least recently used.
+        """
+        with self._lock:
+            profile = self._profiles.get(freelancer_id)
+            if profile is None:
+                profile = self._profiles[freelancer_id] = FreelancerProfile()
+                if len(self._profiles) > PROFILE_CACHE_SIZE:
+                    self._profiles.popitem(last=False)
+            else:
+                self._profiles.move_to_end(freelancer_id)
+            last_bid_id, pending = profile.last_bid_id, profile.pending_ids()
+        rows = self.biddao.get_bids_by_freelancer_since(freelancer_id, last_bid_id, pending)
+        with self._lock:
+            profile.apply(rows, pending)
+            return profile.bid_job_ids(), profile.vector()
+
+    def refresh(self):
+        """Drop the cached job columns so the next call reloads them."""
+        with self._lock:
+            self._columns = None
+
+    def recommend_jobs(self, freelancer_id: int, limit: int = 10) -> List[Dict]:
+        """Return the top open jobs for a freelancer, best first, each with its score."""
+        freelancer = self.userdao.get_user_by_id(freelancer_id)
+        if not freelancer or freelancer["role"] != "freelancer":
+            raise RecommendationError(f"Freelancer with id {freelancer_id} does not exist")
+        if limit < 1 or limit > 100:
+            raise RecommendationError("Limit must be between 1 and 100")
+
+        columns = self._job_columns()
+        bid_job_ids, profile = self._profile(freelancer_id)
+
+        # Skip jobs that are past due, have no budget or were already bid on
+        days_left = (columns["deadline"] - np.datetime64(date.today(), "D")).astype(np.float64)
+        mask = (days_left > 0) & (columns["budget"] > 0)
+        mask &= ~np.isin(columns["job_id"], bid_job_ids)
+        if not mask.any():
+            return []
+
+        scores = score_jobs(columns["budget"][mask], days_left[mask],
+                            columns["client_fill"][mask], profile)
+        best = top_k(scores, limit)
+        job_ids = columns["job_id"][mask][best]
+
+        # Fetch full rows for the winners only and keep score order
+        jobs = {job["job_id"]: job for job in self.jobdao.get_jobs_by_ids(job_ids.tolist())}
+        results = []
+        for job_id, score in zip(job_ids.tolist(), scores[best].tolist()):
+            job = jobs.get(job_id)
+            if job and job["status"] == "open":
+                results.append({**job, "score": round(score, 4)})
+        return results
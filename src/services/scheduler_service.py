@@ -0,0 +1,167 @@
+import heapq
+import itertools
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Optional
+from src.services.bid_service import BidService
+from src.services.job_service import JobService
+
+# Statuses each action applies to when it fires
+ACTION_STATUSES = {
+    "remind": ['open', 'assigned', 'in-progress'],
+    "close-bidding": ['open'],
+    "flag-overdue": ['assigned', 'in-progress']
+}
+PAGE_SIZE = 1000
+
+
+class SchedulerError(Exception):
+    """Exception raised for scheduler-related errors."""
+    pass
+
+
+class DeadlineScheduler:
+    """Fires deadline actions from a time-ordered queue instead of scanning the jobs table."""
+
+    def __init__(self, job_service: JobService, actions: Optional[List[str]] = None,
+                 remind_days: int = 2, horizon_days: int = 7, lookback_days: int = 7,
+                 batch_size: int = 100, bid_service: Optional[BidService] = None):
+        actions = actions or list(ACTION_STATUSES)
+        for action in actions:
+            if action not in ACTION_STATUSES:
+                raise SchedulerError(f"Invalid action. Must be one of: {', '.join(ACTION_STATUSES)}")
+        if remind_days < 0 or lookback_days < 0 or horizon_days < 1 or batch_size < 1:
+            raise SchedulerError("remind_days and lookback_days must be >= 0, horizon_days and batch_size >= 1")
+
+        self.job_service = job_service
+        self.bid_service = bid_service or BidService()
+        self.actions = actions
+        self.remind_days = remind_days
+        self.horizon_days = horizon_days
+        self.lookback_days = lookback_days
+        self.batch_size = batch_size
+        self._queue = []  # (fire_date, seq, job_id, action, deadline)
+        self._scheduled = {}  # (job_id, action) -> deadline currently queued
+        self._fired = set()  # (job_id, action, deadline) already handled, deadline >= _floor
+        self._floor = None  # deadlines before this are outside the window and never queued
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        job_service.add_listener(self.on_job_changed)
+
+    def _fire_date(self, action: str, deadline: date) -> date:
+        if action == "remind":
+            return deadline - timedelta(days=self.remind_days)
+        if action == "flag-overdue":
+            return deadline + timedelta(days=1)
+        return deadline
+
+    def _schedule(self, job: Dict):
+        """Queue (or re-queue) every applicable action for one job. Caller holds the lock."""
+        deadline = job["deadline"]
+        if isinstance(deadline, str):
+            deadline = datetime.strptime(deadline, "%Y-%m-%d").date()
+        historic = self._floor is not None and deadline < self._floor
+        for action in self.actions:
+            key = (job["job_id"], action)
+            if historic or job["status"] not in ACTION_STATUSES[action] \
+                    or (job["job_id"], action, deadline) in self._fired:
+                # Superseded heap entries are skipped lazily when popped
+                self._scheduled.pop(key, None)
+                continue
+            if self._scheduled.get(key) == deadline:
+                continue
+            self._scheduled[key] = deadline
+            heapq.heappush(self._queue, (self._fire_date(action, deadline), next(self._seq),
+                                         job["job_id"], action, deadline))
+
+    def load(self, today: Optional[date] = None) -> int:
+        """Queue every unfinished job whose first action falls within the horizon.
+
+        Deadlines more than `lookback_days` in the past are left out, so a backlog of
+        long-overdue jobs is not reloaded (and re-flagged) on every start.
+        """
+        today = today or date.today()
+        cutoff = (today + timedelta(days=self.horizon_days + self.remind_days)).isoformat()
+        floor = today - timedelta(days=self.lookback_days)
+        statuses = sorted({s for a in self.actions for s in ACTION_STATUSES[a]})
+        with self._lock:
+            self._floor = floor
+            # Fired entries below the window can never be queued again
+            self._fired = {entry for entry in self._fired if entry[2] >= floor}
+        loaded, after_id = 0, 0
+        while True:
+            rows = self.job_service.jobdao.get_jobs_due_by(cutoff, statuses, after_id, PAGE_SIZE,
+                                                           since=floor.isoformat())
+            with self._lock:
+                for job in rows:
+                    self._schedule(job)
+            loaded += len(rows)
+            if len(rows) < PAGE_SIZE:
+                return loaded
+            after_id = rows[-1]["job_id"]
+
+    def on_job_changed(self, job: Dict):
+        """Keep the queue current as jobs are created or updated through JobService."""
+        with self._lock:
+            self._schedule(job)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._scheduled)
+
+    def _pop_due(self, today: date) -> Dict[str, List[int]]:
+        """Pop every due, still-current entry, grouped by action."""
+        due = {}
+        with self._lock:
+            while self._queue and self._queue[0][0] <= today:
+                _, _, job_id, action, deadline = heapq.heappop(self._queue)
+                if self._scheduled.get((job_id, action)) != deadline:
+                    continue
+                del self._scheduled[(job_id, action)]
+                self._fired.add((job_id, action, deadline))
+                due.setdefault(action, []).append(job_id)
+        return due
+
+    def tick(self, today: Optional[date] = None) -> Dict[str, List[Dict]]:
+        """Run every action that is due, in batches, touching only the due jobs."""
+        today = today or date.today()
+        results = {}
+        for action, job_ids in self._pop_due(today).items():
+            for start in range(0, len(job_ids), self.batch_size):
+                batch = job_ids[start:start + self.batch_size]
+                # Re-read only the due jobs so deleted or moved jobs are skipped
+                jobs = [job for job in self.job_service.jobdao.get_jobs_by_ids(batch)
+                        if job["status"] in ACTION_STATUSES[action]]
+                if jobs:
+                    results.setdefault(action, []).extend(self._run_action(action, jobs))
+        return results
+
+    def _run_action(self, action: str, jobs: List[Dict]) -> List[Dict]:
+        if action == "close-bidding":
+            # Same notifications and leaderboard updates as bids rejected by accept_bid
+            rejected = self.bid_service.close_bidding([j["job_id"] for j in jobs])
+            counts = {}
+            for bid in rejected:
+                counts[bid["job_id"]] = counts.get(bid["job_id"], 0) + 1
+            return [{"job_id": j["job_id"], "deadline": j["deadline"],
+                     "rejected_bids": counts.get(j["job_id"], 0)} for j in jobs]
+        if action == "remind":
+            return [{"job_id": j["job_id"], "title": j["title"], "deadline": j["deadline"],
+                     "client_id": j["client_id"], "assigned_to": j["assigned_to"]} for j in jobs]
+        # flag-overdue
+        return [{"job_id": j["job_id"], "title": j["title"], "deadline": j["deadline"],
+                 "status": j["status"], "assigned_to": j["assigned_to"]} for j in jobs]
+
+    def run(self, interval: float = 60, reload_every: float = 3600, on_results=None):
+        """Tick forever, reloading the horizon periodically to pick up other writers."""
+        self.load()
+        last_load = time.monotonic()
+        while True:
+            results = self.tick()
+            if results and on_results:
+                on_results(results)
+            if time.monotonic() - last_load >= reload_every:
+                self.load()
+                last_load = time.monotonic()
+            time.sleep(interval)
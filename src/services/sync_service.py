@@ -0,0 +1,271 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+from postgrest.exceptions import APIError
+from src.config import get_backend_settings
+from src.dao.client import get_primary_client
+from src.dao.local_backend import SCHEMA
+from src.dao.offline import get_local_store, is_temp_id
+from src.dao.transport import is_transient
+
+# Which table an ID column points at, for remapping offline IDs to primary ones
+ID_COLUMNS = {
+    "user_id": "users", "client_id": "users", "assigned_to": "users", "freelancer_id": "users",
+    "job_id": "jobs", "bid_id": "bids", "status_id": "job_status"
+}
+# Parents before children, so a fresh replica never has dangling references
+PULL_ORDER = ["users", "jobs", "bids", "job_status"]
+PAGE_SIZE = 1000
+
+
+class SyncError(Exception):
+    """Exception raised for offline sync errors."""
+    pass
+
+
+class _Rejected(Exception):
+    """The primary cannot apply an operation, though it raised no error itself."""
+    pass
+
+
+class SyncService:
+    """Replays the offline write queue on the primary and refreshes the local replica."""
+
+    def __init__(self):
+        settings = get_backend_settings()
+        self.mode = settings["mode"]
+        self.local_dir = settings["local_dir"]
+        self.conflicts_path = os.path.join(self.local_dir, "conflicts.jsonl")
+        self.id_map_path = os.path.join(self.local_dir, "id_map.json")
+
+    def _store(self):
+        if self.mode != "offline":
+            raise SyncError("Sync is only available with FREELANCE_BACKEND=offline")
+        return get_local_store("offline", self.local_dir)
+
+    # ---- ID remapping ----
+    def _load_id_map(self) -> Dict[str, int]:
+        if not os.path.exists(self.id_map_path):
+            return {}
+        with open(self.id_map_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_id_map(self, id_map: Dict[str, int]):
+        tmp = self.id_map_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(id_map, f)
+        os.replace(tmp, self.id_map_path)
+
+    def _remap_value(self, column: str, value: Any, id_map: Dict[str, int]) -> Any:
+        if column not in ID_COLUMNS or not is_temp_id(value):
+            return value
+        key = f"{ID_COLUMNS[column]}:{value}"
+        if key not in id_map:
+            raise _Rejected(f"{column}={value} was created offline by an operation that did not sync")
+        return id_map[key]
+
+    def _remap_row(self, row: Dict, id_map: Dict[str, int]) -> Dict:
+        return {column: self._remap_value(column, value, id_map) for column, value in row.items()}
+
+    def _remap_step(self, name: str, args: List, id_map: Dict[str, int]) -> List:
+        if not args:
+            return args
+        if name in ("insert", "upsert", "update"):
+            payload = args[0]
+            if isinstance(payload, list):
+                payload = [self._remap_row(row, id_map) for row in payload]
+            else:
+                payload = self._remap_row(payload, id_map)
+            return [payload] + args[1:]
+        if name == "match":
+            return [self._remap_row(args[0], id_map)] + args[1:]
+        if name == "in_":
+            return [args[0], [self._remap_value(args[0], value, id_map) for value in args[1]]] + args[2:]
+        if name in ("eq", "neq", "gt", "gte", "lt", "lte") and len(args) >= 2:
+            return [args[0], self._remap_value(args[0], args[1], id_map)] + args[2:]
+        return args
+
+    # ---- Replay ----
+    @staticmethod
+    def _is_insert(op: Dict) -> bool:
+        return [step[0] for step in op["steps"]] == ["insert"]
+
+    def _next_batch(self, ops: List[Dict], start: int, batch_size: int) -> List[Dict]:
+        """Consecutive plain inserts into one table go out as a single request."""
+        batch = [ops[start]]
+        if not self._is_insert(ops[start]):
+            return batch
+        for op in ops[start + 1:]:
+            if len(batch) >= batch_size or op["table"] != batch[0]["table"] or not self._is_insert(op):
+                break
+            batch.append(op)
+        return batch
+
+    def _apply_inserts(self, primary, batch: List[Dict], id_map: Dict[str, int]):
+        table = batch[0]["table"]
+        rows, temp_ids = [], []
+        for op in batch:
+            payload = op["steps"][0][1][0]
+            payload = payload if isinstance(payload, list) else [payload]
+            rows.extend(self._remap_row(row, id_map) for row in payload)
+            temp_ids.extend(op.get("temp_ids", []))
+        resp = primary.table(table).insert(rows).execute()
+        pk = SCHEMA[table]["pk"]
+        for temp_id, row in zip(temp_ids, resp.data or []):
+            id_map[f"{table}:{temp_id}"] = row[pk]
+
+    def _apply(self, primary, op: Dict, id_map: Dict[str, int]):
+        table = op["table"]
+        query = primary.table(table)
+        for name, args, kwargs in op["steps"]:
+            query = getattr(query, name)(*self._remap_step(name, args, id_map), **kwargs)
+        resp = query.execute()
+        if "temp_ids" in op:
+            pk = SCHEMA[table]["pk"]
+            for temp_id, row in zip(op["temp_ids"], resp.data or []):
+                id_map[f"{table}:{temp_id}"] = row[pk]
+        elif op.get("affected") and not resp.data:
+            raise _Rejected("The rows this change applied to locally no longer match on the backend")
+
+    def _record_conflict(self, op: Dict, error: Exception):
+        entry = {
+            "table": op["table"],
+            "steps": op["steps"],
+            "queued_at": op.get("queued_at"),
+            "error": str(getattr(error, "message", None) or error),
+            "code": getattr(error, "code", None),
+            "rejected_at": datetime.now(timezone.utc).isoformat()
+        }
+        with open(self.conflicts_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+
+    def push(self, batch_size: int = 100) -> Dict:
+        """Replay queued writes on the primary in order, in batches.
+
+        Operations the primary rejects are moved to the conflicts log and
+        skipped. If the backend becomes unreachable, progress so far is kept
+        and the rest stays queued for the next push. When the queue drains,
+        the local replica is refreshed from the primary.
+        """
+        if batch_size < 1:
+            raise SyncError("Batch size must be at least 1")
+        store = self._store()
+        ops = store.queue.load()
+        if not ops:
+            return {"applied": 0, "conflicts": 0, "remaining": 0}
+        id_map = self._load_id_map()
+        applied = conflicts = 0
+        i = 0
+        while i < len(ops):
+            batch = self._next_batch(ops, i, batch_size)
+            try:
+                primary = get_primary_client()
+                try:
+                    if len(batch) > 1:
+                        self._apply_inserts(primary, batch, id_map)
+                    else:
+                        self._apply(primary, batch[0], id_map)
+                    applied += len(batch)
+                except (APIError, _Rejected) as e:
+                    if isinstance(e, APIError) and is_transient(e):
+                        raise
+                    if len(batch) > 1:
+                        # Retry one by one so only the offending inserts are rejected
+                        for op in batch:
+                            try:
+                                self._apply(primary, op, id_map)
+                                applied += 1
+                            except (APIError, _Rejected) as op_error:
+                                if isinstance(op_error, APIError) and is_transient(op_error):
+                                    raise
+                                self._record_conflict(op, op_error)
+                                conflicts += 1
+                    else:
+                        self._record_conflict(batch[0], e)
+                        conflicts += 1
+            except Exception as e:
+                self._save_id_map(id_map)
+                store.queue.replace(ops[i:])
+                raise SyncError(f"Backend unreachable after {applied} operation(s); "
+                                f"{len(ops) - i} still queued: {e}")
+            i += len(batch)
+            # Persist progress after every batch so a crash never replays applied writes
+            self._save_id_map(id_map)
+            store.queue.replace(ops[i:])
+
+        self.pull()
+        self._save_id_map({})
+        return {"applied": applied, "conflicts": conflicts, "remaining": 0}
+
+    def pull(self, force: bool = False) -> Dict[str, int]:
+        """Replace the local replica with a fresh copy of the primary's tables."""
+        store = self._store()
+        if len(store.queue) and not force:
+            raise SyncError("Local changes are still queued; push them first (or pull with force)")
+        counts = {}
+        tables = {}
+        try:
+            primary = get_primary_client()
+            for name in PULL_ORDER:
+                pk = SCHEMA[name]["pk"]
+                rows, after_id = [], 0
+                while True:
+                    page = primary.table(name).select(", ".join(SCHEMA[name]["columns"])).gt(pk, after_id) \
+                        .order(pk, desc=False).limit(PAGE_SIZE).execute().data or []
+                    rows.extend(page)
+                    if len(page) < PAGE_SIZE:
+                        break
+                    after_id = page[-1][pk]
+                tables[name] = rows
+                counts[name] = len(rows)
+        except Exception as e:
+            raise SyncError(f"Could not refresh the local replica: {e}")
+        # Swap every table only once all pages arrived, so a failed pull leaves the replica intact
+        for name, rows in tables.items():
+            store.replica.replace_table(name, rows)
+        store.replica.save()
+        return counts
+
+    def status(self) -> Dict:
+        """Pending operations per table, the oldest queue time and the conflict count."""
+        store = self._store()
+        ops = store.queue.load()
+        by_table = {}
+        for op in ops:
+            by_table[op["table"]] = by_table.get(op["table"], 0) + 1
+        oldest = min((op.get("queued_at") for op in ops if op.get("queued_at")), default=None)
+        return {
+            "pending": len(ops),
+            "pending_by_table": by_table,
+            "oldest_queued_at": datetime.fromtimestamp(oldest, timezone.utc).isoformat() if oldest else None,
+            "conflicts": len(self.conflicts())
+        }
+
+    def conflicts(self, clear: bool = False) -> List[Dict]:
+        """Operations the primary rejected during push, oldest first."""
+        self._store()
+        if not os.path.exists(self.conflicts_path):
+            return []
+        with open(self.conflicts_path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        if clear:
+            os.remove(self.conflicts_path)
+        return entries
+
+    def watch(self, interval: float = 30, batch_size: int = 100, on_result=None):
+        """Keep pushing until the queue drains, waiting `interval` seconds between attempts."""
+        self._store()
+        if batch_size < 1:
+            raise SyncError("Batch size must be at least 1")
+        while True:
+            try:
+                result = self.push(batch_size)
+                if on_result:
+                    on_result(result)
+                return result
+            except SyncError as e:
+                if on_result:
+                    on_result({"error": str(e)})
+                time.sleep(interval)
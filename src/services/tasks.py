@@ -0,0 +1,245 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from src.config import get_task_settings
+from src.dao.errors import ConstraintViolation
+from src.dao.jobstatus_dao import JobStatusDAO
+from src.dao.task_queue import TaskQueue
+from src.services.metrics import metrics
+
+# kind -> function taking a batch of task payloads and whether it runs inline
+# (exactly once, in the caller); queued deliveries must be safe to run twice
+HANDLERS: Dict[str, Callable[[List[Dict]], None]] = {}
+# Callbacks given every batch of notifications (e.g. an email or chat integration)
+NOTIFIERS: List[Callable[[List[Dict]], None]] = []
+
+_queue = None
+_queue_lock = threading.Lock()
+_embedded = None
+
+
+class TaskError(Exception):
+    """Exception raised for background task errors."""
+    pass
+
+
+def handler(kind: str):
+    """Register the function that processes tasks of one kind."""
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def add_notifier(callback: Callable[[List[Dict]], None]):
+    NOTIFIERS.append(callback)
+
+
+def get_task_queue(always: bool = False) -> Optional[TaskQueue]:
+    """The process-wide task queue, or None when side effects run inline (unless `always`)."""
+    global _queue
+    settings = get_task_settings()
+    if settings["mode"] != "queue" and not always:
+        return None
+    with _queue_lock:
+        if _queue is None:
+            _queue = TaskQueue(settings["path"], settings["max_attempts"])
+            metrics.gauge("freelance_task_queue_depth", "Tasks waiting or running, by state.",
+                          lambda: [({"state": state}, value) for state, value in _queue.stats().items()
+                                   if state in ("ready", "delayed", "in_flight", "dead")])
+            metrics.gauge("freelance_task_queue_lag_seconds", "Age of the oldest unfinished task.",
+                          lambda: [({}, _queue.stats()["lag_seconds"])])
+        return _queue
+
+
+def submit(kind: str, payload: Dict):
+    """Run a side effect: queued for a worker in queue mode, otherwise right away in the caller."""
+    if kind not in HANDLERS:
+        raise TaskError(f"No handler for task kind '{kind}'")
+    queue = get_task_queue()
+    if queue is None:
+        HANDLERS[kind]([payload], inline=True)
+    else:
+        queue.enqueue(kind, payload)
+
+
+def submit_many(kind: str, payloads: List[Dict]):
+    """submit() for several tasks of one kind, queued in a single write."""
+    if not payloads:
+        return
+    if kind not in HANDLERS:
+        raise TaskError(f"No handler for task kind '{kind}'")
+    queue = get_task_queue()
+    if queue is None:
+        HANDLERS[kind](payloads, inline=True)
+    else:
+        queue.enqueue_many(kind, payloads)
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ---- Handlers ----
+
+@handler("job_status")
+def record_statuses(payloads: List[Dict], inline: bool = False):
+    """Insert status history rows, skipping any already written by an earlier delivery."""
+    dao = JobStatusDAO()
+    if inline:
+        # Delivered exactly once: no dedupe read, and the database stamps updated_at as before
+        rows = [{"job_id": p["job_id"], "status": p["status"]} for p in payloads]
+    else:
+        existing = dao.get_statuses_at(sorted({p["job_id"] for p in payloads}),
+                                       sorted({p["updated_at"] for p in payloads}))
+        seen = {(row["job_id"], row["status"], datetime.fromisoformat(row["updated_at"])) for row in existing}
+        rows = []
+        for p in payloads:
+            key = (p["job_id"], p["status"], datetime.fromisoformat(p["updated_at"]))
+            if key not in seen:
+                seen.add(key)
+                rows.append({"job_id": p["job_id"], "status": p["status"], "updated_at": p["updated_at"]})
+    if not rows:
+        return
+    try:
+        dao.create_job_statuses(rows)
+    except ConstraintViolation as e:
+        if e.kind != "foreign_key":
+            raise
+        # Some jobs were deleted meanwhile, and their history with them
+        for row in rows:
+            try:
+                dao.create_job_statuses([row])
+            except ConstraintViolation as row_error:
+                if row_error.kind != "foreign_key":
+                    raise
+
+
+@handler("notify")
+def deliver_notifications(payloads: List[Dict], inline: bool = False):
+    for notifier in NOTIFIERS:
+        notifier(payloads)
+
+
+def _append_notifications(payloads: List[Dict]):
+    # Default delivery: a JSON-lines outbox that a mail/SMS integration can follow.
+    # Every notification is written, whatever the backend. Only queued deliveries
+    # are fsynced, since the queue forgets a task once this returns; inline ones
+    # skip it so an accepted bid does not wait on the disk
+    path = get_task_settings()["notifications_path"]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for payload in payloads:
+            f.write(json.dumps(payload, default=str) + "\n")
+        f.flush()
+        if get_task_settings()["mode"] == "queue":
+            os.fsync(f.fileno())
+
+
+add_notifier(_append_notifications)
+
+
+# ---- Worker ----
+
+class TaskWorker:
+    """Pool of threads that claim queued tasks in batches and run their handlers.
+
+    A batch whose handler fails is retried task by task, so one bad task does
+    not hold back the others; a failing task is retried with exponential
+    backoff until the queue marks it dead.
+    """
+
+    def __init__(self, queue: TaskQueue, threads: int = 4, batch_size: int = 100,
+                 lease_seconds: float = 60, poll_interval: float = 1.0, max_backoff: float = 300):
+        if threads < 1 or batch_size < 1:
+            raise TaskError("Threads and batch size must be at least 1")
+        self.queue = queue
+        self.threads = threads
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.failed = 0
+
+    def _run(self, kind: str, tasks: List[Dict]):
+        method = metrics.method("TaskWorker", kind)
+        started = time.perf_counter()
+        try:
+            fn = HANDLERS.get(kind)
+            if fn is None:
+                raise TaskError(f"No handler for task kind '{kind}'")
+            fn([task["payload"] for task in tasks])
+        except Exception as e:
+            method.observe(time.perf_counter() - started, type(e).__name__)
+            if len(tasks) > 1:
+                for task in tasks:
+                    self._run(kind, [task])
+                return
+            task = tasks[0]
+            self.queue.retry(task["task_id"], task["attempts"], f"{type(e).__name__}: {e}",
+                             min(2 ** task["attempts"], self.max_backoff))
+            with self._lock:
+                self.failed += 1
+            return
+        method.observe(time.perf_counter() - started)
+        self.queue.complete([task["task_id"] for task in tasks])
+        with self._lock:
+            self.processed += len(tasks)
+
+    def process_batch(self) -> int:
+        """Claim and run one batch; returns how many tasks were claimed."""
+        tasks = self.queue.claim(self.batch_size, self.lease_seconds)
+        by_kind = {}
+        for task in tasks:
+            by_kind.setdefault(task["kind"], []).append(task)
+        for kind, batch in by_kind.items():
+            self._run(kind, batch)
+        return len(tasks)
+
+    def drain(self) -> Dict:
+        """Process until no task is ready, then return the counts."""
+        while self.process_batch():
+            pass
+        return {"processed": self.processed, "failed": self.failed}
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                claimed = self.process_batch()
+            except Exception:
+                # e.g. the queue file is briefly locked; try again on the next poll
+                claimed = 0
+            if not claimed:
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> "TaskWorker":
+        for i in range(self.threads):
+            thread = threading.Thread(target=self._loop, name=f"task-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+
+def start_embedded_worker() -> Optional[TaskWorker]:
+    """Run workers inside this process when queue mode asks for embedded workers."""
+    global _embedded
+    queue = get_task_queue()
+    threads = get_task_settings()["embedded_workers"]
+    if queue is None or threads < 1:
+        return None
+    with _queue_lock:
+        if _embedded is None:
+            _embedded = TaskWorker(queue, threads=threads).start()
+        return _embedded
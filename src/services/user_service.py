@@ -1,10 +1,19 @@
+import time
 from src.dao.user_dao import UserDAO
 from src.dao.job_dao import JobDAO
 from src.dao.bid_dao import BidDAO
-from typing import List,Dict
+from src.dao.paging import SORTABLE, id_batches
+from src.dao.errors import ConstraintViolation
+from src.dao.geo import location_problem
+from src.services.metrics import instrumented
+from typing import List,Dict,Optional
+
+# Users checked and deleted per request by bulk_remove
+BULK_BATCH_SIZE = 500
 
 class UserError(Exception):
     pass
+@instrumented
 class UserService:
     """Business logic for user operations."""
     
@@ -15,11 +24,6 @@ class UserService:
         
     def create_user(self, name: str, email: str, phone: str, role: str) -> Dict:
         """Create a new user with validation."""
-        # Check if email already exists
-        existing_user = self.userdao.get_user_by_email(email)
-        if existing_user:
-            raise UserError(f"User with email {email} already exists")
-        
         # Validate role
         if role not in ("client", "freelancer"):
             raise UserError("User role must be either 'client' or 'freelancer'")
@@ -32,7 +36,13 @@ class UserService:
         if not name or len(name.strip()) == 0:
             raise UserError("Name cannot be empty")
         
-        return self.userdao.create_user(name, email, phone, role)
+        # Email uniqueness is enforced by the database, in the same request as the insert
+        try:
+            return self.userdao.create_user(name, email, phone, role)
+        except ConstraintViolation as e:
+            if e.on("unique", "email"):
+                raise UserError(f"User with email {email} already exists")
+            raise UserError(str(e))
     
     def remove_user(self, user_id: int) -> Dict:
         """Remove a user after checking for active jobs/bids."""
@@ -59,18 +69,69 @@ class UserService:
         
         return self.userdao.delete_user(user_id)
     
+    def bulk_remove(self, user_ids: Optional[List[int]] = None, role: Optional[str] = None,
+                    limit: Optional[int] = None, batch_size: int = BULK_BATCH_SIZE,
+                    dry_run: bool = False) -> Dict:
+        """Remove many users, listed by ID or all of one role, with remove_user's rules.
+        
+        Each batch is checked with one read of the users and one query per rule
+        (posted jobs, assigned jobs, bids), then deleted with one request. Users
+        that break a rule are listed in "failures" and kept.
+        """
+        if user_ids is None and not role:
+            raise UserError("Give user IDs or a role")
+        if role and role not in ("client", "freelancer"):
+            raise UserError("Role must be either 'client' or 'freelancer'")
+        if batch_size < 1:
+            raise UserError("Batch size must be at least 1")
+        
+        started = time.perf_counter()
+        report = {"dry_run": dry_run, "considered": 0, "applied": 0, "skipped": 0, "failures": []}
+        batches = id_batches(
+            "user_id", user_ids, self.userdao.get_users_by_ids,
+            lambda after_id, size: self.userdao.get_users_page("*", after_id, size, role=role),
+            batch_size, limit
+        )
+        for batch, users in batches:
+            report["considered"] += len(batch)
+            clients = [user_id for user_id, user in users.items() if user["role"] == "client"]
+            freelancers = [user_id for user_id, user in users.items() if user["role"] == "freelancer"]
+            posting = self.jobdao.get_user_ids_with_jobs(clients, "client_id")
+            assigned = self.jobdao.get_user_ids_with_jobs(freelancers, "assigned_to")
+            bidding = self.biddao.get_freelancer_ids_with_bids([f for f in freelancers if f not in assigned])
+            
+            eligible = []
+            for user_id in batch:
+                if user_id not in users:
+                    error = f"User with id {user_id} does not exist"
+                elif user_id in posting:
+                    error = f"Client with id {user_id} has posted active jobs"
+                elif user_id in assigned:
+                    error = f"Freelancer with id {user_id} is assigned to active jobs"
+                elif user_id in bidding:
+                    error = f"Freelancer with id {user_id} has active bids"
+                else:
+                    eligible.append(user_id)
+                    continue
+                report["failures"].append({"user_id": user_id, "error": error})
+            if dry_run:
+                report["applied"] += len(eligible)
+                continue
+            
+            deleted = self.userdao.delete_users(eligible)
+            report["applied"] += len(deleted)
+            report["skipped"] += len(eligible) - len(deleted)
+        
+        report["failed"] = len(report["failures"])
+        report["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return report
+    
     def update_user(self, user_id: int, fields: Dict) -> Dict:
         """Update user information with validation."""
         user = self.userdao.get_user_by_id(user_id)
         if not user:
             raise UserError(f"User with id {user_id} does not exist")
         
-        # Validate email if being updated
-        if "email" in fields:
-            existing = self.userdao.get_user_by_email(fields["email"])
-            if existing and existing["user_id"] != user_id:
-                raise UserError(f"Email {fields['email']} is already in use")
-        
         # Prevent role changes if user has active jobs/bids
         if "role" in fields and fields["role"] != user["role"]:
             if user["role"] == "client":
@@ -83,7 +144,22 @@ class UserService:
                 if jobs or bids:
                     raise UserError("Cannot change role while having active jobs or bids")
         
-        return self.userdao.update_user(user_id, fields)
+        # Validate location and service area; both coordinates change together
+        if "latitude" in fields or "longitude" in fields:
+            problem = location_problem(fields.get("latitude"), fields.get("longitude"))
+            if problem:
+                raise UserError(problem)
+        if fields.get("service_radius_km") is not None and fields["service_radius_km"] <= 0:
+            raise UserError("Service radius must be greater than zero")
+        
+        try:
+            return self.userdao.update_user(user_id, fields)
+        except ConstraintViolation as e:
+            if e.on("unique", "email"):
+                raise UserError(f"Email {fields['email']} is already in use")
+            if e.kind == "check" and e.columns and e.columns[0] in ("location", "latitude", "longitude"):
+                raise UserError("Invalid location. Give latitude (-90 to 90) and longitude (-180 to 180) together")
+            raise UserError(str(e))
     
     def get_user_by_id(self, user_id: int) -> Dict:
         """Retrieve a user by ID."""
@@ -96,8 +172,49 @@ class UserService:
         """List all users."""
         return self.userdao.list_users(limit)
     
-    def list_users_by_role(self, role: str) -> List[Dict]:
+    def list_users_by_role(self, role: str, limit: Optional[int] = None) -> List[Dict]:
         """List users by role."""
         if role not in ("client", "freelancer"):
             raise UserError("Role must be either 'client' or 'freelancer'")
-        return self.userdao.get_users_by_role(role)
\ No newline at end of file
+        return self.userdao.get_users_by_role(role, limit)
+    
+    def page_users(self, role: Optional[str] = None, sort: str = "user_id", desc: bool = False,
+                   cursor: Optional[str] = None, limit: int = 25) -> Dict:
+        """One page of users plus the cursor for the next (and, on the first page, an estimated total)."""
+        if role is not None and role not in ("client", "freelancer"):
+            raise UserError("Role must be either 'client' or 'freelancer'")
+        if sort not in SORTABLE["users"]:
+            raise UserError(f"Cannot sort users by {sort}. Use one of: {', '.join(SORTABLE['users'])}")
+        if limit < 1 or limit > 100:
+            raise UserError("Limit must be between 1 and 100")
+        try:
+            return self.userdao.list_users_page(role, sort, desc, cursor, limit)
+        except ValueError as e:
+            raise UserError(str(e))
+    
+    def export_users(self, role: Optional[str] = None, limit: Optional[int] = None):
+        """Every user (optionally of one role, up to `limit`) as a typed pyarrow.Table."""
+        if role is not None and role not in ("client", "freelancer"):
+            raise UserError("Role must be either 'client' or 'freelancer'")
+        if limit is not None and limit < 1:
+            raise UserError("Limit must be at least 1")
+        return self.userdao.get_users_arrow(role, limit=limit)
+    
+    def get_dashboard(self, user_id: int) -> Dict:
+        """Home view for a client or freelancer: their jobs and bids with counts and latest statuses."""
+        dashboard = self.userdao.get_dashboard(user_id)
+        if not dashboard:
+            raise UserError(f"User with id {user_id} does not exist")
+        jobs_by_status, bids_by_status = {}, {}
+        for job in dashboard["jobs"]:
+            jobs_by_status[job["status"]] = jobs_by_status.get(job["status"], 0) + 1
+        for bid in dashboard["bids"]:
+            bids_by_status[bid["bid_status"]] = bids_by_status.get(bid["bid_status"], 0) + 1
+        dashboard["summary"] = {
+            "jobs": len(dashboard["jobs"]),
+            "jobs_by_status": jobs_by_status,
+            "bids_received": sum(job["bid_count"] for job in dashboard["jobs"]),
+            "bids": len(dashboard["bids"]),
+            "bids_by_status": bids_by_status
+        }
+        return dashboard
\ No newline at end of file
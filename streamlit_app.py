@@ -1,3 +1,5 @@
+import io
+import time
 import streamlit as st
 import sys
 from pathlib import Path
@@ -9,6 +11,15 @@ from src.services.user_service import UserService, UserError
 from src.services.job_service import JobService, JobError
 from src.services.bid_service import BidService, BidError
 from src.services.jobstatus_service import JobStatusService, JobStatusError
+from src.services.analytics_service import AnalyticsService, AnalyticsError
+from src.services.bid_leaderboard import leaderboard_diff
+from src.dao.singleflight import reads
+from src.dao.client import get_client
+from src.dao.paging import SORTABLE, PagePrefetcher
+from src.dao.columnar import EXPORT_FORMATS, write_table
+from src.services.metrics import metrics, start_exporters
+from src.services.tasks import start_embedded_worker
+from src.config import get_metrics_settings
 
 # Initialize services
 @st.cache_resource
@@ -17,11 +28,113 @@ def get_services():
         'user': UserService(),
         'job': JobService(),
         'bid': BidService(),
-        'status': JobStatusService()
+        'status': JobStatusService(),
+        'analytics': AnalyticsService()
     }
 
 services = get_services()
 
+# Expose service metrics for scraping if configured (once per server process)
+@st.cache_resource
+def start_metrics_exporters():
+    settings = get_metrics_settings()
+    start_exporters(settings["port"], settings["file"])
+    return settings
+
+start_metrics_exporters()
+
+# Workers for queued side effects, when configured to run inside the app
+@st.cache_resource
+def start_task_workers():
+    return start_embedded_worker()
+
+start_task_workers()
+
+# Most rows a Streamlit export reads; `freelance-cli export` has no cap
+EXPORT_ROW_LIMIT = 100_000
+
+def paged_table(view, fetch, params):
+    """Show one page of `fetch(filter, sort, desc, cursor, page_size)` with First/Previous/Next navigation.
+    
+    Pages are keyset-paged on the server, so only the page on screen (and the
+    next one, prefetched in the background) is ever loaded. Changing `params`
+    starts again from the first page.
+    """
+    state = st.session_state.setdefault(f"{view}_paging", {"params": None})
+    if state["params"] != params:
+        state.update(params=params, cursors=[None], page=0, total=None)
+    prefetcher = st.session_state.setdefault(f"{view}_prefetcher", PagePrefetcher())
+    
+    load = lambda cursor: fetch(*params[:3], cursor, params[3])
+    cursor = state["cursors"][state["page"]]
+    result = prefetcher.page((params, cursor), lambda: load(cursor))
+    if result["total_estimate"] is not None:
+        state["total"] = result["total_estimate"]
+    next_cursor = result["next_cursor"]
+    if next_cursor:
+        if len(state["cursors"]) == state["page"] + 1:
+            state["cursors"].append(next_cursor)
+        prefetcher.prefetch((params, next_cursor), lambda: load(next_cursor))
+    
+    def go(page):
+        state["page"] = page
+    
+    page_size = params[-1]
+    pages = f" of ~{max(1, -(-state['total'] // page_size))}" if state["total"] is not None else ""
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
+    col1.button("⏮ First", key=f"{view}_first", disabled=state["page"] == 0, on_click=go, args=(0,))
+    col2.button("◀ Previous", key=f"{view}_prev", disabled=state["page"] == 0, on_click=go, args=(state["page"] - 1,))
+    col3.button("Next ▶", key=f"{view}_next", disabled=next_cursor is None, on_click=go, args=(state["page"] + 1,))
+    total = f" · about {state['total']} rows" if state["total"] is not None else ""
+    col4.caption(f"Page {state['page'] + 1}{pages}{total}")
+    
+    if result["rows"]:
+        st.dataframe(result["rows"], use_container_width=True)
+    else:
+        st.info("No rows found")
+
+def full_table(view, load, params):
+    """Offer the rows matching `params`, read with `load(*params, limit=...)`, as a file download.
+    
+    The view itself only ever shows one page (see paged_table); the export
+    reads at most EXPORT_ROW_LIMIT rows and only when asked. The encoded file
+    is kept per (params, format), so reruns caused by other widgets reuse it
+    instead of reading and encoding the table again.
+    """
+    with st.expander("Export"):
+        fmt = st.selectbox("Format", EXPORT_FORMATS, key=f"{view}_export_format")
+        state = st.session_state.setdefault(f"{view}_export", {"key": None})
+        key = (params, fmt)
+        if st.button("Prepare export", key=f"{view}_prepare_export") and state["key"] != key:
+            started = time.perf_counter()
+            table = load(*params, limit=EXPORT_ROW_LIMIT)
+            buffer = io.BytesIO()
+            write_table(table, buffer, fmt)
+            state.update(key=key, data=buffer.getvalue(), rows=table.num_rows,
+                         build_s=time.perf_counter() - started)
+        if state["key"] != key:
+            return
+        capped = " (capped; use `freelance-cli export` for more)" if state["rows"] >= EXPORT_ROW_LIMIT else ""
+        st.caption(f"{state['rows']} rows{capped} · {len(state['data']) / 1e6:.1f} MB {fmt} · "
+                   f"built in {state['build_s']:.2f}s")
+        st.download_button(f"Download {fmt}", state["data"], file_name=f"{view}.{fmt}", key=f"{view}_download")
+
+def table_controls(view, sortable):
+    """Sort column, direction and page size pickers for a paged table."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort = st.selectbox("Sort by", sortable, key=f"{view}_sort")
+    with col2:
+        desc = st.checkbox("Descending", key=f"{view}_desc")
+    with col3:
+        page_size = st.selectbox("Rows per page", [10, 25, 50, 100], index=1, key=f"{view}_size")
+    return sort, desc, page_size
+
+# Script reruns may run on different threads, so key read-your-writes by browser session
+if get_client().router is not None:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    get_client().router.session_key = lambda: getattr(get_script_run_ctx(), "session_id", None)
+
 # Page config
 st.set_page_config(
     page_title="Freelance Management System",
@@ -34,11 +147,47 @@ st.title("💼 Freelance Management System")
 # Sidebar navigation
 page = st.sidebar.selectbox(
     "Choose a page",
-    ["Users", "Jobs", "Bids", "Job Status"]
+    ["My Dashboard", "Users", "Jobs", "Bids", "Job Status", "Insights", "Admin"]
 )
 
+# ========== MY DASHBOARD PAGE ==========
+if page == "My Dashboard":
+    st.header("🏠 My Dashboard")
+    
+    dashboard_user_id = st.number_input("Your User ID", min_value=1, step=1)
+    if st.button("Load Dashboard"):
+        try:
+            dashboard = services['user'].get_dashboard(dashboard_user_id)
+            user = dashboard["user"]
+            summary = dashboard["summary"]
+            st.subheader(f"{user['name']} ({user['role']})")
+            
+            cols = st.columns(3)
+            if user["role"] == "client":
+                cols[0].metric("Posted Jobs", summary["jobs"])
+                cols[1].metric("Open Jobs", summary["jobs_by_status"].get("open", 0))
+                cols[2].metric("Bids Received", summary["bids_received"])
+                st.write("**My jobs**")
+            else:
+                cols[0].metric("Bids", summary["bids"])
+                cols[1].metric("Pending Bids", summary["bids_by_status"].get("pending", 0))
+                cols[2].metric("Assigned Jobs", summary["jobs"])
+                st.write("**My bids**")
+                if dashboard["bids"]:
+                    st.dataframe(dashboard["bids"], use_container_width=True)
+                else:
+                    st.info("No bids yet")
+                st.write("**Assigned jobs**")
+            
+            if dashboard["jobs"]:
+                st.dataframe(dashboard["jobs"], use_container_width=True)
+            else:
+                st.info("No jobs yet")
+        except UserError as e:
+            st.error(f"❌ Error: {e}")
+
 # ========== USERS PAGE ==========
-if page == "Users":
+elif page == "Users":
     st.header("👥 User Management")
     
     tab1, tab2, tab3 = st.tabs(["Create User", "View Users", "Update/Delete User"])
@@ -61,25 +210,14 @@ if page == "Users":
     
     with tab2:
         st.subheader("View Users")
-        col1, col2 = st.columns(2)
-        with col1:
-            role_filter = st.selectbox("Filter by Role", ["All", "client", "freelancer"])
-        with col2:
-            limit = st.number_input("Limit", min_value=1, max_value=100, value=10)
-        
-        if st.button("Load Users"):
-            try:
-                if role_filter == "All":
-                    users = services['user'].list_users(limit)
-                else:
-                    users = services['user'].list_users_by_role(role_filter)
-                
-                if users:
-                    st.dataframe(users, use_container_width=True)
-                else:
-                    st.info("No users found")
-            except UserError as e:
-                st.error(f"❌ Error: {e}")
+        role_filter = st.selectbox("Filter by Role", ["All", "client", "freelancer"])
+        sort, desc, page_size = table_controls("users", SORTABLE["users"])
+        role = None if role_filter == "All" else role_filter
+        try:
+            paged_table("users", services['user'].page_users, (role, sort, desc, page_size))
+            full_table("users", services['user'].export_users, (role,))
+        except UserError as e:
+            st.error(f"❌ Error: {e}")
     
     with tab3:
         st.subheader("Update or Delete User")
@@ -124,7 +262,7 @@ if page == "Users":
 elif page == "Jobs":
     st.header("💼 Job Management")
     
-    tab1, tab2, tab3, tab4 = st.tabs(["Create Job", "View Jobs", "Update Job", "Job Actions"])
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["Create Job", "View Jobs", "Update Job", "Job Actions", "Search Jobs", "Nearby Jobs"])
     
     with tab1:
         st.subheader("Create New Job")
@@ -148,25 +286,14 @@ elif page == "Jobs":
     
     with tab2:
         st.subheader("View Jobs")
-        col1, col2 = st.columns(2)
-        with col1:
-            status_filter = st.selectbox("Filter by Status", ["All", "open", "assigned", "in-progress", "completed"])
-        with col2:
-            limit = st.number_input("Limit", min_value=1, max_value=100, value=10, key="job_limit")
-        
-        if st.button("Load Jobs"):
-            try:
-                if status_filter == "All":
-                    jobs = services['job'].list_jobs(limit=limit)
-                else:
-                    jobs = services['job'].list_jobs(status=status_filter, limit=limit)
-                
-                if jobs:
-                    st.dataframe(jobs, use_container_width=True)
-                else:
-                    st.info("No jobs found")
-            except JobError as e:
-                st.error(f"❌ Error: {e}")
+        status_filter = st.selectbox("Filter by Status", ["All", "open", "assigned", "in-progress", "completed"])
+        sort, desc, page_size = table_controls("jobs", SORTABLE["jobs"])
+        job_status = None if status_filter == "All" else status_filter
+        try:
+            paged_table("jobs", services['job'].page_jobs, (job_status, sort, desc, page_size))
+            full_table("jobs", services['job'].export_jobs, (job_status,))
+        except JobError as e:
+            st.error(f"❌ Error: {e}")
     
     with tab3:
         st.subheader("Update Job")
@@ -226,6 +353,107 @@ elif page == "Jobs":
                 except JobError as e:
                     st.error(f"❌ Error: {e}")
 
+    with tab5:
+        st.subheader("Search Jobs")
+        with st.form("search_jobs"):
+            query = st.text_input("Search job titles")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                search_status = st.selectbox("Status", ["open", "All", "assigned", "in-progress", "completed"])
+                page_size = st.number_input("Page Size", min_value=1, max_value=100, value=20)
+            with col2:
+                min_budget = st.number_input("Min Budget (0 for any)", min_value=0.0, step=100.0)
+                max_budget = st.number_input("Max Budget (0 for any)", min_value=0.0, step=100.0)
+            with col3:
+                deadline_from = st.text_input("Deadline From (YYYY-MM-DD, optional)")
+                deadline_to = st.text_input("Deadline To (YYYY-MM-DD, optional)")
+            
+            if st.form_submit_button("Search"):
+                # Keep the query and a stack of page cursors across reruns
+                st.session_state.job_search = {
+                    "params": {
+                        "query": query,
+                        "status": None if search_status == "All" else search_status,
+                        "min_budget": min_budget if min_budget > 0 else None,
+                        "max_budget": max_budget if max_budget > 0 else None,
+                        "deadline_from": deadline_from or None,
+                        "deadline_to": deadline_to or None,
+                        "limit": int(page_size)
+                    },
+                    "cursors": [None]
+                }
+        
+        search = st.session_state.get("job_search")
+        if search:
+            try:
+                results = services['job'].search_jobs(cursor=search["cursors"][-1], **search["params"])
+                if results["jobs"]:
+                    st.caption(f"Page {len(search['cursors'])}")
+                    st.dataframe(results["jobs"], use_container_width=True)
+                else:
+                    st.info("No matching jobs found")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    if len(search["cursors"]) > 1 and st.button("⬅️ Previous Page"):
+                        search["cursors"].pop()
+                        st.rerun()
+                with col2:
+                    if results["next_cursor"] and st.button("Next Page ➡️"):
+                        search["cursors"].append(results["next_cursor"])
+                        st.rerun()
+            except JobError as e:
+                st.error(f"❌ Error: {e}")
+
+    with tab6:
+        st.subheader("Jobs Near a Freelancer")
+        with st.form("nearby_jobs"):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                near_freelancer = st.number_input("Freelancer ID", min_value=1, step=1)
+                radius = st.number_input("Radius km (0 for their service radius)", min_value=0.0, step=5.0)
+            with col2:
+                near_status = st.selectbox("Status", ["open", "All", "assigned", "in-progress", "completed"], key="near_status")
+                near_size = st.number_input("Page Size", min_value=1, max_value=100, value=20, key="near_size")
+            with col3:
+                near_min = st.number_input("Min Budget (0 for any)", min_value=0.0, step=100.0, key="near_min")
+                near_max = st.number_input("Max Budget (0 for any)", min_value=0.0, step=100.0, key="near_max")
+            
+            if st.form_submit_button("Find Jobs"):
+                st.session_state.job_nearby = {
+                    "params": {
+                        "freelancer_id": int(near_freelancer),
+                        "radius_km": radius if radius > 0 else None,
+                        "status": None if near_status == "All" else near_status,
+                        "min_budget": near_min if near_min > 0 else None,
+                        "max_budget": near_max if near_max > 0 else None,
+                        "limit": int(near_size)
+                    },
+                    "cursors": [None]
+                }
+        
+        nearby = st.session_state.get("job_nearby")
+        if nearby:
+            try:
+                nearby_results = services['job'].find_nearby_jobs(cursor=nearby["cursors"][-1], **nearby["params"])
+                if nearby_results["jobs"]:
+                    st.caption(f"Page {len(nearby['cursors'])}")
+                    st.dataframe(nearby_results["jobs"], use_container_width=True)
+                else:
+                    st.info("No jobs within the radius")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    if len(nearby["cursors"]) > 1 and st.button("⬅️ Previous Page", key="near_prev"):
+                        nearby["cursors"].pop()
+                        st.rerun()
+                with col2:
+                    if nearby_results["next_cursor"] and st.button("Next Page ➡️", key="near_next"):
+                        nearby["cursors"].append(nearby_results["next_cursor"])
+                        st.rerun()
+            except JobError as e:
+                st.error(f"❌ Error: {e}")
+
 # ========== BIDS PAGE ==========
 elif page == "Bids":
     st.header("💰 Bid Management")
@@ -253,19 +481,15 @@ elif page == "Bids":
     with tab2:
         st.subheader("View Bids")
         
-        view_option = st.radio("View by:", ["All Bids", "By Job", "By Freelancer", "By Status"])
+        view_option = st.radio("View by:", ["All Bids", "By Job", "By Freelancer", "By Status", "Lowest Bids"])
         
         if view_option == "All Bids":
-            limit = st.number_input("Limit", min_value=1, max_value=100, value=10, key="all_bids_limit")
-            if st.button("Load All Bids"):
-                try:
-                    bids = services['bid'].list_bids(limit=limit)
-                    if bids:
-                        st.dataframe(bids, use_container_width=True)
-                    else:
-                        st.info("No bids found")
-                except BidError as e:
-                    st.error(f"❌ Error: {e}")
+            sort, desc, page_size = table_controls("all_bids", SORTABLE["bids"])
+            try:
+                paged_table("all_bids", services['bid'].page_bids, (None, sort, desc, page_size))
+                full_table("all_bids", services['bid'].export_bids, (None,))
+            except BidError as e:
+                st.error(f"❌ Error: {e}")
         
         elif view_option == "By Job":
             job_id = st.number_input("Job ID", min_value=1, step=1, key="bids_by_job")
@@ -293,14 +517,42 @@ elif page == "Bids":
         
         elif view_option == "By Status":
             status = st.selectbox("Status", ["pending", "accepted", "rejected"])
-            limit = st.number_input("Limit", min_value=1, max_value=100, value=10, key="bids_by_status_limit")
-            if st.button("Load Bids by Status"):
+            sort, desc, page_size = table_controls("status_bids", SORTABLE["bids"])
+            try:
+                paged_table("status_bids", services['bid'].page_bids, (status, sort, desc, page_size))
+                full_table("status_bids", services['bid'].export_bids, (status,))
+            except BidError as e:
+                st.error(f"❌ Error: {e}")
+    
+        elif view_option == "Lowest Bids":
+            job_id = st.number_input("Job ID", min_value=1, step=1, key="leaderboard_job")
+            top_k = st.slider("Number of bids", min_value=1, max_value=10, value=5)
+            if st.button("Refresh Lowest Bids"):
                 try:
-                    bids = services['bid'].list_bids(status=status, limit=limit)
-                    if bids:
-                        st.dataframe(bids, use_container_width=True)
+                    board = services['bid'].get_bid_leaderboard(job_id, top_k)
+                    state_key = f"leaderboard_{job_id}_{top_k}"
+                    previous = st.session_state.get(state_key)
+                    
+                    # Draw the table on first load and when the top bids moved; otherwise report no change
+                    changed = previous is None
+                    if previous and previous["version"] != board["version"]:
+                        diff = leaderboard_diff(previous["bids"], board["bids"])
+                        for bid in diff["added"]:
+                            st.success(f"➕ Bid {bid['bid_id']} entered at #{bid['rank']} with {bid['amount']}")
+                        for bid in diff["removed"]:
+                            st.warning(f"➖ Bid {bid['bid_id']} left the board (was #{bid['rank']})")
+                        for bid in diff["changed"]:
+                            st.info(f"🔁 Bid {bid['bid_id']} moved #{bid['previous_rank']} → #{bid['rank']} "
+                                    f"({bid['previous_amount']} → {bid['amount']})")
+                        changed = any(diff.values())
+                    st.session_state[state_key] = board
+                    
+                    if not changed:
+                        st.info("No changes since last refresh")
+                    elif board["bids"]:
+                        st.dataframe(board["bids"], use_container_width=True)
                     else:
-                        st.info(f"No {status} bids found")
+                        st.info("No pending bids for this job")
                 except BidError as e:
                     st.error(f"❌ Error: {e}")
     
@@ -371,6 +623,67 @@ elif page == "Job Status":
             except JobStatusError as e:
                 st.error(f"❌ Error: {e}")
 
+# ========== INSIGHTS PAGE ==========
+elif page == "Insights":
+    st.header("📈 Marketplace Insights")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        report_name = st.selectbox("Report", AnalyticsService.REPORTS)
+    with col2:
+        report_limit = st.number_input("Rows", min_value=1, max_value=500, value=25)
+    with col3:
+        refresh = st.checkbox("Recompute now", help="Otherwise results up to a minute old are reused")
+    
+    if st.button("Run Report"):
+        try:
+            rows = services['analytics'].run_report(report_name, limit=report_limit, refresh=refresh)
+            if not rows:
+                st.info("No data yet")
+            elif report_name == "marketplace":
+                summary = rows[0]
+                cols = st.columns(4)
+                cols[0].metric("Jobs", summary["jobs"])
+                cols[1].metric("Bids", summary["bids"])
+                cols[2].metric("Fill Rate", f"{summary['fill_rate']:.1%}")
+                cols[3].metric("Avg Bids / Job", summary["avg_bids_per_job"])
+                st.json(summary)
+            else:
+                st.dataframe(rows, use_container_width=True)
+        except AnalyticsError as e:
+            st.error(f"❌ Error: {e}")
+
+# ========== ADMIN PAGE ==========
+elif page == "Admin":
+    st.header("🛠️ Service Metrics")
+    st.caption("Calls, errors and latency of every service method since this server started")
+    
+    rows = [row for row in metrics.summary() if row["calls"]]
+    if not rows:
+        st.info("No service calls recorded yet")
+    else:
+        cols = st.columns(3)
+        cols[0].metric("Calls", sum(row["calls"] for row in rows))
+        cols[1].metric("Errors", sum(row["errors"] for row in rows))
+        cols[2].metric("Slowest p95 (ms)", max(row["p95_ms"] for row in rows))
+        st.dataframe(rows, use_container_width=True)
+    
+    export = metrics.to_prometheus()
+    st.download_button("Download Prometheus export", export, file_name="freelance_metrics.prom")
+    with st.expander("Prometheus text"):
+        st.code(export)
+
 # Footer
 st.sidebar.markdown("---")
+with st.sidebar.expander("Backend stats"):
+    st.write("**Coalesced reads**")
+    st.json(reads.stats())
+    st.write("**Connection pool**")
+    st.json(get_client().pool.stats())
+    if get_client().policy is not None:
+        st.write("**Transport**")
+        st.json(get_client().policy.stats())
+    if get_client().router is not None:
+        st.write("**Read routing**")
+        st.json(get_client().router.stats())
 st.sidebar.info("💼 Freelance Platform v1.0")
\ No newline at end of file
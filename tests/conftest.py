@@ -0,0 +1,33 @@
+import itertools
+import os
+import tempfile
+import pytest
+
+# Every test runs against a throwaway local backend, never the configured Supabase project
+os.environ["FREELANCE_BACKEND"] = "local"
+os.environ["FREELANCE_LOCAL_DIR"] = tempfile.mkdtemp(prefix="freelance-tests-")
+os.environ["FREELANCE_TASKS"] = "inline"
+
+# Imported once the environment above is in place
+from src.services.job_service import JobService  # noqa: E402
+from src.services.user_service import UserService  # noqa: E402
+
+_seq = itertools.count()
+
+
+@pytest.fixture
+def user():
+    """Create a user with a unique name and email: user("client")."""
+    def create(role):
+        n = next(_seq)
+        return UserService().create_user(f"{role} {n}", f"{role}-{n}@example.com", "555", role)
+    return create
+
+
+@pytest.fixture
+def post_job(user):
+    """Post a job with a unique title, by a fresh client unless one is given."""
+    def create(client=None, budget=100, deadline="2030-01-01", **kwargs):
+        client = client or user("client")
+        return JobService().create_job(f"Job {next(_seq)}", client["user_id"], budget, deadline, **kwargs)
+    return create
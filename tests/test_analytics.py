@@ -0,0 +1,86 @@
+import pytest
+from src.dao.local_backend import LocalBackend
+from src.dao.offline import TEMP_ID_BASE
+from src.services import analytics_service
+from src.services.analytics_service import AnalyticsService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Analytics over a small marketplace whose IDs start above a billion, like offline rows."""
+    monkeypatch.setattr(analytics_service, "PAGE_SIZE", 2)
+    backend = LocalBackend(autosave=False, id_floor=TEMP_ID_BASE)
+    c1, c2, f1, f2 = [row["user_id"] for row in backend.table("users").insert([
+        {"name": "C1", "email": "c1@example.com", "role": "client"},
+        {"name": "C2", "email": "c2@example.com", "role": "client"},
+        {"name": "F1", "email": "f1@example.com", "role": "freelancer"},
+        {"name": "F2", "email": "f2@example.com", "role": "freelancer"}
+    ]).execute().data]
+    j1, j2, j3, j4 = [row["job_id"] for row in backend.table("jobs").insert([
+        {"title": "J1", "client_id": c1, "budget": 100, "status": "assigned", "deadline": "2030-01-01"},
+        {"title": "J2", "client_id": c1, "budget": 200, "status": "open", "deadline": "2030-01-01"},
+        {"title": "J3", "client_id": c2, "budget": 50, "status": "completed", "deadline": "2030-01-01"},
+        {"title": "J4", "client_id": c2, "status": "in-progress", "deadline": "2030-01-01"}
+    ]).execute().data]
+    backend.table("bids").insert([
+        {"job_id": j1, "freelancer_id": f1, "amount": 80, "bid_status": "accepted"},
+        {"job_id": j1, "freelancer_id": f2, "amount": 120, "bid_status": "rejected"},
+        {"job_id": j2, "freelancer_id": f1, "amount": 100},
+        {"job_id": j2, "freelancer_id": f2, "amount": 150},
+        {"job_id": j3, "freelancer_id": f2, "amount": 40, "bid_status": "accepted"}
+    ]).execute()
+    service = AnalyticsService()
+    service.jobdao.sb = service.biddao.sb = backend
+    return service, {"c1": c1, "c2": c2, "f1": f1, "f2": f2, "j1": j1, "j2": j2, "j3": j3, "j4": j4}
+
+
+def by(rows, key):
+    return {row[key]: row for row in rows}
+
+
+def test_marketplace_totals(service):
+    service, _ = service
+    assert service.run_report("marketplace") == [{
+        "jobs": 4, "bids": 5, "fill_rate": 0.75, "avg_bids_per_job": 1.25, "total_budget": 350.0,
+        "accepted_spend": 120.0, "avg_bid_to_budget": 0.81
+    }]
+
+
+def test_client_spend_and_fill_rate(service):
+    service, ids = service
+    spend = by(service.run_report("client-spend"), "client_id")
+    assert spend[ids["c1"]] == {"client_id": ids["c1"], "jobs_posted": 2, "total_budget": 300.0, "accepted_spend": 80.0}
+    assert spend[ids["c2"]] == {"client_id": ids["c2"], "jobs_posted": 2, "total_budget": 50.0, "accepted_spend": 40.0}
+
+    fill = service.run_report("fill-rate")
+    assert [(row["client_id"], row["filled"], row["fill_rate"]) for row in fill] == [
+        (ids["c2"], 2, 1.0), (ids["c1"], 1, 0.5)
+    ]
+
+
+def test_freelancer_win_rate(service):
+    service, ids = service
+    rows = service.run_report("freelancer-win-rate")
+    assert rows == [
+        {"freelancer_id": ids["f1"], "bids": 2, "accepted": 1, "rejected": 0, "win_rate": 1.0, "earned": 80.0},
+        {"freelancer_id": ids["f2"], "bids": 3, "accepted": 1, "rejected": 1, "win_rate": 0.5, "earned": 40.0}
+    ]
+
+
+def test_bid_to_budget_skips_unpriced_jobs(service):
+    service, ids = service
+    rows = by(service.run_report("bid-to-budget"), "client_id")
+    # (80/100 + 120/100 + 100/200 + 150/200) / 4 and 40/50
+    assert rows[ids["c1"]]["bids"] == 4 and rows[ids["c1"]]["avg_bid_to_budget"] == 0.8125
+    assert rows[ids["c2"]]["bids"] == 1 and rows[ids["c2"]]["avg_bid_to_budget"] == 0.8
+
+
+def test_bids_per_job(service):
+    service, ids = service
+    assert service.run_report("bids-per-job-summary") == [
+        {"jobs": 4, "mean": 1.25, "median": 1.5, "p90": 2.0, "max": 2, "jobs_without_bids": 1}
+    ]
+    rows = service.run_report("bids-per-job")
+    assert {row["job_id"]: row["bids"] for row in rows} == {ids["j1"]: 2, ids["j2"]: 2, ids["j3"]: 1, ids["j4"]: 0}
+    assert all(row.keys() == {"job_id", "bids", "budget"} for row in rows)
+    assert len(service.run_report("bids-per-job", limit=2)) == 2
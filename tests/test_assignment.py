@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+from src.dao.client import ConnectionPool, PooledClient
+from src.dao.local_backend import LocalBackend
+from src.services import tasks
+from src.services.assignment_service import AssignmentService, min_cost_assignment
+
+
+def random_case(rng, n_jobs, n_freelancers, n_bids):
+    pairs = rng.choice(n_jobs * n_freelancers, size=n_bids, replace=False)
+    job_idx, freelancer_idx = np.divmod(pairs, n_freelancers)
+    amounts = rng.integers(10, 100, size=n_bids).astype(np.float64)
+    capacity = rng.integers(0, 3, size=n_freelancers)
+    return job_idx, freelancer_idx, amounts, capacity
+
+
+def dense_reference(job_idx, freelancer_idx, amounts, capacity, n_jobs):
+    """(jobs assigned, total amount) of an optimal plan, from a dense slot matrix."""
+    slot_owner = np.repeat(np.arange(len(capacity)), capacity)
+    unassigned = amounts.sum() + 1.0
+    cost = np.full((n_jobs, len(slot_owner) + n_jobs), np.inf)
+    for j, f, amount in zip(job_idx, freelancer_idx, amounts):
+        cost[j, :len(slot_owner)][slot_owner == f] = amount
+    cost[np.arange(n_jobs), len(slot_owner) + np.arange(n_jobs)] = unassigned
+    rows, cols = linear_sum_assignment(cost)
+    chosen = cols < len(slot_owner)
+    return int(chosen.sum()), float(cost[rows[chosen], cols[chosen]].sum())
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_dense_optimum(seed):
+    rng = np.random.default_rng(seed)
+    n_jobs, n_freelancers = int(rng.integers(1, 12)), int(rng.integers(1, 10))
+    n_bids = int(rng.integers(0, n_jobs * n_freelancers + 1))
+    job_idx, freelancer_idx, amounts, capacity = random_case(rng, n_jobs, n_freelancers, n_bids)
+
+    chosen = min_cost_assignment(job_idx, freelancer_idx, amounts, capacity, n_jobs)
+    # Each job at most once, each freelancer within capacity
+    assert len(set(job_idx[chosen].tolist())) == len(chosen)
+    assert (np.bincount(freelancer_idx[chosen], minlength=n_freelancers) <= capacity).all()
+    assigned, total = dense_reference(job_idx, freelancer_idx, amounts, capacity, n_jobs)
+    assert len(chosen) == assigned
+    assert amounts[chosen].sum() == pytest.approx(total)
+
+
+def test_auto_assign_notifies_rejected_bidders(monkeypatch):
+    delivered = []
+    monkeypatch.setattr(tasks, "NOTIFIERS", [delivered.extend])
+    backend = LocalBackend(autosave=False)
+    backend.table("users").insert([{"name": "C", "email": "c@example.com", "role": "client"}] +
+                                  [{"name": f"F{i}", "email": f"f{i}@example.com", "role": "freelancer"}
+                                   for i in range(3)]).execute()
+    backend.table("jobs").insert({"title": "Assigned", "client_id": 1, "deadline": "2030-01-01"}).execute()
+    backend.table("bids").insert([{"job_id": 1, "freelancer_id": 2 + i, "amount": amount}
+                                  for i, amount in enumerate((70, 50, 60))]).execute()
+    service = AssignmentService()
+    service.jobdao.sb = service.biddao.sb = PooledClient(ConnectionPool(lambda: backend))
+
+    report = service.auto_assign()
+    assert (report["applied"], report["rejected"]) == (1, 2)
+    assert report["assignments"] == [{"job_id": 1, "freelancer_id": 3, "bid_id": 2, "amount": 50}]
+    assert sorted((n["event"], n["bid_id"], n["user_id"]) for n in delivered) == [
+        ("bid_rejected", 1, 2), ("bid_rejected", 3, 4)
+    ]
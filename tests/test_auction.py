@@ -0,0 +1,59 @@
+import pytest
+from src.dao.bid_dao import BidDAO
+from src.services.auction_service import AuctionService
+from src.services.bid_service import BidService
+from src.services.job_service import JobService
+
+
+@pytest.fixture
+def auctions(user, post_job):
+    """Five open jobs by a fresh client, each with bids of 70, 50 and 60."""
+    client = user("client")
+    freelancers = [user("freelancer") for _ in range(3)]
+    jobs = [post_job(client) for _ in range(5)]
+    bids = {job["job_id"]: [BidService().create_bid(job["job_id"], freelancer["user_id"], amount)
+                            for freelancer, amount in zip(freelancers, (70, 50, 60))]
+            for job in jobs}
+    return jobs, bids
+
+
+def test_resolve_accepts_each_lowest_bid(auctions):
+    jobs, bids = auctions
+    report = AuctionService().resolve(min_bids=3, concurrency=4)
+    ours = [o for o in report["outcomes"] if o["job_id"] in bids]
+    assert len(ours) == len(jobs) and all(o["status"] == "accepted" for o in ours)
+    for job in jobs:
+        statuses = [BidDAO().get_bid_by_id(bid["bid_id"])["bid_status"] for bid in bids[job["job_id"]]]
+        assert statuses == ["rejected", "accepted", "rejected"]
+        assert JobService().get_job_by_id(job["job_id"])["status"] == "assigned"
+    assert report["throughput_per_s"] > 0
+    # Resolved jobs are no longer eligible
+    assert not [o for o in AuctionService().resolve(min_bids=1)["outcomes"] if o["job_id"] in bids]
+
+
+def test_dry_run_changes_nothing(auctions):
+    jobs, bids = auctions
+    report = AuctionService().resolve(min_bids=3, dry_run=True)
+    ours = [o for o in report["outcomes"] if o["job_id"] in bids]
+    assert {o["status"] for o in ours} == {"candidate"}
+    assert {o["amount"] for o in ours} == {50}
+    assert all(JobService().get_job_by_id(job["job_id"])["status"] == "open" for job in jobs)
+
+
+def test_bid_changed_after_selection_is_skipped(auctions, monkeypatch):
+    jobs, bids = auctions
+    service = AuctionService()
+    candidates = BidDAO.get_auction_candidates
+
+    def withdraw_first(self, *args, **kwargs):
+        page = candidates(self, *args, **kwargs)
+        # The lowest bid on the first job is withdrawn between selection and accept
+        for candidate in page:
+            if candidate["job_id"] == jobs[0]["job_id"]:
+                BidService().delete_bid(candidate["bid_id"])
+        return page
+    monkeypatch.setattr(BidDAO, "get_auction_candidates", withdraw_first)
+    report = service.resolve(min_bids=3)
+    outcome = next(o for o in report["outcomes"] if o["job_id"] == jobs[0]["job_id"])
+    assert outcome["status"] == "skipped" and outcome["error"]
+    assert report["failed"] == 0
@@ -0,0 +1,31 @@
+import pytest
+from src.dao.bid_dao import BidDAO
+from src.services.bid_service import BidService
+
+
+@pytest.fixture
+def jobs(user, post_job):
+    client = user("client")
+    return [post_job(client) for _ in range(3)]
+
+
+def test_malformed_items_fail_alone(jobs, user):
+    freelancer = user("freelancer")
+    results = BidService().create_bids(freelancer["user_id"], [
+        (jobs[0]["job_id"], 50), ("x", 50), (jobs[1]["job_id"],), [jobs[1]["job_id"], "cheap"],
+        (jobs[2]["job_id"], 60, "Can start Monday")
+    ])
+    assert [r["ok"] for r in results] == [True, False, False, False, True]
+    assert results[4]["bid"]["message"] == "Can start Monday"
+
+
+def test_bid_placed_concurrently_fails_only_its_item(jobs, user, monkeypatch):
+    freelancer = user("freelancer")
+    # Placed by another request after create_bids checked for existing bids
+    BidService().create_bid(jobs[1]["job_id"], freelancer["user_id"], 70)
+    monkeypatch.setattr(BidDAO, "get_bids_by_freelancer_for_jobs", lambda self, *args: [])
+
+    results = BidService().create_bids(freelancer["user_id"], [(job["job_id"], 50) for job in jobs])
+    assert [r["ok"] for r in results] == [True, False, True]
+    assert results[1]["error"] == f"Freelancer has already placed a bid on job {jobs[1]['job_id']}"
+    assert results[0]["bid"]["amount"] == 50 and results[2]["bid"]["job_id"] == jobs[2]["job_id"]
@@ -0,0 +1,87 @@
+import pytest
+from src.services.bid_service import BidError, BidService
+from src.services.job_service import JobError, JobService
+from src.services.jobstatus_service import JobStatusService
+from src.services.user_service import UserService
+
+
+def counts(report):
+    return {key: report[key] for key in ("considered", "applied", "unchanged", "skipped", "failed") if key in report}
+
+
+@pytest.fixture
+def job(post_job):
+    return post_job()
+
+
+@pytest.fixture
+def bids(job, user):
+    service = BidService()
+    return [service.create_bid(job["job_id"], user("freelancer")["user_id"], amount) for amount in (70, 60, 50)]
+
+
+def bid_statuses(bids):
+    return [BidService().get_bid_by_id(bid["bid_id"])["bid_status"] for bid in bids]
+
+
+def test_bulk_reject_dry_run_changes_nothing(bids):
+    BidService().reject_bid(bids[0]["bid_id"])
+    before = [BidService().get_bid_by_id(bid["bid_id"]) for bid in bids]
+    report = BidService().bulk_reject(bid_ids=[bid["bid_id"] for bid in bids] + [10 ** 9], dry_run=True)
+    assert report["dry_run"]
+    assert counts(report) == {"considered": 4, "applied": 2, "unchanged": 1, "skipped": 0, "failed": 1}
+    assert [BidService().get_bid_by_id(bid["bid_id"]) for bid in bids] == before
+
+
+def test_bulk_reject_by_job_updates_bids_and_leaderboard(job, bids):
+    assert len(BidService().get_bid_leaderboard(job["job_id"])["bids"]) == 3
+    BidService().reject_bid(bids[0]["bid_id"])
+    report = BidService().bulk_reject(job_id=job["job_id"], bid_status="pending", batch_size=1)
+    assert counts(report) == {"considered": 2, "applied": 2, "unchanged": 0, "skipped": 0, "failed": 0}
+    assert bid_statuses(bids) == ["rejected"] * 3
+    assert BidService().get_bid_leaderboard(job["job_id"])["bids"] == []
+
+
+def test_bulk_reject_needs_a_selection():
+    with pytest.raises(BidError):
+        BidService().bulk_reject()
+
+
+def test_bulk_status_applies_rules_and_writes_history(user, post_job):
+    client, freelancer = user("client"), user("freelancer")
+    service = JobService()
+    assigned = [post_job(client, assigned_to=freelancer["user_id"]) for _ in range(2)]
+    unassigned = post_job(client)
+    service.update_job(assigned[1]["job_id"], {"status": "in-progress"})
+    ids = [job["job_id"] for job in assigned] + [unassigned["job_id"]]
+
+    report = service.bulk_update_status("in-progress", job_ids=ids, dry_run=True)
+    assert counts(report) == {"considered": 3, "applied": 1, "unchanged": 1, "skipped": 0, "failed": 1}
+    assert service.get_job_by_id(ids[0])["status"] == "assigned"
+
+    report = service.bulk_update_status("in-progress", job_ids=ids)
+    assert counts(report) == {"considered": 3, "applied": 1, "unchanged": 1, "skipped": 0, "failed": 1}
+    assert report["failures"][0]["job_id"] == unassigned["job_id"]
+    assert [service.get_job_by_id(job_id)["status"] for job_id in ids] == ["in-progress", "in-progress", "open"]
+    assert [row["status"] for row in JobStatusService().get_status_history(ids[0])] == ["assigned", "in-progress"]
+
+    report = service.bulk_update_status("completed", client_id=client["user_id"], current_status="in-progress")
+    assert counts(report) == {"considered": 2, "applied": 2, "unchanged": 0, "skipped": 0, "failed": 0}
+    with pytest.raises(JobError):
+        service.bulk_update_status("open", job_ids=ids)
+
+
+def test_bulk_remove_keeps_users_with_work(job, bids, user):
+    idle = [user("freelancer"), user("client")]
+    ids = [job["client_id"], bids[0]["freelancer_id"]] + [u["user_id"] for u in idle]
+
+    report = UserService().bulk_remove(user_ids=ids, dry_run=True)
+    assert (report["applied"], report["failed"]) == (2, 2)
+    assert UserService().get_user_by_id(idle[0]["user_id"])
+
+    report = UserService().bulk_remove(user_ids=ids)
+    assert (report["considered"], report["applied"], report["failed"]) == (4, 2, 2)
+    assert [failure["user_id"] for failure in report["failures"]] == ids[:2]
+    assert UserService().get_user_by_id(job["client_id"])
+    remaining = {u["user_id"] for u in UserService().list_users(limit=10 ** 6)}
+    assert not remaining & {u["user_id"] for u in idle}
@@ -0,0 +1,33 @@
+from decimal import Decimal
+import pyarrow as pa
+from src.dao.columnar import MONEY, fetch_table
+from src.dao.local_backend import LocalBackend
+
+
+def test_fetch_table_pages_into_typed_columns():
+    backend = LocalBackend(autosave=False)
+    backend.table("users").insert({"name": "C", "email": "c@example.com", "role": "client"}).execute()
+    backend.table("jobs").insert([
+        {"title": f'Job {i}, "quoted"' if i else "", "client_id": 1, "budget": 0.1 + i, "deadline": "2030-01-01"}
+        for i in range(7)
+    ] + [{"title": "No budget", "client_id": 1, "deadline": "2030-01-01"}]).execute()
+
+    table = fetch_table(backend, "jobs", page_size=3)
+    assert table.num_rows == 8
+    assert table["job_id"].to_pylist() == list(range(1, 9))
+    assert table.schema.field("budget").type == MONEY
+    assert table["budget"].to_pylist()[:2] == [Decimal("0.10"), Decimal("1.10")]
+    assert table["budget"][7].as_py() is None
+    assert table.schema.field("deadline").type == pa.date32()
+    assert table["created_at"].type.tz == "UTC"
+    # Quoted commas survive, and an empty title stays an empty string rather than null
+    assert table["title"].to_pylist()[:2] == ["", 'Job 1, "quoted"']
+
+
+def test_fetch_table_filters_columns_and_limit():
+    backend = LocalBackend(autosave=False)
+    backend.table("users").insert([{"name": f"U{i}", "email": f"u{i}@example.com",
+                                    "role": "client" if i % 2 else "freelancer"} for i in range(10)]).execute()
+    table = fetch_table(backend, "users", {"role": "client"}, columns=["email"], limit=3, page_size=2)
+    assert table.column_names == ["user_id", "email"]
+    assert table["email"].to_pylist() == ["u1@example.com", "u3@example.com", "u5@example.com"]
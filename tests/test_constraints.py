@@ -0,0 +1,69 @@
+import pytest
+from postgrest.exceptions import APIError
+from src.dao.bid_dao import BidDAO
+from src.dao.errors import ConstraintViolation, constraint_errors
+from src.dao.job_dao import JobDAO
+from src.services.bid_service import BidError, BidService
+from src.services.job_service import JobError, JobService
+
+
+def violation(code, message, details=None, table=None):
+    with pytest.raises(ConstraintViolation) as info:
+        with constraint_errors(table):
+            raise APIError({"code": code, "message": message, "details": details})
+    return info.value
+
+
+def test_postgres_codes_map_to_constraint_kinds():
+    unique = violation("23505", 'duplicate key value violates unique constraint "jobs_client_id_title_key"',
+                       "Key (client_id, title)=(4, Fix sink) already exists.")
+    assert unique.on("unique", "title", "client_id")
+    assert (unique.constraint, unique.values) == ("jobs_client_id_title_key", {"client_id": "4", "title": "Fix sink"})
+
+    check = violation("23514", 'new row for relation "bids" violates check constraint "bids_amount_check"')
+    assert check.on("check", "amount") and check.table == "bids"
+
+    foreign = violation("23503", 'insert or update on table "bids" violates foreign key constraint "bids_job_id_fkey"',
+                        'Key (job_id)=(99) is not present in table "jobs".')
+    assert foreign.on("foreign_key", "job_id") and foreign.values == {"job_id": "99"}
+
+
+def test_other_api_errors_pass_through():
+    with pytest.raises(APIError):
+        with constraint_errors("jobs"):
+            raise APIError({"code": "42501", "message": "permission denied for table jobs"})
+
+
+def test_local_backend_raises_the_same_violations(user):
+    client = user("client")
+    with pytest.raises(ConstraintViolation) as info:
+        JobDAO().create_job("Bad budget", client["user_id"], -5, "2030-01-01")
+    assert info.value.on("check", "budget")
+    with pytest.raises(ConstraintViolation) as info:
+        BidDAO().create_bid(10 ** 9, user("freelancer")["user_id"], 50)
+    assert info.value.on("foreign_key", "job_id")
+
+
+def test_duplicate_job_title_for_a_client_is_a_job_error(user):
+    client, other = user("client"), user("client")
+    service = JobService()
+    first = service.create_job("Paint fence", client["user_id"], 100, "2030-01-01")
+    with pytest.raises(JobError, match="already has a job with title 'Paint fence'"):
+        service.create_job("Paint fence", client["user_id"], 120, "2030-02-01")
+    # The same title is fine for another client, and renaming onto a taken title is rejected too
+    service.create_job("Paint fence", other["user_id"], 100, "2030-01-01")
+    second = service.create_job("Mow lawn", client["user_id"], 100, "2030-01-01")
+    with pytest.raises(JobError, match="already has a job"):
+        service.update_job(second["job_id"], {"title": first["title"]})
+    assert [job["title"] for job in service.get_jobs_by_client(client["user_id"])].count("Paint fence") == 1
+
+
+def test_duplicate_bid_maps_to_a_bid_error(user):
+    client, freelancer = user("client"), user("freelancer")
+    job = JobService().create_job("Fix roof", client["user_id"], 100, "2030-01-01")
+    BidService().create_bid(job["job_id"], freelancer["user_id"], 80)
+    with pytest.raises(ConstraintViolation) as info:
+        BidDAO().create_bid(job["job_id"], freelancer["user_id"], 70)
+    error = BidService._bid_error(info.value)
+    assert isinstance(error, BidError)
+    assert str(error) == f"Freelancer has already placed a bid on job {job['job_id']}"
@@ -0,0 +1,63 @@
+import pytest
+from src.services.bid_service import BidService
+from src.services.job_service import JobService
+from src.services.jobstatus_service import JobStatusService
+from src.services.user_service import UserError, UserService
+
+
+@pytest.fixture
+def market(user, post_job):
+    """A client with three jobs, bid on by two freelancers; one bid rejected and one job assigned."""
+    client, first, second = user("client"), user("freelancer"), user("freelancer")
+    jobs = [post_job(client, deadline=f"2030-01-0{i}") for i in (1, 2, 3)]
+    bids = BidService()
+    bids.create_bid(jobs[0]["job_id"], first["user_id"], 80)
+    rejected = bids.create_bid(jobs[0]["job_id"], second["user_id"], 90)
+    bids.create_bid(jobs[1]["job_id"], first["user_id"], 70)
+    bids.create_bid(jobs[2]["job_id"], second["user_id"], 60)
+    bids.reject_bid(rejected["bid_id"])
+    JobService().assign_freelancer_to_job(jobs[2]["job_id"], second["user_id"])
+    return client, first, second
+
+
+def test_client_dashboard_matches_per_table_reads(market):
+    client = market[0]
+    dashboard = UserService().get_dashboard(client["user_id"])
+    jobs = JobService().get_jobs_by_client(client["user_id"])
+    assert dashboard["user"]["user_id"] == client["user_id"]
+    assert sorted(job["job_id"] for job in dashboard["jobs"]) == sorted(job["job_id"] for job in jobs)
+
+    statuses = JobStatusService()
+    for job in dashboard["jobs"]:
+        bids = BidService().get_bids_by_job(job["job_id"])
+        pending = [bid["amount"] for bid in bids if bid["bid_status"] == "pending"]
+        assert job["bid_count"] == len(bids)
+        assert job["pending_bids"] == len(pending)
+        assert job["lowest_pending_bid"] == (min(pending) if pending else None)
+        assert job["latest_status"] == statuses.get_latest_status(job["job_id"])["status"]
+
+    summary = dashboard["summary"]
+    assert summary["jobs"] == len(jobs) == 3
+    assert summary["jobs_by_status"] == {"open": 2, "assigned": 1}
+    assert summary["bids_received"] == sum(len(BidService().get_bids_by_job(job["job_id"])) for job in jobs) == 4
+    assert summary["bids"] == 0
+
+
+def test_freelancer_dashboard_matches_per_table_reads(market):
+    second = market[2]
+    dashboard = UserService().get_dashboard(second["user_id"])
+    bids = BidService().get_bids_by_freelancer(second["user_id"])
+    assert sorted(bid["bid_id"] for bid in dashboard["bids"]) == sorted(bid["bid_id"] for bid in bids)
+    for bid in dashboard["bids"]:
+        job = JobService().get_job_by_id(bid["job_id"])
+        assert (bid["job_title"], bid["job_status"]) == (job["title"], job["status"])
+
+    assigned = JobService().get_jobs_by_freelancer(second["user_id"])
+    assert [job["job_id"] for job in dashboard["jobs"]] == [job["job_id"] for job in assigned]
+    assert dashboard["summary"]["bids"] == len(bids) == 2
+    assert dashboard["summary"]["bids_by_status"] == {"rejected": 1, "pending": 1}
+
+
+def test_dashboard_of_unknown_user():
+    with pytest.raises(UserError):
+        UserService().get_dashboard(10 ** 9)
@@ -0,0 +1,80 @@
+import pytest
+from src.dao.bid_dao import BidDAO
+from src.dao.job_dao import JobDAO
+from src.services.bid_service import BidError, BidService
+
+
+@pytest.fixture
+def jobs(user, post_job):
+    client = user("client")
+    return [post_job(client) for _ in range(3)]
+
+
+@pytest.fixture
+def bid(jobs, user):
+    return BidService().create_bid(jobs[0]["job_id"], user("freelancer")["user_id"], 50)
+
+
+def test_update_job_applies_only_while_guard_matches(jobs):
+    dao, job_id = JobDAO(), jobs[0]["job_id"]
+    assert dao.update_job(job_id, {"status": "assigned"}, expect={"status": "open"})["status"] == "assigned"
+    # The guard no longer matches: nothing is written
+    assert dao.update_job(job_id, {"status": "completed", "budget": 1}, expect={"status": "open"}) is None
+    job = dao.get_job_by_id(job_id)
+    assert (job["status"], job["budget"]) == ("assigned", 100)
+
+
+def test_delete_job_applies_only_in_expected_statuses(jobs):
+    dao, job_id = JobDAO(), jobs[0]["job_id"]
+    dao.update_job(job_id, {"status": "in-progress"})
+    assert dao.delete_job(job_id, expect_status_in=["open", "assigned"]) is None
+    assert dao.get_job_by_id(job_id)["status"] == "in-progress"
+    assert dao.delete_job(jobs[1]["job_id"], expect_status_in=["open"])["job_id"] == jobs[1]["job_id"]
+    assert dao.get_job_by_id(jobs[1]["job_id"]) is None
+
+
+def test_update_jobs_expect_and_unless_skip_rows(jobs):
+    dao = JobDAO()
+    ids = [job["job_id"] for job in jobs]
+    dao.update_job(ids[0], {"status": "assigned"})
+    dao.update_job(ids[1], {"status": "completed"})
+
+    changed = dao.update_jobs(ids, {"status": "in-progress"}, expect={"status": "assigned"})
+    assert [job["job_id"] for job in changed] == [ids[0]]
+    changed = dao.update_jobs(ids, {"status": "completed"}, unless={"status": "completed"})
+    assert sorted(job["job_id"] for job in changed) == [ids[0], ids[2]]
+    assert {job["job_id"]: job["status"] for job in dao.get_jobs_by_ids(ids)} == dict.fromkeys(ids, "completed")
+
+
+def test_update_and_delete_bid_apply_only_while_pending(bid):
+    dao = BidDAO()
+    assert dao.update_bid(bid["bid_id"], {"amount": 40}, expect={"bid_status": "pending"})["amount"] == 40
+    dao.update_bid(bid["bid_id"], {"bid_status": "accepted"})
+    assert dao.update_bid(bid["bid_id"], {"amount": 30}, expect={"bid_status": "pending"}) is None
+    assert dao.delete_bid(bid["bid_id"], expect={"bid_status": "pending"}) is None
+    row = dao.get_bid_by_id(bid["bid_id"])
+    assert (row["amount"], row["bid_status"]) == (40, "accepted")
+
+
+def test_update_bids_unless_skips_rows(jobs, user):
+    freelancer = user("freelancer")
+    bids = [BidService().create_bid(job["job_id"], freelancer["user_id"], 50) for job in jobs]
+    ids = [b["bid_id"] for b in bids]
+    dao = BidDAO()
+    dao.update_bid(ids[0], {"bid_status": "rejected"})
+    changed = dao.update_bids(ids, {"bid_status": "rejected"}, unless={"bid_status": "rejected"})
+    assert sorted(b["bid_id"] for b in changed) == ids[1:]
+    assert dao.update_bids(ids, {"bid_status": "accepted"}, expect={"bid_status": "pending"}) == []
+
+
+def test_reject_does_not_overwrite_a_concurrent_accept(bid, monkeypatch):
+    service = BidService()
+    # The reject reads the bid while it is still pending...
+    stale = [dict(bid)]
+    read = service.biddao.get_bid_by_id
+    monkeypatch.setattr(service.biddao, "get_bid_by_id", lambda bid_id: stale.pop() if stale else read(bid_id))
+    # ...and the accept commits before the reject writes
+    BidService().accept_bid(bid["bid_id"])
+    with pytest.raises(BidError, match="changed to 'accepted'"):
+        service.reject_bid(bid["bid_id"])
+    assert BidDAO().get_bid_by_id(bid["bid_id"])["bid_status"] == "accepted"
@@ -0,0 +1,97 @@
+import pytest
+from src.services.bid_leaderboard import BidLeaderboard, leaderboard_diff, leaderboards
+from src.services.bid_service import BidService
+from src.services.job_service import JobService
+from src.services.scheduler_service import DeadlineScheduler
+
+
+def bid(bid_id, amount, status="pending", job_id=1):
+    return {"bid_id": bid_id, "job_id": job_id, "amount": amount, "bid_status": status}
+
+
+def amounts(board):
+    return [b["amount"] for b in board.top(board.size)]
+
+
+def test_board_keeps_lowest_bids_and_tracks_completeness():
+    board = BidLeaderboard(1, 2, [bid(1, 50)])
+    assert board.complete and not board.stale
+    version = board.version
+    board.offer(bid(2, 40))
+    assert amounts(board) == [40, 50] and board.complete and board.version > version
+
+    # Overflow: the highest bid falls off and the board no longer holds every pending bid
+    board.offer(bid(3, 30))
+    assert amounts(board) == [30, 40] and not board.complete
+    version = board.version
+    board.offer(bid(4, 90))
+    assert amounts(board) == [30, 40] and board.version == version
+
+
+def test_board_update_reject_and_delete():
+    board = BidLeaderboard(1, 3, [bid(1, 50), bid(2, 60)])
+    board.offer(bid(2, 45))
+    assert [b["bid_id"] for b in board.top(3)] == [2, 1]
+    board.offer(bid(1, 50, "rejected"))
+    assert amounts(board) == [45] and board.complete and not board.stale
+    board.remove(2)
+    assert amounts(board) == [] and board.complete and not board.stale
+
+
+def test_removing_from_incomplete_board_marks_it_stale():
+    board = BidLeaderboard(1, 2, [bid(1, 10), bid(2, 20)])
+    assert not board.complete
+    board.remove(1)
+    assert board.stale
+
+
+def test_leaderboard_diff():
+    before = [bid(1, 10), bid(2, 20), bid(3, 30)]
+    after = [bid(2, 15), bid(1, 10), bid(4, 25)]
+    diff = leaderboard_diff(before, after)
+    assert [(b["bid_id"], b["rank"]) for b in diff["added"]] == [(4, 3)]
+    assert [(b["bid_id"], b["rank"]) for b in diff["removed"]] == [(3, 3)]
+    assert diff["changed"] == [dict(bid(2, 15), rank=1, previous_rank=2, previous_amount=20),
+                               dict(bid(1, 10), rank=2, previous_rank=1, previous_amount=10)]
+
+
+@pytest.fixture
+def job(post_job):
+    return post_job()
+
+
+def board_amounts(job):
+    return [b["amount"] for b in BidService().get_bid_leaderboard(job["job_id"])["bids"]]
+
+
+def test_service_writes_update_the_shared_board(job, user):
+    service = BidService()
+    first = service.create_bid(job["job_id"], user("freelancer")["user_id"], 70)
+    assert board_amounts(job) == [70]
+
+    # Each write goes through a different BidService, as separate sessions would
+    second = BidService().create_bid(job["job_id"], user("freelancer")["user_id"], 60)
+    assert board_amounts(job) == [60, 70]
+    BidService().update_bid(first["bid_id"], {"amount": 50})
+    assert board_amounts(job) == [50, 60]
+    BidService().reject_bid(first["bid_id"])
+    assert board_amounts(job) == [60]
+    BidService().delete_bid(second["bid_id"])
+    assert board_amounts(job) == []
+
+
+def test_close_bidding_invalidates_the_board(job, user):
+    BidService().create_bid(job["job_id"], user("freelancer")["user_id"], 70)
+    assert board_amounts(job) == [70]
+    scheduler = DeadlineScheduler(JobService(), actions=["close-bidding"])
+    scheduler._run_action("close-bidding", [JobService().get_job_by_id(job["job_id"])])
+    assert board_amounts(job) == []
+
+
+def test_reload_does_not_overwrite_a_concurrent_write(job, user):
+    previous, version, created = leaderboards.begin_reload(job["job_id"], 10)
+    assert created
+    # Placed after the reload query read the (empty) bids
+    placed = BidService().create_bid(job["job_id"], user("freelancer")["user_id"], 70)
+    assert not leaderboards.store(BidLeaderboard(job["job_id"], 10, []), previous, version)
+    assert [b["bid_id"] for b in BidService().get_bid_leaderboard(job["job_id"])["bids"]] == [placed["bid_id"]]
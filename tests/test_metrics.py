@@ -0,0 +1,51 @@
+from src.services.metrics import instrumented, metrics
+
+
+@instrumented
+class MetricsProbeService:
+    def work(self, fail: bool = False):
+        if fail:
+            raise ValueError("bad input")
+        return "done"
+
+    def outer(self, fail: bool = False):
+        return self.work(fail)
+
+
+def probe_row(method="work"):
+    return next(row for row in metrics.summary()
+                if row["service"] == "MetricsProbeService" and row["method"] == method)
+
+
+def test_reset_keeps_decorated_methods_recording():
+    service = MetricsProbeService()
+    service.work()
+    try:
+        service.work(fail=True)
+    except ValueError:
+        pass
+    assert probe_row()["calls"] == 2
+    assert probe_row()["errors"] == 1
+
+    metrics.reset()
+    assert probe_row()["calls"] == 0
+    assert probe_row()["errors"] == 0
+
+    service.work()
+    assert probe_row()["calls"] == 1
+
+
+def test_nested_calls_are_recorded_once_under_the_outer_method():
+    service = MetricsProbeService()
+    metrics.reset()
+    service.outer()
+    try:
+        service.outer(fail=True)
+    except ValueError:
+        pass
+    assert (probe_row("outer")["calls"], probe_row("outer")["errors"]) == (2, 1)
+    assert probe_row("work")["calls"] == 0
+
+    # Recording resumes normally once the outer call has returned or raised
+    service.work()
+    assert probe_row("work")["calls"] == 1
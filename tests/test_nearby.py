@@ -0,0 +1,50 @@
+import random
+import pytest
+from src.dao.geo import haversine_km
+from src.dao.local_backend import LocalBackend
+
+
+@pytest.fixture(scope="module")
+def backend():
+    rng = random.Random(7)
+    # A cluster in Amsterdam and one straddling the antimeridian near Fiji
+    points = [(52.37 + rng.uniform(-1, 1), 4.90 + rng.uniform(-1.5, 1.5)) for _ in range(3000)]
+    points += [(-17.0 + rng.uniform(-1, 1), (180 + rng.uniform(-1.5, 1.5) + 180) % 360 - 180) for _ in range(3000)]
+    backend = LocalBackend(autosave=False)
+    backend.replace_table("jobs", [{
+        "job_id": i, "title": f"job {i}", "client_id": 1, "budget": 50 + i % 100, "status": "open",
+        "deadline": "2030-01-01", "latitude": lat, "longitude": lon
+    } for i, (lat, lon) in enumerate(points, 1)])
+    return backend
+
+
+def nearby(backend, lat, lon, radius, **params):
+    return backend.rpc("nearby_jobs", dict(p_latitude=lat, p_longitude=lon, p_radius_km=radius,
+                                           p_limit=10_000, **params)).execute().data
+
+
+@pytest.mark.parametrize("lat, lon", [(52.37, 4.90), (52.9, 5.8), (-17.0, 179.9), (-17.2, -179.8)])
+@pytest.mark.parametrize("radius", [1, 10, 60])
+def test_matches_a_full_scan(backend, lat, lon, radius):
+    expected = sorted((haversine_km(lat, lon, job["latitude"], job["longitude"]), job["job_id"])
+                      for job in backend.tables["jobs"].values())
+    expected = [job_id for distance, job_id in expected if distance <= radius]
+    assert [row["job_id"] for row in nearby(backend, lat, lon, radius)] == expected
+
+
+def test_pages_follow_the_distance_cursor(backend):
+    everything = [row["job_id"] for row in nearby(backend, 52.37, 4.90, 30)]
+    paged, after = [], {}
+    while True:
+        page = backend.rpc("nearby_jobs", dict(p_latitude=52.37, p_longitude=4.90, p_radius_km=30,
+                                               p_limit=25, **after)).execute().data
+        paged += [row["job_id"] for row in page]
+        if len(page) < 25:
+            break
+        after = {"p_after_distance": page[-1]["distance_km"], "p_after_id": page[-1]["job_id"]}
+    assert paged == everything
+
+
+def test_filters_apply_before_the_limit(backend):
+    rows = nearby(backend, 52.37, 4.90, 30, p_min_budget=140)
+    assert rows and all(row["budget"] >= 140 for row in rows)
@@ -0,0 +1,90 @@
+import os
+import pytest
+from src.dao.client import ConnectionPool, PooledClient
+from src.dao.local_backend import LocalBackend
+from src.dao.offline import TEMP_ID_BASE, get_local_store, is_temp_id
+from src.services import sync_service
+from src.services.sync_service import SyncService
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """An offline store in a fresh directory, syncing with an in-memory primary."""
+    monkeypatch.setenv("FREELANCE_BACKEND", "offline")
+    monkeypatch.setenv("FREELANCE_LOCAL_DIR", str(tmp_path))
+    primary = LocalBackend(autosave=False)
+    primary.table("users").insert({"name": "Taken", "email": "taken@example.com", "role": "client"}).execute()
+    monkeypatch.setattr(sync_service, "get_primary_client", lambda: PooledClient(ConnectionPool(lambda: primary)))
+    return get_local_store("offline", str(tmp_path)), primary
+
+
+def test_writes_are_queued_and_logged_not_snapshotted(offline, tmp_path):
+    store, _ = offline
+    store.table("users").insert({"name": "C", "email": "c@example.com", "role": "client"}).execute()
+    job = store.table("jobs").insert({"title": "Offline job", "client_id": TEMP_ID_BASE + 1,
+                                      "deadline": "2030-01-01"}).execute().data[0]
+    store.table("jobs").update({"budget": 80}).eq("job_id", job["job_id"]).execute()
+    assert is_temp_id(job["job_id"])
+    assert len(store.queue) == 3
+    assert not os.path.exists(tmp_path / "replica.json")
+
+    # A restart rebuilds the replica from the change log
+    reloaded = LocalBackend(str(tmp_path / "replica.json"), autosave=False, id_floor=TEMP_ID_BASE,
+                            log_path=str(tmp_path / "replica.log.jsonl"))
+    assert reloaded.tables["jobs"][job["job_id"]]["budget"] == 80
+    assert reloaded.tables["jobs"][job["job_id"]]["created_at"] == job["created_at"]
+    assert reloaded.table("jobs").insert({"title": "Next", "client_id": TEMP_ID_BASE + 1,
+                                          "deadline": "2030-01-01"}).execute().data[0]["job_id"] == job["job_id"] + 1
+
+
+def test_snapshot_empties_the_log_and_deletes_replay(offline, tmp_path):
+    store, _ = offline
+    store.replica.snapshot_every = 3
+    for i in range(3):
+        store.table("users").insert({"name": f"U{i}", "email": f"u{i}@example.com", "role": "client"}).execute()
+    assert os.path.exists(tmp_path / "replica.json")
+    assert os.path.getsize(tmp_path / "replica.log.jsonl") == 0
+
+    store.table("users").delete().eq("user_id", TEMP_ID_BASE + 1).execute()
+    reloaded = LocalBackend(str(tmp_path / "replica.json"), autosave=False,
+                            log_path=str(tmp_path / "replica.log.jsonl"))
+    assert sorted(reloaded.tables["users"]) == [TEMP_ID_BASE + 2, TEMP_ID_BASE + 3]
+
+
+def test_sync_remaps_temp_ids_of_children(offline):
+    store, primary = offline
+    client, freelancer = store.table("users").insert([
+        {"name": "C", "email": "c@example.com", "role": "client"},
+        {"name": "F", "email": "f@example.com", "role": "freelancer"}
+    ]).execute().data
+    job = store.table("jobs").insert({"title": "Offline job", "client_id": client["user_id"], "budget": 100,
+                                      "deadline": "2030-01-01"}).execute().data[0]
+    store.table("bids").insert({"job_id": job["job_id"], "freelancer_id": freelancer["user_id"],
+                                "amount": 90}).execute()
+
+    result = SyncService().push()
+    assert result == {"applied": 3, "conflicts": 0, "remaining": 0}
+    users = {row["email"]: row["user_id"] for row in primary.tables["users"].values()}
+    [synced_job] = primary.tables["jobs"].values()
+    [synced_bid] = primary.tables["bids"].values()
+    assert synced_job["client_id"] == users["c@example.com"]
+    assert (synced_bid["job_id"], synced_bid["freelancer_id"]) == (synced_job["job_id"], users["f@example.com"])
+    # The replica now holds the primary's IDs and nothing is left to push
+    assert len(store.queue) == 0
+    assert set(store.replica.tables["bids"]) == {synced_bid["bid_id"]}
+
+
+def test_replay_records_constraint_conflicts_and_skips_dependents(offline):
+    store, primary = offline
+    user = store.table("users").insert({"name": "Dup", "email": "taken@example.com", "role": "client"}) \
+        .execute().data[0]
+    store.table("jobs").insert({"title": "Orphan", "client_id": user["user_id"], "deadline": "2030-01-01"}).execute()
+    store.table("users").insert({"name": "Fine", "email": "fine@example.com", "role": "client"}).execute()
+
+    result = SyncService().push()
+    assert result == {"applied": 1, "conflicts": 2, "remaining": 0}
+    conflicts = SyncService().conflicts()
+    assert [(c["table"], c["code"]) for c in conflicts] == [("users", "23505"), ("jobs", None)]
+    assert "did not sync" in conflicts[1]["error"]
+    assert sorted(row["email"] for row in primary.tables["users"].values()) == ["fine@example.com", "taken@example.com"]
+    assert not primary.tables["jobs"]
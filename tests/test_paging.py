@@ -0,0 +1,61 @@
+import pytest
+from src.dao.client import ConnectionPool, PooledClient
+from src.dao.local_backend import LocalBackend
+from src.dao.paging import decode_cursor, encode_cursor
+from src.services.bid_service import BidError, BidService
+
+
+@pytest.fixture
+def service():
+    """Eleven bids on one job in few distinct amounts, so pages split runs of equal sort keys."""
+    backend = LocalBackend(autosave=False)
+    amounts = [50, 40, 50, 50, 30, 40, 50, 50, 30, 40, 50]
+    backend.table("users").insert([{"name": "C", "email": "c@example.com", "role": "client"}] +
+                                  [{"name": f"F{i}", "email": f"f{i}@example.com", "role": "freelancer"}
+                                   for i in range(len(amounts))]).execute()
+    backend.table("jobs").insert({"title": "Paged", "client_id": 1, "deadline": "2030-01-01"}).execute()
+    backend.table("bids").insert([{"job_id": 1, "freelancer_id": i + 2, "amount": amount,
+                                   "bid_status": "rejected" if i % 4 == 3 else "pending"}
+                                  for i, amount in enumerate(amounts)]).execute()
+    service = BidService()
+    service.biddao.sb = PooledClient(ConnectionPool(lambda: backend))
+    return service, backend
+
+
+def walk(service, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = service.page_bids(cursor=cursor, limit=3, **kwargs)
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return [bid for page in pages for bid in page["rows"]], pages
+
+
+@pytest.mark.parametrize("desc", [False, True])
+def test_cursor_walk_across_equal_sort_keys(service, desc):
+    service, backend = service
+    rows, pages = walk(service, sort="amount", desc=desc)
+    expected = sorted(backend.tables["bids"].values(), key=lambda bid: (bid["amount"], bid["bid_id"]), reverse=desc)
+    # Every bid exactly once, in (amount, bid_id) order, with ties split across page boundaries
+    assert [bid["bid_id"] for bid in rows] == [bid["bid_id"] for bid in expected]
+    assert len(pages) == 4
+    assert pages[0]["total_estimate"] == 11
+    assert all(page["total_estimate"] is None for page in pages[1:])
+
+
+def test_cursor_walk_with_a_status_filter(service):
+    service, backend = service
+    rows, _ = walk(service, status="pending", sort="amount")
+    expected = sorted((bid for bid in backend.tables["bids"].values() if bid["bid_status"] == "pending"),
+                      key=lambda bid: (bid["amount"], bid["bid_id"]))
+    assert [bid["bid_id"] for bid in rows] == [bid["bid_id"] for bid in expected]
+
+
+def test_cursor_encoding_round_trip_and_rejects_garbage(service):
+    service, _ = service
+    assert decode_cursor(encode_cursor(50, 7)) == (50, 7)
+    assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+    for cursor in ("not-a-cursor", encode_cursor(50, "7")):
+        with pytest.raises(BidError):
+            service.page_bids(sort="amount", cursor=cursor)
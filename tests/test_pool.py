@@ -0,0 +1,94 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.dao.client import ConnectionPool, PooledClient, PoolTimeout
+
+LATENCY = 0.005
+
+
+class StandInClient:
+    """Backend client stand-in with a fixed round-trip time that detects concurrent use."""
+
+    def __init__(self):
+        self.busy = False
+        self.shared = 0
+
+    def table(self, name):
+        return StandInQuery(self, name)
+
+
+class StandInQuery:
+    def __init__(self, client, name):
+        self.client = client
+        self.filters = {}
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def execute(self):
+        if self.client.busy:
+            self.client.shared += 1
+        self.client.busy = True
+        time.sleep(LATENCY)
+        self.client.busy = False
+        return type("Response", (), {"data": [dict(self.filters)]})()
+
+
+def run_sessions(sessions, requests_per_session, pool_size=16):
+    clients = []
+
+    def factory():
+        client = StandInClient()
+        clients.append(client)
+        return client
+
+    pool = ConnectionPool(factory, max_size=pool_size, timeout=5)
+    sb = PooledClient(pool)
+    mismatches = []
+
+    def session(n):
+        for i in range(requests_per_session):
+            # Each session reads its own key; a corrupted checkout would return someone else's
+            data = sb.table("jobs").select("*").eq("job_id", (n, i)).execute().data
+            if data != [{"job_id": (n, i)}]:
+                mismatches.append((n, i, data))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        list(executor.map(session, range(sessions)))
+    elapsed = time.perf_counter() - start
+    return sessions * requests_per_session / elapsed, pool, clients, mismatches
+
+
+def test_throughput_scales_with_sessions_without_corruption():
+    throughput = {}
+    for sessions in (1, 4, 16):
+        rate, pool, clients, mismatches = run_sessions(sessions, 40)
+        throughput[sessions] = rate
+        assert not mismatches
+        assert sum(client.shared for client in clients) == 0
+        assert pool.stats()["size"] <= pool.max_size
+        assert pool.stats()["in_use"] == 0
+    assert throughput[4] > 2.5 * throughput[1]
+    assert throughput[16] > 2 * throughput[4]
+
+
+def test_sessions_queue_behind_a_small_pool():
+    _, pool, clients, mismatches = run_sessions(16, 20, pool_size=4)
+    assert not mismatches
+    assert len(clients) == 4
+    assert pool.stats()["waits"] > 0 and pool.stats()["timeouts"] == 0
+
+
+def test_checkout_times_out_when_pool_is_exhausted():
+    pool = ConnectionPool(StandInClient, max_size=1, timeout=0.05)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    pool.release(held)
+    assert pool.acquire() is held
+    assert pool.stats()["timeouts"] == 1
@@ -0,0 +1,65 @@
+import pytest
+from src.dao.bid_dao import BidDAO
+from src.dao.local_backend import LocalBackend
+from src.dao.offline import TEMP_ID_BASE
+from src.services.bid_service import BidService
+from src.services import recommendation_service
+from src.services.recommendation_service import RecommendationService
+
+
+@pytest.fixture
+def freelancer_with_bids(user, post_job):
+    client, freelancer = user("client"), user("freelancer")
+    jobs = [post_job(client, budget=100 + i) for i in range(5)]
+    bids = [BidService().create_bid(job["job_id"], freelancer["user_id"], 90) for job in jobs]
+    return freelancer, jobs, bids
+
+
+def test_recheck_ids_are_fetched_in_chunks(freelancer_with_bids):
+    freelancer, _, bids = freelancer_with_bids
+    bid_ids = [bid["bid_id"] for bid in bids]
+    rows = BidDAO().get_bids_by_freelancer_since(freelancer["user_id"], max(bid_ids), bid_ids, chunk_size=2)
+    assert sorted(row["bid_id"] for row in rows) == bid_ids
+
+
+def test_deleted_pending_bids_leave_the_profile(freelancer_with_bids):
+    freelancer, jobs, bids = freelancer_with_bids
+    service = RecommendationService()
+    bid_job_ids, _ = service._profile(freelancer["user_id"])
+    assert sorted(bid_job_ids.tolist()) == [job["job_id"] for job in jobs]
+
+    BidService().delete_bid(bids[0]["bid_id"])
+    bid_job_ids, _ = service._profile(freelancer["user_id"])
+    assert sorted(bid_job_ids.tolist()) == [job["job_id"] for job in jobs[1:]]
+    # The job is no longer excluded as already bid on
+    recommended = {job["job_id"] for job in service.recommend_jobs(freelancer["user_id"], limit=100)}
+    assert jobs[0]["job_id"] in recommended
+
+
+def test_profile_cache_drops_the_least_recently_used(user, monkeypatch):
+    monkeypatch.setattr(recommendation_service, "PROFILE_CACHE_SIZE", 2)
+    service = RecommendationService()
+    first, second, third = (user("freelancer")["user_id"] for _ in range(3))
+    for freelancer_id in (first, second, first, third):
+        service._profile(freelancer_id)
+    assert list(service._profiles) == [first, third]
+
+
+def test_client_fill_rates_do_not_depend_on_id_size():
+    # Offline rows have IDs above a billion; counts must not be sized by them
+    backend = LocalBackend(autosave=False, id_floor=TEMP_ID_BASE)
+    busy, fresh = [row["user_id"] for row in backend.table("users").insert([
+        {"name": "Busy", "email": "busy@example.com", "role": "client"},
+        {"name": "Fresh", "email": "fresh@example.com", "role": "client"}
+    ]).execute().data]
+    backend.table("jobs").insert([
+        {"title": "Done", "client_id": busy, "status": "completed", "budget": 10, "deadline": "2030-01-01"},
+        {"title": "Busy open", "client_id": busy, "budget": 10, "deadline": "2030-01-01"},
+        {"title": "Fresh open", "client_id": fresh, "budget": 10, "deadline": "2030-01-01"}
+    ]).execute()
+    service = RecommendationService()
+    service.jobdao.sb = backend
+    columns = service._load_job_columns()
+    assert columns["job_id"].tolist() == [TEMP_ID_BASE + 2, TEMP_ID_BASE + 3]
+    # (filled + 1) / (total + 2)
+    assert columns["client_fill"].tolist() == [2 / 4, 1 / 3]
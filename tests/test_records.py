@@ -0,0 +1,25 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import pytest
+from src.dao.records import Bid, Job
+
+
+def test_from_row_parses_typed_columns():
+    job = Job.from_row({"job_id": 1, "title": "Fix sink", "client_id": 2, "assigned_to": None, "budget": 0.1,
+                        "status": "open", "deadline": "2030-01-01", "created_at": "2026-10-01T10:00:00Z"})
+    assert job["budget"] == Decimal("0.1")
+    assert job.deadline == date(2030, 1, 1)
+    assert job.created_at == datetime(2026, 10, 1, 10, tzinfo=timezone.utc)
+    assert job["assigned_to"] is None and "assigned_to" in job
+    assert {**job}["title"] == "Fix sink"
+
+
+def test_columns_missing_from_the_row_behave_like_a_dict():
+    row = {"bid_id": 3, "amount": None, "bid_status": "pending"}
+    bid = Bid.from_row(row)
+    assert "job_id" not in bid and "amount" in bid
+    assert bid.get("job_id", "absent") == "absent"
+    with pytest.raises(KeyError):
+        bid["job_id"]
+    assert bid.to_dict() == row and list(bid) == list(row)
+    assert bid == Bid.from_row(dict(row)) and bid != Bid.from_row(dict(row, job_id=None))
@@ -0,0 +1,100 @@
+import threading
+import time
+import httpx
+import pytest
+from src.dao.client import ConnectionPool, PooledClient
+from src.dao.local_backend import LocalBackend
+from src.dao.routing import ReadRouter, Replica
+from src.dao.transport import TransportPolicy
+
+RYW_WINDOW = 0.2
+
+
+class StandInBackend(LocalBackend):
+    """In-memory local backend that counts requests and can be taken down."""
+
+    def __init__(self):
+        super().__init__(autosave=False)
+        self.requests = 0
+        self.down = False
+
+    def run(self, query):
+        self.requests += 1
+        if self.down:
+            raise httpx.ConnectError("replica unreachable")
+        return super().run(query)
+
+
+@pytest.fixture
+def backends():
+    primary, replica = StandInBackend(), StandInBackend()
+    for backend, name in ((primary, "on primary"), (replica, "on replica")):
+        backend.table("users").insert({"name": name, "email": "a@example.com", "role": "client"}).execute()
+    primary.requests = replica.requests = 0
+    return primary, replica
+
+
+@pytest.fixture
+def sb(backends):
+    primary, replica = backends
+    router = ReadRouter(ConnectionPool(lambda: primary),
+                        [Replica("replica", ConnectionPool(lambda: replica), cooldown=30)], ryw_window=RYW_WINDOW)
+    return PooledClient(router.primary, TransportPolicy(read_retries=0), router=router)
+
+
+def user_name(sb, user_id=1):
+    rows = sb.table("users").select("*").eq("user_id", user_id).execute().data
+    return rows[0]["name"] if rows else None
+
+
+def write(sb):
+    sb.table("users").insert({"name": "new", "email": "b@example.com", "role": "client"}).execute()
+
+
+def test_reads_go_to_replica_and_writes_to_primary(sb, backends):
+    primary, replica = backends
+    assert user_name(sb) == "on replica"
+    write(sb)
+    assert primary.requests == 1 and replica.requests == 1
+    assert replica.table("users").select("*").eq("user_id", 2).execute().data == []
+
+
+def test_reads_follow_own_writes_for_the_window(sb):
+    write(sb)
+    assert user_name(sb) == "on primary"
+    time.sleep(RYW_WINDOW)
+    assert user_name(sb) == "on replica"
+
+
+def test_write_pins_only_the_writing_session(sb):
+    write(sb)
+    names = []
+    other = threading.Thread(target=lambda: names.append(user_name(sb)))
+    other.start()
+    other.join()
+    assert names == ["on replica"]
+    assert user_name(sb) == "on primary"
+
+
+def test_pin_primary_block(sb):
+    with sb.pin_primary():
+        assert user_name(sb) == "on primary"
+    assert user_name(sb) == "on replica"
+
+
+def test_lagging_replica_falls_back_to_primary(sb, backends):
+    primary, _ = backends
+    # Written to the primary only, as if not replicated yet
+    primary.table("users").insert({"name": "lagging", "email": "c@example.com", "role": "client"}).execute()
+    assert user_name(sb, 2) == "lagging"
+    assert sb.router.stats()["lag_fallbacks"] == 1
+
+
+def test_failing_replica_falls_back_and_is_taken_out_of_rotation(sb, backends):
+    _, replica = backends
+    replica.down = True
+    assert user_name(sb) == "on primary"
+    assert sb.router.stats()["replicas"] == {"replica": "down"}
+    requests = replica.requests
+    assert user_name(sb) == "on primary"
+    assert replica.requests == requests
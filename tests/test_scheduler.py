@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+import pytest
+from src.dao.local_backend import LocalBackend
+from src.services import bid_service, tasks
+from src.services.bid_service import BidError, BidService
+from src.services.job_service import JobService
+from src.services.scheduler_service import DeadlineScheduler
+from src.services.user_service import UserService
+
+TODAY = date(2030, 6, 15)
+
+
+@pytest.fixture
+def service():
+    service = JobService()
+    backend = LocalBackend(autosave=False)
+    deadlines = {1: TODAY - timedelta(days=400), 2: TODAY - timedelta(days=30),
+                 3: TODAY - timedelta(days=3), 4: TODAY + timedelta(days=2)}
+    backend.replace_table("jobs", [{
+        "job_id": job_id, "title": f"job {job_id}", "client_id": 1, "budget": 100,
+        "status": "in-progress", "deadline": deadline.isoformat()
+    } for job_id, deadline in deadlines.items()])
+    service.jobdao.sb = backend
+    return service
+
+
+def test_load_skips_deadlines_before_the_lookback_window(service):
+    scheduler = DeadlineScheduler(service, actions=["flag-overdue"], lookback_days=7)
+    assert scheduler.load(TODAY) == 2
+    assert sorted(job["job_id"] for job in scheduler.tick(TODAY)["flag-overdue"]) == [3]
+
+
+def test_fired_entries_are_pruned_once_out_of_the_window(service):
+    scheduler = DeadlineScheduler(service, actions=["flag-overdue"], lookback_days=7)
+    scheduler.load(TODAY)
+    scheduler.tick(TODAY)
+    # Still inside the window: a reload must not flag job 3 again
+    scheduler.load(TODAY + timedelta(days=1))
+    assert scheduler.tick(TODAY + timedelta(days=1)) == {}
+    assert scheduler._fired == {(3, "flag-overdue", TODAY - timedelta(days=3))}
+
+    later = TODAY + timedelta(days=10)
+    scheduler.load(later)
+    assert sorted(job["job_id"] for job in scheduler.tick(later)["flag-overdue"]) == [4]
+    assert scheduler._fired == {(4, "flag-overdue", TODAY + timedelta(days=2))}
+
+
+def test_updates_to_historic_jobs_are_not_queued(service):
+    scheduler = DeadlineScheduler(service, actions=["flag-overdue"], lookback_days=7)
+    scheduler.load(TODAY)
+    scheduler.on_job_changed({"job_id": 1, "status": "assigned",
+                              "deadline": (TODAY - timedelta(days=400)).isoformat()})
+    assert scheduler.pending() == 2
+
+
+def test_close_bidding_notifies_rejected_bidders(monkeypatch):
+    delivered = []
+    monkeypatch.setattr(tasks, "NOTIFIERS", [delivered.extend])
+    users = UserService()
+    client = users.create_user("Close client", "close-client@example.com", "555", "client")
+    freelancers = [users.create_user(f"Close {i}", f"close-{i}@example.com", "555", "freelancer") for i in range(2)]
+    job = JobService().create_job("Close bidding job", client["user_id"], 100, TODAY.isoformat())
+    bids = [BidService().create_bid(job["job_id"], f["user_id"], 50 + i) for i, f in enumerate(freelancers)]
+
+    scheduler = DeadlineScheduler(JobService(), actions=["close-bidding"])
+    scheduler.on_job_changed(job)
+    assert scheduler.tick(TODAY)["close-bidding"] == [
+        {"job_id": job["job_id"], "deadline": job["deadline"], "rejected_bids": 2}
+    ]
+    assert sorted((n["event"], n["bid_id"], n["user_id"]) for n in delivered) == [
+        ("bid_rejected", b["bid_id"], b["freelancer_id"]) for b in bids
+    ]
+    assert {b["bid_status"] for b in BidService().get_bids_by_job(job["job_id"])} == {"rejected"}
+
+
+def test_no_bids_are_taken_once_bidding_closes(monkeypatch, user):
+    job = JobService().create_job("Closing job", user("client")["user_id"], 100, TODAY.isoformat())
+    BidService().create_bid(job["job_id"], user("freelancer")["user_id"], 50)
+    scheduler = DeadlineScheduler(JobService(), actions=["close-bidding"])
+    scheduler.on_job_changed(job)
+    scheduler.tick(TODAY)
+
+    class Today(date):
+        @classmethod
+        def today(cls):
+            return TODAY
+    monkeypatch.setattr(bid_service, "date", Today)
+    with pytest.raises(BidError, match="closed on its deadline"):
+        BidService().create_bid(job["job_id"], user("freelancer")["user_id"], 40)
+    [result] = BidService().create_bids(user("freelancer")["user_id"], [(job["job_id"], 40)])
+    assert not result["ok"] and "closed" in result["error"]
+    assert [b["amount"] for b in BidService().get_bids_by_job(job["job_id"])] == [50]
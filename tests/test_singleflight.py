@@ -0,0 +1,57 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.dao.client import ConnectionPool, PooledClient
+from src.dao.local_backend import LocalBackend
+from src.dao.singleflight import SingleFlight
+
+
+def start_slow_read(flight, key, value, release):
+    """Start a leader call for key that returns value once release is set."""
+    started = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return value
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(flight.do, key, fetch)
+    started.wait(5)
+    executor.shutdown(wait=False)
+    return future
+
+
+def test_concurrent_reads_share_one_call():
+    flight, release = SingleFlight(), threading.Event()
+    leader = start_slow_read(flight, "job:1", {"status": "open"}, release)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        follower = executor.submit(flight.do, "job:1", lambda: {"status": "never fetched"})
+        while flight.stats()["coalesced"] < 1:
+            time.sleep(0.001)
+        release.set()
+        assert leader.result() == follower.result() == {"status": "open"}
+    assert flight.stats()["executed"] == 1
+
+
+def test_read_after_invalidate_does_not_join_older_call():
+    flight, release = SingleFlight(), threading.Event()
+    stale = start_slow_read(flight, "job:1", {"status": "open"}, release)
+    flight.invalidate()
+    # Starts after the write, so it must fetch the new state itself
+    assert flight.do("job:1", lambda: {"status": "assigned"}) == {"status": "assigned"}
+    release.set()
+    assert stale.result() == {"status": "open"}
+    # The detached call finishing did not disturb the key for later reads
+    assert flight.do("job:1", lambda: {"status": "completed"}) == {"status": "completed"}
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_writes_through_the_client_invalidate_in_flight_reads(monkeypatch):
+    flight = SingleFlight()
+    monkeypatch.setattr("src.dao.client.reads", flight)
+    sb = PooledClient(ConnectionPool(lambda: LocalBackend(autosave=False)))
+    release = threading.Event()
+    start_slow_read(flight, "users", [], release)
+    sb.table("users").insert({"name": "C", "email": "c@example.com", "role": "client"}).execute()
+    assert flight.stats()["invalidations"] == 1 and flight.stats()["in_flight"] == 0
+    release.set()
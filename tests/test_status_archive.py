@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from postgrest.exceptions import APIError
+from src.dao.client import ConnectionPool, PooledClient
+from src.dao.jobstatus_dao import JobStatusDAO
+from src.dao.local_backend import LocalBackend
+from src.dao.status_archive import StatusArchive
+from src.services.jobstatus_service import JobStatusService
+
+
+def days_ago(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Three completed jobs: job 1 finished 100 days ago, job 2 ten days ago, and job 3
+    120 days ago, though its history was written last (as a delayed queue would)."""
+    backend = LocalBackend(autosave=False)
+    backend.table("users").insert({"name": "C", "email": "c@example.com", "role": "client"}).execute()
+    backend.table("jobs").insert([{"title": f"Job {i}", "client_id": 1, "status": "completed",
+                                   "deadline": "2030-01-01"} for i in (1, 2, 3)]).execute()
+    backend.table("job_status").insert([
+        {"job_id": 1, "status": "open", "updated_at": days_ago(200)},
+        {"job_id": 1, "status": "assigned", "updated_at": days_ago(150)},
+        {"job_id": 2, "status": "open", "updated_at": days_ago(200)},
+        {"job_id": 2, "status": "completed", "updated_at": days_ago(10)},
+        {"job_id": 1, "status": "completed", "updated_at": days_ago(100)},
+        {"job_id": 3, "status": "open", "updated_at": days_ago(180)},
+        {"job_id": 3, "status": "completed", "updated_at": days_ago(120)}
+    ]).execute()
+    service = JobStatusService()
+    service.jobdao.sb = service.job_status_dao.sb = PooledClient(ConnectionPool(lambda: backend))
+    service.archive = StatusArchive(str(tmp_path))
+    return service
+
+
+def statuses(service, job_id):
+    return [row["status"] for row in service.job_status_dao.get_status_history_by_job_id(job_id)]
+
+
+def test_archive_round_trip_resumes_from_the_watermark(service, monkeypatch):
+    result = service.archive_history(older_than_days=90, batch_size=1)
+    # Job 2's newer completion has a lower ID than both older ones, and holds neither back
+    assert (result["archived_rows"], result["jobs"], result["watermark"][1]) == (3, 2, 5)
+    assert statuses(service, 1) == ["completed"] and statuses(service, 3) == ["completed"]
+    assert [row["status"] for row in service.get_status_history(1)] == ["open", "assigned", "completed"]
+    assert statuses(service, 2) == ["open", "completed"]
+
+    result = service.archive_history(older_than_days=5)
+    assert (result["archived_rows"], result["watermark"][1]) == (1, 4)
+    assert statuses(service, 2) == ["completed"]
+    assert [row["status"] for row in service.get_status_history(2)] == ["open", "completed"]
+    assert service.archive.stats()["rows"] == 4
+
+    # Nothing completed since: the next run reads no history at all
+    monkeypatch.setattr(JobStatusDAO, "get_statuses_before", lambda *args: pytest.fail("rescanned history"))
+    assert service.archive_history(older_than_days=5)["archived_rows"] == 0
+
+
+def test_rows_are_kept_unless_the_backend_is_local(service, monkeypatch):
+    monkeypatch.setenv("FREELANCE_BACKEND", "supabase")
+    result = service.archive_history(older_than_days=5)
+    assert result["skipped"] and result["archived_rows"] == 0
+    assert statuses(service, 1) == ["open", "assigned", "completed"]
+    assert service.archive.stats()["segments"] == 0
+
+
+def test_local_partition_maintenance_is_a_no_op(service):
+    assert service.job_status_dao.maintain_partitions() == {
+        "created": [], "dropped": [], "moved": {}, "default_rows": 0
+    }
+
+
+def test_partition_maintenance_without_the_service_role_is_skipped(service, monkeypatch):
+    def denied(*args, **kwargs):
+        raise APIError({"code": "42501", "message": "permission denied for function maintain_job_status_partitions"})
+    monkeypatch.setattr(JobStatusDAO, "maintain_partitions", denied)
+    assert "skipped" in service.archive_history()["partitions"]
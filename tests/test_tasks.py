@@ -0,0 +1,41 @@
+import os
+import pytest
+from src.dao.jobstatus_dao import JobStatusDAO
+from src.services import tasks
+
+
+@pytest.fixture
+def job(post_job):
+    return post_job()
+
+
+def test_inline_statuses_skip_dedupe_read(job, monkeypatch):
+    def no_read(*args, **kwargs):
+        raise AssertionError("inline delivery must not read before writing")
+    monkeypatch.setattr(JobStatusDAO, "get_statuses_at", no_read)
+    tasks.submit("job_status", {"job_id": job["job_id"], "status": "assigned", "updated_at": tasks.now()})
+    history = JobStatusDAO().get_status_history_by_job_id(job["job_id"])
+    assert [row["status"] for row in history] == ["open", "assigned"]
+
+
+def test_queued_statuses_are_written_once(job):
+    payload = {"job_id": job["job_id"], "status": "in-progress", "updated_at": tasks.now()}
+    tasks.record_statuses([payload])
+    # A redelivered task finds its row already written
+    tasks.record_statuses([payload])
+    history = JobStatusDAO().get_status_history_by_job_id(job["job_id"])
+    assert [row["status"] for row in history] == ["open", "in-progress"]
+
+
+def test_notifications_reach_the_outbox_inline_on_supabase(tmp_path, monkeypatch):
+    path = tmp_path / "notifications.jsonl"
+    monkeypatch.setenv("FREELANCE_NOTIFICATIONS_FILE", str(path))
+    monkeypatch.setenv("FREELANCE_BACKEND", "supabase")
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    tasks.deliver_notifications([{"event": "bid_rejected", "bid_id": 1}], inline=True)
+    # Inline delivery is written without waiting on an fsync
+    assert path.read_text().count("\n") == 1 and not synced
+    monkeypatch.setenv("FREELANCE_TASKS", "queue")
+    tasks.deliver_notifications([{"event": "bid_rejected", "bid_id": 2}])
+    assert path.read_text().count("\n") == 2 and len(synced) == 1
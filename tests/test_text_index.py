@@ -0,0 +1,33 @@
+from src.dao.local_backend import LocalBackend
+from src.dao.text_index import TextIndex
+
+
+def test_prefix_and_fuzzy_matches():
+    index = TextIndex([(1, "Kitchen sink plumbing"), (2, "Garden landscaping"), (3, "Plumbing")])
+    ranks = index.search("plumb")
+    assert set(ranks) == {1, 3}
+    # A typo still matches through trigram similarity, like pg_trgm's % operator
+    assert set(index.search("plumbng")) == {3}
+    assert index.search("zzz") == {}
+
+
+def test_index_follows_writes(tmp_path):
+    path = str(tmp_path / "local.json")
+    backend = LocalBackend(path)
+    backend.table("users").insert({"name": "C", "email": "c@example.com", "role": "client"}).execute()
+    backend.table("jobs").insert([
+        {"title": "Paint the fence", "client_id": 1, "deadline": "2030-01-01"},
+        {"title": "Fix the sink", "client_id": 1, "deadline": "2030-01-01"},
+    ]).execute()
+
+    def search(query):
+        return [row["job_id"] for row in backend.rpc("search_jobs", {"p_query": query}).execute().data]
+
+    assert search("paint") == [1]
+    backend.table("jobs").update({"title": "Stain the deck"}).eq("job_id", 1).execute()
+    assert search("paint") == []
+    assert search("deck") == [1]
+    backend.table("jobs").delete().eq("job_id", 2).execute()
+    assert search("sink") == []
+    # Rebuilt when the file is loaded again
+    assert [row["job_id"] for row in LocalBackend(path).rpc("search_jobs", {"p_query": "stain"}).execute().data] == [1]
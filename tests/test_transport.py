@@ -0,0 +1,120 @@
+import time
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+from src.dao.client import ConnectionPool, PooledQuery, PoolTimeout
+from src.dao.transport import CircuitBreaker, CircuitOpenError, TransportError, TransportPolicy
+
+COOLDOWN = 0.05
+
+
+class FlakyBackend:
+    """Stand-in backend call that raises the injected faults in order, then succeeds."""
+
+    def __init__(self):
+        self.faults = []
+        self.calls = 0
+
+    def fail_with(self, *faults):
+        self.faults.extend(faults)
+
+    def __call__(self):
+        self.calls += 1
+        if self.faults:
+            raise self.faults.pop(0)
+        return "ok"
+
+
+@pytest.fixture
+def backend():
+    return FlakyBackend()
+
+
+@pytest.fixture
+def policy():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=COOLDOWN)
+    return TransportPolicy(read_retries=0, backoff_base=0, breaker=breaker, max_workers=2)
+
+
+def trip(policy, backend):
+    backend.fail_with(*[httpx.ConnectError("refused")] * policy.breaker.failure_threshold)
+    for _ in range(policy.breaker.failure_threshold):
+        with pytest.raises(TransportError):
+            policy.call(backend, is_read=True)
+    assert policy.breaker.state == "open"
+
+
+def test_opens_after_threshold_and_fails_fast(policy, backend):
+    trip(policy, backend)
+    calls = backend.calls
+    with pytest.raises(CircuitOpenError):
+        policy.call(backend, is_read=True)
+    assert backend.calls == calls
+
+
+def test_probe_success_closes_circuit(policy, backend):
+    trip(policy, backend)
+    time.sleep(COOLDOWN)
+    assert policy.breaker.state == "half-open"
+    assert policy.call(backend, is_read=True) == "ok"
+    assert policy.breaker.state == "closed"
+
+
+def test_failed_probe_reopens_circuit(policy, backend):
+    trip(policy, backend)
+    time.sleep(COOLDOWN)
+    backend.fail_with(httpx.ReadTimeout("slow"))
+    with pytest.raises(TransportError):
+        policy.call(backend, is_read=True)
+    assert policy.breaker.state == "open"
+
+
+def test_probe_that_never_reached_backend_does_not_wedge_breaker(policy, backend):
+    trip(policy, backend)
+    time.sleep(COOLDOWN)
+    backend.fail_with(PoolTimeout("no free connection"))
+    with pytest.raises(PoolTimeout):
+        policy.call(backend, is_read=True)
+    # No verdict: still half-open, and the next call probes again
+    assert policy.breaker.state == "half-open"
+    assert policy.call(backend, is_read=True) == "ok"
+    assert policy.breaker.state == "closed"
+
+
+def test_saturated_pool_does_not_open_circuit(policy):
+    pool = ConnectionPool(lambda: object(), max_size=1, timeout=0.01)
+    query = PooledQuery(None, ("table", ("jobs",), {}))
+    query.build = lambda client: type("Query", (), {"execute": lambda self: "ok"})()
+    with pool.connection():
+        for _ in range(policy.breaker.failure_threshold * 2):
+            with pytest.raises(PoolTimeout):
+                policy.call(lambda: query.execute_on(pool), is_read=True)
+    assert policy.breaker.state == "closed"
+    assert policy.stats()["failures"] == 0
+    assert pool.stats()["timeouts"] == policy.breaker.failure_threshold * 2
+    assert policy.call(lambda: query.execute_on(pool), is_read=True) == "ok"
+
+
+def test_bad_request_probe_closes_circuit(policy, backend):
+    trip(policy, backend)
+    time.sleep(COOLDOWN)
+    backend.fail_with(APIError({"code": "23505", "message": "duplicate key"}))
+    with pytest.raises(APIError):
+        policy.call(backend, is_read=False)
+    assert policy.breaker.state == "closed"
+
+
+def test_transient_reads_are_retried(backend):
+    policy = TransportPolicy(read_retries=2, backoff_base=0, max_workers=2)
+    backend.fail_with(httpx.ConnectError("refused"), httpx.ConnectError("refused"))
+    assert policy.call(backend, is_read=True) == "ok"
+    assert backend.calls == 3
+    assert policy.stats()["retries"] == 2
+
+
+def test_writes_are_not_retried(backend):
+    policy = TransportPolicy(read_retries=2, backoff_base=0, max_workers=2)
+    backend.fail_with(httpx.ConnectError("refused"))
+    with pytest.raises(TransportError):
+        policy.call(backend, is_read=False)
+    assert backend.calls == 1